@@ -139,6 +139,8 @@ async def main():
         traceback.print_exc()
 
     finally:
+        if 'client' in locals():
+            await client.close()
         if 'cache_service' in locals():
             await cache_service.close()
             print("\n🔧 Services cleaned up")
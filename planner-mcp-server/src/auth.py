@@ -5,6 +5,7 @@ Authentication service for Microsoft Graph API integration
 import os
 import json
 import secrets
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
@@ -24,6 +25,20 @@ class AuthenticationError(Exception):
     """Authentication related errors"""
     pass
 
+
+@lru_cache(maxsize=4)
+def _derive_token_cipher(encryption_key: str) -> Fernet:
+    """Derive the token encryption cipher (PBKDF2 is slow, so once per key per process)"""
+    salt = b"intelligent_teams_planner_salt"
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(encryption_key.encode()))
+    return Fernet(key)
+
 class AuthService:
     """Microsoft Graph API authentication service"""
 
@@ -33,7 +48,8 @@ class AuthService:
         client_secret: str,
         tenant_id: str,
         cache_service: CacheService,
-        redirect_uri: str = None
+        redirect_uri: str = None,
+        tenant_index: Any = None
     ):
         if not all([client_id, client_secret, tenant_id]):
             raise ValueError("client_id, client_secret, and tenant_id are required")
@@ -42,6 +58,8 @@ class AuthService:
         self.client_secret = client_secret
         self.tenant_id = tenant_id
         self.cache_service = cache_service
+        # UserTenantIndex updated at login and token refresh
+        self.tenant_index = tenant_index
 
         # Default redirect URI for development
         self.redirect_uri = redirect_uri or "http://localhost:8888/auth/callback"
@@ -71,15 +89,7 @@ class AuthService:
             raise ValueError("ENCRYPTION_KEY must be exactly 32 characters")
 
         # Derive a proper Fernet key from the password
-        salt = b"intelligent_teams_planner_salt"
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(encryption_key.encode()))
-        self.cipher = Fernet(key)
+        self.cipher = _derive_token_cipher(encryption_key)
 
         # MSAL app configuration
         self.authority = f"https://login.microsoftonline.com/{tenant_id}"
@@ -164,6 +174,8 @@ class AuthService:
 
             # Encrypt and store tokens
             await self._store_encrypted_tokens(user_id, token_data)
+            if self.tenant_index:
+                await self.tenant_index.record(user_id, token_data["tenant_id"], source="login")
 
             # Clean up state
             await self.cache_service.delete(f"oauth_state:{state}")
@@ -244,6 +256,10 @@ class AuthService:
 
             # Store updated tokens
             await self._store_encrypted_tokens(user_id, updated_token_data)
+            if self.tenant_index:
+                await self.tenant_index.record(
+                    user_id, updated_token_data.get("tenant_id") or self.tenant_id, source="refresh"
+                )
 
             # Cache new access token
             await self.cache_service.set(
@@ -4,7 +4,7 @@ Cache service using Redis for session management and performance optimization
 
 import json
 import asyncio
-from typing import Any, Optional, Dict, List
+from typing import Any, AsyncIterator, Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 
 import redis.asyncio as redis
@@ -124,6 +124,18 @@ class CacheService:
             logger.error("Error deleting cache value", key=key, error=str(e))
             return False
 
+    async def delete_multiple(self, keys: List[str], namespace: str = "itp") -> int:
+        """Delete several keys in a single round trip"""
+        try:
+            if not keys:
+                return 0
+            full_keys = [f"{namespace}:{key}" for key in keys]
+            return await self.redis_client.delete(*full_keys)
+
+        except Exception as e:
+            logger.error("Error deleting multiple cache values", keys=keys, error=str(e))
+            return 0
+
     async def exists(self, key: str, namespace: str = "itp") -> bool:
         """Check if key exists in cache"""
         try:
@@ -293,6 +305,184 @@ class CacheService:
             logger.error("Error getting cache stats", error=str(e))
             return {"error": str(e)}
 
+    # Stream helpers
+    async def stream_add(
+        self,
+        stream: str,
+        value: Any,
+        maxlen: Optional[int] = None,
+        namespace: str = "itp"
+    ) -> Optional[str]:
+        """Append a JSON value to a stream, trimming it to roughly maxlen entries"""
+        try:
+            full_key = f"{namespace}:{stream}"
+            return await self.redis_client.xadd(
+                full_key,
+                {"data": json.dumps(value, default=str)},
+                maxlen=maxlen,
+                approximate=True
+            )
+
+        except Exception as e:
+            logger.error("Error adding stream entry", stream=stream, error=str(e))
+            return None
+
+    async def stream_create_group(
+        self,
+        stream: str,
+        group: str,
+        start_id: str = "0",
+        namespace: str = "itp"
+    ) -> bool:
+        """Create a consumer group (and the stream) if it does not exist yet"""
+        try:
+            full_key = f"{namespace}:{stream}"
+            await self.redis_client.xgroup_create(full_key, group, id=start_id, mkstream=True)
+            return True
+
+        except redis.ResponseError as e:
+            if "BUSYGROUP" in str(e):
+                return True
+            logger.error("Error creating stream group", stream=stream, group=group, error=str(e))
+            return False
+        except Exception as e:
+            logger.error("Error creating stream group", stream=stream, group=group, error=str(e))
+            return False
+
+    async def stream_read_group(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block_ms: Optional[int] = None,
+        namespace: str = "itp"
+    ) -> List[Tuple[str, Any]]:
+        """Read new entries for a consumer group member"""
+        try:
+            full_key = f"{namespace}:{stream}"
+            response = await self.redis_client.xreadgroup(
+                group, consumer, {full_key: ">"}, count=count, block=block_ms
+            )
+
+            entries = []
+            for _, stream_entries in response or []:
+                entries.extend(self._decode_stream_entries(stream_entries))
+            return entries
+
+        except Exception as e:
+            logger.error("Error reading stream group", stream=stream, group=group, error=str(e))
+            return []
+
+    async def stream_ack(
+        self,
+        stream: str,
+        group: str,
+        entry_ids: List[str],
+        namespace: str = "itp"
+    ) -> int:
+        """Acknowledge processed stream entries"""
+        try:
+            if not entry_ids:
+                return 0
+            full_key = f"{namespace}:{stream}"
+            return await self.redis_client.xack(full_key, group, *entry_ids)
+
+        except Exception as e:
+            logger.error("Error acknowledging stream entries", stream=stream, error=str(e))
+            return 0
+
+    async def stream_autoclaim(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        min_idle_ms: int,
+        start_id: str = "0-0",
+        count: int = 100,
+        namespace: str = "itp"
+    ) -> Tuple[str, List[Tuple[str, Any]]]:
+        """Claim pending entries idle for at least min_idle_ms from other consumers"""
+        try:
+            full_key = f"{namespace}:{stream}"
+            response = await self.redis_client.xautoclaim(
+                full_key, group, consumer, min_idle_ms, start_id=start_id, count=count
+            )
+            next_start_id, claimed = response[0], response[1]
+            return next_start_id, self._decode_stream_entries(claimed)
+
+        except Exception as e:
+            logger.error("Error claiming stream entries", stream=stream, group=group, error=str(e))
+            return "0-0", []
+
+    async def stream_stats(
+        self,
+        stream: str,
+        group: str,
+        namespace: str = "itp"
+    ) -> Dict[str, Any]:
+        """Get length and pending count for a stream consumer group"""
+        try:
+            full_key = f"{namespace}:{stream}"
+            length = await self.redis_client.xlen(full_key)
+            pending = await self.redis_client.xpending(full_key, group)
+
+            return {
+                "length": length,
+                "pending": pending.get("pending", 0),
+                "consumers": len(pending.get("consumers") or [])
+            }
+
+        except Exception as e:
+            logger.error("Error getting stream stats", stream=stream, error=str(e))
+            return {"error": str(e)}
+
+    def _decode_stream_entries(self, entries: List[Any]) -> List[Tuple[str, Any]]:
+        """Decode (entry_id, fields) pairs written by stream_add"""
+        decoded = []
+        for entry_id, fields in entries:
+            # Entries deleted by MAXLEN trimming come back without fields
+            if not fields or "data" not in fields:
+                continue
+            try:
+                decoded.append((entry_id, json.loads(fields["data"])))
+            except json.JSONDecodeError:
+                decoded.append((entry_id, fields["data"]))
+        return decoded
+
+    # Pub/sub helpers
+    async def publish(self, channel: str, value: Any, namespace: str = "itp") -> int:
+        """Publish a JSON value on a channel; returns the number of subscribers reached"""
+        try:
+            full_channel = f"{namespace}:{channel}"
+            return await self.redis_client.publish(full_channel, json.dumps(value, default=str))
+
+        except Exception as e:
+            logger.error("Error publishing message", channel=channel, error=str(e))
+            return 0
+
+    async def subscribe(self, channel: str, namespace: str = "itp") -> AsyncIterator[Any]:
+        """
+        Yield JSON values published on a channel until the consumer stops
+
+        Connection errors are raised to the consumer, which decides whether to
+        resubscribe.
+        """
+        full_channel = f"{namespace}:{channel}"
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(full_channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    yield json.loads(message["data"])
+                except json.JSONDecodeError:
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe(full_channel)
+            await pubsub.aclose()
+
     # Session management helpers
     async def create_session(
         self,
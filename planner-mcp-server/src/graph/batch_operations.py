@@ -6,9 +6,9 @@ Story 2.1 Task 1: Advanced batch operations with intelligent optimization and er
 import uuid
 import time
 import asyncio
-from typing import Dict, List, Any, Optional, Callable, Tuple
+from typing import AsyncIterator, Awaitable, Dict, List, Any, Optional, Callable, Set, Tuple
 from datetime import datetime, timezone
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import structlog
 
@@ -23,6 +23,14 @@ from ..utils.performance_monitor import get_performance_monitor, track_operation
 
 logger = structlog.get_logger(__name__)
 
+# Sub-request statuses worth retrying individually
+RETRYABLE_OPERATION_STATUSES = {429, 500, 502, 503, 504}
+
+# Statuses where Graph did not apply the request, so even POSTs are safe to resend
+NOT_APPLIED_STATUSES = {429, 503}
+
+FAILED_DEPENDENCY_STATUS = 424
+
 
 class BatchOptimizationStrategy(str, Enum):
     """Batch optimization strategies"""
@@ -55,6 +63,10 @@ class BatchRequestConfig:
     )
     enable_correlation_tracking: bool = True
     enable_performance_monitoring: bool = True
+    retry_failed_operations: bool = True
+    max_operation_retries: int = 3
+    operation_retry_base_delay: float = 1.0
+    operation_retry_max_delay: float = 60.0
 
 
 @dataclass
@@ -70,6 +82,11 @@ class BatchExecutionContext:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+# Sends a prepared $batch request (url, method, headers, data) and returns the
+# Graph response body; lets callers route batches through their own HTTP client
+BatchTransport = Callable[[Dict[str, Any], BatchExecutionContext], Awaitable[Dict[str, Any]]]
+
+
 @dataclass
 class OperationDependency:
     """Represents a dependency between operations"""
@@ -79,6 +96,35 @@ class OperationDependency:
     conditional: bool = False  # If true, operation is skipped if dependency fails
 
 
+@dataclass
+class BatchPackingPlan:
+    """Operations packed into $batch requests, grouped into sequential rounds"""
+    rounds: List[List[List[BatchOperation]]]
+    max_operations_per_batch: int
+
+    @property
+    def batch_count(self) -> int:
+        return sum(len(batches) for batches in self.rounds)
+
+    @property
+    def operation_count(self) -> int:
+        return sum(len(batch) for batches in self.rounds for batch in batches)
+
+    @property
+    def fill_ratio(self) -> float:
+        """Share of the available batch slots actually used"""
+        capacity = self.batch_count * self.max_operations_per_batch
+        return self.operation_count / capacity if capacity else 0.0
+
+
+@dataclass
+class _PackingPiece:
+    """Dependency-closed group of operations that must share one batch"""
+    operations: List[BatchOperation]
+    round: int = 0
+    flexible: bool = True  # No dependencies or dependents outside the piece
+
+
 class BatchOperationBuilder:
     """Builder for creating batch operations with validation and optimization"""
 
@@ -239,6 +285,120 @@ class BatchOperationBuilder:
 
         return batch_request
 
+    def pack_operations(self,
+                        operations: Optional[List[BatchOperation]] = None,
+                        max_per_batch: Optional[int] = None) -> BatchPackingPlan:
+        """
+        Pack operations into as few $batch requests and rounds as possible
+
+        Dependency chains that fit in one batch stay together so Graph resolves
+        their dependsOn in a single round trip. Chains larger than the batch
+        limit are cut in topological order; each cut runs one round after the
+        cuts it depends on. Pieces are then bin-packed first-fit decreasing,
+        and independent pieces fill leftover space in any round.
+
+        Args:
+            operations: Operations to pack (defaults to the builder's operations)
+            max_per_batch: Override the per-batch operation limit
+
+        Returns:
+            BatchPackingPlan with rounds of batches
+        """
+        operations = list(operations if operations is not None else self.operations)
+        max_per_batch = max_per_batch or self.config.max_operations_per_batch
+        op_map = {op.id: op for op in operations}
+
+        # Union-find over in-set dependencies gives the dependency clusters
+        parent = {op.id: op.id for op in operations}
+
+        def find(op_id: str) -> str:
+            while parent[op_id] != op_id:
+                parent[op_id] = parent[parent[op_id]]
+                op_id = parent[op_id]
+            return op_id
+
+        for op in operations:
+            for dep_id in op.depends_on or []:
+                if dep_id in op_map:
+                    parent[find(op.id)] = find(dep_id)
+
+        components: Dict[str, List[BatchOperation]] = {}
+        for op in operations:
+            components.setdefault(find(op.id), []).append(op)
+
+        pieces: List[_PackingPiece] = []
+        for component in components.values():
+            ordered = self._topological_sort(component)
+            if len(ordered) < len(component):
+                ordered_ids = {op.id for op in ordered}
+                cycle = sorted(op.id for op in component if op.id not in ordered_ids)
+                raise ValueError(
+                    f"Circular dependency detected in batch operations: {', '.join(cycle)}"
+                )
+            if len(ordered) <= max_per_batch:
+                pieces.append(_PackingPiece(ordered))
+                continue
+
+            round_of: Dict[str, int] = {}
+            for start in range(0, len(ordered), max_per_batch):
+                segment = ordered[start:start + max_per_batch]
+                segment_ids = {op.id for op in segment}
+                segment_round = 0
+                for op in segment:
+                    for dep_id in op.depends_on or []:
+                        if dep_id in op_map and dep_id not in segment_ids:
+                            segment_round = max(segment_round, round_of[dep_id] + 1)
+                for op in segment:
+                    round_of[op.id] = segment_round
+                pieces.append(_PackingPiece(segment, round=segment_round, flexible=False))
+
+        rounds: Dict[int, List[List[BatchOperation]]] = {}
+
+        # Pieces of oversized chains are pinned to their round
+        for piece in sorted((p for p in pieces if not p.flexible), key=lambda p: -len(p.operations)):
+            batches = rounds.setdefault(piece.round, [])
+            target = next(
+                (batch for batch in batches if len(batch) + len(piece.operations) <= max_per_batch),
+                None
+            )
+            if target is None:
+                batches.append(list(piece.operations))
+            else:
+                target.extend(piece.operations)
+
+        # Independent pieces take the tightest existing fit, else a new first-round batch
+        for piece in sorted((p for p in pieces if p.flexible), key=lambda p: -len(p.operations)):
+            candidates = [
+                (max_per_batch - len(batch) - len(piece.operations), round_index, batch)
+                for round_index, batches in rounds.items()
+                for batch in batches
+                if len(batch) + len(piece.operations) <= max_per_batch
+            ]
+            if candidates:
+                min(candidates, key=lambda candidate: candidate[:2])[2].extend(piece.operations)
+            else:
+                rounds.setdefault(0, []).append(list(piece.operations))
+
+        plan = BatchPackingPlan(
+            rounds=[rounds[round_index] for round_index in sorted(rounds)],
+            max_operations_per_batch=max_per_batch
+        )
+
+        get_performance_monitor().record_batch_packing(
+            batch_count=plan.batch_count,
+            operation_count=plan.operation_count,
+            capacity=plan.batch_count * max_per_batch,
+            rounds=len(plan.rounds)
+        )
+
+        logger.debug("Operations packed into batches",
+                     operation_count=plan.operation_count,
+                     batch_count=plan.batch_count,
+                     rounds=len(plan.rounds),
+                     fill_ratio=plan.fill_ratio)
+
+        return plan
+
     def _validate_url(self, url: str) -> bool:
         """Validate URL format for Graph API"""
         # Remove leading slash if present
@@ -323,15 +483,20 @@ class BatchOperationBuilder:
 
         return self.operations.copy()
 
-    def _topological_sort(self) -> List[BatchOperation]:
+    def _topological_sort(self, operations: Optional[List[BatchOperation]] = None) -> List[BatchOperation]:
         """Sort operations using topological sort to respect dependencies"""
+        operations = self.operations if operations is None else operations
+
         # Build adjacency list
-        graph: Dict[str, List[str]] = {op.id: [] for op in self.operations}
-        in_degree = {op.id: 0 for op in self.operations}
+        graph: Dict[str, List[str]] = {op.id: [] for op in operations}
+        in_degree = {op.id: 0 for op in operations}
 
-        for op in self.operations:
+        for op in operations:
             if op.depends_on:
                 for dep_id in op.depends_on:
+                    # Dependencies on operations from an earlier chunk are already satisfied
+                    if dep_id not in graph:
+                        continue
                     graph[dep_id].append(op.id)
                     in_degree[op.id] += 1
 
@@ -349,7 +514,7 @@ class BatchOperationBuilder:
                     queue.append(neighbor)
 
         # Convert back to BatchOperation objects
-        op_map = {op.id: op for op in self.operations}
+        op_map = {op.id: op for op in operations}
         return [op_map[op_id] for op_id in sorted_ops]
 
     def _priority_sort(self) -> List[BatchOperation]:
@@ -533,8 +698,11 @@ class BatchResponseParser:
 class BatchExecutor:
     """Executes batch operations with intelligent retry and error handling"""
 
-    def __init__(self, config: Optional[BatchRequestConfig] = None):
+    def __init__(self,
+                 config: Optional[BatchRequestConfig] = None,
+                 transport: Optional[BatchTransport] = None):
         self.config = config or BatchRequestConfig()
+        self.transport = transport
         self.rate_limiter = get_rate_limiter()
         self.performance_monitor = get_performance_monitor()
         self.error_handler = get_error_handler()
@@ -587,6 +755,10 @@ class BatchExecutor:
             # Parse response
             batch_response = self.response_parser.parse_response(response, batch_request)
 
+            # Resend only the throttled or transiently failed sub-requests
+            if self.config.retry_failed_operations:
+                batch_response = await self._retry_failed_operations(execution_context, response, batch_response)
+
             # Record successful execution
             await self.rate_limiter.record_request_result(
                 endpoint="/$batch",
@@ -714,10 +886,177 @@ class BatchExecutor:
         else:
             raise Exception("Batch execution failed after all retries")
 
+    async def _retry_failed_operations(self,
+                                       context: BatchExecutionContext,
+                                       raw_response: Dict[str, Any],
+                                       batch_response: BatchResponse) -> BatchResponse:
+        """
+        Retry failed sub-requests individually, re-packed into new batches
+
+        Each throttled or transient failure waits for its own Retry-After (or
+        exponential backoff) before being resent. Dependents that failed with 424
+        only because of such a failure are resent with it. Successful operations
+        are never resent, and POSTs are only resent when Graph did not apply them.
+        """
+        batch_request = context.batch_request
+        op_map = {op.id: op for op in batch_request.operations}
+        final_responses = {response.get("id"): response for response in raw_response["responses"]}
+        attempts: Dict[str, int] = {}
+        ready_at: Dict[str, float] = {}
+
+        self._collect_retryable_operations(raw_response["responses"], op_map, attempts, ready_at)
+        if not ready_at:
+            return batch_response
+
+        builder = BatchOperationBuilder(self.config)
+        while ready_at:
+            wait_time = min(ready_at.values()) - time.monotonic()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+
+            now = time.monotonic()
+            due_operations = [op for op in batch_request.operations if ready_at.get(op.id, now + 1) <= now]
+            for op in due_operations:
+                del ready_at[op.id]
+
+            logger.info("Retrying failed batch operations",
+                        batch_id=batch_request.id,
+                        operation_count=len(due_operations),
+                        correlation_id=context.correlation_id)
+
+            plan = builder.pack_operations(due_operations)
+            for round_batches in plan.rounds:
+                raw_results = await asyncio.gather(*(
+                    self._execute_retry_batch(context, operations) for operations in round_batches
+                ))
+                for responses in raw_results:
+                    final_responses.update((response.get("id"), response) for response in responses)
+                    self._collect_retryable_operations(responses, op_map, attempts, ready_at)
+
+        batch_request.update_statistics()
+        batch_request.metadata["operation_retries"] = sum(attempts.values())
+
+        return BatchResponse(
+            batch_id=batch_request.id,
+            responses=list(final_responses.values()),
+            total_duration=batch_response.total_duration
+        )
+
+    async def _execute_retry_batch(self,
+                                   context: BatchExecutionContext,
+                                   operations: List[BatchOperation]) -> List[Dict[str, Any]]:
+        """Send one batch of retried operations and update their statuses"""
+        # Skip operations whose dependency failed again in an earlier retry round
+        op_map = {op.id: op for op in context.batch_request.operations}
+        batch_ids = {op.id for op in operations}
+        runnable = []
+        skipped = []
+        skipped_ids = set()
+        for op in operations:
+            blocked = any(
+                dep_id in skipped_ids or (
+                    dep_id in op_map and dep_id not in batch_ids and
+                    op_map[dep_id].status != OperationStatus.SUCCESS
+                )
+                for dep_id in op.depends_on or []
+            )
+            if blocked:
+                skipped.append(op)
+                skipped_ids.add(op.id)
+            else:
+                runnable.append(op)
+
+        responses = [{
+            "id": op.id,
+            "status": FAILED_DEPENDENCY_STATUS,
+            "body": {"error": {"code": "FailedDependency", "message": "Failed dependency"}}
+        } for op in skipped]
+        if not runnable:
+            return responses
+
+        for op in runnable:
+            op.status = OperationStatus.PENDING
+
+        retry_request = BatchRequest(
+            id=str(uuid.uuid4()),
+            operations=runnable,
+            user_id=context.batch_request.user_id,
+            tenant_id=context.batch_request.tenant_id,
+            metadata={"retry_of": context.batch_request.id}
+        )
+        retry_context = replace(context, batch_request=retry_request)
+
+        await self._check_rate_limits(retry_context)
+        raw_response = await self._execute_with_retry(retry_context)
+        self.response_parser.parse_response(raw_response, retry_request)
+
+        return responses + raw_response["responses"]
+
+    def _collect_retryable_operations(self,
+                                      responses: List[Dict[str, Any]],
+                                      op_map: Dict[str, BatchOperation],
+                                      attempts: Dict[str, int],
+                                      ready_at: Dict[str, float]) -> None:
+        """Schedule retryable sub-responses, including 424s caused by them"""
+        now = time.monotonic()
+        statuses = {response.get("id"): response.get("status", 0) for response in responses}
+
+        for response in responses:
+            op = op_map.get(response.get("id"))
+            status = response.get("status", 0)
+            if not op or status not in RETRYABLE_OPERATION_STATUSES:
+                continue
+
+            if op.method == RequestMethod.POST and status not in NOT_APPLIED_STATUSES:
+                logger.warning("Not retrying POST with unknown outcome",
+                               operation_id=op.id,
+                               status_code=status)
+                continue
+
+            attempts[op.id] = attempts.get(op.id, 0) + 1
+            if attempts[op.id] > self.config.max_operation_retries:
+                continue
+
+            ready_at[op.id] = now + self._operation_retry_delay(response, attempts[op.id])
+
+        # Operations are in dependency order, so chained 424s resolve in one pass
+        for op in op_map.values():
+            if statuses.get(op.id) != FAILED_DEPENDENCY_STATUS:
+                continue
+
+            dependencies = [dep_id for dep_id in op.depends_on or [] if dep_id in op_map]
+            pending = [dep_id for dep_id in dependencies if dep_id in ready_at]
+            if not pending or any(
+                dep_id not in ready_at and op_map[dep_id].status != OperationStatus.SUCCESS
+                for dep_id in dependencies
+            ):
+                continue
+
+            attempts[op.id] = attempts.get(op.id, 0) + 1
+            if attempts[op.id] <= self.config.max_operation_retries:
+                ready_at[op.id] = max(ready_at[dep_id] for dep_id in pending)
+
+    def _operation_retry_delay(self, response: Dict[str, Any], attempt: int) -> float:
+        """Delay before resending a sub-request, honouring its Retry-After header"""
+        headers = {key.lower(): value for key, value in (response.get("headers") or {}).items()}
+
+        delay = None
+        if "retry-after" in headers:
+            try:
+                delay = float(headers["retry-after"])
+            except (ValueError, TypeError):
+                pass
+
+        if delay is None:
+            delay = self.config.operation_retry_base_delay * (2 ** (attempt - 1))
+
+        return min(delay, self.config.operation_retry_max_delay)
+
     def _prepare_batch_request(self, context: BatchExecutionContext) -> Dict[str, Any]:
         """Prepare the HTTP request data for batch execution"""
         # Build requests array
         requests = []
+        batch_operation_ids = {operation.id for operation in context.batch_request.operations}
         for operation in context.batch_request.operations:
             request_data = {
                 "id": operation.id,
@@ -725,6 +1064,11 @@ class BatchExecutor:
                 "url": operation.url
             }
 
+            # Only in-batch dependencies are sent; earlier batches already completed
+            depends_on = [dep_id for dep_id in operation.depends_on or [] if dep_id in batch_operation_ids]
+            if depends_on:
+                request_data["dependsOn"] = depends_on
+
             if operation.body:
                 request_data["body"] = operation.body
 
@@ -749,7 +1093,10 @@ class BatchExecutor:
         }
 
     async def _make_http_request(self, request_data: Dict[str, Any], context: BatchExecutionContext) -> Dict[str, Any]:
-        """Make the actual HTTP request (placeholder for actual HTTP client)"""
+        """Make the actual HTTP request through the transport (placeholder without one)"""
+        if self.transport:
+            return await self.transport(request_data, context)
+
         # This is a placeholder for the actual HTTP request implementation
         # In a real implementation, this would use aiohttp, httpx, or similar
 
@@ -790,12 +1137,17 @@ class BatchExecutor:
 class BatchOperationsManager:
     """High-level manager for batch operations with advanced features"""
 
-    def __init__(self, config: Optional[BatchRequestConfig] = None):
+    def __init__(self,
+                 config: Optional[BatchRequestConfig] = None,
+                 transport: Optional[BatchTransport] = None):
         self.config = config or BatchRequestConfig()
-        self.executor = BatchExecutor(self.config)
+        self.executor = BatchExecutor(self.config, transport)
         self.performance_monitor = get_performance_monitor()
         self.active_batches: Dict[str, BatchRequest] = {}
 
+        # In-flight batch slots per tenant, shared by all chunked executions
+        self._tenant_slots: Dict[str, asyncio.Semaphore] = {}
+
     def create_builder(self) -> BatchOperationBuilder:
         """Create a new batch operation builder"""
         return BatchOperationBuilder(self.config)
@@ -838,7 +1190,8 @@ class BatchOperationsManager:
                                            user_id: str,
                                            auth_token: str,
                                            tenant_id: Optional[str] = None,
-                                           chunk_size: Optional[int] = None) -> List[BatchResponse]:
+                                           chunk_size: Optional[int] = None,
+                                           max_in_flight: Optional[int] = None) -> List[BatchResponse]:
         """
         Execute a large list of operations by chunking into multiple batches
 
@@ -848,41 +1201,161 @@ class BatchOperationsManager:
             auth_token: Authentication token
             tenant_id: Optional tenant ID
             chunk_size: Override default chunk size
+            max_in_flight: Override the number of concurrent batches
 
         Returns:
-            List of BatchResponse objects
+            List of BatchResponse objects in chunk order
         """
-        chunk_size = chunk_size or self.config.max_operations_per_batch
+        results: List[Tuple[int, BatchResponse]] = []
+        async for chunk_index, response in self._pipeline_chunks(
+            operations, user_id, auth_token, tenant_id, chunk_size, max_in_flight
+        ):
+            results.append((chunk_index, response))
+
+        results.sort(key=lambda result: result[0])
+        return [response for _, response in results]
+
+    async def stream_operations_in_chunks(self,
+                                          operations: List[BatchOperation],
+                                          user_id: str,
+                                          auth_token: str,
+                                          tenant_id: Optional[str] = None,
+                                          chunk_size: Optional[int] = None,
+                                          max_in_flight: Optional[int] = None) -> AsyncIterator[BatchResponse]:
+        """
+        Execute operations in pipelined chunks, yielding each BatchResponse as it completes
 
-        if len(operations) <= chunk_size:
-            # Single batch
-            builder = self.create_builder()
-            for op in operations:
-                builder.operations.append(op)
+        Args:
+            operations: List of operations to execute
+            user_id: User ID
+            auth_token: Authentication token
+            tenant_id: Optional tenant ID
+            chunk_size: Override default chunk size
+            max_in_flight: Override the number of concurrent batches
 
-            batch_request = builder.build(user_id, tenant_id)
-            response = await self.execute_batch_operations(batch_request, auth_token)
-            return [response]
+        Yields:
+            BatchResponse objects in completion order
+        """
+        chunks = self._pipeline_chunks(
+            operations, user_id, auth_token, tenant_id, chunk_size, max_in_flight
+        )
+        try:
+            async for _, response in chunks:
+                yield response
+        finally:
+            # Cancels in-flight batches when the consumer stops early
+            await chunks.aclose()
+
+    async def _pipeline_chunks(self,
+                               operations: List[BatchOperation],
+                               user_id: str,
+                               auth_token: str,
+                               tenant_id: Optional[str],
+                               chunk_size: Optional[int],
+                               max_in_flight: Optional[int]) -> AsyncIterator[Tuple[int, BatchResponse]]:
+        """
+        Keep up to max_in_flight batches running, one packing round at a time
 
-        # Multiple batches
-        responses = []
-        for i in range(0, len(operations), chunk_size):
-            chunk = operations[i:i + chunk_size]
+        Operations are packed so dependency chains share a batch where they fit;
+        every cross-batch dependsOn target runs in an earlier round. Batches
+        within a round are independent and run concurrently. Operations whose
+        dependencies did not succeed are skipped and reported with a 424
+        response, as Graph does within a single batch.
+        """
+        chunk_size = chunk_size or self.config.max_operations_per_batch
+        max_in_flight = max_in_flight or self.config.max_concurrent_batches
+        start_time = time.time()
 
+        plan = self.create_builder().pack_operations(operations, max_per_batch=chunk_size)
+        operation_ids = {op.id for op in operations}
+        failed_ids: Set[str] = set()
+        chunk_index = 0
+
+        for round_batches in plan.rounds:
+            chunks = []
+            skipped = []
+            for batch in round_batches:
+                runnable = []
+                for op in batch:
+                    if any(dep_id in operation_ids and dep_id in failed_ids for dep_id in op.depends_on or []):
+                        skipped.append(op)
+                        failed_ids.add(op.id)
+                    else:
+                        runnable.append(op)
+                if runnable:
+                    chunks.append(runnable)
+
+            if skipped:
+                yield chunk_index, self._skip_failed_dependents(skipped)
+                chunk_index += 1
+
+            pending = {
+                asyncio.create_task(self._execute_chunk(chunk, user_id, auth_token, tenant_id, max_in_flight)):
+                    (chunk_index + offset, chunk)
+                for offset, chunk in enumerate(chunks)
+            }
+            chunk_index += len(chunks)
+
+            try:
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        index, chunk = pending.pop(task)
+                        response = task.result()
+                        failed_ids.update(
+                            op.id for op in chunk if op.status != OperationStatus.SUCCESS
+                        )
+                        yield index, response
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+        logger.info("Chunked batch execution completed",
+                    total_operations=len(operations),
+                    chunk_count=chunk_index,
+                    rounds=len(plan.rounds),
+                    fill_ratio=plan.fill_ratio,
+                    chunk_size=chunk_size,
+                    max_in_flight=max_in_flight,
+                    duration=time.time() - start_time)
+
+    async def _execute_chunk(self,
+                             chunk: List[BatchOperation],
+                             user_id: str,
+                             auth_token: str,
+                             tenant_id: Optional[str],
+                             max_in_flight: int) -> BatchResponse:
+        """Execute one chunk while holding one of the tenant's in-flight slots"""
+        slots = self._tenant_slots.get(tenant_id or "default")
+        if slots is None:
+            slots = self._tenant_slots[tenant_id or "default"] = asyncio.Semaphore(max_in_flight)
+
+        async with slots:
             builder = self.create_builder()
             for op in chunk:
                 builder.operations.append(op)
 
             batch_request = builder.build(user_id, tenant_id)
-            response = await self.execute_batch_operations(batch_request, auth_token)
-            responses.append(response)
+            return await self.execute_batch_operations(batch_request, auth_token)
 
-        logger.info("Chunked batch execution completed",
-                    total_operations=len(operations),
-                    chunk_count=len(responses),
-                    chunk_size=chunk_size)
+    def _skip_failed_dependents(self, operations: List[BatchOperation]) -> BatchResponse:
+        """Mark operations whose dependencies failed as skipped"""
+        responses = []
+        for op in operations:
+            op.status = OperationStatus.SKIPPED
+            op.error = "Failed dependency"
+            responses.append({
+                "id": op.id,
+                "status": 424,
+                "body": {"error": {"code": "FailedDependency", "message": op.error}}
+            })
+
+        logger.warning("Skipping operations with failed dependencies",
+                       operation_count=len(operations))
 
-        return responses
+        return BatchResponse(batch_id=str(uuid.uuid4()), responses=responses)
 
     def get_active_batches(self) -> List[BatchRequest]:
         """Get list of currently active batch requests"""
@@ -0,0 +1,289 @@
+"""
+Webhook-driven cache invalidation for Planner resources
+
+When a task or plan change notification arrives, the cached ``graph_api:*``
+responses that include the changed resource are deleted and the local database
+row is updated, so read-heavy users see fresh data without lowering cache TTLs
+globally. Optionally the changed resource is refetched right away (targeted
+refresh) or a delta sync is run for the affected plan.
+"""
+
+import os
+from enum import Enum
+from typing import Any, Dict, List, Optional, Set
+import structlog
+
+from ..models.graph_models import WebhookNotification, WebhookSubscription
+from ..graph_client import graph_cache_key
+from ..database import Database
+from ..cache import CacheService
+from .delta_queries import convert_graph_plan_to_db_format, convert_graph_task_to_db_format
+from .etag_cache import PlannerETagCache, get_etag_cache
+
+logger = structlog.get_logger(__name__)
+
+
+class CacheRefreshMode(str, Enum):
+    """What to do after invalidating cached entries"""
+    NONE = "none"  # Invalidate only; next read refetches
+    TARGETED = "targeted"  # Refetch just the changed task or plan
+    DELTA = "delta"  # Run a delta sync for the affected plan
+
+
+def extract_resource_id(notification: WebhookNotification, collection: str) -> Optional[str]:
+    """Get the changed resource ID from resource data or the resource path"""
+    resource_data = notification.resource_data or {}
+    if resource_data.get("id"):
+        return resource_data["id"]
+
+    segments = [segment for segment in notification.resource.split("/") if segment]
+    for index, segment in enumerate(segments[:-1]):
+        if segment.lower() == collection:
+            return segments[index + 1]
+    return None
+
+
+class WebhookCacheInvalidator:
+    """Invalidates and optionally refreshes cached Planner data from notifications"""
+
+    def __init__(
+        self,
+        cache_service: CacheService,
+        database: Optional[Database] = None,
+        graph_client: Any = None,
+        delta_manager: Any = None,
+        refresh_mode: Optional[CacheRefreshMode] = None,
+        etag_cache: Optional[PlannerETagCache] = None
+    ):
+        self.cache_service = cache_service
+        self.database = database
+        self.graph_client = graph_client
+        self.delta_manager = delta_manager
+        self.etag_cache = etag_cache or get_etag_cache()
+        self.refresh_mode = refresh_mode or CacheRefreshMode(
+            os.getenv("WEBHOOK_CACHE_REFRESH_MODE", "none").lower()
+        )
+
+        # Refreshes currently running, used to coalesce notification bursts
+        self._refreshing: Set[str] = set()
+
+        self.stats = {
+            "keys_invalidated": 0,
+            "rows_deleted": 0,
+            "refreshes": 0,
+            "refreshes_coalesced": 0,
+            "refresh_failures": 0
+        }
+
+    async def handle_task_change(
+        self,
+        notification: WebhookNotification,
+        subscription: WebhookSubscription
+    ) -> Dict[str, Any]:
+        """Invalidate cached data affected by a task change"""
+        task_id = extract_resource_id(notification, "tasks")
+        if not task_id:
+            logger.warning("Task notification without task ID", resource=notification.resource)
+            return {"invalidated": []}
+
+        plan_id = await self._resolve_task_plan_id(task_id, notification)
+
+        keys = [
+            graph_cache_key(f"/planner/tasks/{task_id}"),
+            graph_cache_key(f"/planner/tasks/{task_id}/details")
+        ]
+        if plan_id:
+            keys.append(graph_cache_key(f"/planner/plans/{plan_id}/tasks"))
+        await self._invalidate(keys)
+        self._update_etag("task", task_id, notification)
+
+        if notification.change_type == "deleted":
+            await self._delete_row("task", task_id)
+        else:
+            await self._refresh("task", task_id, plan_id, subscription)
+
+        return {"task_id": task_id, "plan_id": plan_id, "invalidated": keys}
+
+    async def handle_plan_change(
+        self,
+        notification: WebhookNotification,
+        subscription: WebhookSubscription
+    ) -> Dict[str, Any]:
+        """Invalidate cached data affected by a plan change"""
+        plan_id = extract_resource_id(notification, "plans")
+        if not plan_id:
+            logger.warning("Plan notification without plan ID", resource=notification.resource)
+            return {"invalidated": []}
+
+        group_id = await self._resolve_plan_group_id(plan_id, notification)
+
+        keys = [
+            graph_cache_key(f"/planner/plans/{plan_id}"),
+            graph_cache_key(f"/planner/plans/{plan_id}/details")
+        ]
+        if notification.change_type == "deleted":
+            keys.extend([
+                graph_cache_key(f"/planner/plans/{plan_id}/tasks"),
+                graph_cache_key(f"/planner/plans/{plan_id}/buckets")
+            ])
+        if group_id:
+            keys.append(graph_cache_key(f"/groups/{group_id}/planner/plans"))
+        await self._invalidate(keys)
+        self._update_etag("plan", plan_id, notification)
+
+        if notification.change_type == "deleted":
+            await self._delete_row("plan", plan_id)
+        else:
+            await self._refresh("plan", plan_id, plan_id, subscription)
+
+        return {"plan_id": plan_id, "group_id": group_id, "invalidated": keys}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get invalidation statistics"""
+        return {**self.stats, "refresh_mode": self.refresh_mode.value}
+
+    # Private methods
+
+    async def _invalidate(self, keys: List[str]) -> None:
+        """Delete cache keys in one round trip"""
+        deleted = await self.cache_service.delete_multiple(keys)
+        self.stats["keys_invalidated"] += deleted or 0
+        logger.debug("Invalidated cached Graph responses", keys=keys, deleted=deleted)
+
+    def _update_etag(self, resource_type: str, resource_id: str, notification: WebhookNotification) -> None:
+        """Keep the ETag cache in step with the changed resource"""
+        if notification.change_type == "deleted":
+            self.etag_cache.invalidate(resource_type, resource_id)
+            if resource_type == "task":
+                self.etag_cache.invalidate("details", resource_id)
+            return
+
+        etag = (notification.resource_data or {}).get("@odata.etag")
+        if not self.etag_cache.set(resource_type, resource_id, etag):
+            self.etag_cache.invalidate(resource_type, resource_id)
+
+    async def _resolve_task_plan_id(
+        self,
+        task_id: str,
+        notification: WebhookNotification
+    ) -> Optional[str]:
+        """Find the plan of a task from resource data, the cached task or the local row"""
+        resource_data = notification.resource_data or {}
+        if resource_data.get("planId"):
+            return resource_data["planId"]
+
+        cached_task = await self.cache_service.get(graph_cache_key(f"/planner/tasks/{task_id}"))
+        if isinstance(cached_task, dict) and cached_task.get("planId"):
+            return cached_task["planId"]
+
+        if self.database:
+            try:
+                task = await self.database.get_task_by_graph_id(task_id)
+                if task:
+                    return task.plan_graph_id
+            except Exception as e:
+                logger.warning("Failed to look up task plan", task_id=task_id, error=str(e))
+
+        return None
+
+    async def _resolve_plan_group_id(
+        self,
+        plan_id: str,
+        notification: WebhookNotification
+    ) -> Optional[str]:
+        """Find the owning group of a plan from resource data, the cached plan or the local row"""
+        for plan_data in (
+            notification.resource_data or {},
+            await self.cache_service.get(graph_cache_key(f"/planner/plans/{plan_id}")) or {}
+        ):
+            if isinstance(plan_data, dict):
+                group_id = (plan_data.get("container") or {}).get("containerId") or plan_data.get("owner")
+                if group_id:
+                    return group_id
+
+        if self.database:
+            try:
+                plan = await self.database.get_plan_by_graph_id(plan_id)
+                if plan:
+                    return plan.group_id
+            except Exception as e:
+                logger.warning("Failed to look up plan group", plan_id=plan_id, error=str(e))
+
+        return None
+
+    async def _delete_row(self, resource_type: str, resource_id: str) -> None:
+        """Remove the local copy of a deleted resource"""
+        if not self.database:
+            return
+        try:
+            if resource_type == "task":
+                deleted = await self.database.delete_task(resource_id)
+            else:
+                deleted = await self.database.delete_plan(resource_id)
+            if deleted:
+                self.stats["rows_deleted"] += 1
+        except Exception as e:
+            logger.warning(
+                "Failed to delete local resource",
+                resource_type=resource_type,
+                resource_id=resource_id,
+                error=str(e)
+            )
+
+    async def _refresh(
+        self,
+        resource_type: str,
+        resource_id: str,
+        plan_id: Optional[str],
+        subscription: WebhookSubscription
+    ) -> None:
+        """Refetch the changed resource according to the refresh mode"""
+        if self.refresh_mode == CacheRefreshMode.NONE or not subscription.user_id:
+            return
+
+        refresh_key = f"{resource_type}:{resource_id}"
+        if self.refresh_mode == CacheRefreshMode.DELTA:
+            refresh_key = f"delta:{plan_id}"
+
+        if refresh_key in self._refreshing:
+            self.stats["refreshes_coalesced"] += 1
+            return
+
+        self._refreshing.add(refresh_key)
+        try:
+            if self.refresh_mode == CacheRefreshMode.DELTA and self.delta_manager and plan_id:
+                await self.delta_manager.sync_resource_changes(
+                    resource_type="tasks",
+                    user_id=subscription.user_id,
+                    tenant_id=subscription.tenant_id,
+                    resource_id=plan_id
+                )
+            elif self.graph_client:
+                await self._refetch_resource(resource_type, resource_id, subscription.user_id)
+            else:
+                return
+            self.stats["refreshes"] += 1
+
+        except Exception as e:
+            self.stats["refresh_failures"] += 1
+            logger.warning(
+                "Failed to refresh resource after notification",
+                resource_type=resource_type,
+                resource_id=resource_id,
+                error=str(e)
+            )
+        finally:
+            self._refreshing.discard(refresh_key)
+
+    async def _refetch_resource(self, resource_type: str, resource_id: str, user_id: str) -> None:
+        """Refetch a single task or plan (re-warming its cache entry) and store it locally"""
+        if resource_type == "task":
+            graph_data = await self.graph_client.get_task_details(resource_id, user_id)
+            self.etag_cache.record_resource("task", graph_data)
+            if graph_data and self.database:
+                await self.database.save_task(convert_graph_task_to_db_format(graph_data))
+        else:
+            graph_data = await self.graph_client.get_plan_details(resource_id, user_id)
+            self.etag_cache.record_resource("plan", graph_data)
+            if graph_data and self.database:
+                await self.database.save_plan(convert_graph_plan_to_db_format(graph_data))
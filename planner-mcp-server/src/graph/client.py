@@ -4,6 +4,7 @@ Story 2.1 Task 8: Performance optimization and connection management
 """
 
 import os
+import re
 import asyncio
 import time
 from typing import Dict, Any, Optional, Union, List
@@ -26,10 +27,25 @@ except ImportError:
     UVLOOP_AVAILABLE = False
 
 from ..utils.performance_monitor import get_performance_monitor, track_operation
+from .rate_limiter import get_rate_limiter
+from .concurrency_limiter import RequestPriority, current_priority, get_concurrency_limiter
+from .pool_telemetry import ConnectionPoolTelemetry, InstrumentedTransport
 
 
 logger = structlog.get_logger(__name__)
 
+# Path segments kept when grouping endpoints for rate limiting; anything else is an ID
+ENDPOINT_WORD_PATTERN = re.compile(r"^[A-Za-z$]+$")
+
+
+def rate_limit_endpoint(endpoint: str) -> str:
+    """Collapse resource IDs so e.g. every /planner/tasks/{id} shares one rate limit state"""
+    path = endpoint.split("?", 1)[0]
+    return "/".join(
+        segment if not segment or ENDPOINT_WORD_PATTERN.match(segment) else "{id}"
+        for segment in path.split("/")
+    )
+
 
 class GraphClientConfig:
     """Configuration for Graph API client"""
@@ -100,6 +116,9 @@ class EnhancedGraphClient:
     - Request compression and optimized JSON encoding
     - Performance monitoring and metrics
     - Connection reuse and optimization
+    - Measured connection pool telemetry (InstrumentedTransport)
+    - Backoff driven by the shared IntelligentRateLimiter
+    - Adaptive in-flight limits per tenant and endpoint tier
     """
 
     def __init__(self, auth_service, cache_service=None):
@@ -107,18 +126,19 @@ class EnhancedGraphClient:
         self.cache_service = cache_service
         self.config = GraphClientConfig()
         self.performance_monitor = get_performance_monitor()
+        self.rate_limiter = get_rate_limiter()
+        self.concurrency_limiter = get_concurrency_limiter()
 
         # HTTP client will be initialized lazily
         self._client: Optional[httpx.AsyncClient] = None
         self._client_lock = asyncio.Lock()
 
-        # Connection statistics
+        # Request statistics; connection counts come from the pool telemetry
         self._connection_stats = {
-            "created": 0,
-            "reused": 0,
             "errors": 0,
-            "active": 0
+            "in_flight": 0
         }
+        self._pool_telemetry = ConnectionPoolTelemetry(self.performance_monitor)
 
         logger.info("Enhanced Graph client initialized")
 
@@ -148,18 +168,22 @@ class EnhancedGraphClient:
                     # Enable HTTP/2 if configured
                     http2 = self.config.enable_http2
 
-                    self._client = httpx.AsyncClient(
+                    # Pool limits and HTTP/2 belong to the transport, which measures the pool
+                    transport = InstrumentedTransport(
+                        self._pool_telemetry,
                         limits=limits,
+                        http2=http2
+                    )
+
+                    self._client = httpx.AsyncClient(
+                        transport=transport,
                         timeout=timeout,
-                        http2=http2,
                         headers={
                             "Accept": "application/json",
                             "User-Agent": "PlannerMCP/2.0"
                         }
                     )
 
-                    self._connection_stats["created"] += 1
-
                     logger.info("HTTP client created",
                                max_connections=self.config.max_connections,
                                http2=http2,
@@ -177,10 +201,7 @@ class EnhancedGraphClient:
     @asynccontextmanager
     async def _track_request(self, operation: str, endpoint: str):
         """Track request performance"""
-        metadata = {
-            "endpoint": endpoint,
-            "connection_stats": self._connection_stats.copy()
-        }
+        metadata = {"endpoint": endpoint}
 
         async with self.performance_monitor.track_operation(operation, metadata) as metrics:
             start_time = time.time()
@@ -198,12 +219,7 @@ class EnhancedGraphClient:
     async def _get_pool_info(self) -> Dict[str, int]:
         """Get connection pool information"""
         if self._client:
-            # HTTPx doesn't expose detailed pool stats, so we approximate
-            return {
-                "active": self._connection_stats["active"],
-                "idle": max(0, self.config.max_keepalive_connections - self._connection_stats["active"]),
-                "total": self._connection_stats["created"]
-            }
+            return self._pool_telemetry.get_pool_info()
         return {"active": 0, "idle": 0, "total": 0}
 
     @track_operation("graph_api_request")
@@ -215,9 +231,14 @@ class EnhancedGraphClient:
                           params: Optional[Dict[str, Any]] = None,
                           headers: Optional[Dict[str, str]] = None,
                           use_beta: bool = False,
-                          timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+                          timeout: Optional[float] = None,
+                          tenant_id: Optional[str] = None,
+                          priority: Optional[RequestPriority] = None) -> Optional[Dict[str, Any]]:
         """
         Make authenticated request to Graph API with enhanced performance
+
+        Requests are interactive unless a priority is given here or set for the
+        calling context with graph_priority().
         """
         client = await self._get_client()
         base_url = self.config.beta_url if use_beta else self.config.base_url
@@ -255,9 +276,11 @@ class EnhancedGraphClient:
         request_timeout = timeout or self.config.timeout
 
         # Execute request with retry logic
+        limit_key = (rate_limit_endpoint(endpoint), tenant_id, user_id)
         async with self._track_request(f"graph_{method.lower()}", endpoint):
             return await self._execute_with_retry(
-                client, method, url, request_headers, request_body, params, request_timeout
+                client, method, url, request_headers, request_body, params, request_timeout, limit_key,
+                priority or current_priority()
             )
 
     async def _execute_with_retry(self,
@@ -267,26 +290,43 @@ class EnhancedGraphClient:
                                  headers: Dict[str, str],
                                  body: Any,
                                  params: Optional[Dict[str, Any]],
-                                 timeout: float) -> Optional[Dict[str, Any]]:
+                                 timeout: float,
+                                 limit_key: Optional[tuple] = None,
+                                 priority: Optional[RequestPriority] = None) -> Optional[Dict[str, Any]]:
         """Execute request with exponential backoff retry"""
         last_exception = None
 
         for attempt in range(self.config.max_retries + 1):
-            try:
-                self._connection_stats["active"] += 1
-
-                # Make request
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    content=body if isinstance(body, (str, bytes)) else None,
-                    json=body if isinstance(body, dict) else None,
-                    params=params,
-                    timeout=timeout
-                )
+            if limit_key:
+                await self._wait_for_rate_limit(*limit_key)
 
-                self._connection_stats["reused"] += 1
+            try:
+                self._connection_stats["in_flight"] += 1
+
+                # Make request once the adaptive concurrency limit admits it
+                endpoint, tenant_id = limit_key[:2] if limit_key else (url, None)
+                async with self.concurrency_limiter.acquire(endpoint, tenant_id, priority) as slot:
+                    response = await client.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        content=body if isinstance(body, (str, bytes)) else None,
+                        json=body if isinstance(body, dict) else None,
+                        params=params,
+                        timeout=timeout
+                    )
+                    slot.record(response.status_code)
+
+                if limit_key:
+                    endpoint, tenant_id, user_id = limit_key
+                    await self.rate_limiter.record_request_result(
+                        endpoint=endpoint,
+                        success=response.status_code < 500 and response.status_code != 429,
+                        response_headers=response.headers,
+                        status_code=response.status_code,
+                        tenant_id=tenant_id,
+                        user_id=user_id
+                    )
 
                 # Handle response
                 return await self._handle_response(response, attempt, url)
@@ -319,19 +359,38 @@ class EnhancedGraphClient:
                 self._connection_stats["errors"] += 1
                 raise
 
+            except (GraphAPIAuthError, GraphAPIClientError):
+                # Not retryable; callers branch on the status code
+                raise
+
             except Exception as e:
                 self._connection_stats["errors"] += 1
                 logger.error("Unexpected error in request", error=str(e), url=url)
                 raise GraphAPIError(f"Unexpected error: {str(e)}")
 
             finally:
-                self._connection_stats["active"] = max(0, self._connection_stats["active"] - 1)
+                self._connection_stats["in_flight"] = max(0, self._connection_stats["in_flight"] - 1)
 
         # If we get here, all retries failed
         if last_exception:
             raise last_exception
         raise GraphAPIError("All retry attempts failed")
 
+    async def _wait_for_rate_limit(self, endpoint: str, tenant_id: Optional[str], user_id: Optional[str]) -> None:
+        """Wait while the rate limiter reports throttling for this endpoint"""
+        rate_limit_check = await self.rate_limiter.check_rate_limit(
+            endpoint=endpoint,
+            tenant_id=tenant_id,
+            user_id=user_id
+        )
+        if not rate_limit_check["allowed"] and rate_limit_check["delay"] > 0:
+            delay = min(rate_limit_check["delay"], self.config.max_delay)
+            logger.warning("Rate limit detected, delaying request",
+                         endpoint=endpoint,
+                         delay=delay,
+                         reason=rate_limit_check["reason"])
+            await asyncio.sleep(delay)
+
     async def _handle_response(self,
                               response: httpx.Response,
                               attempt: int,
@@ -395,10 +454,16 @@ class EnhancedGraphClient:
     async def get_connection_stats(self) -> Dict[str, Any]:
         """Get detailed connection statistics"""
         pool_info = await self._get_pool_info()
+        pool_stats = self._pool_telemetry.get_stats()
 
         return {
             **self._connection_stats,
+            "created": pool_stats["connections_opened"],
+            "reused": pool_stats["connections_reused"],
             **pool_info,
+            "pool": pool_stats,
+            "concurrency": self.concurrency_limiter.get_stats(),
+            "priority_queues": self.concurrency_limiter.get_priority_stats(),
             "max_connections": self.config.max_connections,
             "max_keepalive": self.config.max_keepalive_connections,
             "http2_enabled": self.config.enable_http2,
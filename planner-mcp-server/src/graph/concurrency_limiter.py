@@ -0,0 +1,406 @@
+"""
+Adaptive concurrency limiting for outbound Microsoft Graph traffic
+
+Each (tenant, endpoint tier) pair gets its own in-flight request limit, tuned
+with a gradient algorithm: while observed latency stays near its long-term
+baseline the limit grows, and when latency rises above the baseline the limit
+shrinks in proportion. A 429/503 or a timeout cuts the limit multiplicatively
+(AIMD). Like TCP, growth is fast (sqrt(limit) per round trip) until the first
+throttle and one request per round trip afterwards. Requests over the limit wait
+in a queue, so throughput settles just under the service-side throttle
+instead of bursting into Retry-After stalls.
+
+Queued requests are dispatched by priority class. Interactive tool calls go
+ahead of queued bulk work (delta syncs, $batch jobs) and maintenance work
+(subscription renewals), but each background class is owed a minimum share of
+the dispatches made while it waits, so it never starves.
+"""
+
+import os
+import re
+import time
+import math
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, Tuple
+import structlog
+
+import httpx
+
+from ..utils.performance_monitor import get_performance_monitor
+from .rate_limiter import EndpointTier
+
+logger = structlog.get_logger(__name__)
+
+
+# Status codes meaning Graph is shedding load
+THROTTLE_STATUSES = {429, 503}
+
+ENDPOINT_TIER_PATTERNS = [
+    (re.compile(r"^/\$batch"), EndpointTier.BATCH),
+    (re.compile(r"^/subscriptions"), EndpointTier.WEBHOOK),
+    (re.compile(r"^/(applications|servicePrincipals|directoryRoles)"), EndpointTier.LOW_VOLUME),
+    (re.compile(r"^/(me|users)(/|$)"), EndpointTier.HIGH_VOLUME)
+]
+
+
+def endpoint_tier(endpoint: str) -> EndpointTier:
+    """Get the tier an endpoint's traffic is limited under"""
+    for pattern, tier in ENDPOINT_TIER_PATTERNS:
+        if pattern.match(endpoint):
+            return tier
+    return EndpointTier.MEDIUM_VOLUME
+
+
+class RequestPriority(str, Enum):
+    """Dispatch class of a Graph request, highest priority first"""
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+    MAINTENANCE = "maintenance"
+
+
+PRIORITY_ORDER = list(RequestPriority)
+
+_request_priority: ContextVar[RequestPriority] = ContextVar(
+    "graph_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def graph_priority(priority: RequestPriority):
+    """
+    Send the Graph requests made inside the block with the given priority
+
+    The priority is carried by the current context, so tasks created inside
+    the block inherit it and background jobs only need to wrap their entry point.
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def current_priority() -> RequestPriority:
+    """Get the priority of Graph requests made from the current context"""
+    return _request_priority.get()
+
+
+def _priority_queues() -> Dict[RequestPriority, Deque[asyncio.Future]]:
+    return {priority: deque() for priority in PRIORITY_ORDER}
+
+
+@dataclass
+class PriorityQueueStats:
+    """Admission statistics for one priority class"""
+    queued: int = 0
+    admitted: int = 0
+    waits: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+
+@dataclass
+class ConcurrencyState:
+    """Adaptive limit and in-flight requests for one tenant and endpoint tier"""
+    limit: float
+    in_flight: int = 0
+    long_rtt: Optional[float] = None
+    last_rtt: Optional[float] = None
+    last_decrease: float = 0.0
+    slow_start: bool = True
+    waiters: Dict[RequestPriority, Deque[asyncio.Future]] = field(default_factory=_priority_queues)
+    # Dispatches owed to background classes passed over while queued
+    credits: Dict[RequestPriority, float] = field(
+        default_factory=lambda: {priority: 0.0 for priority in PRIORITY_ORDER}
+    )
+    total_requests: int = 0
+    total_throttled: int = 0
+    total_waits: int = 0
+
+
+class ConcurrencySlot:
+    """One admitted request; the outcome decides how the limit moves"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.status_code: Optional[int] = None
+
+    def record(self, status_code: int) -> None:
+        """Record the response status of the request"""
+        self.status_code = status_code
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Gradient/AIMD concurrency limiter for Graph requests
+
+    Features:
+    - Per tenant and endpoint tier in-flight limits
+    - Limit growth while latency is healthy, proportional cuts on latency inflection
+    - Multiplicative decrease on 429/503 and timeouts
+    - Priority admission queue with minimum shares for background classes
+    """
+
+    def __init__(self, performance_monitor: Any = None):
+        self.config = self._load_config()
+        self.performance_monitor = performance_monitor
+        self.states: Dict[Tuple[str, EndpointTier], ConcurrencyState] = {}
+        self.priority_stats: Dict[RequestPriority, PriorityQueueStats] = {
+            priority: PriorityQueueStats() for priority in PRIORITY_ORDER
+        }
+
+        logger.info("Adaptive concurrency limiter initialized",
+                   enabled=self.config["enabled"],
+                   initial_limit=self.config["initial_limit"],
+                   max_limit=self.config["max_limit"])
+
+    def _load_config(self) -> Dict[str, Any]:
+        """Load concurrency limiter configuration"""
+        return {
+            "enabled": os.getenv("GRAPH_ADAPTIVE_CONCURRENCY", "true").lower() == "true",
+            "initial_limit": float(os.getenv("GRAPH_CONCURRENCY_INITIAL", "20")),
+            "min_limit": float(os.getenv("GRAPH_CONCURRENCY_MIN", "1")),
+            "max_limit": float(os.getenv("GRAPH_CONCURRENCY_MAX", "200")),
+            # Latency may exceed the baseline by this factor before the limit shrinks
+            "rtt_tolerance": float(os.getenv("GRAPH_CONCURRENCY_RTT_TOLERANCE", "1.5")),
+            # Share of each new estimate blended into the limit
+            "smoothing": float(os.getenv("GRAPH_CONCURRENCY_SMOOTHING", "0.2")),
+            # Weight of each sample in the long-term latency baseline
+            "baseline_weight": float(os.getenv("GRAPH_CONCURRENCY_BASELINE_WEIGHT", "0.05")),
+            "backoff_ratio": float(os.getenv("GRAPH_CONCURRENCY_BACKOFF_RATIO", "0.5")),
+            # Minimum share of queued dispatches guaranteed to each background class
+            "min_shares": {
+                RequestPriority.BULK: float(os.getenv("GRAPH_PRIORITY_BULK_MIN_SHARE", "0.2")),
+                RequestPriority.MAINTENANCE: float(os.getenv("GRAPH_PRIORITY_MAINTENANCE_MIN_SHARE", "0.1"))
+            }
+        }
+
+    @asynccontextmanager
+    async def acquire(self,
+                      endpoint: str,
+                      tenant_id: Optional[str] = None,
+                      priority: Optional[RequestPriority] = None):
+        """
+        Wait for an in-flight slot for a request
+
+        Args:
+            endpoint: Graph endpoint of the request
+            tenant_id: Tenant the request is made for
+            priority: Dispatch class; defaults to the priority of the current context
+
+        Yields:
+            ConcurrencySlot on which the caller records the response status
+        """
+        slot = ConcurrencySlot()
+        if not self.config["enabled"]:
+            yield slot
+            return
+
+        state = self._get_state(endpoint, tenant_id)
+        await self._admit(state, priority or current_priority())
+        slot.started = time.monotonic()
+
+        try:
+            yield slot
+        except BaseException as e:
+            # A timed out request is a sign of overload, like a 429
+            self._release(state, slot, dropped=isinstance(e, (asyncio.TimeoutError, httpx.TimeoutException)))
+            raise
+        else:
+            self._release(state, slot)
+
+    def get_limit(self, endpoint: str, tenant_id: Optional[str] = None) -> int:
+        """Get the current in-flight limit for an endpoint and tenant"""
+        return self._effective_limit(self._get_state(endpoint, tenant_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limits and queue depth per tenant and endpoint tier"""
+        return {
+            f"{tenant}|{tier.value}": {
+                "limit": round(state.limit, 2),
+                "in_flight": state.in_flight,
+                "queued": sum(len(waiters) for waiters in state.waiters.values()),
+                "long_rtt": state.long_rtt,
+                "last_rtt": state.last_rtt,
+                "total_requests": state.total_requests,
+                "total_throttled": state.total_throttled,
+                "total_waits": state.total_waits
+            }
+            for (tenant, tier), state in self.states.items()
+        }
+
+    def get_priority_stats(self) -> Dict[str, Any]:
+        """Get queue depth and wait time per priority class"""
+        return {
+            priority.value: {
+                "queued": stats.queued,
+                "admitted": stats.admitted,
+                "waits": stats.waits,
+                "wait_avg": stats.wait_total / stats.waits if stats.waits else 0.0,
+                "wait_max": stats.wait_max,
+                "min_share": self.config["min_shares"].get(priority, 0.0)
+            }
+            for priority, stats in self.priority_stats.items()
+        }
+
+    # Private methods
+
+    def _get_state(self, endpoint: str, tenant_id: Optional[str]) -> ConcurrencyState:
+        """Get or create the state for a tenant and endpoint tier"""
+        key = (tenant_id or "default", endpoint_tier(endpoint))
+        state = self.states.get(key)
+        if state is None:
+            state = ConcurrencyState(limit=self.config["initial_limit"])
+            self.states[key] = state
+        return state
+
+    def _effective_limit(self, state: ConcurrencyState) -> int:
+        """Whole number of requests allowed in flight"""
+        return max(1, int(state.limit))
+
+    async def _admit(self, state: ConcurrencyState, priority: RequestPriority) -> None:
+        """Take a slot, queueing by priority when the limit is reached"""
+        stats = self.priority_stats[priority]
+        if state.in_flight < self._effective_limit(state) and not any(state.waiters.values()):
+            state.in_flight += 1
+            stats.admitted += 1
+            return
+
+        state.total_waits += 1
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters[priority].append(waiter)
+        self._queue_changed(priority, 1)
+        enqueued = time.monotonic()
+        try:
+            # The releasing request hands its slot over by resolving the future
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just before cancellation; pass it on
+                state.in_flight -= 1
+                self._wake_waiters(state)
+            elif waiter in state.waiters[priority]:
+                state.waiters[priority].remove(waiter)
+                self._queue_changed(priority, -1)
+            raise
+
+        wait = time.monotonic() - enqueued
+        stats.admitted += 1
+        stats.waits += 1
+        stats.wait_total += wait
+        stats.wait_max = max(stats.wait_max, wait)
+        if self.performance_monitor:
+            self.performance_monitor.record_priority_queue(priority.value, stats.queued, wait=wait)
+
+    def _queue_changed(self, priority: RequestPriority, delta: int) -> None:
+        """Track the number of requests queued in a priority class"""
+        stats = self.priority_stats[priority]
+        stats.queued += delta
+        if self.performance_monitor:
+            self.performance_monitor.record_priority_queue(priority.value, stats.queued)
+
+    def _next_priority(self, state: ConcurrencyState) -> Optional[RequestPriority]:
+        """
+        Pick the class to dispatch from next
+
+        The highest non-empty class is served, except that every class waiting
+        behind it earns its minimum share as credit on each dispatch and is
+        served instead once a whole dispatch is owed.
+        """
+        queued = [priority for priority in PRIORITY_ORDER if state.waiters[priority]]
+        if not queued:
+            return None
+
+        for priority in PRIORITY_ORDER[1:]:
+            if priority in queued[1:]:
+                # Rounded so that e.g. ten shares of 0.1 add up to a whole dispatch
+                share = self.config["min_shares"].get(priority, 0.0)
+                state.credits[priority] = round(state.credits[priority] + share, 9)
+            elif priority not in queued:
+                # Credit is only owed while the class is actually waiting
+                state.credits[priority] = 0.0
+
+        owed = max(queued[1:], key=lambda priority: state.credits[priority], default=None)
+        if owed is not None and state.credits[owed] >= 1.0:
+            state.credits[owed] -= 1.0
+            return owed
+        return queued[0]
+
+    def _wake_waiters(self, state: ConcurrencyState) -> None:
+        """Hand free slots to queued requests by priority"""
+        while state.in_flight < self._effective_limit(state):
+            priority = self._next_priority(state)
+            if priority is None:
+                break
+            waiter = state.waiters[priority].popleft()
+            self._queue_changed(priority, -1)
+            if waiter.done():
+                continue
+            state.in_flight += 1
+            waiter.set_result(None)
+
+    def _release(self, state: ConcurrencyState, slot: ConcurrencySlot, dropped: bool = False) -> None:
+        """Free a slot and adjust the limit from the request's outcome"""
+        rtt = time.monotonic() - slot.started
+        in_flight = state.in_flight
+        state.in_flight = max(0, state.in_flight - 1)
+        state.total_requests += 1
+
+        if dropped or slot.status_code in THROTTLE_STATUSES:
+            state.total_throttled += 1
+            # Requests sent under the old limit report the same overload; cut once per episode
+            if slot.started >= state.last_decrease:
+                self._decrease(state)
+        elif slot.status_code is not None and slot.status_code < 500:
+            self._update_gradient(state, rtt, in_flight)
+
+        self._wake_waiters(state)
+
+    def _decrease(self, state: ConcurrencyState) -> None:
+        """Multiplicative decrease after throttling"""
+        previous = state.limit
+        state.limit = max(self.config["min_limit"], state.limit * self.config["backoff_ratio"])
+        state.last_decrease = time.monotonic()
+        state.slow_start = False
+        logger.warning("Graph concurrency limit reduced after throttling",
+                      previous_limit=round(previous, 2),
+                      limit=round(state.limit, 2))
+
+    def _update_gradient(self, state: ConcurrencyState, rtt: float, in_flight: int) -> None:
+        """Scale the limit by baseline / latency and add headroom"""
+        state.last_rtt = rtt
+        if state.long_rtt is None:
+            state.long_rtt = rtt
+            return
+
+        weight = self.config["baseline_weight"]
+        state.long_rtt = state.long_rtt * (1 - weight) + rtt * weight
+
+        # Only grow while the limit is actually being used
+        if in_flight < state.limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.config["rtt_tolerance"] * state.long_rtt / rtt)) if rtt > 0 else 1.0
+
+        # About `limit` samples arrive per round trip, so each adds 1/limit of the headroom
+        smoothing = self.config["smoothing"]
+        headroom = (math.sqrt(state.limit) if state.slow_start else 1.0) / state.limit
+        state.limit = state.limit * (1 - smoothing) + state.limit * gradient * smoothing + headroom
+        state.limit = min(self.config["max_limit"], max(self.config["min_limit"], state.limit))
+
+
+# Global concurrency limiter instance
+_concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+
+
+def get_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """Get or create global concurrency limiter instance"""
+    global _concurrency_limiter
+    if _concurrency_limiter is None:
+        _concurrency_limiter = AdaptiveConcurrencyLimiter(get_performance_monitor())
+    return _concurrency_limiter
@@ -20,6 +20,8 @@ from ..models.graph_models import DeltaToken, DeltaResult, ResourceChange, Error
 from ..database import Database
 from ..utils.performance_monitor import get_performance_monitor, track_operation
 from .client import EnhancedGraphClient
+from .concurrency_limiter import RequestPriority, graph_priority
+from .etag_cache import get_etag_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -380,6 +382,77 @@ class FileTokenStorage(DeltaTokenStorage):
         return count
 
 
+def convert_graph_plan_to_db_format(graph_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert Graph API plan data to database format"""
+    return {
+        "graph_id": graph_data.get("id"),
+        "title": graph_data.get("title", ""),
+        "description": graph_data.get("description"),
+        "owner_id": graph_data.get("owner", ""),
+        "group_id": graph_data.get("container", {}).get("containerId"),
+        "is_archived": False,  # Graph API doesn't have archived flag
+        "plan_metadata": {
+            "etag": graph_data.get("@odata.etag"),
+            "created_datetime": graph_data.get("createdDateTime"),
+            "last_modified_datetime": graph_data.get("lastModifiedDateTime"),
+            "raw_data": graph_data,
+        },
+    }
+
+def convert_graph_task_to_db_format(graph_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert Graph API task data to database format"""
+    # Parse due date
+    due_date = None
+    if graph_data.get("dueDateTime"):
+        try:
+            due_date = datetime.fromisoformat(graph_data["dueDateTime"].replace("Z", "+00:00"))
+        except ValueError:
+            pass
+
+    # Parse start date
+    start_date = None
+    if graph_data.get("startDateTime"):
+        try:
+            start_date = datetime.fromisoformat(
+                graph_data["startDateTime"].replace("Z", "+00:00")
+            )
+        except ValueError:
+            pass
+
+    # Parse completion
+    completed_at = None
+    if graph_data.get("completedDateTime"):
+        try:
+            completed_at = datetime.fromisoformat(
+                graph_data["completedDateTime"].replace("Z", "+00:00")
+            )
+        except ValueError:
+            pass
+
+    return {
+        "graph_id": graph_data.get("id"),
+        "plan_graph_id": graph_data.get("planId"),
+        "title": graph_data.get("title", ""),
+        "description": graph_data.get("description"),
+        "bucket_id": graph_data.get("bucketId"),
+        "assigned_to": (
+            graph_data.get("assignments", {}).keys() if graph_data.get("assignments") else []
+        ),
+        "priority": graph_data.get("priority"),
+        "due_date": due_date,
+        "start_date": start_date,
+        "completion_percentage": graph_data.get("percentComplete", 0),
+        "is_completed": graph_data.get("percentComplete", 0) == 100,
+        "completed_at": completed_at,
+        "task_metadata": {
+            "etag": graph_data.get("@odata.etag"),
+            "created_datetime": graph_data.get("createdDateTime"),
+            "last_modified_datetime": graph_data.get("lastModifiedDateTime"),
+            "raw_data": graph_data,
+        },
+    }
+
+
 class DeltaQueryManager:
     """
     Main delta query manager for Microsoft Graph API
@@ -576,7 +649,9 @@ class DeltaQueryManager:
         # Execute delta query with retry logic
         for attempt in range(self.config.retry_attempts):
             try:
-                response = await self.graph_client.get(url, params=query_params)
+                # Background sync yields to interactive calls
+                with graph_priority(RequestPriority.BULK):
+                    response = await self.graph_client.get(url, params=query_params)
                 return self._parse_delta_response(
                     response, delta_token.token if delta_token else None
                 )
@@ -616,7 +691,8 @@ class DeltaQueryManager:
         query_params = {"$top": str(self.config.max_page_size)}
 
         # Execute full query
-        response = await self.graph_client.get(url, params=query_params)
+        with graph_priority(RequestPriority.BULK):
+            response = await self.graph_client.get(url, params=query_params)
 
         # Convert full response to delta format
         resources = response.get("value", [])
@@ -764,6 +840,8 @@ class DeltaQueryManager:
         elif change.resource_type == "task":
             # Delete task
             await self.database.delete_task(change.resource_id)
+            get_etag_cache().invalidate("details", change.resource_id)
+        get_etag_cache().invalidate(change.resource_type, change.resource_id)
 
     async def _handle_resource_upsert(self, change: ResourceChange) -> bool:
         """Handle resource creation/update with conflict resolution"""
@@ -793,6 +871,9 @@ class DeltaQueryManager:
     async def _simple_upsert(self, change: ResourceChange) -> bool:
         """Perform simple upsert without conflict resolution"""
         try:
+            # Writes through the Planner clients can skip reading the ETag
+            get_etag_cache().set(change.resource_type, change.resource_id, change.etag)
+
             if change.resource_type == "plan":
                 plan_data = self._convert_graph_plan_to_db_format(change.resource_data)
                 await self.database.save_plan(plan_data)
@@ -835,73 +916,11 @@ class DeltaQueryManager:
 
     def _convert_graph_plan_to_db_format(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Graph API plan data to database format"""
-        return {
-            "graph_id": graph_data.get("id"),
-            "title": graph_data.get("title", ""),
-            "description": graph_data.get("description"),
-            "owner_id": graph_data.get("owner", ""),
-            "group_id": graph_data.get("container", {}).get("containerId"),
-            "is_archived": False,  # Graph API doesn't have archived flag
-            "plan_metadata": {
-                "etag": graph_data.get("@odata.etag"),
-                "created_datetime": graph_data.get("createdDateTime"),
-                "last_modified_datetime": graph_data.get("lastModifiedDateTime"),
-                "raw_data": graph_data,
-            },
-        }
+        return convert_graph_plan_to_db_format(graph_data)
 
     def _convert_graph_task_to_db_format(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Graph API task data to database format"""
-        # Parse due date
-        due_date = None
-        if graph_data.get("dueDateTime"):
-            try:
-                due_date = datetime.fromisoformat(graph_data["dueDateTime"].replace("Z", "+00:00"))
-            except ValueError:
-                pass
-
-        # Parse start date
-        start_date = None
-        if graph_data.get("startDateTime"):
-            try:
-                start_date = datetime.fromisoformat(
-                    graph_data["startDateTime"].replace("Z", "+00:00")
-                )
-            except ValueError:
-                pass
-
-        # Parse completion
-        completed_at = None
-        if graph_data.get("completedDateTime"):
-            try:
-                completed_at = datetime.fromisoformat(
-                    graph_data["completedDateTime"].replace("Z", "+00:00")
-                )
-            except ValueError:
-                pass
-
-        return {
-            "graph_id": graph_data.get("id"),
-            "plan_graph_id": graph_data.get("planId"),
-            "title": graph_data.get("title", ""),
-            "description": graph_data.get("description"),
-            "bucket_id": graph_data.get("bucketId"),
-            "assigned_to": (
-                graph_data.get("assignments", {}).keys() if graph_data.get("assignments") else []
-            ),
-            "priority": graph_data.get("priority"),
-            "due_date": due_date,
-            "start_date": start_date,
-            "completion_percentage": graph_data.get("percentComplete", 0),
-            "is_completed": graph_data.get("percentComplete", 0) == 100,
-            "completed_at": completed_at,
-            "task_metadata": {
-                "etag": graph_data.get("@odata.etag"),
-                "created_datetime": graph_data.get("createdDateTime"),
-                "last_modified_datetime": graph_data.get("lastModifiedDateTime"),
-                "raw_data": graph_data,
-            },
-        }
+        return convert_graph_task_to_db_format(graph_data)
 
     async def _save_delta_token(
         self,
@@ -0,0 +1,96 @@
+"""
+ETag cache for Planner resources
+
+Planner requires If-Match on every update and delete. Keeping the latest known
+ETag of each task, task details, plan and bucket (from reads, write responses,
+webhook notifications and delta sync) lets writes go out optimistically instead
+of reading the resource first; a 412 means the cached ETag was stale.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class PlannerETagCache:
+    """Bounded LRU map of (resource type, resource ID) to the latest known ETag"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.getenv("PLANNER_ETAG_CACHE_SIZE", "10000"))
+        self._etags: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "updates": 0,
+            "invalidations": 0,
+            "evictions": 0
+        }
+
+    def get(self, resource_type: str, resource_id: str) -> Optional[str]:
+        """Get the cached ETag of a resource"""
+        key = (resource_type, resource_id)
+        etag = self._etags.get(key)
+        if etag is None:
+            self.stats["misses"] += 1
+            return None
+
+        self._etags.move_to_end(key)
+        self.stats["hits"] += 1
+        return etag
+
+    def set(self, resource_type: str, resource_id: Optional[str], etag: Any) -> bool:
+        """
+        Store the latest ETag of a resource
+
+        Returns:
+            True if the ETag was stored
+        """
+        if not resource_id or not isinstance(etag, str) or not etag:
+            return False
+
+        key = (resource_type, resource_id)
+        self._etags[key] = etag
+        self._etags.move_to_end(key)
+        self.stats["updates"] += 1
+
+        while len(self._etags) > self.max_entries:
+            self._etags.popitem(last=False)
+            self.stats["evictions"] += 1
+        return True
+
+    def record_resource(self, resource_type: str, resource: Any) -> bool:
+        """Store the ETag of a Graph resource representation (id and @odata.etag)"""
+        if not isinstance(resource, dict):
+            return False
+        return self.set(resource_type, resource.get("id"), resource.get("@odata.etag"))
+
+    def invalidate(self, resource_type: str, resource_id: str) -> None:
+        """Forget the ETag of a resource"""
+        if self._etags.pop((resource_type, resource_id), None) is not None:
+            self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._etags),
+            "max_entries": self.max_entries,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+        }
+
+
+# Global ETag cache instance
+_etag_cache: Optional[PlannerETagCache] = None
+
+
+def get_etag_cache() -> PlannerETagCache:
+    """Get or create global ETag cache instance"""
+    global _etag_cache
+    if _etag_cache is None:
+        _etag_cache = PlannerETagCache()
+    return _etag_cache
@@ -0,0 +1,172 @@
+"""
+Durable Redis Streams backbone for Microsoft Graph webhook notifications
+
+Incoming notifications are appended to a single Redis stream and consumed
+through a consumer group, so every planner-mcp-server replica shares the
+processing load. Entries stay pending until acknowledged; entries left behind
+by a crashed replica are reclaimed after an idle timeout. The stream is trimmed
+to an approximate MAXLEN so it cannot grow without bound.
+
+Per-resource ordering is guaranteed within one replica (see the sharded worker
+pool in webhooks.py) but not across replicas sharing a consumer group.
+"""
+
+import os
+import socket
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+import structlog
+
+from ..models.graph_models import WebhookNotification
+from ..cache import CacheService
+
+logger = structlog.get_logger(__name__)
+
+
+class NotificationStreamError(Exception):
+    """Notification stream error"""
+    pass
+
+
+class WebhookNotificationStream:
+    """Redis Streams producer/consumer for webhook notifications"""
+
+    def __init__(
+        self,
+        cache_service: CacheService,
+        stream_name: Optional[str] = None,
+        group_name: Optional[str] = None,
+        consumer_name: Optional[str] = None,
+        max_length: Optional[int] = None
+    ):
+        self.cache_service = cache_service
+        self.stream_name = stream_name or os.getenv("WEBHOOK_STREAM_NAME", "webhook_notifications")
+        self.group_name = group_name or os.getenv("WEBHOOK_STREAM_GROUP", "webhook_processors")
+        self.consumer_name = consumer_name or os.getenv(
+            "WEBHOOK_STREAM_CONSUMER", f"{socket.gethostname()}-{os.getpid()}"
+        )
+        self.max_length = max_length or int(os.getenv("WEBHOOK_STREAM_MAX_LENGTH", "100000"))
+
+        # Cursor for incremental XAUTOCLAIM scans
+        self._claim_cursor = "0-0"
+
+    async def initialize(self) -> bool:
+        """Create the stream and consumer group if needed"""
+        created = await self.cache_service.stream_create_group(self.stream_name, self.group_name)
+        if created:
+            logger.info(
+                "Webhook notification stream initialized",
+                stream=self.stream_name,
+                group=self.group_name,
+                consumer=self.consumer_name
+            )
+        return created
+
+    async def publish(self, notification: WebhookNotification) -> str:
+        """
+        Durably append a notification to the stream
+
+        Raises:
+            NotificationStreamError: If the entry could not be written
+        """
+        entry_id = await self.cache_service.stream_add(
+            self.stream_name,
+            self.serialize(notification),
+            maxlen=self.max_length
+        )
+        if not entry_id:
+            raise NotificationStreamError(
+                f"Failed to publish notification for subscription {notification.subscription_id}"
+            )
+        return entry_id
+
+    async def read(self, count: int = 100, block_ms: Optional[int] = None) -> List[WebhookNotification]:
+        """Read new notifications assigned to this consumer"""
+        entries = await self.cache_service.stream_read_group(
+            self.stream_name,
+            self.group_name,
+            self.consumer_name,
+            count=count,
+            block_ms=block_ms
+        )
+        return await self._deserialize_entries(entries)
+
+    async def acknowledge(self, notification: WebhookNotification) -> bool:
+        """Acknowledge a notification once it reached a terminal state"""
+        if not notification.stream_entry_id:
+            return False
+        acknowledged = await self.cache_service.stream_ack(
+            self.stream_name, self.group_name, [notification.stream_entry_id]
+        )
+        return acknowledged > 0
+
+    async def reclaim_stale(self, min_idle_ms: int, count: int = 100) -> List[WebhookNotification]:
+        """Take over pending notifications idle for longer than min_idle_ms"""
+        next_cursor, entries = await self.cache_service.stream_autoclaim(
+            self.stream_name,
+            self.group_name,
+            self.consumer_name,
+            min_idle_ms,
+            start_id=self._claim_cursor,
+            count=count
+        )
+        self._claim_cursor = next_cursor or "0-0"
+
+        if entries:
+            logger.info(
+                "Reclaimed stale webhook notifications",
+                count=len(entries),
+                consumer=self.consumer_name
+            )
+        return await self._deserialize_entries(entries)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get stream length and pending entry statistics"""
+        stats = await self.cache_service.stream_stats(self.stream_name, self.group_name)
+        return {
+            "stream": self.stream_name,
+            "group": self.group_name,
+            "consumer": self.consumer_name,
+            "max_length": self.max_length,
+            **stats
+        }
+
+    @staticmethod
+    def serialize(notification: WebhookNotification) -> Dict[str, Any]:
+        """Convert a notification to a JSON-friendly dict"""
+        data = asdict(notification)
+        data.pop("stream_entry_id", None)
+        return data
+
+    @staticmethod
+    def deserialize(data: Dict[str, Any], entry_id: Optional[str] = None) -> WebhookNotification:
+        """Rebuild a notification from a stream entry"""
+        data = dict(data)
+        for field_name in ("received_at", "subscription_expiration_date_time"):
+            value = data.get(field_name)
+            if isinstance(value, str):
+                data[field_name] = datetime.fromisoformat(value)
+
+        notification = WebhookNotification(**data)
+        notification.stream_entry_id = entry_id
+        return notification
+
+    async def _deserialize_entries(self, entries: List[Any]) -> List[WebhookNotification]:
+        """Deserialize entries, acknowledging malformed ones so they are not redelivered"""
+        notifications = []
+        malformed_ids = []
+        for entry_id, data in entries:
+            try:
+                notifications.append(self.deserialize(data, entry_id))
+            except (TypeError, ValueError) as e:
+                logger.error(
+                    "Discarding malformed stream entry",
+                    entry_id=entry_id,
+                    error=str(e)
+                )
+                malformed_ids.append(entry_id)
+
+        if malformed_ids:
+            await self.cache_service.stream_ack(self.stream_name, self.group_name, malformed_ids)
+        return notifications
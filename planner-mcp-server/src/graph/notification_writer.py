@@ -0,0 +1,307 @@
+"""
+Batched persistence of webhook notifications and subscription statistics
+
+Instead of two database round trips per notification (one INSERT into
+webhook_notifications, one upsert of the subscription to bump its counter),
+rows and counter increments are buffered and flushed every ``batch_size``
+notifications or every ``flush_interval_ms`` milliseconds, whichever comes
+first: one COPY per ``batch_size`` rows plus one executemany of the counter
+UPDATEs of the touched subscriptions, on a connection from the asyncpg pool.
+"""
+
+import os
+import json
+import uuid
+import asyncio
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import structlog
+
+from ..models.graph_models import WebhookNotification, WebhookSubscription
+from ..database import Database
+
+logger = structlog.get_logger(__name__)
+
+
+NOTIFICATION_COLUMNS = [
+    "id", "notification_id", "subscription_id", "tenant_id", "change_type",
+    "resource", "notification_data", "received_at", "processed"
+]
+
+PersistedCallback = Callable[[WebhookNotification], Awaitable[None]]
+
+
+@dataclass
+class _PendingNotification:
+    """Buffered notification row with its post-persist and drop callbacks"""
+    row: Dict[str, Any]
+    notification: WebhookNotification
+    on_persisted: Optional[PersistedCallback] = None
+    on_dropped: Optional[PersistedCallback] = None
+
+
+@dataclass
+class _PendingSubscriptionStats:
+    """Buffered notification counter increment for one subscription"""
+    subscription: WebhookSubscription
+    increment: int = 0
+
+
+class NotificationBatchWriter:
+    """Buffers webhook notification rows and subscription counters for bulk writes"""
+
+    def __init__(
+        self,
+        database: Database,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.database = database
+        self.batch_size = batch_size or int(os.getenv("WEBHOOK_NOTIFICATION_BATCH_SIZE", "100"))
+        self.flush_interval_ms = flush_interval_ms or int(
+            os.getenv("WEBHOOK_PERSIST_FLUSH_INTERVAL_MS", "200")
+        )
+        self.max_pending = max_pending or int(os.getenv("WEBHOOK_PERSIST_MAX_PENDING", "10000"))
+
+        self._pending_notifications: List[_PendingNotification] = []
+        self._pending_stats: Dict[str, _PendingSubscriptionStats] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+
+        self.stats = {
+            "flushes": 0,
+            "notifications_written": 0,
+            "subscription_updates": 0,
+            "statements_executed": 0,
+            "failed_flushes": 0,
+            "dropped_notifications": 0
+        }
+
+    async def start(self) -> None:
+        """Start the periodic flush task"""
+        if not self._flush_task or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out everything still buffered"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    async def add_notification(
+        self,
+        notification: WebhookNotification,
+        on_persisted: Optional[PersistedCallback] = None,
+        on_dropped: Optional[PersistedCallback] = None
+    ) -> None:
+        """
+        Buffer a notification row
+
+        Args:
+            notification: Notification in its final processed/failed state
+            on_persisted: Awaited once the row has been written
+            on_dropped: Awaited if the row is dropped unwritten because the
+                buffer exceeded max_pending
+        """
+        self._pending_notifications.append(_PendingNotification(
+            row=self._build_notification_row(notification),
+            notification=notification,
+            on_persisted=on_persisted,
+            on_dropped=on_dropped
+        ))
+
+        if len(self._pending_notifications) >= self.batch_size:
+            await self.flush()
+
+    def record_subscription_notification(self, subscription: WebhookSubscription) -> None:
+        """Bump in-memory notification stats and buffer the database increment"""
+        subscription.update_notification_stats()
+
+        pending = self._pending_stats.get(subscription.id)
+        if not pending:
+            pending = self._pending_stats[subscription.id] = _PendingSubscriptionStats(subscription)
+        pending.increment += 1
+
+    def pending_count(self) -> int:
+        """Number of notification rows waiting to be written"""
+        return len(self._pending_notifications)
+
+    async def flush(self) -> Dict[str, int]:
+        """Write all buffered rows and counter increments"""
+        async with self._flush_lock:
+            notifications, self._pending_notifications = self._pending_notifications, []
+            subscription_stats, self._pending_stats = self._pending_stats, {}
+
+            if not notifications and not subscription_stats:
+                return {"notifications": 0, "subscriptions": 0}
+
+            written = await self._write_notifications(notifications)
+            updated = await self._write_subscription_stats(subscription_stats)
+            self.stats["flushes"] += 1
+
+            for pending in notifications[:written]:
+                if pending.on_persisted:
+                    try:
+                        await pending.on_persisted(pending.notification)
+                    except Exception as e:
+                        logger.error(
+                            "Post-persist callback failed",
+                            error=str(e),
+                            subscription_id=pending.notification.subscription_id
+                        )
+
+            return {"notifications": written, "subscriptions": updated}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        return {
+            **self.stats,
+            "pending_notifications": len(self._pending_notifications),
+            "pending_subscription_updates": len(self._pending_stats),
+            "batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval_ms
+        }
+
+    # Private methods
+
+    async def _flush_loop(self) -> None:
+        """Background task flushing on the time trigger"""
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval_ms / 1000)
+                # Shielded so stop() can't cancel a flush holding rows already
+                # taken from the buffer; stop() waits for it on the flush lock
+                await asyncio.shield(self.flush())
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Error in notification batch writer", error=str(e))
+
+    def _build_notification_row(self, notification: WebhookNotification) -> Dict[str, Any]:
+        """Build the webhook_notifications row for a notification"""
+        return {
+            "id": uuid.uuid4(),
+            "notification_id": str(uuid.uuid4()),
+            "subscription_id": notification.subscription_id,
+            "tenant_id": notification.tenant_id,
+            "change_type": notification.change_type,
+            "resource": notification.resource,
+            "notification_data": json.dumps(asdict(notification), default=str),
+            "received_at": notification.received_at,
+            "processed": notification.processed
+        }
+
+    async def _write_notifications(self, notifications: List[_PendingNotification]) -> int:
+        """
+        Copy buffered rows to the table, one COPY per batch_size rows
+
+        Rows are written in order; from the first failed chunk on, everything
+        is requeued so the next flush retries it in chunks of the same size.
+
+        Returns:
+            Number of leading rows written
+        """
+        written = 0
+        for start in range(0, len(notifications), self.batch_size):
+            chunk = notifications[start:start + self.batch_size]
+            records = [
+                tuple(pending.row[column] for column in NOTIFICATION_COLUMNS)
+                for pending in chunk
+            ]
+
+            try:
+                async with self.database._connection_pool.acquire() as conn:
+                    await conn.copy_records_to_table(
+                        "webhook_notifications", records=records, columns=NOTIFICATION_COLUMNS
+                    )
+                self.stats["statements_executed"] += 1
+                self.stats["notifications_written"] += len(chunk)
+                written += len(chunk)
+
+            except Exception as e:
+                self.stats["failed_flushes"] += 1
+                logger.error(
+                    "Failed to store notification batch in database",
+                    error=str(e),
+                    batch_size=len(chunk),
+                    unwritten=len(notifications) - start
+                )
+                await self._requeue_notifications(notifications[start:])
+                break
+
+        return written
+
+    async def _requeue_notifications(self, notifications: List[_PendingNotification]) -> None:
+        """Put failed rows back in front of the buffer, dropping what exceeds max_pending"""
+        requeued = notifications + self._pending_notifications
+        overflow = len(requeued) - self.max_pending
+        if overflow > 0:
+            self.stats["dropped_notifications"] += overflow
+            logger.error("Dropping unpersisted webhook notifications", count=overflow)
+            dropped, requeued = requeued[:overflow], requeued[overflow:]
+        else:
+            dropped = []
+        self._pending_notifications = requeued
+
+        for pending in dropped:
+            if pending.on_dropped:
+                try:
+                    await pending.on_dropped(pending.notification)
+                except Exception as e:
+                    logger.error(
+                        "Drop callback failed",
+                        error=str(e),
+                        subscription_id=pending.notification.subscription_id
+                    )
+
+    async def _write_subscription_stats(self, subscription_stats: Dict[str, _PendingSubscriptionStats]) -> int:
+        """Apply buffered counter increments in one executemany"""
+        if not subscription_stats:
+            return 0
+
+        query = """
+        UPDATE webhook_subscriptions SET
+            notification_count = COALESCE(notification_count, 0) + $2,
+            last_notification = $3,
+            subscription_data = $4,
+            updated_at = $5
+        WHERE subscription_id = $1
+        """
+
+        now = datetime.utcnow()
+        args = [
+            (
+                subscription_id,
+                pending.increment,
+                pending.subscription.last_notification,
+                json.dumps(asdict(pending.subscription), default=str),
+                now
+            )
+            for subscription_id, pending in subscription_stats.items()
+        ]
+
+        try:
+            async with self.database._connection_pool.acquire() as conn:
+                await conn.executemany(query, args)
+            self.stats["statements_executed"] += 1
+            self.stats["subscription_updates"] += len(args)
+            return len(args)
+
+        except Exception as e:
+            logger.error(
+                "Failed to update subscription statistics",
+                error=str(e),
+                subscriptions=len(args)
+            )
+            # Keep the increments for the next flush
+            for subscription_id, pending in subscription_stats.items():
+                retained = self._pending_stats.setdefault(
+                    subscription_id, _PendingSubscriptionStats(pending.subscription)
+                )
+                retained.increment += pending.increment
+            return 0
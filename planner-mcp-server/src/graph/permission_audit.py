@@ -0,0 +1,443 @@
+"""
+Asynchronous, batched persistence of permission audit entries
+
+Permission checks only append their audit entry to a bounded in-memory queue;
+a background task copies the queue to Postgres in batches (one COPY per batch)
+every ``batch_size`` entries or ``flush_interval_ms`` milliseconds, whichever
+comes first. When the database falls behind and the queue is full, new entries
+are dropped and counted rather than slowing down permission checks. Batches
+that fail on a connection error are retried; entries the database rejects
+(bad data, constraint violations) are isolated, logged and dropped.
+
+The permission_audit table is partitioned by day on the entry timestamp, so
+time-bounded queries only scan the partitions they cover and retention is a
+DROP TABLE per expired day. Partitions are created on demand for the days a
+batch touches; indexes on (user_id, timestamp) and (tenant_id, timestamp)
+serve per-user and per-tenant lookups.
+"""
+
+import os
+import json
+import asyncio
+from collections import deque
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional, Set
+import asyncpg
+import structlog
+
+from ..database import Database
+
+logger = structlog.get_logger(__name__)
+
+
+AUDIT_TABLE = "permission_audit"
+
+AUDIT_COLUMNS = [
+    "audit_id", "user_id", "tenant_id", "operation", "resource_type", "resource_id",
+    "requested_scopes", "granted_scopes", "denied_scopes", "result", "timestamp",
+    "ip_address", "user_agent", "correlation_id", "additional_context"
+]
+
+# Failures worth retrying the same rows for; anything else is blamed on the rows
+TRANSIENT_ERRORS = (asyncpg.PostgresConnectionError, OSError, asyncio.TimeoutError)
+
+
+class PermissionAuditSink:
+    """Bounded queue of audit entries flushed to a day-partitioned Postgres table"""
+
+    def __init__(
+        self,
+        database: Database,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        retention_days: Optional[int] = None
+    ):
+        self.database = database
+        self.queue_size = queue_size or int(os.getenv("PERMISSION_AUDIT_QUEUE_SIZE", "50000"))
+        self.batch_size = batch_size or int(os.getenv("PERMISSION_AUDIT_BATCH_SIZE", "500"))
+        self.flush_interval_ms = flush_interval_ms or int(
+            os.getenv("PERMISSION_AUDIT_FLUSH_INTERVAL_MS", "1000")
+        )
+        # 0 keeps partitions forever
+        self.retention_days = retention_days if retention_days is not None else int(
+            os.getenv("PERMISSION_AUDIT_RETENTION_DAYS", "90")
+        )
+
+        self._queue: Deque[Any] = deque()
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+
+        self._table_created = False
+        self._partitions: Set[date] = set()
+
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "rejected": 0,
+            "partitions_created": 0,
+            "partitions_dropped": 0
+        }
+
+    async def start(self) -> None:
+        """Create the table and start the periodic flush task"""
+        try:
+            await self._ensure_table()
+        except Exception as e:
+            # Retried on the first flush
+            logger.error("Failed to create permission audit table", error=str(e))
+
+        if not self._flush_task or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out everything still queued"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+
+    def enqueue(self, entry: Any) -> bool:
+        """
+        Queue an audit entry for persistence without waiting on the database
+
+        Args:
+            entry: PermissionAuditEntry
+
+        Returns:
+            False if the queue was full and the entry was dropped
+        """
+        if len(self._queue) >= self.queue_size:
+            self.stats["dropped"] += 1
+            return False
+
+        self._queue.append(entry)
+        self.stats["enqueued"] += 1
+        if len(self._queue) >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    def pending_count(self) -> int:
+        """Number of entries waiting to be written"""
+        return len(self._queue)
+
+    async def flush(self) -> int:
+        """
+        Write all queued entries in batches
+
+        Returns:
+            Number of entries written
+        """
+        async with self._flush_lock:
+            written_before = self.stats["written"]
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not await self._write_batch(batch):
+                    break
+            return self.stats["written"] - written_before
+
+    async def query(
+        self,
+        user_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        operation: Optional[str] = None,
+        result: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Query persisted audit entries, newest first
+
+        Args:
+            user_id: Only entries of this user
+            tenant_id: Only entries of this tenant
+            operation: Only entries of this operation
+            result: Only entries with this result
+            since: Oldest timestamp (inclusive)
+            until: Newest timestamp (exclusive)
+            limit: Maximum number of rows
+
+        Returns:
+            Audit rows as dictionaries
+        """
+        await self._ensure_table()
+
+        conditions = []
+        params: List[Any] = []
+        for column, value in (("user_id", user_id), ("tenant_id", tenant_id),
+                              ("operation", operation), ("result", result)):
+            if value is not None:
+                params.append(value)
+                conditions.append(f"{column} = ${len(params)}")
+        if since is not None:
+            params.append(self._as_utc(since))
+            conditions.append(f"timestamp >= ${len(params)}")
+        if until is not None:
+            params.append(self._as_utc(until))
+            conditions.append(f"timestamp < ${len(params)}")
+        params.append(limit)
+
+        query = f"""
+        SELECT {", ".join(AUDIT_COLUMNS)}
+        FROM {AUDIT_TABLE}
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY timestamp DESC
+        LIMIT ${len(params)}
+        """
+
+        async with self.database._connection_pool.acquire() as conn:
+            rows = await conn.fetch(query, *params)
+
+        entries = []
+        for row in rows:
+            entry = dict(row)
+            context = entry.get("additional_context")
+            if isinstance(context, str):
+                entry["additional_context"] = json.loads(context)
+            entries.append(entry)
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sink statistics"""
+        return {
+            **self.stats,
+            "pending": len(self._queue),
+            "queue_size": self.queue_size,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval_ms,
+            "partitions": len(self._partitions)
+        }
+
+    # Private methods
+
+    async def _flush_loop(self) -> None:
+        """Background task flushing on the size and time triggers"""
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+                self._batch_ready.clear()
+                # Shielded so stop() can't cancel a flush holding a batch already
+                # taken from the queue; stop() waits for it on the flush lock
+                await asyncio.shield(self.flush())
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Error in permission audit sink", error=str(e))
+
+    async def _write_batch(self, batch: List[Any]) -> bool:
+        """
+        COPY a batch into the table
+
+        A transient failure puts the unwritten entries back in the queue. Any
+        other failure is taken to come from the rows themselves: the batch is
+        split in halves until the rejected entries are isolated, and those are
+        dropped so they cannot block the entries queued behind them.
+
+        Returns:
+            False if the batch was requeued
+        """
+        chunks = [batch]
+        rejected: List[Any] = []
+        last_error = None
+
+        while chunks:
+            chunk = chunks.pop()
+            try:
+                await self._copy_entries(chunk)
+
+            except TRANSIENT_ERRORS as e:
+                self.stats["failed_flushes"] += 1
+                logger.error("Failed to store permission audit batch", error=str(e), batch_size=len(batch))
+                self._requeue(chunk + [entry for pending in reversed(chunks) for entry in pending])
+                self._drop_rejected(rejected, last_error)
+                return False
+
+            except Exception as e:
+                if len(chunk) == 1:
+                    rejected.extend(chunk)
+                    last_error = str(e)
+                else:
+                    middle = len(chunk) // 2
+                    chunks.append(chunk[middle:])
+                    chunks.append(chunk[:middle])
+                continue
+
+            self.stats["written"] += len(chunk)
+
+        self.stats["flushes"] += 1
+        self._drop_rejected(rejected, last_error)
+        return True
+
+    async def _copy_entries(self, entries: List[Any]) -> None:
+        """COPY entries into their daily partitions"""
+        records = [self._build_record(entry) for entry in entries]
+
+        await self._ensure_table()
+        await self._ensure_partitions({record[10].date() for record in records})
+
+        async with self.database._connection_pool.acquire() as conn:
+            await conn.copy_records_to_table(AUDIT_TABLE, records=records, columns=AUDIT_COLUMNS)
+
+    def _drop_rejected(self, rejected: List[Any], error: Optional[str]) -> None:
+        """Count and log entries the database refused to store"""
+        if not rejected:
+            return
+
+        self.stats["rejected"] += len(rejected)
+        logger.error(
+            "Dropping permission audit entries rejected by the database",
+            count=len(rejected),
+            audit_ids=[getattr(entry, "audit_id", None) for entry in rejected],
+            error=error
+        )
+
+    def _requeue(self, batch: List[Any]) -> None:
+        """Put a failed batch back in front of the queue, dropping what exceeds queue_size"""
+        room = self.queue_size - len(self._queue)
+        if room < len(batch):
+            overflow = len(batch) - max(0, room)
+            self.stats["dropped"] += overflow
+            logger.error("Dropping unpersisted permission audit entries", count=overflow)
+            batch = batch[overflow:]
+        self._queue.extendleft(reversed(batch))
+
+    async def _ensure_table(self) -> None:
+        """Create the partitioned table and its indexes"""
+        if self._table_created:
+            return
+
+        async with self.database._connection_pool.acquire() as conn:
+            await conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {AUDIT_TABLE} (
+                    audit_id VARCHAR(64) NOT NULL,
+                    user_id VARCHAR(255) NOT NULL,
+                    tenant_id VARCHAR(255),
+                    operation VARCHAR(255) NOT NULL,
+                    resource_type VARCHAR(100) NOT NULL,
+                    resource_id VARCHAR(255),
+                    requested_scopes TEXT[] NOT NULL DEFAULT '{{}}',
+                    granted_scopes TEXT[] NOT NULL DEFAULT '{{}}',
+                    denied_scopes TEXT[] NOT NULL DEFAULT '{{}}',
+                    result VARCHAR(50) NOT NULL,
+                    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+                    ip_address VARCHAR(64),
+                    user_agent TEXT,
+                    correlation_id VARCHAR(255),
+                    additional_context JSONB DEFAULT '{{}}',
+                    PRIMARY KEY (audit_id, timestamp)
+                ) PARTITION BY RANGE (timestamp)
+            """
+            )
+
+            # Indexes on the parent are created on every partition
+            await conn.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_{AUDIT_TABLE}_user_time
+                ON {AUDIT_TABLE}(user_id, timestamp DESC)
+            """
+            )
+            await conn.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_{AUDIT_TABLE}_tenant_time
+                ON {AUDIT_TABLE}(tenant_id, timestamp DESC)
+            """
+            )
+            await conn.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_{AUDIT_TABLE}_time
+                ON {AUDIT_TABLE}(timestamp DESC)
+            """
+            )
+
+        self._table_created = True
+
+    async def _ensure_partitions(self, days: Set[date]) -> None:
+        """Create the daily partitions that don't exist yet"""
+        missing = sorted(days - self._partitions)
+        if not missing:
+            return
+
+        async with self.database._connection_pool.acquire() as conn:
+            for day in missing:
+                start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+                end = start + timedelta(days=1)
+                await conn.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {self._partition_name(day)}
+                    PARTITION OF {AUDIT_TABLE}
+                    FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')
+                """
+                )
+                self._partitions.add(day)
+                self.stats["partitions_created"] += 1
+
+        await self._drop_expired_partitions()
+
+    async def _drop_expired_partitions(self) -> None:
+        """Drop partitions older than the retention period"""
+        if self.retention_days <= 0:
+            return
+
+        cutoff = datetime.now(timezone.utc).date() - timedelta(days=self.retention_days)
+        async with self.database._connection_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT child.relname AS name
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = $1
+            """,
+                AUDIT_TABLE
+            )
+            for row in rows:
+                try:
+                    day = datetime.strptime(row["name"].rsplit("_", 1)[-1], "%Y%m%d").date()
+                except ValueError:
+                    continue
+                if day < cutoff:
+                    await conn.execute(f"DROP TABLE IF EXISTS {row['name']}")
+                    self._partitions.discard(day)
+                    self.stats["partitions_dropped"] += 1
+
+    def _build_record(self, entry: Any) -> tuple:
+        """Build the row tuple for an audit entry, in AUDIT_COLUMNS order"""
+        return (
+            entry.audit_id,
+            entry.user_id,
+            entry.tenant_id,
+            entry.operation,
+            entry.resource_type,
+            entry.resource_id,
+            list(entry.requested_scopes),
+            list(entry.granted_scopes),
+            list(entry.denied_scopes),
+            entry.result,
+            self._as_utc(entry.timestamp),
+            entry.ip_address,
+            entry.user_agent,
+            entry.correlation_id,
+            json.dumps(entry.additional_context or {}, default=str)
+        )
+
+    @staticmethod
+    def _partition_name(day: date) -> str:
+        return f"{AUDIT_TABLE}_{day:%Y%m%d}"
+
+    @staticmethod
+    def _as_utc(timestamp: datetime) -> datetime:
+        """Naive timestamps are taken as UTC"""
+        if timestamp.tzinfo is None:
+            return timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.astimezone(timezone.utc)
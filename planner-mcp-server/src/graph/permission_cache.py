@@ -0,0 +1,341 @@
+"""
+Sharded LRU cache for user permissions
+
+Entries are spread over shards by key hash; each shard is an OrderedDict kept
+in access order, so hits, inserts and evictions are O(1) and threads working
+on different shards don't share a lock. Shards are bounded both in entries and
+in (estimated) bytes, and entries expire after their TTL.
+
+An optional Redis tier behind the in-process shards lets permissions survive
+restarts and be shared by replicas: misses fall through to Redis, and fetched
+permissions are written to both tiers.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+import structlog
+
+from ..models.graph_models import UserPermissions
+
+logger = structlog.get_logger(__name__)
+
+PermissionCacheKey = Tuple[str, str]  # (tenant_id or "", user_id)
+
+
+@dataclass
+class PermissionCacheEntry:
+    """Cached permission entry"""
+    user_id: str
+    tenant_id: Optional[str]
+    permissions: UserPermissions
+    cache_key: Hashable
+    cached_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: Optional[datetime] = None
+    access_count: int = 0
+    last_accessed: Optional[datetime] = None
+    # Granted scopes as a CompiledPermissionModel mask, with the scopes it was built from
+    scope_mask: Optional[int] = None
+    scope_mask_scopes: Tuple[str, ...] = ()
+
+    def is_expired(self) -> bool:
+        """Check if cache entry is expired"""
+        if self.expires_at is None:
+            return False  # Never expires if no expiration set
+        return datetime.now(timezone.utc) > self.expires_at
+
+    def update_access(self) -> None:
+        """Update access statistics"""
+        self.access_count += 1
+        self.last_accessed = datetime.now(timezone.utc)
+
+    def estimated_size(self) -> int:
+        """Rough memory footprint in bytes"""
+        strings = [self.user_id, self.tenant_id or "", *self.permissions.granted_scopes,
+                   *self.permissions.effective_permissions]
+        return 600 + sum(sys.getsizeof(value) for value in strings)
+
+
+class _LRUShard:
+    """One shard: entries in access order under a lock"""
+
+    __slots__ = ("entries", "bytes", "max_entries", "max_bytes", "lock")
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.entries: "OrderedDict[Hashable, Tuple[PermissionCacheEntry, int]]" = OrderedDict()
+        self.bytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the shard is within its limits"""
+        evicted = 0
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            evicted += 1
+        return evicted
+
+
+class PermissionCache:
+    """Sharded in-process LRU with TTL and an optional Redis tier"""
+
+    def __init__(self,
+                 max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 shards: int = 16,
+                 cache_service: Any = None,
+                 namespace: str = "permissions"):
+        self.configured_shards = max(1, shards)
+        self.shard_count = self.configured_shards
+        self._shards = [_LRUShard(0, 0) for _ in range(self.shard_count)]
+
+        self.cache_service = cache_service
+        self.namespace = namespace
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "redis_hits": 0,
+            "redis_misses": 0,
+            "redis_errors": 0
+        }
+
+        self.resize(max_entries, max_bytes)
+
+    # In-process tier
+
+    def get(self, key: Hashable) -> Optional[PermissionCacheEntry]:
+        """Get a live entry and mark it most recently used"""
+        shard = self._shard(key)
+        with shard.lock:
+            item = shard.entries.get(key)
+            if item is None:
+                self.stats["misses"] += 1
+                return None
+
+            entry, size = item
+            if entry.is_expired():
+                del shard.entries[key]
+                shard.bytes -= size
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            shard.entries.move_to_end(key)
+            entry.update_access()
+            self.stats["hits"] += 1
+            return entry
+
+    def peek(self, key: Hashable) -> Optional[PermissionCacheEntry]:
+        """Get an entry without touching its recency or counters"""
+        item = self._shard(key).entries.get(key)
+        return item[0] if item else None
+
+    def put(self, entry: PermissionCacheEntry) -> None:
+        """Insert or replace an entry, evicting least recently used ones past the limits"""
+        key = entry.cache_key
+        size = entry.estimated_size()
+        shard = self._shard(key)
+        with shard.lock:
+            previous = shard.entries.pop(key, None)
+            if previous:
+                shard.bytes -= previous[1]
+            shard.entries[key] = (entry, size)
+            shard.bytes += size
+            self.stats["evictions"] += shard.evict()
+
+    def pop(self, key: Hashable) -> Optional[PermissionCacheEntry]:
+        """Remove an entry from the in-process tier"""
+        shard = self._shard(key)
+        with shard.lock:
+            item = shard.entries.pop(key, None)
+            if item is None:
+                return None
+            shard.bytes -= item[1]
+            return item[0]
+
+    def resize(self, max_entries: int, max_bytes: Optional[int] = None) -> None:
+        """Change the limits, evicting entries that no longer fit"""
+        self.max_entries = max(1, max_entries)
+        if max_bytes is not None:
+            self.max_bytes = max(1, max_bytes)
+
+        # Caches smaller than the shard count use one shard, so eviction stays exact LRU
+        shard_count = self.configured_shards if self.max_entries >= self.configured_shards else 1
+        if shard_count != self.shard_count:
+            self._reshard(shard_count)
+
+        # Per-shard limits add up to at most the totals
+        for shard in self._shards:
+            with shard.lock:
+                shard.max_entries = max(1, self.max_entries // self.shard_count)
+                shard.max_bytes = max(1, self.max_bytes // self.shard_count)
+                self.stats["evictions"] += shard.evict()
+
+    def clear(self) -> None:
+        """Remove all in-process entries"""
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.bytes = 0
+
+    def values(self) -> Iterator[PermissionCacheEntry]:
+        """Iterate over in-process entries"""
+        for shard in self._shards:
+            for entry, _ in list(shard.entries.values()):
+                yield entry
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._shard(key).entries
+
+    def __getitem__(self, key: Hashable) -> PermissionCacheEntry:
+        return self._shard(key).entries[key][0]
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    # Redis tier
+
+    async def load(self, key: PermissionCacheKey) -> Optional[PermissionCacheEntry]:
+        """
+        Get an entry from Redis and add it to the in-process tier
+
+        Args:
+            key: (tenant_id or "", user_id)
+
+        Returns:
+            The entry, or None if Redis is not configured or has no live entry
+        """
+        if not self.cache_service:
+            return None
+
+        try:
+            data = await self.cache_service.get(self._redis_key(key), namespace=self.namespace)
+        except Exception as e:
+            self.stats["redis_errors"] += 1
+            logger.error("Failed to read cached permissions", error=str(e))
+            return None
+
+        if not isinstance(data, dict):
+            self.stats["redis_misses"] += 1
+            return None
+
+        entry = self._deserialize(key, data)
+        if entry.is_expired():
+            self.stats["redis_misses"] += 1
+            return None
+
+        self.stats["redis_hits"] += 1
+        entry.update_access()
+        self.put(entry)
+        return entry
+
+    async def store(self, entry: PermissionCacheEntry) -> bool:
+        """Write an entry to Redis for the rest of its TTL"""
+        if not self.cache_service:
+            return False
+
+        ttl = None
+        if entry.expires_at:
+            ttl = int((entry.expires_at - datetime.now(timezone.utc)).total_seconds())
+            if ttl <= 0:
+                return False
+
+        try:
+            return await self.cache_service.set(
+                self._redis_key(entry.cache_key), self._serialize(entry), ttl=ttl, namespace=self.namespace
+            )
+        except Exception as e:
+            self.stats["redis_errors"] += 1
+            logger.error("Failed to write cached permissions", error=str(e))
+            return False
+
+    async def invalidate(self, key: PermissionCacheKey) -> bool:
+        """Remove an entry from both tiers"""
+        removed = self.pop(key) is not None
+        if self.cache_service:
+            try:
+                removed = await self.cache_service.delete(self._redis_key(key), namespace=self.namespace) or removed
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                logger.error("Failed to delete cached permissions", error=str(e))
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self),
+            "bytes": sum(shard.bytes for shard in self._shards),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "shards": self.shard_count,
+            "hit_rate": (self.stats["hits"] / lookups) * 100 if lookups else 0.0,
+            "redis_tier": self.cache_service is not None
+        }
+
+    # Private methods
+
+    def _reshard(self, shard_count: int) -> None:
+        """Redistribute entries over a new number of shards, keeping each shard's access order"""
+        shards = [_LRUShard(0, 0) for _ in range(shard_count)]
+        for old in self._shards:
+            with old.lock:
+                for key, (entry, size) in old.entries.items():
+                    shard = shards[hash(key) % shard_count]
+                    shard.entries[key] = (entry, size)
+                    shard.bytes += size
+        self._shards = shards
+        self.shard_count = shard_count
+
+    def _shard(self, key: Hashable) -> _LRUShard:
+        return self._shards[hash(key) % self.shard_count]
+
+    @staticmethod
+    def _redis_key(key: PermissionCacheKey) -> str:
+        tenant_id, user_id = key
+        return f"{tenant_id or '_'}:{user_id}"
+
+    @staticmethod
+    def _serialize(entry: PermissionCacheEntry) -> Dict[str, Any]:
+        permissions = entry.permissions
+        return {
+            "user_id": entry.user_id,
+            "tenant_id": entry.tenant_id,
+            "granted_scopes": list(permissions.granted_scopes),
+            "effective_permissions": dict(permissions.effective_permissions),
+            "last_validated": permissions.last_validated.isoformat() if permissions.last_validated else None,
+            "permissions_expire_at": permissions.expires_at.isoformat() if permissions.expires_at else None,
+            "cached_at": entry.cached_at.isoformat(),
+            "expires_at": entry.expires_at.isoformat() if entry.expires_at else None
+        }
+
+    @staticmethod
+    def _deserialize(key: PermissionCacheKey, data: Dict[str, Any]) -> PermissionCacheEntry:
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        permissions = UserPermissions(
+            user_id=data["user_id"],
+            tenant_id=data.get("tenant_id"),
+            granted_scopes=list(data.get("granted_scopes", [])),
+            effective_permissions=dict(data.get("effective_permissions", {})),
+            last_validated=parse(data.get("last_validated")),
+            expires_at=parse(data.get("permissions_expire_at"))
+        )
+        return PermissionCacheEntry(
+            user_id=data["user_id"],
+            tenant_id=data.get("tenant_id"),
+            permissions=permissions,
+            cache_key=key,
+            cached_at=parse(data.get("cached_at")) or datetime.now(timezone.utc),
+            expires_at=parse(data.get("expires_at"))
+        )
@@ -0,0 +1,158 @@
+"""
+Compiled permission model for scope validation
+
+Every scope name gets one bit, so a user's granted scopes become a single
+integer mask. For each resource type the scope table and access level
+hierarchy are folded once into a mask per required scope: the bits of every
+scope that satisfies it (itself, plus the scopes whose level includes its
+level). Checking a requirement is then an AND of the user's mask with the
+requirement's mask when the user holds the scopes directly, and one AND per
+scope otherwise, instead of walking the scope and hierarchy tables.
+
+Scopes outside the scope table (custom or newer Graph scopes) get a bit the
+first time they are seen and are satisfied only by themselves.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+# Scopes that count as admin-level access for escalation detection
+ESCALATION_SCOPE_PATTERNS = [
+    # Requesting admin permissions without current admin access
+    r".*\.Admin.*",
+    r".*\.All$",
+    r"Directory\..*",
+    # Application permissions when user typically has delegated
+    r".*\.Application$"
+]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRequirement:
+    """Required scopes of an operation, resolved to masks"""
+    resource_type: Any
+    scopes: Tuple[str, ...]
+    checks: Tuple[Tuple[str, int], ...]  # Per scope: (scope, bits of every scope that satisfies it)
+    required_mask: int  # Bits of the required scopes themselves
+    admin_mask: int  # Bits of required scopes matching ESCALATION_SCOPE_PATTERNS
+
+
+class CompiledPermissionModel:
+    """Scope tables and access level hierarchy compiled into bitsets"""
+
+    def __init__(self,
+                 graph_scopes: Mapping[Any, Mapping[str, Dict[str, Any]]],
+                 hierarchy: Mapping[Any, Sequence[Any]],
+                 escalation_patterns: Iterable[str] = ESCALATION_SCOPE_PATTERNS,
+                 max_requirements: int = 4096):
+        self._escalation_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in escalation_patterns]
+        self._bits: Dict[str, int] = {}
+        self._admin_mask = 0
+        self._intern_lock = threading.Lock()
+
+        # resource type -> scope -> mask of the scopes satisfying it
+        self._satisfying: Dict[Any, Dict[str, int]] = {}
+        for resource_type, scopes in graph_scopes.items():
+            masks: Dict[str, int] = {}
+            for scope, info in scopes.items():
+                mask = self.bit(scope)
+                for other, other_info in scopes.items():
+                    if info["level"] in hierarchy.get(other_info["level"], ()):
+                        mask |= self.bit(other)
+                masks[scope] = mask
+            self._satisfying[resource_type] = masks
+
+        self.max_requirements = max_requirements
+        self._requirements: Dict[Tuple[Any, Tuple[str, ...]], CompiledRequirement] = {}
+
+    def bit(self, scope: str) -> int:
+        """Get the bit of a scope, assigning one to scopes not seen before"""
+        bit = self._bits.get(scope)
+        if bit is None:
+            with self._intern_lock:
+                bit = self._bits.get(scope)
+                if bit is None:
+                    bit = 1 << len(self._bits)
+                    if any(pattern.match(scope) for pattern in self._escalation_patterns):
+                        self._admin_mask |= bit
+                    self._bits[scope] = bit
+        return bit
+
+    def mask(self, scopes: Iterable[str]) -> int:
+        """Get the mask of a set of scopes"""
+        mask = 0
+        for scope in scopes:
+            mask |= self.bit(scope)
+        return mask
+
+    def satisfying_mask(self, resource_type: Any, scope: str) -> int:
+        """Get the bits of every scope that grants `scope` on a resource type"""
+        mask = self._satisfying.get(resource_type, {}).get(scope)
+        return mask if mask is not None else self.bit(scope)
+
+    def admin_mask(self, mask: int) -> int:
+        """Get the admin-level scopes of a mask"""
+        return mask & self._admin_mask
+
+    def compile(self, resource_type: Any, scopes: Sequence[str]) -> CompiledRequirement:
+        """
+        Resolve the required scopes of an operation (memoized)
+
+        Args:
+            resource_type: Resource type the scopes are checked against
+            scopes: Required scopes
+
+        Returns:
+            CompiledRequirement for check()
+        """
+        key = (resource_type, tuple(scopes))
+        requirement = self._requirements.get(key)
+        if requirement is not None:
+            return requirement
+
+        required_mask = self.mask(key[1])
+        requirement = CompiledRequirement(
+            resource_type=resource_type,
+            scopes=key[1],
+            checks=tuple((scope, self.satisfying_mask(resource_type, scope)) for scope in key[1]),
+            required_mask=required_mask,
+            admin_mask=self.admin_mask(required_mask)
+        )
+
+        if len(self._requirements) >= self.max_requirements:
+            self._requirements.clear()
+        self._requirements[key] = requirement
+        return requirement
+
+    def check(self, requirement: CompiledRequirement, user_mask: int) -> Tuple[List[str], List[str]]:
+        """
+        Split required scopes into granted and missing ones
+
+        Args:
+            requirement: Compiled requirement
+            user_mask: Mask of the user's granted scopes
+
+        Returns:
+            (granted scopes, missing scopes), in requirement order
+        """
+        if user_mask & requirement.required_mask == requirement.required_mask:
+            return list(requirement.scopes), []
+
+        granted: List[str] = []
+        missing: List[str] = []
+        for scope, mask in requirement.checks:
+            if user_mask & mask:
+                granted.append(scope)
+            else:
+                missing.append(scope)
+        return granted, missing
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get model size statistics"""
+        return {
+            "scopes": len(self._bits),
+            "resource_types": len(self._satisfying),
+            "compiled_requirements": len(self._requirements)
+        }
@@ -3,22 +3,24 @@ Advanced Permission Management for Microsoft Graph API Integration
 Story 2.1 Task 5: Comprehensive permission validation, scope-based access control, and audit logging
 """
 
-import re
+import os
 import uuid
+import inspect
 import time
-import hashlib
 import asyncio
-from typing import Dict, List, Any, Optional, Callable
+from typing import Deque, Dict, List, Any, Optional, Callable
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import wraps
-from collections import defaultdict
+from collections import defaultdict, deque
 import structlog
 
 from ..models.graph_models import UserPermissions, TenantContext
 from ..utils.error_handler import get_error_handler
 from ..utils.performance_monitor import get_performance_monitor, track_operation
+from .permission_cache import PermissionCache, PermissionCacheEntry, PermissionCacheKey
+from .permission_model import CompiledPermissionModel
 
 
 logger = structlog.get_logger(__name__)
@@ -87,30 +89,6 @@ class PermissionAuditEntry:
             self.resource_id = ""
 
 
-@dataclass
-class PermissionCacheEntry:
-    """Cached permission entry"""
-    user_id: str
-    tenant_id: Optional[str]
-    permissions: UserPermissions
-    cache_key: str
-    cached_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    expires_at: Optional[datetime] = None
-    access_count: int = 0
-    last_accessed: Optional[datetime] = None
-
-    def is_expired(self) -> bool:
-        """Check if cache entry is expired"""
-        if self.expires_at is None:
-            return False  # Never expires if no expiration set
-        return datetime.now(timezone.utc) > self.expires_at
-
-    def update_access(self) -> None:
-        """Update access statistics"""
-        self.access_count += 1
-        self.last_accessed = datetime.now(timezone.utc)
-
-
 class GraphPermissionValidator:
     """
     Microsoft Graph API permission validation and management system
@@ -163,19 +141,28 @@ class GraphPermissionValidator:
                  cache_ttl_minutes: int = 15,
                  max_cache_size: int = 10000,
                  enable_audit_logging: bool = True,
-                 enable_escalation_detection: bool = True):
+                 enable_escalation_detection: bool = True,
+                 cache_service: Any = None):
         self.cache_ttl_minutes = cache_ttl_minutes
-        self.max_cache_size = max_cache_size
         self.enable_audit_logging = enable_audit_logging
         self.enable_escalation_detection = enable_escalation_detection
 
-        # Permission cache
-        self._permission_cache: Dict[str, PermissionCacheEntry] = {}
-        self._cache_access_order: List[str] = []
+        # Permission cache (in-process LRU shards, optionally backed by Redis)
+        self._permission_cache = PermissionCache(
+            max_entries=max_cache_size,
+            max_bytes=int(os.getenv("PERMISSION_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            shards=int(os.getenv("PERMISSION_CACHE_SHARDS", "16")),
+            cache_service=cache_service
+        )
 
-        # Audit trail
-        self._audit_trail: List[PermissionAuditEntry] = []
-        self._max_audit_entries = 50000
+        # Scope tables compiled into bitsets
+        self.permission_model = CompiledPermissionModel(self.GRAPH_SCOPES, self.PERMISSION_HIERARCHY)
+
+        # Recent audit entries; the full trail goes to the audit sink when one is attached
+        self._audit_trail: Deque[PermissionAuditEntry] = deque(
+            maxlen=int(os.getenv("PERMISSION_AUDIT_RECENT_ENTRIES", "1000"))
+        )
+        self._audit_sink: Any = None
 
         # Tenant contexts
         self._tenant_contexts: Dict[str, TenantContext] = {}
@@ -189,21 +176,26 @@ class GraphPermissionValidator:
                     audit_enabled=enable_audit_logging,
                     escalation_detection=enable_escalation_detection)
 
-    def _generate_cache_key(self, user_id: str, tenant_id: Optional[str] = None) -> str:
-        """Generate cache key for user permissions"""
-        key_parts = [user_id]
-        if tenant_id:
-            key_parts.append(tenant_id)
+    @property
+    def max_cache_size(self) -> int:
+        """Maximum number of cached users"""
+        return self._permission_cache.max_entries
+
+    @max_cache_size.setter
+    def max_cache_size(self, value: int) -> None:
+        self._permission_cache.resize(value)
 
-        key_string = "|".join(key_parts)
-        return hashlib.md5(key_string.encode()).hexdigest()
+    def set_cache_service(self, cache_service: Any) -> None:
+        """Attach (or detach with None) the Redis tier of the permission cache"""
+        self._permission_cache.cache_service = cache_service
 
-    def _manage_cache_size(self) -> None:
-        """Manage cache size using LRU eviction"""
-        while len(self._permission_cache) >= self.max_cache_size:
-            if self._cache_access_order:
-                oldest_key = self._cache_access_order.pop(0)
-                self._permission_cache.pop(oldest_key, None)
+    def set_audit_sink(self, audit_sink: Any) -> None:
+        """Attach (or detach with None) the PermissionAuditSink persisting audit entries"""
+        self._audit_sink = audit_sink
+
+    def _generate_cache_key(self, user_id: str, tenant_id: Optional[str] = None) -> PermissionCacheKey:
+        """Generate cache key for user permissions"""
+        return (tenant_id or "", user_id)
 
     @track_operation("permission_validation")
     async def validate_permissions(self,
@@ -234,7 +226,10 @@ class GraphPermissionValidator:
 
         try:
             # Get user permissions (cached or fresh)
-            user_permissions = await self._get_user_permissions(user_id, tenant_id)
+            permission_entry = await self._get_permission_entry(user_id, tenant_id)
+            user_permissions = permission_entry.permissions
+            user_mask = self._get_scope_mask(permission_entry)
+            requirement = self.permission_model.compile(resource_type, required_scopes)
 
             # Validate tenant isolation
             if tenant_id and not self._validate_tenant_isolation(user_id, tenant_id):
@@ -262,18 +257,12 @@ class GraphPermissionValidator:
             escalation_detected = False
             if self.enable_escalation_detection:
                 escalation_detected = self._detect_permission_escalation(
-                    user_permissions, required_scopes, context
+                    user_permissions, required_scopes, context,
+                    user_mask=user_mask, requested_admin_mask=requirement.admin_mask
                 )
 
             # Validate individual scopes
-            granted_scopes = []
-            missing_scopes = []
-
-            for scope in required_scopes:
-                if self._validate_scope(user_permissions, scope, resource_type):
-                    granted_scopes.append(scope)
-                else:
-                    missing_scopes.append(scope)
+            granted_scopes, missing_scopes = self.permission_model.check(requirement, user_mask)
 
             # Determine validation result
             is_valid = len(missing_scopes) == 0 and not escalation_detected
@@ -341,56 +330,50 @@ class GraphPermissionValidator:
 
     async def _get_user_permissions(self, user_id: str, tenant_id: Optional[str] = None) -> UserPermissions:
         """Get user permissions from cache or fetch fresh"""
+        return (await self._get_permission_entry(user_id, tenant_id)).permissions
+
+    async def _get_permission_entry(self, user_id: str, tenant_id: Optional[str] = None) -> PermissionCacheEntry:
+        """Get the cache entry of a user's permissions, fetching them on a miss"""
         cache_key = self._generate_cache_key(user_id, tenant_id)
 
-        # Check cache first
-        if cache_key in self._permission_cache:
-            cache_entry = self._permission_cache[cache_key]
-
-            if not cache_entry.is_expired():
-                cache_entry.update_access()
-                # Move to end of access order (most recently used)
-                if cache_key in self._cache_access_order:
-                    self._cache_access_order.remove(cache_key)
-                self._cache_access_order.append(cache_key)
-
-                logger.debug("Permission cache hit", user_id=user_id, cache_key=cache_key)
-                return cache_entry.permissions
-            else:
-                # Remove expired entry
-                del self._permission_cache[cache_key]
-                if cache_key in self._cache_access_order:
-                    self._cache_access_order.remove(cache_key)
+        # Check cache first (in-process, then Redis)
+        cache_entry = self._permission_cache.get(cache_key) or await self._permission_cache.load(cache_key)
+        if cache_entry:
+            logger.debug("Permission cache hit", user_id=user_id, tenant_id=tenant_id)
+            return cache_entry
 
         # Fetch fresh permissions (would integrate with actual Graph API in production)
         user_permissions = await self._fetch_user_permissions(user_id, tenant_id)
 
         # Cache the result
-        self._manage_cache_size()
-
         cache_entry = PermissionCacheEntry(
             user_id=user_id,
             tenant_id=tenant_id,
             permissions=user_permissions,
-            cache_key=cache_key
+            cache_key=cache_key,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=self.cache_ttl_minutes)
         )
         cache_entry.update_access()  # Initialize access count
 
-        self._permission_cache[cache_key] = cache_entry
-        self._cache_access_order.append(cache_key)
+        self._permission_cache.put(cache_entry)
+        await self._permission_cache.store(cache_entry)
 
-        logger.debug("Permission cached", user_id=user_id, cache_key=cache_key)
-        return user_permissions
+        logger.debug("Permission cached", user_id=user_id, tenant_id=tenant_id)
+        return cache_entry
+
+    def _get_scope_mask(self, cache_entry: PermissionCacheEntry) -> int:
+        """Get the granted scopes of a cache entry as a mask, rebuilt whenever the scopes changed"""
+        granted_scopes = tuple(cache_entry.permissions.granted_scopes)
+        if cache_entry.scope_mask is None or cache_entry.scope_mask_scopes != granted_scopes:
+            cache_entry.scope_mask = self.permission_model.mask(granted_scopes)
+            cache_entry.scope_mask_scopes = granted_scopes
+        return cache_entry.scope_mask
 
     def _was_cache_hit(self, user_id: str, tenant_id: Optional[str] = None) -> bool:
         """Check if the last request was a cache hit"""
-        cache_key = self._generate_cache_key(user_id, tenant_id)
-        if cache_key in self._permission_cache:
-            cache_entry = self._permission_cache[cache_key]
-            # Consider it a cache hit if accessed recently and not expired
-            if not cache_entry.is_expired() and cache_entry.access_count > 1:
-                return True
-        return False
+        cache_entry = self._permission_cache.peek(self._generate_cache_key(user_id, tenant_id))
+        # Consider it a cache hit if accessed recently and not expired
+        return bool(cache_entry and not cache_entry.is_expired() and cache_entry.access_count > 1)
 
     async def _fetch_user_permissions(self, user_id: str, tenant_id: Optional[str] = None) -> UserPermissions:
         """
@@ -425,41 +408,9 @@ class GraphPermissionValidator:
         )
 
     def _validate_scope(self, user_permissions: UserPermissions, scope: str, resource_type: ResourceType) -> bool:
-        """Validate if user has specific scope for resource type"""
-        # Direct scope match
-        if scope in user_permissions.granted_scopes:
-            return True
-
-        # Check permission hierarchy
-        return self._check_permission_hierarchy(user_permissions, scope, resource_type)
-
-    def _check_permission_hierarchy(self, user_permissions: UserPermissions, scope: str,
-                                    resource_type: ResourceType) -> bool:
-        """Check if user has higher-level permission that includes the requested scope"""
-        # Get scope information
-        resource_scopes = self.GRAPH_SCOPES.get(resource_type, {})
-        scope_info = resource_scopes.get(scope)
-
-        if not scope_info:
-            return False
-
-        required_level = scope_info["level"]
-
-        # Check if user has higher-level permissions
-        for user_scope in user_permissions.granted_scopes:
-            user_scope_info = resource_scopes.get(user_scope)
-            if not user_scope_info:
-                continue
-
-            user_level = user_scope_info["level"]
-
-            # Check hierarchy
-            if user_level in self.PERMISSION_HIERARCHY:
-                included_levels = self.PERMISSION_HIERARCHY[user_level]
-                if required_level in included_levels:
-                    return True
-
-        return False
+        """Validate if user has specific scope, directly or through a higher-level scope"""
+        user_mask = self.permission_model.mask(user_permissions.granted_scopes)
+        return bool(user_mask & self.permission_model.satisfying_mask(resource_type, scope))
 
     def _validate_tenant_isolation(self, user_id: str, tenant_id: str) -> bool:
         """Validate tenant isolation boundaries"""
@@ -478,33 +429,20 @@ class GraphPermissionValidator:
     def _detect_permission_escalation(self,
                                       user_permissions: UserPermissions,
                                       requested_scopes: List[str],
-                                      context: Dict[str, Any]) -> bool:
+                                      context: Dict[str, Any],
+                                      user_mask: Optional[int] = None,
+                                      requested_admin_mask: Optional[int] = None) -> bool:
         """Detect potential permission escalation attempts"""
         if not self.enable_escalation_detection:
             return False
 
-        # Check for suspicious patterns
-        suspicious_patterns = [
-            # Requesting admin permissions without current admin access
-            r".*\.Admin.*",
-            r".*\.All$",
-            r"Directory\..*",
-            # Application permissions when user typically has delegated
-            r".*\.Application$"
-        ]
-
-        current_admin_scopes = [
-            scope for scope in user_permissions.granted_scopes
-            if any(re.match(pattern, scope, re.IGNORECASE) for pattern in suspicious_patterns)
-        ]
-
-        requested_admin_scopes = [
-            scope for scope in requested_scopes
-            if any(re.match(pattern, scope, re.IGNORECASE) for pattern in suspicious_patterns)
-        ]
+        if user_mask is None:
+            user_mask = self.permission_model.mask(user_permissions.granted_scopes)
+        if requested_admin_mask is None:
+            requested_admin_mask = self.permission_model.admin_mask(self.permission_model.mask(requested_scopes))
 
         # Escalation if requesting admin scopes without having any
-        if requested_admin_scopes and not current_admin_scopes:
+        if requested_admin_mask and not self.permission_model.admin_mask(user_mask):
             return True
 
         # Check for unusual access patterns in context
@@ -554,15 +492,11 @@ class GraphPermissionValidator:
             additional_context=context
         )
 
-        # Manage audit trail size
-        if len(self._audit_trail) >= self._max_audit_entries:
-            # Remove oldest 10% of entries
-            remove_count = self._max_audit_entries // 10
-            self._audit_trail = self._audit_trail[remove_count:]
-
         self._audit_trail.append(audit_entry)
+        if self._audit_sink:
+            self._audit_sink.enqueue(audit_entry)
 
-        logger.info("Permission audit logged",
+        logger.debug("Permission audit logged",
                     audit_id=audit_entry.audit_id,
                     user_id=user_id,
                     operation=operation,
@@ -578,6 +512,10 @@ class GraphPermissionValidator:
                 # Function implementation
         """
         def decorator(func: Callable) -> Callable:
+            # Resolve the scopes and signature once, not per call
+            self.permission_model.compile(resource_type, required_scopes)
+            accepts_validation = "permission_validation" in inspect.signature(func).parameters
+
             @wraps(func)
             async def wrapper(*args, **kwargs):
                 # Extract user_id and tenant_id from function arguments
@@ -608,9 +546,7 @@ class GraphPermissionValidator:
                     raise PermissionError(error_msg)
 
                 # Add validation result to kwargs for function access if function accepts it
-                import inspect
-                sig = inspect.signature(func)
-                if "permission_validation" in sig.parameters:
+                if accepts_validation:
                     kwargs["permission_validation"] = validation_result
 
                 return await func(*args, **kwargs)
@@ -623,7 +559,7 @@ class GraphPermissionValidator:
                         operation: Optional[str] = None,
                         result: Optional[str] = None,
                         hours: int = 24) -> List[PermissionAuditEntry]:
-        """Get filtered audit trail entries"""
+        """Get filtered entries from the recent audit trail (see query_audit_trail for the full one)"""
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
 
         filtered_entries = []
@@ -644,6 +580,46 @@ class GraphPermissionValidator:
 
         return filtered_entries
 
+    async def query_audit_trail(self,
+                                user_id: Optional[str] = None,
+                                tenant_id: Optional[str] = None,
+                                operation: Optional[str] = None,
+                                result: Optional[str] = None,
+                                hours: int = 24,
+                                limit: int = 1000) -> List[PermissionAuditEntry]:
+        """
+        Get filtered audit entries from the persisted trail, newest first
+
+        Falls back to the recent in-memory entries when no audit sink is attached.
+
+        Args:
+            user_id: Only entries of this user
+            tenant_id: Only entries of this tenant
+            operation: Only entries of this operation
+            result: Only entries with this result
+            hours: How far back to look
+            limit: Maximum number of entries
+
+        Returns:
+            Matching audit entries
+        """
+        if not self._audit_sink:
+            entries = [
+                entry for entry in self.get_audit_trail(user_id, operation, result, hours)
+                if not tenant_id or entry.tenant_id == tenant_id
+            ]
+            return entries[::-1][:limit]
+
+        rows = await self._audit_sink.query(
+            user_id=user_id,
+            tenant_id=tenant_id,
+            operation=operation,
+            result=result,
+            since=datetime.now(timezone.utc) - timedelta(hours=hours),
+            limit=limit
+        )
+        return [PermissionAuditEntry(**row) for row in rows]
+
     def get_permission_statistics(self) -> Dict[str, Any]:
         """Get permission system statistics"""
         total_validations = len(self._audit_trail)
@@ -673,33 +649,21 @@ class GraphPermissionValidator:
 
     def _get_cache_statistics(self) -> Dict[str, Any]:
         """Get permission cache statistics"""
-        total_entries = len(self._permission_cache)
-        expired_entries = sum(1 for entry in self._permission_cache.values() if entry.is_expired())
-        total_accesses = sum(entry.access_count for entry in self._permission_cache.values())
+        entries = list(self._permission_cache.values())
+        expired_entries = sum(1 for entry in entries if entry.is_expired())
 
         return {
-            "total_entries": total_entries,
+            **self._permission_cache.get_stats(),
+            "total_entries": len(entries),
             "expired_entries": expired_entries,
-            "active_entries": total_entries - expired_entries,
-            "total_accesses": total_accesses,
+            "active_entries": len(entries) - expired_entries,
+            "total_accesses": sum(entry.access_count for entry in entries),
             "cache_hit_rate": self._calculate_cache_hit_rate()
         }
 
     def _calculate_cache_hit_rate(self) -> float:
-        """Calculate cache hit rate from recent operations"""
-        # This would be more sophisticated in production
-        # For now, estimate based on cache access patterns
-        if not self._permission_cache:
-            return 0.0
-
-        recent_accesses = sum(
-            entry.access_count for entry in self._permission_cache.values()
-            if entry.last_accessed and
-            entry.last_accessed > datetime.now(timezone.utc) - timedelta(hours=1)
-        )
-
-        # Estimate hit rate based on cache usage
-        return min(75.0, recent_accesses * 5.0)  # Simplified calculation
+        """Calculate cache hit rate from cache lookups"""
+        return self._permission_cache.get_stats()["hit_rate"]
 
     def _get_most_requested_scopes(self) -> List[Dict[str, Any]]:
         """Get most frequently requested permission scopes"""
@@ -730,13 +694,7 @@ class GraphPermissionValidator:
 
     async def invalidate_user_cache(self, user_id: str, tenant_id: Optional[str] = None) -> bool:
         """Invalidate cached permissions for a user"""
-        cache_key = self._generate_cache_key(user_id, tenant_id)
-
-        if cache_key in self._permission_cache:
-            del self._permission_cache[cache_key]
-            if cache_key in self._cache_access_order:
-                self._cache_access_order.remove(cache_key)
-
+        if await self._permission_cache.invalidate(self._generate_cache_key(user_id, tenant_id)):
             logger.info("User permission cache invalidated", user_id=user_id, tenant_id=tenant_id)
             return True
 
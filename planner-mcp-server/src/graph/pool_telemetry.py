@@ -0,0 +1,186 @@
+"""
+Connection pool telemetry for the Graph HTTP client
+
+httpx does not expose pool statistics, so EnhancedGraphClient sends requests
+through InstrumentedTransport. It attaches an httpcore trace callback to each
+request to time the wait for a pooled connection (or HTTP/2 stream slot) and
+TLS handshakes. It tells new connections from reused ones, counts concurrent
+HTTP/2 streams per connection, and diffs the pool whenever a response opens or
+closes to count closed connections. Measurements are exported through the
+PerformanceMonitor's Prometheus histograms.
+"""
+
+import time
+from typing import Any, Dict, Optional, Set
+import structlog
+
+import httpx
+
+logger = structlog.get_logger(__name__)
+
+
+class ConnectionPoolTelemetry:
+    """Measured connection pool statistics for one HTTP client"""
+
+    def __init__(self, performance_monitor: Any = None):
+        self.performance_monitor = performance_monitor
+
+        self.stats = {
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "connections_closed": 0,
+            "pool_wait_count": 0,
+            "pool_wait_total": 0.0,
+            "pool_wait_max": 0.0,
+            "tls_handshakes": 0,
+            "tls_handshake_total": 0.0,
+            "http2_streams_max": 0
+        }
+
+        # Pool snapshot from the last request
+        self._connections: Set[int] = set()
+        self._active = 0
+        self._idle = 0
+
+        # Open HTTP/2 streams keyed by connection (its network stream)
+        self._http2_streams: Dict[int, int] = {}
+
+    def record_acquired(self, pool_wait: float, reused: bool) -> None:
+        """Record a request getting a connection"""
+        self.stats["connections_reused" if reused else "connections_opened"] += 1
+        self.stats["pool_wait_count"] += 1
+        self.stats["pool_wait_total"] += pool_wait
+        self.stats["pool_wait_max"] = max(self.stats["pool_wait_max"], pool_wait)
+
+        if self.performance_monitor:
+            self.performance_monitor.record_connection_pool_telemetry(
+                event="reused" if reused else "opened",
+                pool_wait=pool_wait
+            )
+
+    def record_tls_handshake(self, duration: float) -> None:
+        """Record the duration of a TLS handshake"""
+        self.stats["tls_handshakes"] += 1
+        self.stats["tls_handshake_total"] += duration
+
+        if self.performance_monitor:
+            self.performance_monitor.record_connection_pool_telemetry(tls_handshake=duration)
+
+    def open_http2_stream(self, connection_key: int) -> None:
+        """Record an HTTP/2 stream opening on a connection"""
+        streams = self._http2_streams.get(connection_key, 0) + 1
+        self._http2_streams[connection_key] = streams
+        self.stats["http2_streams_max"] = max(self.stats["http2_streams_max"], streams)
+
+        if self.performance_monitor:
+            self.performance_monitor.record_connection_pool_telemetry(http2_streams=streams)
+
+    def close_http2_stream(self, connection_key: int) -> None:
+        """Record an HTTP/2 stream closing"""
+        streams = self._http2_streams.get(connection_key, 0) - 1
+        if streams > 0:
+            self._http2_streams[connection_key] = streams
+        else:
+            self._http2_streams.pop(connection_key, None)
+
+    def sync_pool(self, connections: list) -> None:
+        """Count connections that left the pool and refresh active/idle counts"""
+        current = {id(connection) for connection in connections if not connection.is_closed()}
+        closed = len(self._connections - current)
+        self._connections = current
+        self._idle = sum(1 for connection in connections if connection.is_idle())
+        self._active = len(current) - self._idle
+
+        if closed:
+            self.stats["connections_closed"] += closed
+            if self.performance_monitor:
+                self.performance_monitor.record_connection_pool_telemetry(event="closed", count=closed)
+
+    def get_pool_info(self) -> Dict[str, int]:
+        """Get the connection counts of the last pool snapshot"""
+        return {
+            "active": self._active,
+            "idle": self._idle,
+            "total": len(self._connections)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics"""
+        stats = self.stats
+        return {
+            **stats,
+            **self.get_pool_info(),
+            "pool_wait_avg": stats["pool_wait_total"] / stats["pool_wait_count"] if stats["pool_wait_count"] else 0.0,
+            "tls_handshake_avg": stats["tls_handshake_total"] / stats["tls_handshakes"] if stats["tls_handshakes"] else 0.0,
+            "http2_open_streams": sum(self._http2_streams.values())
+        }
+
+
+class _RequestTrace:
+    """httpcore trace callback for one request"""
+
+    def __init__(self, telemetry: ConnectionPoolTelemetry, chained: Any = None, on_response_closed: Any = None):
+        self.telemetry = telemetry
+        self.chained = chained
+        self.on_response_closed = on_response_closed
+        self.started = time.perf_counter()
+        self.acquired = False
+        self.tls_started: Optional[float] = None
+        self.http2_connection: Optional[int] = None
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+
+        if event_name == "connection.connect_tcp.started" and not self.acquired:
+            # Pool had no usable connection; a new one is being opened
+            self.acquired = True
+            self.telemetry.record_acquired(now - self.started, reused=False)
+        elif event_name == "connection.start_tls.started":
+            self.tls_started = now
+        elif event_name == "connection.start_tls.complete" and self.tls_started is not None:
+            self.telemetry.record_tls_handshake(now - self.tls_started)
+        elif event_name.endswith(".send_request_headers.started") and not self.acquired:
+            self.acquired = True
+            self.telemetry.record_acquired(now - self.started, reused=True)
+        elif ".response_closed." in event_name:
+            if self.http2_connection is not None:
+                self.telemetry.close_http2_stream(self.http2_connection)
+                self.http2_connection = None
+            if self.on_response_closed and not event_name.endswith(".started"):
+                # The connection went back to the pool (or was dropped)
+                self.on_response_closed()
+
+        if self.chained:
+            await self.chained(event_name, info)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that measures the connection pool it sends through"""
+
+    def __init__(self, telemetry: ConnectionPoolTelemetry, **transport_options):
+        self.telemetry = telemetry
+        self._transport = httpx.AsyncHTTPTransport(**transport_options)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        trace = _RequestTrace(self.telemetry, request.extensions.get("trace"), self._sync_pool)
+        request.extensions = {**request.extensions, "trace": trace}
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        finally:
+            self._sync_pool()
+
+        if response.extensions.get("http_version") == b"HTTP/2":
+            trace.http2_connection = id(response.extensions.get("network_stream"))
+            self.telemetry.open_http2_stream(trace.http2_connection)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+        self.telemetry.sync_pool([])
+
+    def _sync_pool(self) -> None:
+        """Snapshot the connections currently held by the httpcore pool"""
+        pool = getattr(self._transport, "_pool", None)
+        self.telemetry.sync_pool(list(getattr(pool, "connections", [])))
@@ -1,19 +1,27 @@
 """
 Intelligent rate limiting for Microsoft Graph API
 Story 2.1 Task 6: Rate Limit Handling with exponential backoff, adaptive retry, and circuit breaker
+
+Per-key state lives in bounded tables of slotted records: entries idle past
+their TTL are dropped by a periodic compaction task, and a hard cap evicts the
+least recently used entry, so memory stays flat however many users are seen.
 """
 
 import os
+import sys
 import time
 import asyncio
 import random
-from typing import Dict, List, Any, Optional, Callable, Union
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Union
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import structlog
 
 from ..utils.performance_monitor import get_performance_monitor
+from ..utils.shared_circuit_breaker import SharedCircuitBreaker
 
 
 logger = structlog.get_logger(__name__)
@@ -36,7 +44,7 @@ class EndpointTier(str, Enum):
     WEBHOOK = "webhook"              # Webhook subscriptions
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitWindow:
     """Rate limit tracking window"""
     window_start: datetime
@@ -71,7 +79,7 @@ class RetryConfig:
     strategy: RateLimitStrategy = RateLimitStrategy.EXPONENTIAL_BACKOFF
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitState:
     """Current rate limit state for an endpoint"""
     endpoint: str
@@ -84,12 +92,146 @@ class RateLimitState:
     total_requests: int = 0
     total_rate_limits: int = 0
     success_rate: float = 100.0
+    last_seen: float = 0.0
 
     def update_success_rate(self) -> None:
         """Update success rate based on rate limits"""
         if self.total_requests > 0:
             self.success_rate = ((self.total_requests - self.total_rate_limits) / self.total_requests) * 100
 
+    def is_pinned(self) -> bool:
+        """A pending Retry-After must outlive the idle TTL"""
+        return bool(self.retry_after and self.retry_after > time.time())
+
+
+@dataclass(slots=True)
+class EndpointCircuitBreaker:
+    """Circuit breaker for one endpoint, tenant and user"""
+    state: str = "closed"  # closed, open, half_open
+    failure_count: int = 0
+    success_count: int = 0
+    last_failure: Optional[float] = None
+    next_attempt: Optional[float] = None
+    test_requests: int = 0
+    last_seen: float = 0.0
+
+    def is_pinned(self) -> bool:
+        """Open and half-open breakers are kept until they close"""
+        return self.state != "closed"
+
+
+USAGE_WINDOW_SECONDS = 60
+
+
+@dataclass(slots=True)
+class UsagePattern:
+    """Requests per second over the last minute, in a ring of one-second slots"""
+    counts: array = field(default_factory=lambda: array("I", bytes(4 * USAGE_WINDOW_SECONDS)))
+    current_second: int = 0
+    window_total: int = 0
+    last_seen: float = 0.0
+
+    def record(self, timestamp: float) -> None:
+        """Count a request made at the given time"""
+        self._advance(int(timestamp))
+        self.counts[int(timestamp) % USAGE_WINDOW_SECONDS] += 1
+        self.window_total += 1
+
+    def requests_in_window(self, now: float) -> int:
+        """Requests made in the last minute"""
+        self._advance(int(now))
+        return self.window_total
+
+    def _advance(self, second: int) -> None:
+        """Clear the slots of seconds that have left the window"""
+        if second <= self.current_second:
+            return
+        if second - self.current_second >= USAGE_WINDOW_SECONDS:
+            self.counts = array("I", bytes(4 * USAGE_WINDOW_SECONDS))
+            self.window_total = 0
+        else:
+            for expired in range(self.current_second + 1, second + 1):
+                slot = expired % USAGE_WINDOW_SECONDS
+                self.window_total -= self.counts[slot]
+                self.counts[slot] = 0
+        self.current_second = second
+
+    def is_pinned(self) -> bool:
+        return False
+
+
+class BoundedStateTable(OrderedDict):
+    """
+    Dict of state records kept in least recently used order
+
+    Storing a record stamps it as seen and moves it to the end; once the table
+    holds max_entries, storing a new key evicts the least recently used one.
+    compact() drops records idle longer than idle_ttl unless they are pinned
+    (an active Retry-After or a breaker that is not closed).
+    """
+
+    def __init__(self, name: str, idle_ttl: float, max_entries: int):
+        super().__init__()
+        self.name = name
+        self.idle_ttl = idle_ttl
+        self.max_entries = max_entries
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+
+    def __setitem__(self, key: str, record: Any) -> None:
+        record.last_seen = time.monotonic()
+        if key in self:
+            self.move_to_end(key)
+        elif len(self) >= self.max_entries:
+            self.popitem(last=False)
+            self.evicted_capacity += 1
+        super().__setitem__(key, record)
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Get the record for a key, creating it if missing, and mark it as seen"""
+        record = self.get(key)
+        if record is None:
+            record = factory()
+            self[key] = record
+        else:
+            record.last_seen = time.monotonic()
+            self.move_to_end(key)
+        return record
+
+    def compact(self) -> int:
+        """Drop records idle longer than the TTL; returns the number dropped"""
+        cutoff = time.monotonic() - self.idle_ttl
+        expired = []
+        for key, record in self.items():
+            if record.last_seen >= cutoff:
+                # Records are in last-seen order, so the rest are fresh
+                break
+            if not record.is_pinned():
+                expired.append(key)
+
+        for key in expired:
+            del self[key]
+        self.evicted_idle += len(expired)
+        return len(expired)
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """Approximate memory held by the table and its records"""
+        size = sys.getsizeof(self)
+        for key, record in self.items():
+            size += sys.getsizeof(key) + sys.getsizeof(record)
+            for name in record.__slots__:
+                value = getattr(record, name)
+                if isinstance(value, (array, RateLimitWindow)):
+                    size += sys.getsizeof(value)
+
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "bytes": size,
+            "evicted_idle": self.evicted_idle,
+            "evicted_capacity": self.evicted_capacity
+        }
+
 
 class IntelligentRateLimiter:
     """
@@ -107,17 +249,22 @@ class IntelligentRateLimiter:
         self.config = self._load_config()
 
         # Rate limit tracking
-        self.rate_limit_states: Dict[str, RateLimitState] = {}
+        self.rate_limit_states = self._create_table("rate_limit_states")
         self.endpoint_configs: Dict[str, RetryConfig] = self._initialize_endpoint_configs()
 
         # Circuit breaker tracking
-        self.circuit_breakers: Dict[str, Dict[str, Any]] = {}
+        self.circuit_breakers = self._create_table("circuit_breakers")
 
         # Performance monitoring
         self.performance_monitor = get_performance_monitor()
 
         # Predictive models
-        self.usage_patterns: Dict[str, List[float]] = {}
+        self.usage_patterns = self._create_table("usage_patterns")
+
+        self._compaction_task = None
+
+        # Breaker transitions shared with other replicas, if enabled
+        self.shared_breakers: Optional[SharedCircuitBreaker] = None
 
         logger.info("Intelligent rate limiter initialized",
                    default_strategy=self.config["default_strategy"],
@@ -135,9 +282,50 @@ class IntelligentRateLimiter:
             "circuit_breaker_threshold": int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5")),
             "circuit_breaker_timeout": int(os.getenv("CIRCUIT_BREAKER_TIMEOUT", "60")),
             "predictive_enabled": os.getenv("RATE_LIMIT_PREDICTIVE", "true").lower() == "true",
-            "jitter_enabled": os.getenv("RATE_LIMIT_JITTER", "true").lower() == "true"
+            "jitter_enabled": os.getenv("RATE_LIMIT_JITTER", "true").lower() == "true",
+            "state_idle_ttl": float(os.getenv("RATE_LIMIT_STATE_IDLE_TTL", "900")),
+            "state_max_entries": int(os.getenv("RATE_LIMIT_STATE_MAX_ENTRIES", "50000")),
+            "compaction_interval": float(os.getenv("RATE_LIMIT_COMPACTION_INTERVAL", "60"))
         }
 
+    def set_shared_circuit_breaker(self, shared_breakers: Optional[SharedCircuitBreaker]) -> None:
+        """Share circuit breaker transitions with other replicas (None to stop sharing)"""
+        self.shared_breakers = shared_breakers
+
+    def _create_table(self, name: str) -> BoundedStateTable:
+        """Create a bounded state table with the configured TTL and cap"""
+        return BoundedStateTable(name, self.config["state_idle_ttl"], self.config["state_max_entries"])
+
+    async def start(self) -> None:
+        """Start the periodic compaction task"""
+        if not self._compaction_task or self._compaction_task.done():
+            self._compaction_task = asyncio.create_task(self._compaction_loop())
+
+    async def stop(self) -> None:
+        """Stop the compaction task"""
+        if self._compaction_task:
+            self._compaction_task.cancel()
+            await asyncio.gather(self._compaction_task, return_exceptions=True)
+            self._compaction_task = None
+
+    def compact(self) -> Dict[str, int]:
+        """Drop idle state from every table; returns the number dropped per table"""
+        return {
+            table.name: table.compact()
+            for table in (self.rate_limit_states, self.circuit_breakers, self.usage_patterns)
+        }
+
+    async def _compaction_loop(self) -> None:
+        """Background task compacting the state tables"""
+        while True:
+            await asyncio.sleep(self.config["compaction_interval"])
+            try:
+                dropped = self.compact()
+                if any(dropped.values()):
+                    logger.debug("Rate limiter state compacted", **dropped)
+            except Exception as e:
+                logger.error("Rate limiter compaction failed", error=str(e))
+
     def _initialize_endpoint_configs(self) -> Dict[str, RetryConfig]:
         """Initialize retry configurations for different endpoint patterns"""
         return {
@@ -228,14 +416,9 @@ class IntelligentRateLimiter:
             }
 
         # Get or create rate limit state
-        if key not in self.rate_limit_states:
-            self.rate_limit_states[key] = RateLimitState(
-                endpoint=endpoint,
-                tenant_id=tenant_id,
-                user_id=user_id
-            )
-
-        state = self.rate_limit_states[key]
+        state = self.rate_limit_states.get_or_create(
+            key, lambda: RateLimitState(endpoint=endpoint, tenant_id=tenant_id, user_id=user_id)
+        )
 
         # Check if currently rate limited
         if state.retry_after and state.retry_after > time.time():
@@ -267,15 +450,9 @@ class IntelligentRateLimiter:
                                    user_id: Optional[str] = None) -> None:
         """Record the result of a request for rate limit tracking"""
         key = self._get_rate_limit_key(endpoint, tenant_id, user_id)
-
-        if key not in self.rate_limit_states:
-            self.rate_limit_states[key] = RateLimitState(
-                endpoint=endpoint,
-                tenant_id=tenant_id,
-                user_id=user_id
-            )
-
-        state = self.rate_limit_states[key]
+        state = self.rate_limit_states.get_or_create(
+            key, lambda: RateLimitState(endpoint=endpoint, tenant_id=tenant_id, user_id=user_id)
+        )
         state.total_requests += 1
 
         if status_code == 429:  # Rate limited
@@ -400,28 +577,21 @@ class IntelligentRateLimiter:
 
         # Track usage patterns
         current_time = time.time()
-        if key not in self.usage_patterns:
-            self.usage_patterns[key] = []
-
-        self.usage_patterns[key].append(current_time)
-
-        # Keep only last 100 requests for pattern analysis
-        self.usage_patterns[key] = self.usage_patterns[key][-100:]
-
-        # Analyze request frequency
-        if len(self.usage_patterns[key]) >= 10:
-            recent_requests = [t for t in self.usage_patterns[key] if current_time - t < 60]  # Last minute
-
-            if len(recent_requests) >= 8:  # High frequency detected
-                # Calculate adaptive delay
-                frequency = len(recent_requests) / 60.0  # requests per second
-                if frequency > 0.5:  # More than 0.5 requests per second
-                    suggested_delay = min(2.0 / frequency, 10.0)  # Adaptive delay
-                    logger.debug("Predictive throttling applied",
-                               endpoint=endpoint,
-                               frequency=frequency,
-                               delay=suggested_delay)
-                    return suggested_delay
+        pattern = self.usage_patterns.get_or_create(key, UsagePattern)
+        pattern.record(current_time)
+
+        # Analyze request frequency, counting at most 100 requests as before
+        recent_requests = min(pattern.requests_in_window(current_time), 100)  # Last minute
+        if recent_requests >= 10:  # High frequency detected
+            # Calculate adaptive delay
+            frequency = recent_requests / 60.0  # requests per second
+            if frequency > 0.5:  # More than 0.5 requests per second
+                suggested_delay = min(2.0 / frequency, 10.0)  # Adaptive delay
+                logger.debug("Predictive throttling applied",
+                           endpoint=endpoint,
+                           frequency=frequency,
+                           delay=suggested_delay)
+                return suggested_delay
 
         return 0.0
 
@@ -445,8 +615,9 @@ class IntelligentRateLimiter:
             # Adaptive based on recent success rate
             key = self._get_rate_limit_key(endpoint, tenant_id, user_id)
             success_rate = 100.0
-            if key in self.rate_limit_states:
-                success_rate = self.rate_limit_states[key].success_rate
+            state = self.rate_limit_states.get(key)
+            if state:
+                success_rate = state.success_rate
 
             # More aggressive backoff for lower success rates
             multiplier = max(1.0, (100.0 - success_rate) / 50.0)
@@ -476,77 +647,74 @@ class IntelligentRateLimiter:
         if not self.config["circuit_breaker_enabled"]:
             return False
 
-        if key not in self.circuit_breakers:
-            return False
-
-        breaker = self.circuit_breakers[key]
-
-        if breaker["state"] == "open":
+        breaker = self.circuit_breakers.get(key)
+        if breaker is not None and breaker.state == "open":
             # Check if timeout has passed
-            if time.time() >= breaker["next_attempt"]:
-                breaker["state"] = "half_open"
-                breaker["test_requests"] = 0
+            if time.time() >= breaker.next_attempt:
+                breaker.state = "half_open"
+                breaker.test_requests = 0
                 logger.info("Circuit breaker transitioning to half-open", key=key)
+                # Other replicas hold off while this one probes
+                self._share_transition(key, "half_open", time.time() + self.config["circuit_breaker_timeout"])
                 return False
             return True
 
-        return False
+        # Another replica opened the breaker or is probing it
+        return bool(self.shared_breakers and self.shared_breakers.blocking_state(key))
 
     def _get_circuit_breaker_delay(self, key: str) -> float:
         """Get delay until circuit breaker can be retried"""
-        if key not in self.circuit_breakers:
-            return 0.0
+        breaker = self.circuit_breakers.get(key)
+        if breaker is not None and breaker.state == "open":
+            return max(0.0, breaker.next_attempt - time.time())
 
-        breaker = self.circuit_breakers[key]
-        if breaker["state"] == "open":
-            return max(0.0, breaker["next_attempt"] - time.time())
+        shared = self.shared_breakers.blocking_state(key) if self.shared_breakers else None
+        if shared:
+            return max(0.0, shared.next_attempt - time.time())
 
         return 0.0
 
+    def _share_transition(self, key: str, state: str, next_attempt: Optional[float] = None) -> None:
+        """Propagate a breaker transition to other replicas"""
+        if self.shared_breakers:
+            self.shared_breakers.share(key, state, next_attempt)
+
     def _update_circuit_breaker(self, key: str, success: bool, rate_limited: bool) -> None:
         """Update circuit breaker state based on request result"""
         if not self.config["circuit_breaker_enabled"]:
             return
 
-        if key not in self.circuit_breakers:
-            self.circuit_breakers[key] = {
-                "state": "closed",
-                "failure_count": 0,
-                "success_count": 0,
-                "last_failure": None,
-                "next_attempt": None,
-                "test_requests": 0
-            }
-
-        breaker = self.circuit_breakers[key]
+        breaker = self.circuit_breakers.get_or_create(key, EndpointCircuitBreaker)
 
         if success and not rate_limited:
-            breaker["success_count"] += 1
+            breaker.success_count += 1
 
             # Reset failure count on success (unless in half-open state testing)
-            if breaker["state"] == "closed":
-                breaker["failure_count"] = 0
-            elif breaker["state"] == "half_open":
-                breaker["test_requests"] += 1
-                if breaker["test_requests"] >= 3:  # 3 successful test requests
-                    breaker["state"] = "closed"
-                    breaker["failure_count"] = 0
+            if breaker.state == "closed":
+                breaker.failure_count = 0
+            elif breaker.state == "half_open":
+                breaker.test_requests += 1
+                if breaker.test_requests >= 3:  # 3 successful test requests
+                    breaker.state = "closed"
+                    breaker.failure_count = 0
                     logger.info("Circuit breaker closed", key=key)
+                    self._share_transition(key, "closed")
 
         else:
-            breaker["failure_count"] += 1
-            breaker["last_failure"] = time.time()
+            breaker.failure_count += 1
+            breaker.last_failure = time.time()
 
             # Open circuit breaker if threshold exceeded
             threshold = self.config["circuit_breaker_threshold"]
-            if breaker["state"] in ["closed", "half_open"] and breaker["failure_count"] >= threshold:
-                breaker["state"] = "open"
+            if breaker.state in ["closed", "half_open"] and breaker.failure_count >= threshold:
+                breaker.state = "open"
                 timeout = self.config["circuit_breaker_timeout"]
-                breaker["next_attempt"] = time.time() + timeout
+                breaker.next_attempt = time.time() + timeout
+                self._share_transition(key, "open", breaker.next_attempt)
 
                 logger.warning("Circuit breaker opened",
                              key=key,
-                             failure_count=breaker["failure_count"],
+                             failure_count=breaker.failure_count,
                              timeout=timeout)
 
     async def get_rate_limit_status(self, endpoint: Optional[str] = None) -> Dict[str, Any]:
@@ -571,7 +739,8 @@ class IntelligentRateLimiter:
             "total_endpoints": len(self.rate_limit_states),
             "total_requests": sum(s.total_requests for s in self.rate_limit_states.values()),
             "total_rate_limits": sum(s.total_rate_limits for s in self.rate_limit_states.values()),
-            "endpoints": []
+            "endpoints": [],
+            "memory": self.get_memory_usage()
         }
 
         for key, state in self.rate_limit_states.items():
@@ -584,16 +753,29 @@ class IntelligentRateLimiter:
 
         return summary
 
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """Get entry counts, evictions and approximate bytes of each state table"""
+        tables = {
+            table.name: table.memory_usage()
+            for table in (self.rate_limit_states, self.circuit_breakers, self.usage_patterns)
+        }
+        return {
+            "tables": tables,
+            "total_entries": sum(table["entries"] for table in tables.values()),
+            "total_bytes": sum(table["bytes"] for table in tables.values()),
+            "idle_ttl": self.config["state_idle_ttl"]
+        }
+
     def get_circuit_breaker_status(self) -> Dict[str, Any]:
         """Get circuit breaker status for all tracked endpoints"""
         status = {}
         for key, breaker in self.circuit_breakers.items():
             status[key] = {
-                "state": breaker["state"],
-                "failure_count": breaker["failure_count"],
-                "success_count": breaker["success_count"],
-                "last_failure": breaker["last_failure"],
-                "next_attempt": breaker["next_attempt"]
+                "state": breaker.state,
+                "failure_count": breaker.failure_count,
+                "success_count": breaker.success_count,
+                "last_failure": breaker.last_failure,
+                "next_attempt": breaker.next_attempt
             }
         return status
 
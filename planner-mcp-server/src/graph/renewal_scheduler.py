@@ -0,0 +1,223 @@
+"""
+Deadline-ordered renewal scheduler for webhook subscriptions
+
+Subscriptions are kept in a min-heap keyed by their renewal deadline
+(expiration minus the renewal buffer, pulled earlier by a random jitter so a
+fleet created together does not renew together). A single task sleeps until
+the earliest deadline, then renews everything that is due in parallel batches,
+checking the Graph rate limiter before each call. Failed renewals are retried
+with a delay instead of waiting for the next hourly scan.
+"""
+
+import os
+import time
+import heapq
+import random
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import structlog
+
+from ..models.graph_models import WebhookSubscription
+
+logger = structlog.get_logger(__name__)
+
+
+RenewCallback = Callable[[str], Awaitable[Any]]
+
+RENEWAL_ENDPOINT = "/subscriptions"
+
+
+class SubscriptionRenewalScheduler:
+    """Fires subscription renewals close to their deadlines"""
+
+    def __init__(
+        self,
+        renew_callback: RenewCallback,
+        rate_limiter: Any = None,
+        renewal_buffer: Optional[int] = None,
+        jitter_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        retry_delay: Optional[float] = None
+    ):
+        self.renew_callback = renew_callback
+        self.rate_limiter = rate_limiter
+        self.renewal_buffer = renewal_buffer if renewal_buffer is not None else int(
+            os.getenv("WEBHOOK_SUBSCRIPTION_RENEWAL_BUFFER", "86400")
+        )
+        self.jitter_seconds = jitter_seconds if jitter_seconds is not None else float(
+            os.getenv("WEBHOOK_RENEWAL_JITTER_SECONDS", "300")
+        )
+        self.batch_size = batch_size or int(os.getenv("WEBHOOK_RENEWAL_BATCH_SIZE", "10"))
+        self.retry_delay = retry_delay if retry_delay is not None else float(
+            os.getenv("WEBHOOK_RENEWAL_RETRY_DELAY", "300")
+        )
+
+        # Heap of (due_time, sequence, subscription_id, tenant_id); entries whose
+        # due time no longer matches _deadlines are stale and skipped when popped
+        self._heap: List[Tuple[float, int, str, Optional[str]]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._sequence = 0
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.stats = {
+            "renewals": 0,
+            "failed_renewals": 0,
+            "rate_limit_waits": 0,
+            "batches": 0
+        }
+
+    def schedule(self, subscription: WebhookSubscription) -> Optional[float]:
+        """
+        Schedule (or reschedule) renewal of a subscription
+
+        Returns:
+            Monotonic due time, or None if the subscription never expires
+        """
+        if not subscription.expiration_date_time:
+            self.unschedule(subscription.id)
+            return None
+
+        seconds_left = subscription.expiration_date_time.timestamp() - datetime.utcnow().timestamp()
+        delay = seconds_left - self.renewal_buffer - random.uniform(0, self.jitter_seconds)
+        return self._push(subscription.id, subscription.tenant_id, max(0.0, delay))
+
+    def schedule_retry(self, subscription_id: str, tenant_id: Optional[str] = None) -> float:
+        """Retry a failed renewal after the retry delay"""
+        return self._push(subscription_id, tenant_id, self.retry_delay)
+
+    def unschedule(self, subscription_id: str) -> None:
+        """Drop a subscription from the schedule"""
+        self._deadlines.pop(subscription_id, None)
+
+    def rebuild(self, subscriptions: List[WebhookSubscription]) -> int:
+        """Replace the schedule with the given subscriptions"""
+        self._heap = []
+        self._deadlines = {}
+        for subscription in subscriptions:
+            self.schedule(subscription)
+
+        logger.info("Subscription renewal schedule rebuilt", scheduled=len(self._deadlines))
+        return len(self._deadlines)
+
+    def pop_due(self, now: Optional[float] = None) -> List[Tuple[str, Optional[str]]]:
+        """Remove and return every subscription whose deadline has passed"""
+        now = now if now is not None else time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_time, _, subscription_id, tenant_id = heapq.heappop(self._heap)
+            if self._deadlines.get(subscription_id) != due_time:
+                continue
+            del self._deadlines[subscription_id]
+            due.append((subscription_id, tenant_id))
+        return due
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest live deadline"""
+        while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+    async def run(self) -> None:
+        """Sleep until the earliest deadline, then renew everything due"""
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                self._wakeup.clear()
+                wait_time = self.next_due_in()
+                if wait_time is None or wait_time > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=wait_time)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                await self.renew_due()
+
+            except asyncio.CancelledError:
+                logger.info("Subscription renewal scheduler cancelled")
+                break
+            except Exception as e:
+                logger.error("Error in subscription renewal scheduler", error=str(e))
+                await asyncio.sleep(1)
+
+    async def renew_due(self) -> int:
+        """Renew all due subscriptions in parallel batches"""
+        due = self.pop_due()
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            await asyncio.gather(*(
+                self._renew(subscription_id, tenant_id) for subscription_id, tenant_id in batch
+            ))
+            self.stats["batches"] += 1
+        return len(due)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics"""
+        return {
+            **self.stats,
+            "scheduled": len(self._deadlines),
+            "next_due_in": self.next_due_in(),
+            "batch_size": self.batch_size
+        }
+
+    # Private methods
+
+    def _push(self, subscription_id: str, tenant_id: Optional[str], delay: float) -> float:
+        """Add a deadline to the heap and wake the scheduler if it moved earlier"""
+        due_time = time.monotonic() + delay
+        self._sequence += 1
+        self._deadlines[subscription_id] = due_time
+        heapq.heappush(self._heap, (due_time, self._sequence, subscription_id, tenant_id))
+
+        if self._wakeup and self._heap[0][2] == subscription_id:
+            self._wakeup.set()
+        return due_time
+
+    async def _wait_for_rate_limit(self, tenant_id: Optional[str]) -> None:
+        """Wait until the Graph rate limiter allows a subscription call"""
+        if not self.rate_limiter:
+            return
+
+        rate_limit_check = await self.rate_limiter.check_rate_limit(
+            endpoint=RENEWAL_ENDPOINT,
+            tenant_id=tenant_id
+        )
+        if not rate_limit_check["allowed"] and rate_limit_check["delay"] > 0:
+            self.stats["rate_limit_waits"] += 1
+            logger.warning(
+                "Rate limit detected, delaying subscription renewal",
+                tenant_id=tenant_id,
+                delay=rate_limit_check["delay"],
+                reason=rate_limit_check["reason"]
+            )
+            await asyncio.sleep(rate_limit_check["delay"])
+
+    async def _renew(self, subscription_id: str, tenant_id: Optional[str]) -> None:
+        """Renew one subscription, scheduling a retry on failure"""
+        await self._wait_for_rate_limit(tenant_id)
+
+        try:
+            await self.renew_callback(subscription_id)
+            self.stats["renewals"] += 1
+            success = True
+
+        except Exception as e:
+            self.stats["failed_renewals"] += 1
+            success = False
+            logger.error(
+                "Failed to auto-renew subscription",
+                error=str(e),
+                subscription_id=subscription_id
+            )
+            if subscription_id not in self._deadlines:
+                self.schedule_retry(subscription_id, tenant_id)
+
+        if self.rate_limiter:
+            await self.rate_limiter.record_request_result(
+                endpoint=RENEWAL_ENDPOINT,
+                success=success,
+                tenant_id=tenant_id
+            )
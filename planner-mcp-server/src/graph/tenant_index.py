@@ -0,0 +1,164 @@
+"""
+Persistent user to tenant index
+
+Tenant discovery used to probe every configured tenant for a valid token,
+which could refresh tokens in each of them. Instead, the tenant of a user is
+written when the user logs in and whenever their token is refreshed: to
+Postgres (the source of truth, one row per user) and to Redis under the
+user_tenant:<user_id> key. A lookup is a Redis GET, falling back to a primary
+key lookup in Postgres that refills Redis.
+"""
+
+import os
+from typing import Any, Dict, Optional
+import structlog
+
+from ..cache import CacheService
+from ..database import Database
+
+logger = structlog.get_logger(__name__)
+
+
+class UserTenantIndex:
+    """User to tenant mapping in Postgres with a Redis read path"""
+
+    def __init__(self, cache_service: CacheService, database: Optional[Database] = None,
+                 ttl: Optional[int] = None):
+        self.cache_service = cache_service
+        self.database = database
+        self.key_prefix = "user_tenant:"
+        self.ttl = ttl or int(os.getenv("USER_TENANT_INDEX_TTL", str(86400 * 30)))
+
+        self._table_created = False
+
+        self.stats = {
+            "writes": 0,
+            "redis_hits": 0,
+            "database_hits": 0,
+            "misses": 0,
+            "errors": 0
+        }
+
+    async def record(self, user_id: str, tenant_id: str, source: str = "login") -> bool:
+        """
+        Write the tenant of a user
+
+        Failures are logged and counted; they never fail the login or refresh
+        that triggered the write.
+
+        Args:
+            user_id: User identifier
+            tenant_id: Tenant the user authenticated against
+            source: What triggered the write (login, refresh, discovery)
+
+        Returns:
+            True if every configured store was written
+        """
+        if not user_id or not tenant_id:
+            return False
+
+        written = True
+        if self.database:
+            try:
+                await self._ensure_table()
+                async with self.database._connection_pool.acquire() as conn:
+                    await conn.execute(
+                        """
+                        INSERT INTO user_tenant_index (user_id, tenant_id, source, updated_at)
+                        VALUES ($1, $2, $3, NOW())
+                        ON CONFLICT (user_id) DO UPDATE SET
+                            tenant_id = EXCLUDED.tenant_id,
+                            source = EXCLUDED.source,
+                            updated_at = EXCLUDED.updated_at
+                    """,
+                        user_id,
+                        tenant_id,
+                        source
+                    )
+            except Exception as e:
+                written = False
+                self.stats["errors"] += 1
+                logger.error("Failed to store user tenant mapping", user_id=user_id, error=str(e))
+
+        try:
+            await self.cache_service.set(self.key_prefix + user_id, tenant_id, ttl=self.ttl)
+        except Exception as e:
+            written = False
+            self.stats["errors"] += 1
+            logger.error("Failed to cache user tenant mapping", user_id=user_id, error=str(e))
+
+        self.stats["writes"] += 1
+        return written
+
+    async def lookup(self, user_id: str) -> Optional[str]:
+        """
+        Get the tenant of a user
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Tenant ID, or None if the user never logged in
+        """
+        try:
+            tenant_id = await self.cache_service.get(self.key_prefix + user_id)
+            if tenant_id:
+                self.stats["redis_hits"] += 1
+                return tenant_id
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error("Failed to read cached user tenant mapping", user_id=user_id, error=str(e))
+
+        if self.database:
+            try:
+                await self._ensure_table()
+                async with self.database._connection_pool.acquire() as conn:
+                    tenant_id = await conn.fetchval(
+                        "SELECT tenant_id FROM user_tenant_index WHERE user_id = $1", user_id
+                    )
+                if tenant_id:
+                    self.stats["database_hits"] += 1
+                    await self.cache_service.set(self.key_prefix + user_id, tenant_id, ttl=self.ttl)
+                    return tenant_id
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error("Failed to read user tenant mapping", user_id=user_id, error=str(e))
+
+        self.stats["misses"] += 1
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        return {
+            **self.stats,
+            "persistent": self.database is not None
+        }
+
+    # Private methods
+
+    async def _ensure_table(self) -> None:
+        """Ensure the user tenant index table exists"""
+        if self._table_created:
+            return
+
+        async with self.database._connection_pool.acquire() as conn:
+            await conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS user_tenant_index (
+                    user_id VARCHAR(255) PRIMARY KEY,
+                    tenant_id VARCHAR(255) NOT NULL,
+                    source VARCHAR(50),
+                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+                )
+            """
+            )
+
+            # Users of a tenant, e.g. when a tenant is removed
+            await conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_user_tenant_index_tenant
+                ON user_tenant_index(tenant_id)
+            """
+            )
+
+        self._table_created = True
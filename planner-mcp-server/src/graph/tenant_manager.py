@@ -6,6 +6,7 @@ Story 2.1 Task 4: Advanced multi-tenant management with comprehensive tenant iso
 import os
 import re
 import time
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
@@ -16,7 +17,9 @@ import structlog
 from ..models.graph_models import TenantContext
 from ..auth import AuthService
 from ..cache import CacheService
+from ..database import Database
 from .rate_limiter import IntelligentRateLimiter
+from .tenant_index import UserTenantIndex
 
 
 logger = structlog.get_logger(__name__)
@@ -142,7 +145,8 @@ class TenantManager:
     - Performance monitoring per tenant
     """
 
-    def __init__(self, cache_service: CacheService, rate_limiter: IntelligentRateLimiter):
+    def __init__(self, cache_service: CacheService, rate_limiter: IntelligentRateLimiter,
+                 database: Optional[Database] = None):
         """Initialize tenant manager"""
         self.cache_service = cache_service
         self.rate_limiter = rate_limiter
@@ -150,7 +154,14 @@ class TenantManager:
         # Tenant configurations
         self.tenant_configs: Dict[str, TenantConfiguration] = {}
         self.tenant_quotas: Dict[str, TenantQuota] = {}
-        self.auth_services: Dict[str, AuthService] = {}
+
+        # Auth services created on first use, least recently used ones dropped past the pool size
+        self.auth_services: "OrderedDict[str, AuthService]" = OrderedDict()
+        self.auth_service_pool_size = max(1, int(os.getenv("TENANT_AUTH_SERVICE_POOL_SIZE", "64")))
+        self.auth_service_evictions = 0
+
+        # User -> tenant mapping written at login and token refresh
+        self.user_tenant_index = UserTenantIndex(cache_service, database)
 
         # Security and isolation settings
         self.default_tenant_id = os.getenv("DEFAULT_TENANT_ID", "")
@@ -494,58 +505,51 @@ class TenantManager:
             raise
 
     async def get_auth_service(self, tenant_id: str) -> AuthService:
-        """Get tenant-specific authentication service"""
-        if tenant_id not in self.auth_services:
-            config = await self.get_tenant_config(tenant_id)
+        """Get tenant-specific authentication service, creating it on first use"""
+        auth_service = self.auth_services.get(tenant_id)
+        if auth_service is not None:
+            self.auth_services.move_to_end(tenant_id)
+            return auth_service
 
-            self.auth_services[tenant_id] = AuthService(
-                client_id=config.client_id,
-                client_secret=config.client_secret,
-                tenant_id=tenant_id,
-                cache_service=self.cache_service
-            )
+        config = await self.get_tenant_config(tenant_id)
+        auth_service = AuthService(
+            client_id=config.client_id,
+            client_secret=config.client_secret,
+            tenant_id=tenant_id,
+            cache_service=self.cache_service,
+            tenant_index=self.user_tenant_index
+        )
+        self.auth_services[tenant_id] = auth_service
+
+        while len(self.auth_services) > self.auth_service_pool_size:
+            evicted_tenant, _ = self.auth_services.popitem(last=False)
+            self.auth_service_evictions += 1
+            logger.debug("Auth service evicted", tenant_id=evicted_tenant)
 
-        return self.auth_services[tenant_id]
+        return auth_service
 
     async def discover_tenant_from_user(self, user_id: str) -> Optional[str]:
         """Discover tenant ID from user information"""
-        # Check cached tenant mapping
-        cached_tenant = await self.cache_service.get(f"user_tenant:{user_id}")
-        if cached_tenant:
-            return cached_tenant
-
-        # Try default tenant first
-        if self.default_tenant_id:
-            try:
-                auth_service = await self.get_auth_service(self.default_tenant_id)
-                token_info = await auth_service.get_token_info(user_id)
-                if token_info:
-                    tenant_id = token_info.get("tenant_id", self.default_tenant_id)
-
-                    # Cache the mapping
-                    await self.cache_service.set(f"user_tenant:{user_id}", tenant_id, ttl=3600)
+        # Mapping written at login and token refresh
+        tenant_id = await self.user_tenant_index.lookup(user_id)
+        if tenant_id:
+            return tenant_id
 
-                    return tenant_id
-            except Exception as e:
-                logger.debug("Default tenant check failed", user_id=user_id, error=str(e))
+        # Users who logged in before the index existed: stored tokens are kept per user
+        # and carry their tenant, so reading them through any one tenant is enough
+        probe_tenant_id = self.default_tenant_id or next(iter(self.tenant_configs), None)
+        if not probe_tenant_id:
+            return None
 
-        # Check all configured tenants
-        for tenant_id in self.tenant_configs:
-            try:
-                auth_service = await self.get_auth_service(tenant_id)
-                if await auth_service.has_valid_token(user_id):
-                    # Cache the mapping
-                    await self.cache_service.set(
-                        f"user_tenant:{user_id}", tenant_id, ttl=3600
-                    )
-                    return tenant_id
-            except Exception as e:
-                logger.debug(
-                    "Tenant discovery failed",
-                    tenant_id=tenant_id,
-                    user_id=user_id,
-                    error=str(e)
-                )
+        try:
+            auth_service = await self.get_auth_service(probe_tenant_id)
+            token_info = await auth_service.get_token_info(user_id)
+            if token_info:
+                tenant_id = token_info.get("tenant_id") or probe_tenant_id
+                await self.user_tenant_index.record(user_id, tenant_id, source="discovery")
+                return tenant_id
+        except Exception as e:
+            logger.debug("Tenant discovery failed", tenant_id=probe_tenant_id, user_id=user_id, error=str(e))
 
         return None
 
@@ -627,6 +631,12 @@ class TenantManager:
             "total_tenants": len(self.tenant_configs),
             "multi_tenant_enabled": self.multi_tenant_enabled,
             "isolation_enabled": self.tenant_isolation_enabled,
+            "auth_service_pool": {
+                "size": len(self.auth_services),
+                "max_size": self.auth_service_pool_size,
+                "evictions": self.auth_service_evictions
+            },
+            "user_tenant_index": self.user_tenant_index.get_stats(),
             "tenants": []
         }
 
@@ -653,7 +663,11 @@ class TenantManager:
 _tenant_manager: Optional[TenantManager] = None
 
 
-def get_tenant_manager(cache_service: CacheService = None, rate_limiter: IntelligentRateLimiter = None) -> TenantManager:
+def get_tenant_manager(
+    cache_service: CacheService = None,
+    rate_limiter: IntelligentRateLimiter = None,
+    database: Database = None
+) -> TenantManager:
     """Get or create global tenant manager instance"""
     global _tenant_manager
     if _tenant_manager is None:
@@ -664,5 +678,5 @@ def get_tenant_manager(cache_service: CacheService = None, rate_limiter: Intelli
             from .rate_limiter import get_rate_limiter
             rate_limiter = get_rate_limiter()
 
-        _tenant_manager = TenantManager(cache_service, rate_limiter)
+        _tenant_manager = TenantManager(cache_service, rate_limiter, database)
     return _tenant_manager
@@ -8,9 +8,12 @@ import hmac
 import hashlib
 import json
 import uuid
+import zlib
+import heapq
 import asyncio
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from dataclasses import asdict
 from urllib.parse import urljoin
 import structlog
@@ -26,9 +29,18 @@ from ..models.graph_models import (
 )
 from ..database import Database
 from ..cache import CacheService
+from .notification_stream import WebhookNotificationStream, NotificationStreamError
+from .notification_writer import NotificationBatchWriter
+from .cache_invalidation import WebhookCacheInvalidator
+from .renewal_scheduler import SubscriptionRenewalScheduler
+from .rate_limiter import get_rate_limiter
+from .concurrency_limiter import RequestPriority, graph_priority
 
 logger = structlog.get_logger(__name__)
 
+# How often a shard held full by deferred notifications is checked for room
+DEFERRED_POLL_INTERVAL = 0.05
+
 
 class WebhookValidationError(Exception):
     """Webhook validation error"""
@@ -50,7 +62,8 @@ class WebhookSubscriptionManager:
         self,
         database: Database,
         cache_service: CacheService,
-        graph_client: Any = None
+        graph_client: Any = None,
+        delta_manager: Any = None
     ):
         self.database = database
         self.cache_service = cache_service
@@ -66,13 +79,68 @@ class WebhookSubscriptionManager:
         self.notification_timeout = int(os.getenv("WEBHOOK_NOTIFICATION_TIMEOUT", "30"))
         self.signature_algorithm = os.getenv("WEBHOOK_SIGNATURE_ALGORITHM", "HMAC-SHA256")
 
+        # Notification worker pool configuration
+        self.worker_count = max(1, int(os.getenv("WEBHOOK_NOTIFICATION_PROCESSOR_WORKERS", "3")))
+        self.queue_max_size = int(os.getenv("WEBHOOK_NOTIFICATION_QUEUE_SIZE", "1000"))
+        self.enqueue_timeout = float(os.getenv("WEBHOOK_ENQUEUE_TIMEOUT", "5.0"))
+
+        # Durable ingestion through Redis Streams
+        self.stream_enabled = os.getenv("WEBHOOK_STREAM_ENABLED", "true").lower() == "true"
+        self.stream_read_count = int(os.getenv("WEBHOOK_STREAM_READ_COUNT", "100"))
+        self.stream_block_ms = int(os.getenv("WEBHOOK_STREAM_BLOCK_MS", "2000"))
+        self.stream_claim_idle_ms = int(os.getenv("WEBHOOK_STREAM_CLAIM_IDLE_MS", "300000"))
+        self.tenant_stream_max_length = int(os.getenv("WEBHOOK_TENANT_STREAM_MAX_LENGTH", "10000"))
+        self.cache_invalidation_enabled = os.getenv("WEBHOOK_CACHE_INVALIDATION_ENABLED", "true").lower() == "true"
+
         # In-memory storage for validation tokens and subscriptions
         self.validation_tokens: Dict[str, Dict[str, Any]] = {}
         self.subscriptions: Dict[str, WebhookSubscription] = {}
-        self.notification_queue: asyncio.Queue = asyncio.Queue()
 
-        # Background task for processing notifications
-        self._notification_processor_task = None
+        # One bounded queue per worker; notifications are sharded by resource so
+        # changes to the same resource are always handled in arrival order
+        shard_size = max(1, self.queue_max_size // self.worker_count)
+        self.notification_shards: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=shard_size) for _ in range(self.worker_count)
+        ]
+
+        # Delayed retry queue: heap of (due_time, sequence, attempt, notification)
+        self.retry_queue: List[Tuple[float, int, int, WebhookNotification]] = []
+        self._retry_sequence = 0
+        self._retry_wakeup: Optional[asyncio.Event] = None
+
+        # Notifications parked behind a pending retry for the same resource; they
+        # count against their shard's capacity so a stuck resource can't grow them
+        # past the queue limit
+        self._deferred_notifications: Dict[str, Deque[WebhookNotification]] = {}
+        self._deferred_counts: List[int] = [0] * self.worker_count
+
+        # Buffered writer for notification rows and subscription counters
+        self.notification_writer = NotificationBatchWriter(database)
+
+        # Targeted invalidation of cached Graph responses touched by a change
+        self.cache_invalidator = WebhookCacheInvalidator(
+            cache_service,
+            database=database,
+            graph_client=graph_client,
+            delta_manager=delta_manager
+        )
+
+        # Deadline-ordered subscription renewals, rate limited like other Graph calls
+        self.renewal_scheduler = SubscriptionRenewalScheduler(
+            self._renew_scheduled_subscription,
+            rate_limiter=get_rate_limiter(),
+            renewal_buffer=self.renewal_buffer
+        )
+
+        # Stream state; falls back to in-process queues when Redis Streams are unavailable
+        self.notification_stream: Optional[WebhookNotificationStream] = None
+        self._stream_inflight_ids: set = set()
+
+        # Background tasks for processing notifications
+        self._worker_tasks: List[asyncio.Task] = []
+        self._retry_scheduler_task = None
+        self._stream_consumer_task = None
+        self._stream_reclaimer_task = None
         self._subscription_renewal_task = None
 
     async def initialize(self) -> None:
@@ -82,9 +150,9 @@ class WebhookSubscriptionManager:
             await self._load_subscriptions_from_database()
 
             # Start background tasks
-            self._notification_processor_task = asyncio.create_task(
-                self._process_notifications()
-            )
+            await self.notification_writer.start()
+            self._start_notification_workers()
+            await self._start_notification_stream()
             self._subscription_renewal_task = asyncio.create_task(
                 self._renewal_monitor()
             )
@@ -99,18 +167,25 @@ class WebhookSubscriptionManager:
         """Shutdown webhook manager"""
         try:
             # Cancel background tasks
-            if self._notification_processor_task:
-                self._notification_processor_task.cancel()
-
-            if self._subscription_renewal_task:
-                self._subscription_renewal_task.cancel()
+            background_tasks = [
+                task for task in [
+                    *self._worker_tasks,
+                    self._retry_scheduler_task,
+                    self._stream_consumer_task,
+                    self._stream_reclaimer_task,
+                    self._subscription_renewal_task
+                ]
+                if task
+            ]
+            for task in background_tasks:
+                task.cancel()
 
             # Wait for tasks to complete
-            await asyncio.gather(
-                self._notification_processor_task,
-                self._subscription_renewal_task,
-                return_exceptions=True
-            )
+            await asyncio.gather(*background_tasks, return_exceptions=True)
+            self._worker_tasks = []
+
+            # Persist whatever is still buffered
+            await self.notification_writer.stop()
 
             logger.info("Webhook subscription manager shutdown completed")
 
@@ -189,6 +264,7 @@ class WebhookSubscriptionManager:
             # Store subscription
             self.subscriptions[subscription.id] = subscription
             await self._store_subscription_in_database(subscription)
+            self.renewal_scheduler.schedule(subscription)
 
             # Cache subscription for quick lookup
             await self.cache_service.set(
@@ -307,13 +383,16 @@ class WebhookSubscriptionManager:
             body = await request.body()
             payload = json.loads(body.decode("utf-8"))
 
+            # Make sure workers are running before applying backpressure
+            self._start_notification_workers()
+
             # Process notifications in background
             for notification_data in payload["value"]:
                 notification = self._create_webhook_notification(notification_data)
-                await self.notification_queue.put(notification)
-
-            # Schedule background processing
-            background_tasks.add_task(self._ensure_notification_processing)
+                if self.notification_stream:
+                    await self._publish_to_stream(notification)
+                else:
+                    await self.enqueue_notification(notification)
 
             return {
                 "success": True,
@@ -330,6 +409,52 @@ class WebhookSubscriptionManager:
                 detail="Internal server error"
             )
 
+    async def enqueue_notification(self, notification: WebhookNotification) -> None:
+        """
+        Hand a notification to the worker responsible for its resource
+
+        Blocks for at most ``enqueue_timeout`` seconds when the shard is full
+        (queued plus deferred notifications) and then rejects the notification
+        with 503 so Microsoft Graph redelivers it later instead of us buffering
+        an unbounded backlog.
+
+        Args:
+            notification: Notification to enqueue
+        """
+        shard_index = self._get_shard_index(notification)
+        shard = self.notification_shards[shard_index]
+        try:
+            await asyncio.wait_for(self._put_in_shard(shard_index, notification), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Notification queue full, rejecting webhook delivery",
+                subscription_id=notification.subscription_id,
+                resource=notification.resource,
+                queue_size=shard.qsize(),
+                deferred=self._deferred_counts[shard_index]
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Notification queue is full",
+                headers={"Retry-After": str(max(1, int(self.enqueue_timeout)))}
+            )
+
+    async def _publish_to_stream(self, notification: WebhookNotification) -> None:
+        """Durably record a notification, answering 503 if Redis rejects it"""
+        try:
+            await self.notification_stream.publish(notification)
+        except NotificationStreamError as e:
+            logger.error(
+                "Failed to persist webhook notification",
+                error=str(e),
+                subscription_id=notification.subscription_id
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Notification stream unavailable",
+                headers={"Retry-After": str(max(1, int(self.enqueue_timeout)))}
+            )
+
     async def renew_subscription(
         self,
         subscription_id: str,
@@ -366,6 +491,7 @@ class WebhookSubscriptionManager:
 
             # Update in database
             await self._store_subscription_in_database(subscription)
+            self.renewal_scheduler.schedule(subscription)
 
             # Update cache
             await self.cache_service.set(
@@ -407,6 +533,7 @@ class WebhookSubscriptionManager:
 
             # Remove from local storage
             self.subscriptions.pop(subscription_id, None)
+            self.renewal_scheduler.unschedule(subscription_id)
 
             # Remove from database
             await self._delete_subscription_from_database(subscription_id)
@@ -476,15 +603,24 @@ class WebhookSubscriptionManager:
                 if s.is_expired()
             ])
 
-            queue_size = self.notification_queue.qsize()
+            queue_size = sum(shard.qsize() for shard in self.notification_shards)
+            running_workers = len([task for task in self._worker_tasks if not task.done()])
 
             return {
                 "status": "healthy",
                 "active_subscriptions": active_subscriptions,
                 "expired_subscriptions": expired_subscriptions,
                 "notification_queue_size": queue_size,
-                "processor_running": self._notification_processor_task and not self._notification_processor_task.done(),
+                "notification_queue_capacity": sum(shard.maxsize for shard in self.notification_shards),
+                "retry_queue_size": len(self.retry_queue),
+                "deferred_notifications": sum(self._deferred_counts),
+                "workers_running": running_workers,
+                "processor_running": running_workers == self.worker_count,
+                "stream": await self.notification_stream.get_stats() if self.notification_stream else None,
+                "persistence": self.notification_writer.get_stats(),
+                "cache_invalidation": self.cache_invalidator.get_stats(),
                 "renewal_monitor_running": self._subscription_renewal_task and not self._subscription_renewal_task.done(),
+                "renewal_schedule": self.renewal_scheduler.get_stats(),
                 "timestamp": datetime.utcnow().isoformat()
             }
 
@@ -576,69 +712,257 @@ class WebhookSubscriptionManager:
         except (ValueError, AttributeError):
             return None
 
-    async def _process_notifications(self) -> None:
-        """Background task to process webhook notifications"""
+    def _get_resource_key(self, notification: WebhookNotification) -> str:
+        """Get the ordering key for a notification (the changed resource)"""
+        resource_data = notification.resource_data or {}
+        return resource_data.get("id") or notification.resource.lower()
+
+    def _get_shard_index(self, notification: WebhookNotification) -> int:
+        """Map a notification to a worker shard by its resource key"""
+        key = self._get_resource_key(notification)
+        return zlib.crc32(key.encode("utf-8")) % self.worker_count
+
+    def _start_notification_workers(self) -> None:
+        """Start (or restart) notification workers and the retry scheduler"""
+        if self._retry_wakeup is None:
+            self._retry_wakeup = asyncio.Event()
+
+        if len(self._worker_tasks) != self.worker_count:
+            self._worker_tasks = [None] * self.worker_count
+
+        for index, task in enumerate(self._worker_tasks):
+            if task is None or task.done():
+                self._worker_tasks[index] = asyncio.create_task(
+                    self._notification_worker(index)
+                )
+
+        if not self._retry_scheduler_task or self._retry_scheduler_task.done():
+            self._retry_scheduler_task = asyncio.create_task(self._retry_scheduler())
+
+    async def _notification_worker(self, shard_index: int) -> None:
+        """Background worker draining one notification shard"""
+        shard = self.notification_shards[shard_index]
         while True:
             try:
-                # Get notification from queue with timeout
-                notification = await asyncio.wait_for(
-                    self.notification_queue.get(),
-                    timeout=10.0
+                notification, attempt = await shard.get()
+                try:
+                    await self._run_notification(notification, attempt)
+                finally:
+                    shard.task_done()
+
+            except asyncio.CancelledError:
+                logger.info("Notification worker cancelled", shard=shard_index)
+                break
+            except Exception as e:
+                logger.error("Error in notification worker", error=str(e), shard=shard_index)
+
+    async def _put_in_shard(self, shard_index: int, notification: WebhookNotification) -> None:
+        """Queue a new notification once its shard has room for queued plus deferred entries"""
+        shard = self.notification_shards[shard_index]
+        while self._deferred_counts[shard_index] and \
+                shard.qsize() + self._deferred_counts[shard_index] >= shard.maxsize:
+            await asyncio.sleep(DEFERRED_POLL_INTERVAL)
+        await shard.put((notification, 0))
+
+    async def _run_notification(self, notification: WebhookNotification, attempt: int) -> None:
+        """Process a notification while preserving per-resource ordering"""
+        key = self._get_resource_key(notification)
+        shard_index = self._get_shard_index(notification)
+
+        # A previous change to this resource is waiting for a retry; keep order
+        if attempt == 0 and key in self._deferred_notifications:
+            self._deferred_notifications[key].append(notification)
+            self._deferred_counts[shard_index] += 1
+            return
+
+        if not await self._attempt_notification(notification, attempt):
+            return
+
+        # Resource is unblocked, replay changes that arrived while retrying
+        pending = self._deferred_notifications.pop(key, None)
+        while pending:
+            next_notification = pending.popleft()
+            self._deferred_counts[shard_index] -= 1
+            if not await self._attempt_notification(next_notification, 0):
+                self._deferred_notifications[key].extend(pending)
+                return
+
+    async def _attempt_notification(self, notification: WebhookNotification, attempt: int) -> bool:
+        """
+        Make one processing attempt for a notification
+
+        Returns:
+            bool: False if the notification was scheduled for a delayed retry
+        """
+        try:
+            await self._handle_notification(notification)
+
+            # Mark as processed; stream entries are acknowledged once persisted
+            notification.processed = True
+            await self.notification_writer.add_notification(
+                notification,
+                on_persisted=self._acknowledge_notification,
+                on_dropped=self._release_notification
+            )
+
+            logger.info(
+                "Webhook notification processed successfully",
+                subscription_id=notification.subscription_id,
+                change_type=notification.change_type,
+                resource=notification.resource,
+                attempt=attempt + 1
+            )
+            return True
+
+        except Exception as e:
+            notification.processing_error = str(e)
+
+            if attempt < self.retry_attempts - 1:
+                wait_time = self.retry_delay * (2 ** attempt)
+                logger.warning(
+                    f"Notification processing failed, retrying in {wait_time}s",
+                    error=str(e),
+                    attempt=attempt + 1,
+                    subscription_id=notification.subscription_id
                 )
+                self._schedule_retry(notification, attempt + 1, wait_time)
+                return False
+
+            logger.error(
+                "Notification processing failed after all retries",
+                error=str(e),
+                subscription_id=notification.subscription_id
+            )
 
-                await self._handle_notification_with_retry(notification)
-                self.notification_queue.task_done()
+            # Store failed notification for manual review
+            await self.notification_writer.add_notification(
+                notification,
+                on_persisted=self._acknowledge_notification,
+                on_dropped=self._release_notification
+            )
+            return True
+
+    def _schedule_retry(self, notification: WebhookNotification, attempt: int, delay: float) -> None:
+        """Put a notification on the delayed retry queue"""
+        key = self._get_resource_key(notification)
+        self._deferred_notifications.setdefault(key, deque())
+
+        loop = asyncio.get_running_loop()
+        self._retry_sequence += 1
+        heapq.heappush(
+            self.retry_queue,
+            (loop.time() + delay, self._retry_sequence, attempt, notification)
+        )
+        if self._retry_wakeup:
+            self._retry_wakeup.set()
+
+    async def _retry_scheduler(self) -> None:
+        """Background task re-enqueuing notifications whose retry delay expired"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                self._retry_wakeup.clear()
+
+                while self.retry_queue and self.retry_queue[0][0] <= loop.time():
+                    _, _, attempt, notification = heapq.heappop(self.retry_queue)
+                    shard = self.notification_shards[self._get_shard_index(notification)]
+                    await shard.put((notification, attempt))
+
+                timeout = None
+                if self.retry_queue:
+                    timeout = max(0.0, self.retry_queue[0][0] - loop.time())
+
+                try:
+                    await asyncio.wait_for(self._retry_wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
 
-            except asyncio.TimeoutError:
-                # Normal timeout, continue processing
-                continue
             except asyncio.CancelledError:
-                logger.info("Notification processor task cancelled")
+                logger.info("Notification retry scheduler cancelled")
                 break
             except Exception as e:
-                logger.error("Error in notification processor", error=str(e))
+                logger.error("Error in notification retry scheduler", error=str(e))
                 await asyncio.sleep(1)
 
-    async def _handle_notification_with_retry(self, notification: WebhookNotification) -> None:
-        """Handle notification with retry logic"""
-        for attempt in range(self.retry_attempts):
+    async def _start_notification_stream(self) -> None:
+        """Attach to the Redis notification stream and start its consumers"""
+        if not self.stream_enabled:
+            return
+
+        stream = WebhookNotificationStream(self.cache_service)
+        if not await stream.initialize():
+            logger.warning("Notification stream unavailable, using in-process queues only")
+            return
+
+        self.notification_stream = stream
+        self._stream_consumer_task = asyncio.create_task(self._stream_consumer())
+        self._stream_reclaimer_task = asyncio.create_task(self._stream_reclaimer())
+
+    async def _dispatch_stream_notifications(self, notifications: List[WebhookNotification]) -> None:
+        """Hand stream entries to the shard workers, waiting while shards are full"""
+        for notification in notifications:
+            if notification.stream_entry_id in self._stream_inflight_ids:
+                continue
+            self._stream_inflight_ids.add(notification.stream_entry_id)
+
+            # Rebind tenant context which is not carried across replicas
+            if not notification.tenant_id:
+                subscription = self.subscriptions.get(notification.subscription_id)
+                notification.tenant_id = subscription.tenant_id if subscription else None
+
+            await self._put_in_shard(self._get_shard_index(notification), notification)
+
+    async def _stream_consumer(self) -> None:
+        """Background task reading new stream entries for this replica"""
+        while True:
             try:
-                await self._handle_notification(notification)
+                notifications = await self.notification_stream.read(
+                    count=self.stream_read_count,
+                    block_ms=self.stream_block_ms
+                )
+                if not notifications:
+                    await asyncio.sleep(0.1)
+                    continue
 
-                # Mark as processed
-                notification.processed = True
-                await self._store_notification_in_database(notification)
+                await self._dispatch_stream_notifications(notifications)
 
-                logger.info(
-                    "Webhook notification processed successfully",
-                    subscription_id=notification.subscription_id,
-                    change_type=notification.change_type,
-                    resource=notification.resource
+            except asyncio.CancelledError:
+                logger.info("Notification stream consumer cancelled")
+                break
+            except Exception as e:
+                logger.error("Error in notification stream consumer", error=str(e))
+                await asyncio.sleep(1)
+
+    async def _stream_reclaimer(self) -> None:
+        """Background task taking over entries left pending by dead consumers"""
+        interval = max(1.0, self.stream_claim_idle_ms / 2000)
+        while True:
+            try:
+                await asyncio.sleep(interval)
+
+                notifications = await self.notification_stream.reclaim_stale(
+                    self.stream_claim_idle_ms,
+                    count=self.stream_read_count
                 )
-                return
+                await self._dispatch_stream_notifications(notifications)
 
+            except asyncio.CancelledError:
+                logger.info("Notification stream reclaimer cancelled")
+                break
             except Exception as e:
-                notification.processing_error = str(e)
-
-                if attempt < self.retry_attempts - 1:
-                    # Wait before retry with exponential backoff
-                    wait_time = self.retry_delay * (2 ** attempt)
-                    logger.warning(
-                        f"Notification processing failed, retrying in {wait_time}s",
-                        error=str(e),
-                        attempt=attempt + 1,
-                        subscription_id=notification.subscription_id
-                    )
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(
-                        "Notification processing failed after all retries",
-                        error=str(e),
-                        subscription_id=notification.subscription_id
-                    )
+                logger.error("Error in notification stream reclaimer", error=str(e))
 
-                    # Store failed notification for manual review
-                    await self._store_notification_in_database(notification)
+    async def _acknowledge_notification(self, notification: WebhookNotification) -> None:
+        """Acknowledge a stream-backed notification once it is finished"""
+        if not notification.stream_entry_id or not self.notification_stream:
+            return
+        await self.notification_stream.acknowledge(notification)
+        self._stream_inflight_ids.discard(notification.stream_entry_id)
+
+    async def _release_notification(self, notification: WebhookNotification) -> None:
+        """Leave an unpersisted stream entry pending so the reclaimer redelivers it"""
+        if notification.stream_entry_id:
+            self._stream_inflight_ids.discard(notification.stream_entry_id)
 
     async def _handle_notification(self, notification: WebhookNotification) -> None:
         """Handle individual notification"""
@@ -648,9 +972,8 @@ class WebhookSubscriptionManager:
             if not subscription:
                 raise ValueError(f"Subscription {notification.subscription_id} not found")
 
-            # Update subscription statistics
-            subscription.update_notification_stats()
-            await self._store_subscription_in_database(subscription)
+            # Update subscription statistics (persisted in batches)
+            self.notification_writer.record_subscription_notification(subscription)
 
             # Process based on change type and resource
             if "planner/plans" in notification.resource:
@@ -687,11 +1010,11 @@ class WebhookSubscriptionManager:
             tenant_id=subscription.tenant_id
         )
 
+        if self.cache_invalidation_enabled:
+            await self.cache_invalidator.handle_plan_change(notification, subscription)
+
         # Store notification for processing by other components
-        await self.cache_service.lpush(
-            f"plan_notifications:{subscription.tenant_id}",
-            asdict(notification)
-        )
+        await self._publish_change(f"plan_notifications:{subscription.tenant_id}", notification)
 
     async def _handle_planner_task_notification(
         self,
@@ -706,11 +1029,11 @@ class WebhookSubscriptionManager:
             tenant_id=subscription.tenant_id
         )
 
+        if self.cache_invalidation_enabled:
+            await self.cache_invalidator.handle_task_change(notification, subscription)
+
         # Store notification for processing by other components
-        await self.cache_service.lpush(
-            f"task_notifications:{subscription.tenant_id}",
-            asdict(notification)
-        )
+        await self._publish_change(f"task_notifications:{subscription.tenant_id}", notification)
 
     async def _handle_group_notification(
         self,
@@ -726,48 +1049,28 @@ class WebhookSubscriptionManager:
         )
 
         # Store notification for processing by other components
-        await self.cache_service.lpush(
-            f"group_notifications:{subscription.tenant_id}",
-            asdict(notification)
+        await self._publish_change(f"group_notifications:{subscription.tenant_id}", notification)
+
+    async def _publish_change(self, stream: str, notification: WebhookNotification) -> None:
+        """Publish a processed change to a capped per-tenant stream for other components"""
+        await self.cache_service.stream_add(
+            stream,
+            WebhookNotificationStream.serialize(notification),
+            maxlen=self.tenant_stream_max_length
         )
 
     async def _renewal_monitor(self) -> None:
-        """Background task to monitor and renew expiring subscriptions"""
-        while True:
-            try:
-                # Check every hour
-                await asyncio.sleep(3600)
-
-                # Find subscriptions that need renewal
-                buffer_hours = self.renewal_buffer // 3600
-                expiring_subscriptions = [
-                    subscription for subscription in self.subscriptions.values()
-                    if subscription.needs_renewal(buffer_hours)
-                ]
+        """Background task renewing subscriptions as their deadlines come up"""
+        await self.renewal_scheduler.run()
 
-                # Renew expiring subscriptions
-                for subscription in expiring_subscriptions:
-                    try:
-                        await self.renew_subscription(subscription.id)
-                    except Exception as e:
-                        logger.error(
-                            "Failed to auto-renew subscription",
-                            error=str(e),
-                            subscription_id=subscription.id
-                        )
-
-            except asyncio.CancelledError:
-                logger.info("Subscription renewal monitor cancelled")
-                break
-            except Exception as e:
-                logger.error("Error in subscription renewal monitor", error=str(e))
-
-    async def _ensure_notification_processing(self) -> None:
-        """Ensure notification processing task is running"""
-        if not self._notification_processor_task or self._notification_processor_task.done():
-            self._notification_processor_task = asyncio.create_task(
-                self._process_notifications()
-            )
+    async def _renew_scheduled_subscription(self, subscription_id: str) -> None:
+        """Renewal callback for the scheduler; skips subscriptions deleted meanwhile"""
+        if subscription_id not in self.subscriptions:
+            logger.info("Skipping renewal of removed subscription", subscription_id=subscription_id)
+            return
+        # Scheduled renewals have hours of slack; let interactive calls go first
+        with graph_priority(RequestPriority.MAINTENANCE):
+            await self.renew_subscription(subscription_id)
 
     # Microsoft Graph API integration methods
 
@@ -822,20 +1125,21 @@ class WebhookSubscriptionManager:
     # Database methods
 
     async def _load_subscriptions_from_database(self) -> None:
-        """Load existing subscriptions from database"""
+        """Load existing subscriptions from database and rebuild the renewal schedule"""
         try:
             query = """
-            SELECT subscription_data FROM webhook_subscriptions
+            SELECT subscription_data, expiration_date_time FROM webhook_subscriptions
             WHERE expiration_date_time > NOW()
             """
 
-            rows = await self.database.fetch_all(query)
+            async with self.database._connection_pool.acquire() as conn:
+                rows = await conn.fetch(query)
 
             for row in rows:
-                subscription_data = row["subscription_data"]
-                subscription = WebhookSubscription(**subscription_data)
+                subscription = self._subscription_from_row(row)
                 self.subscriptions[subscription.id] = subscription
 
+            self.renewal_scheduler.rebuild(list(self.subscriptions.values()))
             logger.info(f"Loaded {len(rows)} subscriptions from database")
 
         except Exception as e:
@@ -848,15 +1152,15 @@ class WebhookSubscriptionManager:
         """Load specific subscription from database"""
         try:
             query = """
-            SELECT subscription_data FROM webhook_subscriptions
-            WHERE subscription_id = :subscription_id
+            SELECT subscription_data, expiration_date_time FROM webhook_subscriptions
+            WHERE subscription_id = $1
             """
 
-            row = await self.database.fetch_one(query, {"subscription_id": subscription_id})
+            async with self.database._connection_pool.acquire() as conn:
+                row = await conn.fetchrow(query, subscription_id)
 
             if row:
-                subscription_data = row["subscription_data"]
-                return WebhookSubscription(**subscription_data)
+                return self._subscription_from_row(row)
 
             return None
 
@@ -868,33 +1172,67 @@ class WebhookSubscriptionManager:
             )
             return None
 
+    def _subscription_from_row(self, row: Any) -> WebhookSubscription:
+        """Build a subscription from a webhook_subscriptions row"""
+        data = row["subscription_data"]
+        if isinstance(data, str):
+            data = json.loads(data)
+        subscription = WebhookSubscription(**data)
+
+        # The JSON copy stores datetimes as strings
+        for name in ("created_at", "last_notification"):
+            value = getattr(subscription, name)
+            if isinstance(value, str):
+                setattr(subscription, name, self._parse_utc_datetime(value))
+
+        # The column is authoritative for the expiration
+        expiration = row["expiration_date_time"] or subscription.expiration_date_time
+        subscription.expiration_date_time = self._parse_utc_datetime(expiration)
+        return subscription
+
+    @staticmethod
+    def _parse_utc_datetime(value: Any) -> Any:
+        """Parse an ISO string or aware datetime into a naive UTC datetime"""
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if isinstance(value, datetime) and value.tzinfo:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
     async def _store_subscription_in_database(self, subscription: WebhookSubscription) -> None:
         """Store subscription in database"""
         try:
             query = """
             INSERT INTO webhook_subscriptions (
-                subscription_id, tenant_id, user_id, resource,
-                expiration_date_time, subscription_data, created_at, updated_at
-            ) VALUES (
-                :subscription_id, :tenant_id, :user_id, :resource,
-                :expiration_date_time, :subscription_data, :created_at, :updated_at
-            )
+                id, subscription_id, tenant_id, user_id, resource, notification_url,
+                change_types, client_state, expiration_date_time, include_resource_data,
+                notification_count, last_notification, subscription_data, created_at, updated_at
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
             ON CONFLICT (subscription_id) DO UPDATE SET
                 expiration_date_time = EXCLUDED.expiration_date_time,
                 subscription_data = EXCLUDED.subscription_data,
                 updated_at = EXCLUDED.updated_at
             """
 
-            await self.database.execute(query, {
-                "subscription_id": subscription.id,
-                "tenant_id": subscription.tenant_id,
-                "user_id": subscription.user_id,
-                "resource": subscription.resource,
-                "expiration_date_time": subscription.expiration_date_time,
-                "subscription_data": asdict(subscription),
-                "created_at": subscription.created_at,
-                "updated_at": datetime.utcnow()
-            })
+            async with self.database._connection_pool.acquire() as conn:
+                await conn.execute(
+                    query,
+                    uuid.uuid4(),
+                    subscription.id,
+                    subscription.tenant_id,
+                    subscription.user_id or "",
+                    subscription.resource,
+                    subscription.notification_url,
+                    json.dumps(subscription.change_types),
+                    subscription.client_state,
+                    subscription.expiration_date_time,
+                    subscription.include_resource_data,
+                    subscription.notification_count,
+                    subscription.last_notification,
+                    json.dumps(asdict(subscription), default=str),
+                    subscription.created_at,
+                    datetime.utcnow()
+                )
 
         except Exception as e:
             logger.error(
@@ -907,8 +1245,9 @@ class WebhookSubscriptionManager:
     async def _delete_subscription_from_database(self, subscription_id: str) -> None:
         """Delete subscription from database"""
         try:
-            query = "DELETE FROM webhook_subscriptions WHERE subscription_id = :subscription_id"
-            await self.database.execute(query, {"subscription_id": subscription_id})
+            query = "DELETE FROM webhook_subscriptions WHERE subscription_id = $1"
+            async with self.database._connection_pool.acquire() as conn:
+                await conn.execute(query, subscription_id)
 
         except Exception as e:
             logger.error(
@@ -918,37 +1257,6 @@ class WebhookSubscriptionManager:
             )
             raise
 
-    async def _store_notification_in_database(self, notification: WebhookNotification) -> None:
-        """Store webhook notification in database"""
-        try:
-            query = """
-            INSERT INTO webhook_notifications (
-                notification_id, subscription_id, tenant_id, change_type,
-                resource, notification_data, received_at, processed
-            ) VALUES (
-                :notification_id, :subscription_id, :tenant_id, :change_type,
-                :resource, :notification_data, :received_at, :processed
-            )
-            """
-
-            await self.database.execute(query, {
-                "notification_id": str(uuid.uuid4()),
-                "subscription_id": notification.subscription_id,
-                "tenant_id": notification.tenant_id,
-                "change_type": notification.change_type,
-                "resource": notification.resource,
-                "notification_data": asdict(notification),
-                "received_at": notification.received_at,
-                "processed": notification.processed
-            })
-
-        except Exception as e:
-            logger.error(
-                "Failed to store notification in database",
-                error=str(e),
-                subscription_id=notification.subscription_id
-            )
-
 
 # FastAPI router for webhook endpoints
 def create_webhook_router(webhook_manager: WebhookSubscriptionManager) -> Any:
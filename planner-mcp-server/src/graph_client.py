@@ -16,6 +16,10 @@ from .cache import CacheService
 
 logger = structlog.get_logger(__name__)
 
+def graph_cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build the cache key used for cached Graph GET responses"""
+    return f"graph_api:{endpoint}:{json.dumps(params or {}, sort_keys=True)}"
+
 class GraphAPIError(Exception):
     """Graph API operation error"""
     pass
@@ -64,7 +68,7 @@ class GraphAPIClient:
 
             # Check cache for GET requests
             if method == "GET" and use_cache:
-                cache_key = f"graph_api:{endpoint}:{json.dumps(params or {}, sort_keys=True)}"
+                cache_key = graph_cache_key(endpoint, params)
                 cached_result = await self.cache_service.get(cache_key)
                 if cached_result:
                     logger.debug("Returning cached result", endpoint=endpoint)
@@ -89,7 +93,7 @@ class GraphAPIClient:
 
             # Cache successful GET requests
             if method == "GET" and use_cache and result:
-                cache_key = f"graph_api:{endpoint}:{json.dumps(params or {}, sort_keys=True)}"
+                cache_key = graph_cache_key(endpoint, params)
                 await self.cache_service.set(cache_key, result, ttl=cache_ttl)
 
             # Update rate limiting counter
@@ -21,6 +21,13 @@ from .graph_client import GraphAPIClient
 from .tools import ToolRegistry, Tool, ToolResult
 from .cache import CacheService
 from .graph.webhooks import WebhookSubscriptionManager, create_webhook_router
+from .graph.rate_limiter import get_rate_limiter
+from .graph.permissions import get_permission_validator
+from .graph.permission_audit import PermissionAuditSink
+from .graph.tenant_index import UserTenantIndex
+from .utils.error_handler import get_error_handler
+from .utils.performance_monitor import get_performance_monitor
+from .utils.shared_circuit_breaker import SharedCircuitBreaker
 
 # Configure structured logging
 structlog.configure(
@@ -39,11 +46,14 @@ graph_client: GraphAPIClient = None
 cache_service: CacheService = None
 tool_registry: ToolRegistry = None
 webhook_manager: WebhookSubscriptionManager = None
+shared_breakers: List[SharedCircuitBreaker] = []
+permission_audit_sink: PermissionAuditSink = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
-    global database, auth_service, graph_client, cache_service, tool_registry, webhook_manager
+    global database, auth_service, graph_client, cache_service, tool_registry, webhook_manager, shared_breakers
+    global permission_audit_sink
 
     try:
         # Initialize database
@@ -64,7 +74,8 @@ async def lifespan(app: FastAPI):
             client_id=os.getenv("MICROSOFT_CLIENT_ID"),
             client_secret=os.getenv("MICROSOFT_CLIENT_SECRET"),
             tenant_id=os.getenv("MICROSOFT_TENANT_ID"),
-            cache_service=cache_service
+            cache_service=cache_service,
+            tenant_index=UserTenantIndex(cache_service, database)
         )
 
         # Initialize Graph API client
@@ -74,6 +85,32 @@ async def lifespan(app: FastAPI):
         tool_registry = ToolRegistry(graph_client, database, cache_service)
         await tool_registry.initialize()
 
+        # Start compacting idle rate limiter state
+        await get_rate_limiter().start()
+
+        # Flush unsampled operation counts and trim old metrics periodically
+        await get_performance_monitor().start()
+
+        # Share circuit breaker transitions between replicas
+        if os.getenv("CIRCUIT_BREAKER_SHARED", "false").lower() == "true":
+            endpoint_breakers = SharedCircuitBreaker(cache_service, scope="graph_endpoints")
+            operation_breakers = SharedCircuitBreaker(cache_service, scope="operations")
+            shared_breakers = [endpoint_breakers, operation_breakers]
+            for shared in shared_breakers:
+                await shared.start()
+            get_rate_limiter().set_shared_circuit_breaker(endpoint_breakers)
+            get_error_handler().set_shared_circuit_breaker(operation_breakers)
+
+        # Keep permissions in Redis behind the in-process cache
+        if os.getenv("PERMISSION_CACHE_REDIS", "false").lower() == "true":
+            get_permission_validator().set_cache_service(cache_service)
+
+        # Persist the permission audit trail in batches
+        if os.getenv("PERMISSION_AUDIT_PERSIST", "false").lower() == "true":
+            permission_audit_sink = PermissionAuditSink(database)
+            await permission_audit_sink.start()
+            get_permission_validator().set_audit_sink(permission_audit_sink)
+
         # Initialize webhook subscription manager
         webhook_manager = WebhookSubscriptionManager(database, cache_service, graph_client)
         await webhook_manager.initialize()
@@ -94,6 +131,17 @@ async def lifespan(app: FastAPI):
         # Cleanup
         if webhook_manager:
             await webhook_manager.shutdown()
+        await get_rate_limiter().stop()
+        await get_performance_monitor().stop()
+        if shared_breakers:
+            get_rate_limiter().set_shared_circuit_breaker(None)
+            get_error_handler().set_shared_circuit_breaker(None)
+        for shared in shared_breakers:
+            await shared.stop()
+        get_permission_validator().set_cache_service(None)
+        if permission_audit_sink:
+            get_permission_validator().set_audit_sink(None)
+            await permission_audit_sink.stop()
         if cache_service:
             await cache_service.close()
         if database:
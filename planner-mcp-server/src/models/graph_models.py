@@ -229,6 +229,7 @@ class WebhookNotification:
     received_at: datetime = field(default_factory=datetime.utcnow)
     processed: bool = False
     processing_error: Optional[str] = None
+    stream_entry_id: Optional[str] = None
 
 
 @dataclass
@@ -5,13 +5,75 @@ Story 1.3 Task 5: Batch operation support with progress tracking
 
 import re
 import asyncio
-from typing import Dict, List, Any, Optional, AsyncGenerator
+from typing import Dict, List, Any, Optional, AsyncGenerator, Awaitable, Callable
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 import structlog
 
+from ..models.graph_models import BatchOperation as GraphBatchOperation, RequestMethod
+
 logger = structlog.get_logger(__name__)
 
+# Async callable returning Graph task resources matching a query filter
+TaskLookup = Callable[[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]]
+
+# Operations that target every task matching a filter
+QUERY_OPERATION_TYPES = {
+    "query_and_update_tasks": "update_task",
+    "query_and_delete_tasks": "delete_task"
+}
+
+# Planner percentComplete values for status words used in commands
+STATUS_PERCENT_COMPLETE = {
+    "not started": 0,
+    "not_started": 0,
+    "in progress": 50,
+    "in_progress": 50,
+    "started": 50,
+    "complete": 100,
+    "completed": 100,
+    "done": 100,
+    "finished": 100
+}
+
+# Command parameter names and their Graph plannerTask equivalents
+GRAPH_TASK_FIELDS = {
+    "title": "title",
+    "plan_id": "planId",
+    "planId": "planId",
+    "bucket_id": "bucketId",
+    "bucketId": "bucketId",
+    "due_date": "dueDateTime",
+    "dueDateTime": "dueDateTime",
+    "start_date": "startDateTime",
+    "startDateTime": "startDateTime",
+    "percent_complete": "percentComplete",
+    "percentComplete": "percentComplete",
+    "priority": "priority",
+    "assignments": "assignments"
+}
+
+
+def to_graph_task_fields(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert command parameters into a Graph plannerTask request body"""
+    body: Dict[str, Any] = {}
+    for key, value in values.items():
+        graph_field = GRAPH_TASK_FIELDS.get(key)
+        if graph_field and value is not None:
+            body[graph_field] = value.isoformat() if isinstance(value, datetime) else value
+
+    status = values.get("status")
+    if isinstance(status, str) and status.lower() in STATUS_PERCENT_COMPLETE:
+        body["percentComplete"] = STATUS_PERCENT_COMPLETE[status.lower()]
+
+    assignee = values.get("assignee_id")
+    if assignee and "assignments" not in body:
+        body["assignments"] = {
+            assignee: {"@odata.type": "#microsoft.graph.plannerAssignment", "orderHint": " !"}
+        }
+
+    return body
+
 
 @dataclass
 class BatchOperation:
@@ -47,10 +109,21 @@ class BatchProcessor:
     """
     Processes batch operations for natural language commands
     Supports operations like "create 5 tasks for project Alpha"
+
+    With a BatchOperationsManager, task operations are compiled into Graph
+    $batch requests instead of one call per operation; query operations are
+    expanded into per-task operations through task_lookup first. Operations
+    that cannot be expressed as a single Graph request still go through the
+    operation executor.
     """
 
-    def __init__(self, max_batch_size: int = 50):
+    def __init__(self,
+                 max_batch_size: int = 50,
+                 batch_manager: Any = None,
+                 task_lookup: Optional[TaskLookup] = None):
         self.max_batch_size = max_batch_size
+        self.batch_manager = batch_manager
+        self.task_lookup = task_lookup
         self.active_jobs: Dict[str, BatchJob] = {}
 
         # Batch command patterns
@@ -257,13 +330,22 @@ class BatchProcessor:
             raise
 
     async def execute_batch_job(self, job_id: str,
-                               operation_executor: callable) -> AsyncGenerator[Dict[str, Any], None]:
+                               operation_executor: Optional[callable] = None,
+                               auth_token: Optional[str] = None,
+                               tenant_id: Optional[str] = None) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Execute a batch job with progress tracking
 
+        When a batch manager and auth token are available, task operations run
+        as Graph $batch requests; a progress update is still yielded for every
+        operation as its sub-response arrives. Cancelling the job stops sending
+        further batches (requests already sent may still be applied).
+
         Args:
             job_id: Batch job identifier
             operation_executor: Async function to execute individual operations
+            auth_token: Graph access token for $batch execution
+            tenant_id: Optional tenant ID for rate limiting
 
         Yields:
             Progress updates
@@ -288,61 +370,70 @@ class BatchProcessor:
                 "message": f"Starting batch job with {batch_job.total_operations} operations"
             }
 
-            # Execute operations
-            for i, operation in enumerate(batch_job.operations):
+            remaining = batch_job.operations
+            if self.batch_manager and auth_token:
+                await self._expand_query_operations(batch_job)
+
+                graph_operations: Dict[str, BatchOperation] = {}
+                requests: List[GraphBatchOperation] = []
+                remaining = []
+                for operation in batch_job.operations:
+                    request = self._compile_graph_request(operation)
+                    if request:
+                        graph_operations[request.id] = operation
+                        requests.append(request)
+                    else:
+                        remaining.append(operation)
+
+                if requests:
+                    async for update in self._execute_graph_batches(
+                        batch_job, graph_operations, requests, auth_token, tenant_id
+                    ):
+                        yield update
+
+            # Execute operations that have no $batch form one at a time
+            for operation in remaining:
+                if batch_job.status == 'cancelled':
+                    break
+
+                if operation_executor is None:
+                    self._fail_operation(batch_job, operation, "No executor for operation")
+                    yield self._progress_update(batch_job, operation)
+                    continue
+
                 try:
                     operation.status = 'running'
                     operation.started_at = datetime.now(timezone.utc)
 
                     # Execute the operation
                     result = await operation_executor(operation.operation_type, operation.parameters)
-
-                    operation.status = 'completed'
-                    operation.result = result
-                    operation.completed_at = datetime.now(timezone.utc)
-                    batch_job.completed_operations += 1
-
-                    logger.debug("Completed batch operation",
-                                job_id=job_id,
-                                operation_id=operation.operation_id,
-                                operation_type=operation.operation_type)
+                    self._complete_operation(batch_job, operation, result)
 
                 except Exception as op_error:
-                    operation.status = 'failed'
-                    operation.error = str(op_error)
-                    operation.completed_at = datetime.now(timezone.utc)
-                    batch_job.failed_operations += 1
-
-                    logger.warning("Batch operation failed",
-                                  job_id=job_id,
-                                  operation_id=operation.operation_id,
-                                  error=str(op_error))
+                    self._fail_operation(batch_job, operation, str(op_error))
 
                 # Yield progress update
-                progress = ((i + 1) / batch_job.total_operations) * 100
-                yield {
-                    "job_id": job_id,
-                    "status": "progress",
-                    "progress": progress,
-                    "completed": batch_job.completed_operations,
-                    "failed": batch_job.failed_operations,
-                    "total": batch_job.total_operations,
-                    "current_operation": operation.operation_type,
-                    "message": f"Completed {batch_job.completed_operations}/{batch_job.total_operations} operations"
-                }
+                yield self._progress_update(batch_job, operation)
 
             # Finalize job status
-            batch_job.completed_at = datetime.now(timezone.utc)
-
-            if batch_job.failed_operations == 0:
-                batch_job.status = 'completed'
-                final_message = f"All {batch_job.total_operations} operations completed successfully"
-            elif batch_job.completed_operations == 0:
-                batch_job.status = 'failed'
-                final_message = f"All {batch_job.total_operations} operations failed"
+            if batch_job.status == 'cancelled':
+                for operation in batch_job.operations:
+                    if operation.status in ('pending', 'running'):
+                        operation.status = 'cancelled'
+                final_message = (f"Cancelled after {batch_job.completed_operations}/"
+                                 f"{batch_job.total_operations} operations")
             else:
-                batch_job.status = 'partial'
-                final_message = f"Completed {batch_job.completed_operations}/{batch_job.total_operations} operations"
+                batch_job.completed_at = datetime.now(timezone.utc)
+
+                if batch_job.failed_operations == 0:
+                    batch_job.status = 'completed'
+                    final_message = f"All {batch_job.total_operations} operations completed successfully"
+                elif batch_job.completed_operations == 0:
+                    batch_job.status = 'failed'
+                    final_message = f"All {batch_job.total_operations} operations failed"
+                else:
+                    batch_job.status = 'partial'
+                    final_message = f"Completed {batch_job.completed_operations}/{batch_job.total_operations} operations"
 
             # Yield final progress
             yield {
@@ -378,6 +469,168 @@ class BatchProcessor:
                 "error": str(e)
             }
 
+    async def _execute_graph_batches(self,
+                                     batch_job: BatchJob,
+                                     graph_operations: Dict[str, BatchOperation],
+                                     requests: List[GraphBatchOperation],
+                                     auth_token: str,
+                                     tenant_id: Optional[str]) -> AsyncGenerator[Dict[str, Any], None]:
+        """Run compiled operations through $batch, yielding progress per sub-response"""
+        for operation in graph_operations.values():
+            operation.status = 'running'
+            operation.started_at = datetime.now(timezone.utc)
+
+        stream = self.batch_manager.stream_operations_in_chunks(
+            requests,
+            user_id=batch_job.user_id,
+            auth_token=auth_token,
+            tenant_id=tenant_id
+        )
+        try:
+            async for batch_response in stream:
+                for response in batch_response.responses:
+                    operation = graph_operations.get(response.get("id"))
+                    if not operation or operation.status != 'running':
+                        continue
+
+                    status = response.get("status", 0)
+                    body = response.get("body") or {}
+                    if status < 400:
+                        self._complete_operation(batch_job, operation, {"success": True, "status": status, **body})
+                    else:
+                        error = (body.get("error") or {}).get("message") or f"HTTP {status}"
+                        self._fail_operation(batch_job, operation, error)
+                    yield self._progress_update(batch_job, operation)
+
+                if batch_job.status == 'cancelled':
+                    logger.info("Stopping batch job after cancellation", job_id=batch_job.job_id)
+                    return
+
+        except Exception as e:
+            logger.error("Graph batch execution failed", error=str(e), job_id=batch_job.job_id)
+            for operation in graph_operations.values():
+                if operation.status == 'running':
+                    self._fail_operation(batch_job, operation, str(e))
+                    yield self._progress_update(batch_job, operation)
+
+        finally:
+            await stream.aclose()
+
+    async def _expand_query_operations(self, batch_job: BatchJob) -> None:
+        """Replace query operations with one operation per matching task"""
+        if not self.task_lookup:
+            return
+
+        operations: List[BatchOperation] = []
+        for operation in batch_job.operations:
+            task_operation_type = QUERY_OPERATION_TYPES.get(operation.operation_type)
+            if not task_operation_type:
+                operations.append(operation)
+                continue
+
+            tasks = await self.task_lookup(operation.parameters.get("filter", {}))
+            for index, task in enumerate(tasks):
+                operations.append(BatchOperation(
+                    operation_id=f"{operation.operation_id}_{index}",
+                    operation_type=task_operation_type,
+                    parameters={
+                        "task_id": task.get("id"),
+                        "etag": task.get("@odata.etag"),
+                        "update_data": operation.parameters.get("update_data", {})
+                    }
+                ))
+
+            logger.debug("Expanded query operation",
+                        job_id=batch_job.job_id,
+                        operation_id=operation.operation_id,
+                        task_count=len(tasks))
+
+        batch_job.operations = operations
+        batch_job.total_operations = len(operations)
+
+    def _compile_graph_request(self, operation: BatchOperation) -> Optional[GraphBatchOperation]:
+        """Translate an operation into a $batch sub-request, or None if it has no single-request form"""
+        parameters = operation.parameters
+
+        if operation.operation_type == "create_task":
+            body = to_graph_task_fields(parameters)
+            if not body.get("planId") or not body.get("title") or parameters.get("assignee"):
+                return None
+            return GraphBatchOperation(
+                id=operation.operation_id,
+                method=RequestMethod.POST,
+                url="/planner/tasks",
+                body=body,
+                headers={"Content-Type": "application/json"}
+            )
+
+        task_id = parameters.get("task_id")
+        etag = parameters.get("etag")
+        if not task_id or not etag:
+            return None
+
+        if operation.operation_type == "update_task":
+            update_data = parameters.get("update_data", {})
+            body = to_graph_task_fields(update_data)
+            if not body or update_data.get("assignee"):
+                return None
+            return GraphBatchOperation(
+                id=operation.operation_id,
+                method=RequestMethod.PATCH,
+                url=f"/planner/tasks/{task_id}",
+                body=body,
+                headers={"Content-Type": "application/json", "If-Match": etag}
+            )
+
+        if operation.operation_type == "delete_task":
+            return GraphBatchOperation(
+                id=operation.operation_id,
+                method=RequestMethod.DELETE,
+                url=f"/planner/tasks/{task_id}",
+                headers={"If-Match": etag}
+            )
+
+        return None
+
+    def _complete_operation(self, batch_job: BatchJob, operation: BatchOperation, result: Any) -> None:
+        """Record a successful operation"""
+        operation.status = 'completed'
+        operation.result = result
+        operation.completed_at = datetime.now(timezone.utc)
+        batch_job.completed_operations += 1
+
+        logger.debug("Completed batch operation",
+                    job_id=batch_job.job_id,
+                    operation_id=operation.operation_id,
+                    operation_type=operation.operation_type)
+
+    def _fail_operation(self, batch_job: BatchJob, operation: BatchOperation, error: str) -> None:
+        """Record a failed operation"""
+        operation.status = 'failed'
+        operation.error = error
+        operation.completed_at = datetime.now(timezone.utc)
+        batch_job.failed_operations += 1
+
+        logger.warning("Batch operation failed",
+                      job_id=batch_job.job_id,
+                      operation_id=operation.operation_id,
+                      error=error)
+
+    def _progress_update(self, batch_job: BatchJob, operation: BatchOperation) -> Dict[str, Any]:
+        """Build the progress update for a finished operation"""
+        processed = batch_job.completed_operations + batch_job.failed_operations
+        return {
+            "job_id": batch_job.job_id,
+            "status": "progress",
+            "progress": (processed / batch_job.total_operations) * 100,
+            "completed": batch_job.completed_operations,
+            "failed": batch_job.failed_operations,
+            "total": batch_job.total_operations,
+            "current_operation": operation.operation_type,
+            "operation_id": operation.operation_id,
+            "message": f"Completed {batch_job.completed_operations}/{batch_job.total_operations} operations"
+        }
+
     async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Get status of a batch job
@@ -6,10 +6,14 @@ Focus on basic connectivity and task creation
 import asyncio
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
-import httpx
 import structlog
 
 from .auth import AuthService, AuthenticationError
+from .graph.batch_operations import BatchExecutionContext, BatchOperationsManager
+from .graph.client import EnhancedGraphClient, GraphAPIError, GraphAPIAuthError, GraphAPIClientError
+from .graph.concurrency_limiter import RequestPriority, graph_priority
+from .graph.etag_cache import PlannerETagCache, get_etag_cache
+from .models.graph_models import BatchOperation, RequestMethod
 
 logger = structlog.get_logger(__name__)
 
@@ -20,36 +24,45 @@ class TeamsPlannierError(Exception):
 
 
 class SimpleTeamsPlannerClient:
-    """Simple client for Microsoft Teams and Planner operations"""
+    """
+    Simple client for Microsoft Teams and Planner operations
 
-    def __init__(self, auth_service: AuthService):
+    Requests go through the pooled EnhancedGraphClient, which provides
+    connection reuse, HTTP/2, compression, rate limiter backoff, retries and
+    performance tracking.
+    """
+
+    def __init__(
+        self,
+        auth_service: AuthService,
+        etag_cache: Optional[PlannerETagCache] = None,
+        graph_client: Optional[EnhancedGraphClient] = None,
+        batch_manager: Optional[BatchOperationsManager] = None
+    ):
         self.auth_service = auth_service
-        self.base_url = "https://graph.microsoft.com/v1.0"
+        self.graph_client = graph_client or EnhancedGraphClient(auth_service)
+        self.base_url = self.graph_client.config.base_url
+
+        # Latest known ETags, so updates and deletes need no read first
+        self.etag_cache = etag_cache or get_etag_cache()
+
+        # Chunks, pipelines and retries $batch requests sent through the pooled client
+        self.batch_manager = batch_manager or BatchOperationsManager(transport=self._send_batch)
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        await self.graph_client.close()
 
     async def get_user_teams(self, user_id: str) -> List[Dict[str, Any]]:
         """Get teams that the user is a member of"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/me/joinedTeams",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
+            teams_data = await self._request("GET", "/me/joinedTeams", user_id)
+            logger.info("Retrieved user teams", count=len(teams_data.get('value', [])))
+            return teams_data.get('value', [])
 
-                if response.status_code == 200:
-                    teams_data = response.json()
-                    logger.info("Retrieved user teams", count=len(teams_data.get('value', [])))
-                    return teams_data.get('value', [])
-                else:
-                    logger.error("Failed to get teams", status_code=response.status_code)
-                    raise TeamsPlannierError(f"Failed to get teams: {response.status_code}")
-
-        except httpx.HTTPError as e:
-            logger.error("HTTP error getting teams", error=str(e))
-            raise TeamsPlannierError(f"HTTP error: {str(e)}")
+        except GraphAPIError as e:
+            logger.error("Failed to get teams", status_code=e.status_code)
+            raise TeamsPlannierError(f"Failed to get teams: {e.status_code}")
         except Exception as e:
             logger.error("Error getting teams", error=str(e))
             raise TeamsPlannierError(f"Error getting teams: {str(e)}")
@@ -57,35 +70,22 @@ class SimpleTeamsPlannerClient:
     async def get_team_planner_plans(self, user_id: str, team_id: str) -> List[Dict[str, Any]]:
         """Get Planner plans for a specific team with enhanced error handling"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                # Get plans for the group (team_id is actually the group_id in Microsoft Graph)
-                response = await client.get(
-                    f"{self.base_url}/groups/{team_id}/planner/plans",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code == 200:
-                    plans_data = response.json()
-                    logger.info("Retrieved team plans", team_id=team_id, count=len(plans_data.get('value', [])))
-                    return plans_data.get('value', [])
-                elif response.status_code == 403:
-                    logger.error("Insufficient permissions for plans", team_id=team_id)
-                    raise TeamsPlannierError(f"Insufficient permissions to access plans for team {team_id}")
-                elif response.status_code == 404:
-                    logger.info("No plans found for team", team_id=team_id)
-                    return []  # Return empty list instead of error
-                else:
-                    error_text = response.text
-                    logger.error("Failed to get plans", team_id=team_id, status_code=response.status_code, error=error_text)
-                    raise TeamsPlannierError(f"Failed to get plans: {response.status_code} - {error_text}")
-
-        except httpx.HTTPError as e:
-            logger.error("HTTP error getting plans", error=str(e))
-            raise TeamsPlannierError(f"HTTP error: {str(e)}")
+            # Get plans for the group (team_id is actually the group_id in Microsoft Graph)
+            plans_data = await self._request("GET", f"/groups/{team_id}/planner/plans", user_id)
+            for plan in plans_data.get('value', []):
+                self.etag_cache.record_resource("plan", plan)
+            logger.info("Retrieved team plans", team_id=team_id, count=len(plans_data.get('value', [])))
+            return plans_data.get('value', [])
+
+        except GraphAPIError as e:
+            if e.status_code == 403:
+                logger.error("Insufficient permissions for plans", team_id=team_id)
+                raise TeamsPlannierError(f"Insufficient permissions to access plans for team {team_id}")
+            elif e.status_code == 404:
+                logger.info("No plans found for team", team_id=team_id)
+                return []  # Return empty list instead of error
+            logger.error("Failed to get plans", team_id=team_id, status_code=e.status_code, error=str(e))
+            raise TeamsPlannierError(f"Failed to get plans: {e.status_code} - {str(e)}")
         except Exception as e:
             logger.error("Error getting plans", error=str(e))
             raise TeamsPlannierError(f"Error getting plans: {str(e)}")
@@ -93,24 +93,15 @@ class SimpleTeamsPlannerClient:
     async def get_plan_buckets(self, user_id: str, plan_id: str) -> List[Dict[str, Any]]:
         """Get buckets (columns) for a specific Planner plan"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/planner/plans/{plan_id}/buckets",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code == 200:
-                    buckets_data = response.json()
-                    logger.info("Retrieved plan buckets", plan_id=plan_id, count=len(buckets_data.get('value', [])))
-                    return buckets_data.get('value', [])
-                else:
-                    logger.error("Failed to get buckets", plan_id=plan_id, status_code=response.status_code)
-                    raise TeamsPlannierError(f"Failed to get buckets: {response.status_code}")
-
+            buckets_data = await self._request("GET", f"/planner/plans/{plan_id}/buckets", user_id)
+            for bucket in buckets_data.get('value', []):
+                self.etag_cache.record_resource("bucket", bucket)
+            logger.info("Retrieved plan buckets", plan_id=plan_id, count=len(buckets_data.get('value', [])))
+            return buckets_data.get('value', [])
+
+        except GraphAPIError as e:
+            logger.error("Failed to get buckets", plan_id=plan_id, status_code=e.status_code)
+            raise TeamsPlannierError(f"Failed to get buckets: {e.status_code}")
         except Exception as e:
             logger.error("Error getting buckets", error=str(e))
             raise TeamsPlannierError(f"Error getting buckets: {str(e)}")
@@ -118,24 +109,15 @@ class SimpleTeamsPlannerClient:
     async def get_plan_tasks(self, user_id: str, plan_id: str) -> List[Dict[str, Any]]:
         """Get all tasks for a specific Planner plan"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/planner/plans/{plan_id}/tasks",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code == 200:
-                    tasks_data = response.json()
-                    logger.info("Retrieved plan tasks", plan_id=plan_id, count=len(tasks_data.get('value', [])))
-                    return tasks_data.get('value', [])
-                else:
-                    logger.error("Failed to get tasks", plan_id=plan_id, status_code=response.status_code)
-                    raise TeamsPlannierError(f"Failed to get tasks: {response.status_code}")
-
+            tasks_data = await self._request("GET", f"/planner/plans/{plan_id}/tasks", user_id)
+            for task in tasks_data.get('value', []):
+                self.etag_cache.record_resource("task", task)
+            logger.info("Retrieved plan tasks", plan_id=plan_id, count=len(tasks_data.get('value', [])))
+            return tasks_data.get('value', [])
+
+        except GraphAPIError as e:
+            logger.error("Failed to get tasks", plan_id=plan_id, status_code=e.status_code)
+            raise TeamsPlannierError(f"Failed to get tasks: {e.status_code}")
         except Exception as e:
             logger.error("Error getting tasks", error=str(e))
             raise TeamsPlannierError(f"Error getting tasks: {str(e)}")
@@ -156,109 +138,358 @@ class SimpleTeamsPlannerClient:
     ) -> Dict[str, Any]:
         """Create a new task in a Planner plan with full functionality"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            # Comprehensive task payload
-            task_data = {
-                "planId": plan_id,
-                "title": title,
-                "assignments": assignments or {},
-                "priority": priority,
-                "percentComplete": 0 if progress == "notStarted" else 50 if progress == "inProgress" else 100
-            }
-
-            # Add optional fields
-            if bucket_id:
-                task_data["bucketId"] = bucket_id
-
-            if due_date:
-                task_data["dueDateTime"] = due_date.isoformat() + "Z"
-
-            if start_date:
-                task_data["startDateTime"] = start_date.isoformat() + "Z"
-
-            if categories:
-                # Categories are boolean flags (category1, category2, etc.)
-                for i, category in enumerate(categories[:6]):  # Max 6 categories
-                    task_data[f"appliedCategories"] = task_data.get("appliedCategories", {})
-                    task_data["appliedCategories"][f"category{i+1}"] = True
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/planner/tasks",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": "application/json"
-                    },
-                    json=task_data
-                )
-
-                if response.status_code == 201:
-                    task_result = response.json()
-
-                    # If description provided, update task details separately
-                    if description:
-                        await self._update_task_details(user_id, task_result["id"], description)
-
-                    logger.info("Task created successfully",
-                              task_id=task_result.get('id'),
-                              title=title,
-                              plan_id=plan_id)
-                    return task_result
-                else:
-                    error_text = response.text
-                    logger.error("Failed to create task",
-                               status_code=response.status_code,
-                               error=error_text)
-                    raise TeamsPlannierError(f"Failed to create task: {response.status_code} - {error_text}")
-
-        except httpx.HTTPError as e:
-            logger.error("HTTP error creating task", error=str(e))
-            raise TeamsPlannierError(f"HTTP error: {str(e)}")
+            task_data = self._build_task_payload(
+                plan_id, title, bucket_id, assignments, due_date, start_date, priority, progress, categories
+            )
+
+            task_result = await self._request("POST", "/planner/tasks", user_id, data=task_data)
+            self.etag_cache.record_resource("task", task_result)
+
+            # If description provided, update task details separately
+            if description:
+                await self._update_task_details(user_id, task_result["id"], description)
+
+            logger.info("Task created successfully",
+                      task_id=task_result.get('id'),
+                      title=title,
+                      plan_id=plan_id)
+            return task_result
+
+        except GraphAPIError as e:
+            logger.error("Failed to create task",
+                       status_code=e.status_code,
+                       error=str(e))
+            raise TeamsPlannierError(f"Failed to create task: {e.status_code} - {str(e)}")
         except Exception as e:
             logger.error("Error creating task", error=str(e))
             raise TeamsPlannierError(f"Error creating task: {str(e)}")
 
-    async def _update_task_details(self, user_id: str, task_id: str, description: str) -> None:
-        """Update task details (description, checklist, etc.)"""
+    async def create_planner_tasks_bulk(
+        self,
+        user_id: str,
+        plan_id: str,
+        task_specs: List[Dict[str, Any]],
+        max_concurrent_batches: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Create many tasks with their descriptions and checklists using $batch
+
+        Takes three rounds of $batch requests, 20 sub-requests each: the task
+        creates, then a GET of each new task's details, then one details PATCH
+        per task. plannerTaskDetails has its own ETag, which the create response
+        does not carry and $batch cannot pass from one sub-request to another,
+        so the PATCH waits for the GET. Tasks without a description or checklist
+        skip the last two rounds.
+
+        Args:
+            user_id: User ID
+            plan_id: Plan to create the tasks in
+            task_specs: Task specifications, each accepting the keyword arguments
+                of create_planner_task (title, description, bucket_id, assignments,
+                due_date, start_date, priority, progress, categories) plus:
+                - checklist: List[Dict] - Checklist items (title, isChecked)
+            max_concurrent_batches: $batch requests sent at the same time
+
+        Returns:
+            One outcome per spec, in order, containing:
+                - index: int - Position in task_specs
+                - title: str - Task title
+                - status: str - "created", "partial" (task created, details failed) or "failed"
+                - task: Dict - Created task, if any
+                - error: str - Failure reason, if any
+        """
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            # Get current task details first to get the @odata.etag
-            async with httpx.AsyncClient() as client:
-                get_response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}/details",
-                    headers={"Authorization": f"Bearer {access_token}"}
+            outcomes = [
+                {"index": i, "title": spec.get("title"), "status": "failed", "task": None, "error": None}
+                for i, spec in enumerate(task_specs)
+            ]
+
+            create_operations = [
+                BatchOperation(
+                    id=str(i),
+                    method=RequestMethod.POST,
+                    url="/planner/tasks",
+                    headers={"Content-Type": "application/json"},
+                    body=self._build_task_payload(
+                        plan_id,
+                        spec["title"],
+                        spec.get("bucket_id"),
+                        spec.get("assignments"),
+                        spec.get("due_date"),
+                        spec.get("start_date"),
+                        spec.get("priority", 5),
+                        spec.get("progress", "notStarted"),
+                        spec.get("categories")
+                    )
                 )
-
-                if get_response.status_code == 200:
-                    current_details = get_response.json()
-                    etag = get_response.headers.get("ETag", "")
-
-                    # Update with new description
-                    update_data = {
-                        "description": description
-                    }
-
-                    patch_response = await client.patch(
-                        f"{self.base_url}/planner/tasks/{task_id}/details",
+                for i, spec in enumerate(task_specs)
+            ]
+            created = await self._send_batch_requests(user_id, create_operations, max_concurrent_batches)
+
+            details_updates: Dict[str, Dict[str, Any]] = {}
+            for i, spec in enumerate(task_specs):
+                response = created.get(str(i), {})
+                if response.get("status") != 201:
+                    outcomes[i]["error"] = self._batch_error_message(response)
+                    continue
+
+                task = response.get("body") or {}
+                outcomes[i].update(status="created", task=task)
+                self.etag_cache.record_resource("task", task)
+
+                details = {}
+                if spec.get("description"):
+                    details["description"] = spec["description"]
+                if spec.get("checklist"):
+                    details["checklist"] = self._build_checklist(spec["checklist"])
+                if details:
+                    details_updates[str(i)] = details
+
+            if details_updates:
+                fetched = await self._send_batch_requests(user_id, [
+                    BatchOperation(
+                        id=request_id,
+                        method=RequestMethod.GET,
+                        url=f"/planner/tasks/{outcomes[int(request_id)]['task']['id']}/details"
+                    )
+                    for request_id in details_updates
+                ], max_concurrent_batches)
+
+                patch_operations = []
+                for request_id, details in details_updates.items():
+                    response = fetched.get(request_id, {})
+                    if response.get("status") != 200:
+                        outcomes[int(request_id)].update(status="partial",
+                                                         error=self._batch_error_message(response))
+                        continue
+
+                    patch_operations.append(BatchOperation(
+                        id=request_id,
+                        method=RequestMethod.PATCH,
+                        url=f"/planner/tasks/{outcomes[int(request_id)]['task']['id']}/details",
                         headers={
-                            "Authorization": f"Bearer {access_token}",
                             "Content-Type": "application/json",
-                            "If-Match": etag
+                            "If-Match": self._batch_etag(response),
+                            # Ask for the updated details so their new ETag can be cached
+                            "Prefer": "return=representation"
                         },
-                        json=update_data
-                    )
+                        body=details
+                    ))
+
+                patched = await self._send_batch_requests(user_id, patch_operations, max_concurrent_batches)
+                for operation in patch_operations:
+                    response = patched.get(operation.id, {})
+                    outcome = outcomes[int(operation.id)]
+                    if response.get("status") not in (200, 204):
+                        outcome.update(status="partial", error=self._batch_error_message(response))
+                    elif not self.etag_cache.set("details", outcome["task"]["id"], self._batch_etag(response)):
+                        self.etag_cache.invalidate("details", outcome["task"]["id"])
+
+            logger.info("Bulk task creation completed",
+                      plan_id=plan_id,
+                      requested=len(task_specs),
+                      created=sum(1 for outcome in outcomes if outcome["status"] == "created"),
+                      partial=sum(1 for outcome in outcomes if outcome["status"] == "partial"),
+                      failed=sum(1 for outcome in outcomes if outcome["status"] == "failed"))
+            return outcomes
 
-                    if patch_response.status_code != 200:
-                        logger.warning("Failed to update task description",
-                                     task_id=task_id,
-                                     status_code=patch_response.status_code)
+        except Exception as e:
+            logger.error("Error creating tasks in bulk", error=str(e))
+            raise TeamsPlannierError(f"Error creating tasks in bulk: {str(e)}")
 
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        user_id: str,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a request through the pooled Graph client
+
+        Returns:
+            Response body ({} for responses without content)
+
+        Raises:
+            TeamsPlannierError: No usable access token
+            GraphAPIError: Graph returned an error status, 404 included
+        """
+        try:
+            result = await self.graph_client.make_request(method, endpoint, user_id, data=data, headers=headers)
+        except GraphAPIAuthError as e:
+            raise TeamsPlannierError(str(e))
+
+        if result is None:
+            raise GraphAPIClientError(f"Resource not found: {endpoint}", status_code=404)
+        return result
+
+    async def _conditional_write(
+        self,
+        user_id: str,
+        method: str,
+        endpoint: str,
+        resource_type: str,
+        resource_id: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a PATCH or DELETE with the cached ETag
+
+        The resource is read for its ETag only when none is cached or the
+        cached one is rejected with 412; the write is then sent once more.
+
+        Returns:
+            Response body ({} when Graph returns no content)
+        """
+        etag = self.etag_cache.get(resource_type, resource_id)
+
+        for attempt in range(2):
+            if not etag:
+                current = await self._request("GET", endpoint, user_id)
+                etag = current.get("@odata.etag", "")
+                self.etag_cache.set(resource_type, resource_id, etag)
+
+            headers = {"If-Match": etag}
+            if method == "PATCH":
+                # Ask for the updated resource so its new ETag can be cached
+                headers["Prefer"] = "return=representation"
+
+            try:
+                result = await self._request(method, endpoint, user_id, data=data, headers=headers)
+            except GraphAPIClientError as e:
+                if e.status_code != 412 or attempt == 1:
+                    raise
+                logger.info("Cached ETag was stale, refetching",
+                          resource_type=resource_type,
+                          resource_id=resource_id)
+                self.etag_cache.invalidate(resource_type, resource_id)
+                etag = None
+                continue
+
+            # Written without a representation (or deleted): the old ETag is no longer valid
+            if not self.etag_cache.set(resource_type, resource_id, result.get("@odata.etag")):
+                self.etag_cache.invalidate(resource_type, resource_id)
+            return result
+
+    async def _send_batch_requests(
+        self,
+        user_id: str,
+        operations: List[BatchOperation],
+        max_concurrent_batches: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Send sub-requests through the batch manager and return the final sub-responses by ID
+
+        The manager packs them into $batch requests of 20 and resends throttled
+        sub-requests after their Retry-After delay.
+        """
+        responses: Dict[str, Dict[str, Any]] = {}
+        if not operations:
+            return responses
+
+        # The transport authenticates through the graph client, so no token is passed here
+        async for batch_response in self.batch_manager.stream_operations_in_chunks(
+            operations, user_id, auth_token="", max_in_flight=max_concurrent_batches
+        ):
+            for response in batch_response.responses:
+                responses[response.get("id")] = response
+        return responses
+
+    async def _send_batch(self, request_data: Dict[str, Any], context: BatchExecutionContext) -> Dict[str, Any]:
+        """Batch manager transport: post the $batch payload through the pooled graph client"""
+        payload = request_data["data"]
+        try:
+            # Bulk creation queues behind interactive calls
+            with graph_priority(RequestPriority.BULK):
+                return await self._request("POST", "/$batch", context.batch_request.user_id, data=payload)
+        except GraphAPIError as e:
+            # Report the failure on every sub-request so each outcome carries it
+            return {"responses": [
+                {"id": request["id"], "status": e.status_code or 0, "body": {"error": {"message": str(e)}}}
+                for request in payload["requests"]
+            ]}
+
+    @staticmethod
+    def _batch_etag(response: Dict[str, Any]) -> str:
+        """ETag of a $batch sub-response"""
+        body = response.get("body") or {}
+        return body.get("@odata.etag") or (response.get("headers") or {}).get("ETag", "")
+
+    @staticmethod
+    def _batch_error_message(response: Dict[str, Any]) -> str:
+        """Error message of a failed $batch sub-response"""
+        body = response.get("body") or {}
+        message = (body.get("error") or {}).get("message") if isinstance(body, dict) else None
+        return f"{response.get('status') or 'no response'}: {message or 'request failed'}"
+
+    @staticmethod
+    def _build_task_payload(
+        plan_id: str,
+        title: str,
+        bucket_id: str = None,
+        assignments: Dict[str, Any] = None,
+        due_date: datetime = None,
+        start_date: datetime = None,
+        priority: int = 5,
+        progress: str = "notStarted",
+        categories: List[str] = None
+    ) -> Dict[str, Any]:
+        """Build the request body for creating a task"""
+        # Comprehensive task payload
+        task_data = {
+            "planId": plan_id,
+            "title": title,
+            "assignments": assignments or {},
+            "priority": priority,
+            "percentComplete": 0 if progress == "notStarted" else 50 if progress == "inProgress" else 100
+        }
+
+        # Add optional fields
+        if bucket_id:
+            task_data["bucketId"] = bucket_id
+
+        if due_date:
+            task_data["dueDateTime"] = due_date.isoformat() + "Z"
+
+        if start_date:
+            task_data["startDateTime"] = start_date.isoformat() + "Z"
+
+        if categories:
+            # Categories are boolean flags (category1, category2, etc.)
+            for i, category in enumerate(categories[:6]):  # Max 6 categories
+                task_data[f"appliedCategories"] = task_data.get("appliedCategories", {})
+                task_data["appliedCategories"][f"category{i+1}"] = True
+
+        return task_data
+
+    @staticmethod
+    def _build_checklist(checklist_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the checklist object for a task details update"""
+        checklist_object = {}
+        for i, item in enumerate(checklist_items):
+            checklist_id = f"checklist-{i+1}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            checklist_object[checklist_id] = {
+                "@odata.type": "microsoft.graph.plannerChecklistItem",
+                "title": item.get("title", ""),
+                "isChecked": item.get("isChecked", False)
+            }
+        return checklist_object
+
+    async def _update_task_details(self, user_id: str, task_id: str, description: str) -> None:
+        """Update task details (description, checklist, etc.)"""
+        try:
+            await self._conditional_write(
+                user_id,
+                "PATCH",
+                f"/planner/tasks/{task_id}/details",
+                "details",
+                task_id,
+                {"description": description}
+            )
+
+        except GraphAPIError as e:
+            logger.warning("Failed to update task description",
+                         task_id=task_id,
+                         status_code=e.status_code)
         except Exception as e:
             logger.warning("Error updating task details", task_id=task_id, error=str(e))
 
@@ -278,62 +509,29 @@ class SimpleTeamsPlannerClient:
                 - isChecked: bool - Whether item is checked (optional, default False)
         """
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            # Get current task details to get ETag
-            async with httpx.AsyncClient() as client:
-                get_response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}/details",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if get_response.status_code == 200:
-                    current_details = get_response.json()
-                    etag = get_response.headers.get("ETag", "")
-
-                    # Build checklist items object
-                    checklist_object = {}
-                    for i, item in enumerate(checklist_items):
-                        checklist_id = f"checklist-{i+1}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-                        checklist_object[checklist_id] = {
-                            "@odata.type": "microsoft.graph.plannerChecklistItem",
-                            "title": item.get("title", ""),
-                            "isChecked": item.get("isChecked", False)
-                        }
-
-                    # Update task details with checklist
-                    update_data = {
-                        "checklist": checklist_object
-                    }
-
-                    patch_response = await client.patch(
-                        f"{self.base_url}/planner/tasks/{task_id}/details",
-                        headers={
-                            "Authorization": f"Bearer {access_token}",
-                            "Content-Type": "application/json",
-                            "If-Match": etag
-                        },
-                        json=update_data
-                    )
-
-                    if patch_response.status_code in [200, 204]:  # 204 is also success for PATCH
-                        logger.info("Checklist added successfully", task_id=task_id, items=len(checklist_items))
-                        return True
-                    else:
-                        error_text = patch_response.text
-                        logger.error("Failed to add checklist",
-                                   task_id=task_id,
-                                   status_code=patch_response.status_code,
-                                   error=error_text)
-                        return False
-                else:
-                    logger.error("Failed to get task details for checklist",
-                               task_id=task_id,
-                               status_code=get_response.status_code)
-                    return False
+            # Update task details with checklist
+            update_data = {
+                "checklist": self._build_checklist(checklist_items)
+            }
 
+            await self._conditional_write(
+                user_id,
+                "PATCH",
+                f"/planner/tasks/{task_id}/details",
+                "details",
+                task_id,
+                update_data
+            )
+
+            logger.info("Checklist added successfully", task_id=task_id, items=len(checklist_items))
+            return True
+
+        except GraphAPIError as e:
+            logger.error("Failed to add checklist",
+                       task_id=task_id,
+                       status_code=e.status_code,
+                       error=str(e))
+            return False
         except Exception as e:
             logger.error("Error adding checklist", task_id=task_id, error=str(e))
             raise TeamsPlannierError(f"Error adding checklist: {str(e)}")
@@ -347,47 +545,40 @@ class SimpleTeamsPlannerClient:
     ) -> bool:
         """Update a specific checklist item's checked status"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                get_response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}/details",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
+            details_endpoint = f"/planner/tasks/{task_id}/details"
 
-                if get_response.status_code == 200:
-                    current_details = get_response.json()
-                    etag = get_response.headers.get("ETag", "")
-
-                    # Update specific checklist item
-                    checklist = current_details.get("checklist", {})
-                    if checklist_item_id in checklist:
-                        checklist[checklist_item_id]["isChecked"] = is_checked
-
-                        update_data = {"checklist": checklist}
-
-                        patch_response = await client.patch(
-                            f"{self.base_url}/planner/tasks/{task_id}/details",
-                            headers={
-                                "Authorization": f"Bearer {access_token}",
-                                "Content-Type": "application/json",
-                                "If-Match": etag
-                            },
-                            json=update_data
-                        )
-
-                        if patch_response.status_code in [200, 204]:
-                            logger.info("Checklist item updated",
-                                      task_id=task_id,
-                                      item_id=checklist_item_id,
-                                      checked=is_checked)
-                            return True
+            # Without a cached ETag, read the details once and check the item exists
+            if not self.etag_cache.get("details", task_id):
+                current_details = await self._request("GET", details_endpoint, user_id)
+                self.etag_cache.set("details", task_id, current_details.get("@odata.etag"))
 
+                if checklist_item_id not in current_details.get("checklist", {}):
                     logger.warning("Checklist item not found", item_id=checklist_item_id)
                     return False
 
+            # Checklist is an open type: only the changed item is sent
+            update_data = {
+                "checklist": {
+                    checklist_item_id: {
+                        "@odata.type": "microsoft.graph.plannerChecklistItem",
+                        "isChecked": is_checked
+                    }
+                }
+            }
+
+            await self._conditional_write(user_id, "PATCH", details_endpoint, "details", task_id, update_data)
+
+            logger.info("Checklist item updated",
+                      task_id=task_id,
+                      item_id=checklist_item_id,
+                      checked=is_checked)
+            return True
+
+        except GraphAPIError as e:
+            logger.warning("Failed to update checklist item",
+                         item_id=checklist_item_id,
+                         status_code=e.status_code)
+            return False
         except Exception as e:
             logger.error("Error updating checklist item", task_id=task_id, error=str(e))
             raise TeamsPlannierError(f"Error updating checklist item: {str(e)}")
@@ -395,35 +586,25 @@ class SimpleTeamsPlannerClient:
     async def get_task_checklist(self, user_id: str, task_id: str) -> List[Dict[str, Any]]:
         """Get checklist items for a task"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}/details",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code == 200:
-                    details = response.json()
-                    checklist = details.get("checklist", {})
-
-                    # Convert checklist object to list
-                    checklist_items = []
-                    for item_id, item_data in checklist.items():
-                        checklist_items.append({
-                            "id": item_id,
-                            "title": item_data.get("title", ""),
-                            "isChecked": item_data.get("isChecked", False)
-                        })
-
-                    logger.info("Retrieved task checklist", task_id=task_id, items=len(checklist_items))
-                    return checklist_items
-                else:
-                    logger.error("Failed to get task checklist", task_id=task_id, status_code=response.status_code)
-                    return []
-
+            details = await self._request("GET", f"/planner/tasks/{task_id}/details", user_id)
+            self.etag_cache.set("details", task_id, details.get("@odata.etag"))
+            checklist = details.get("checklist", {})
+
+            # Convert checklist object to list
+            checklist_items = []
+            for item_id, item_data in checklist.items():
+                checklist_items.append({
+                    "id": item_id,
+                    "title": item_data.get("title", ""),
+                    "isChecked": item_data.get("isChecked", False)
+                })
+
+            logger.info("Retrieved task checklist", task_id=task_id, items=len(checklist_items))
+            return checklist_items
+
+        except GraphAPIError as e:
+            logger.error("Failed to get task checklist", task_id=task_id, status_code=e.status_code)
+            return []
         except Exception as e:
             logger.error("Error getting task checklist", task_id=task_id, error=str(e))
             raise TeamsPlannierError(f"Error getting task checklist: {str(e)}")
@@ -436,56 +617,32 @@ class SimpleTeamsPlannerClient:
     ) -> bool:
         """Add a comment/reference to a task"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                # Get current task details to get ETag
-                get_response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}/details",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
+            details_endpoint = f"/planner/tasks/{task_id}/details"
 
-                if get_response.status_code == 200:
-                    current_details = get_response.json()
-                    etag = get_response.headers.get("ETag", "")
+            # The current description is needed to append to it
+            current_details = await self._request("GET", details_endpoint, user_id)
+            self.etag_cache.set("details", task_id, current_details.get("@odata.etag"))
 
-                    # Add comment to description (references API has URI validation issues)
-                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    current_description = current_details.get("description", "")
-                    new_description = f"{current_description}\n\n--- Comment ({timestamp}) ---\n{comment}" if current_description else f"--- Comment ({timestamp}) ---\n{comment}"
+            # Add comment to description (references API has URI validation issues)
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            current_description = current_details.get("description", "")
+            new_description = f"{current_description}\n\n--- Comment ({timestamp}) ---\n{comment}" if current_description else f"--- Comment ({timestamp}) ---\n{comment}"
 
-                    update_data = {
-                        "description": new_description
-                    }
+            update_data = {
+                "description": new_description
+            }
 
-                    patch_response = await client.patch(
-                        f"{self.base_url}/planner/tasks/{task_id}/details",
-                        headers={
-                            "Authorization": f"Bearer {access_token}",
-                            "Content-Type": "application/json",
-                            "If-Match": etag
-                        },
-                        json=update_data
-                    )
+            await self._conditional_write(user_id, "PATCH", details_endpoint, "details", task_id, update_data)
 
-                    if patch_response.status_code in [200, 204]:
-                        logger.info("Comment added successfully", task_id=task_id)
-                        return True
-                    else:
-                        error_text = patch_response.text
-                        logger.error("Failed to add comment",
-                                   task_id=task_id,
-                                   status_code=patch_response.status_code,
-                                   error=error_text)
-                        return False
-                else:
-                    logger.error("Failed to get task details for comment",
-                               task_id=task_id,
-                               status_code=get_response.status_code)
-                    return False
+            logger.info("Comment added successfully", task_id=task_id)
+            return True
 
+        except GraphAPIError as e:
+            logger.error("Failed to add comment",
+                       task_id=task_id,
+                       status_code=e.status_code,
+                       error=str(e))
+            return False
         except Exception as e:
             logger.error("Error adding comment", task_id=task_id, error=str(e))
             raise TeamsPlannierError(f"Error adding comment: {str(e)}")
@@ -493,52 +650,42 @@ class SimpleTeamsPlannerClient:
     async def get_task_comments(self, user_id: str, task_id: str) -> List[Dict[str, Any]]:
         """Get comments/references for a task"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}/details",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
+            details = await self._request("GET", f"/planner/tasks/{task_id}/details", user_id)
+            self.etag_cache.set("details", task_id, details.get("@odata.etag"))
+            references = details.get("references", {})
+
+            # Extract comments from references
+            comments = []
+            for ref_id, ref_data in references.items():
+                if ref_id.startswith("comment-"):
+                    comments.append({
+                        "id": ref_id,
+                        "alias": ref_data.get("alias", ""),
+                        "type": ref_data.get("type", "Other"),
+                        "lastModifiedBy": ref_data.get("lastModifiedBy", {})
+                    })
+
+            # Also extract from description
+            description = details.get("description", "")
+            if "--- Comment (" in description:
+                # Parse comments from description
+                comment_sections = description.split("--- Comment (")
+                for section in comment_sections[1:]:  # Skip first part (original description)
+                    if ") ---\n" in section:
+                        timestamp_end = section.find(") ---\n")
+                        timestamp = section[:timestamp_end]
+                        comment_text = section[timestamp_end + 6:]
+                        comments.append({
+                            "timestamp": timestamp,
+                            "text": comment_text.strip()
+                        })
 
-                if response.status_code == 200:
-                    details = response.json()
-                    references = details.get("references", {})
-
-                    # Extract comments from references
-                    comments = []
-                    for ref_id, ref_data in references.items():
-                        if ref_id.startswith("comment-"):
-                            comments.append({
-                                "id": ref_id,
-                                "alias": ref_data.get("alias", ""),
-                                "type": ref_data.get("type", "Other"),
-                                "lastModifiedBy": ref_data.get("lastModifiedBy", {})
-                            })
-
-                    # Also extract from description
-                    description = details.get("description", "")
-                    if "--- Comment (" in description:
-                        # Parse comments from description
-                        comment_sections = description.split("--- Comment (")
-                        for section in comment_sections[1:]:  # Skip first part (original description)
-                            if ") ---\n" in section:
-                                timestamp_end = section.find(") ---\n")
-                                timestamp = section[:timestamp_end]
-                                comment_text = section[timestamp_end + 6:]
-                                comments.append({
-                                    "timestamp": timestamp,
-                                    "text": comment_text.strip()
-                                })
-
-                    logger.info("Retrieved task comments", task_id=task_id, comments=len(comments))
-                    return comments
-                else:
-                    logger.error("Failed to get task comments", task_id=task_id, status_code=response.status_code)
-                    return []
+            logger.info("Retrieved task comments", task_id=task_id, comments=len(comments))
+            return comments
 
+        except GraphAPIError as e:
+            logger.error("Failed to get task comments", task_id=task_id, status_code=e.status_code)
+            return []
         except Exception as e:
             logger.error("Error getting task comments", task_id=task_id, error=str(e))
             raise TeamsPlannierError(f"Error getting task comments: {str(e)}")
@@ -546,45 +693,31 @@ class SimpleTeamsPlannerClient:
     async def get_task_details(self, user_id: str, task_id: str) -> Dict[str, Any]:
         """Get complete task details including description, checklist, and comments"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                # Get basic task info
-                task_response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                # Get detailed task info
-                details_response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}/details",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if task_response.status_code == 200 and details_response.status_code == 200:
-                    task_data = task_response.json()
-                    details_data = details_response.json()
-
-                    # Combine basic task data with details
-                    complete_task = {
-                        **task_data,
-                        "description": details_data.get("description", ""),
-                        "checklist": details_data.get("checklist", {}),
-                        "references": details_data.get("references", {}),
-                        "details": details_data
-                    }
+            # Basic and detailed task info are independent, so fetch them together
+            task_data, details_data = await asyncio.gather(
+                self._request("GET", f"/planner/tasks/{task_id}", user_id),
+                self._request("GET", f"/planner/tasks/{task_id}/details", user_id)
+            )
+            self.etag_cache.set("task", task_id, task_data.get("@odata.etag"))
+            self.etag_cache.set("details", task_id, details_data.get("@odata.etag"))
+
+            # Combine basic task data with details
+            complete_task = {
+                **task_data,
+                "description": details_data.get("description", ""),
+                "checklist": details_data.get("checklist", {}),
+                "references": details_data.get("references", {}),
+                "details": details_data
+            }
 
-                    logger.info("Retrieved complete task details", task_id=task_id)
-                    return complete_task
-                else:
-                    logger.error("Failed to get complete task details",
-                               task_id=task_id,
-                               task_status=task_response.status_code,
-                               details_status=details_response.status_code)
-                    raise TeamsPlannierError(f"Failed to get task details: task={task_response.status_code}, details={details_response.status_code}")
+            logger.info("Retrieved complete task details", task_id=task_id)
+            return complete_task
 
+        except GraphAPIError as e:
+            logger.error("Failed to get complete task details",
+                       task_id=task_id,
+                       status_code=e.status_code)
+            raise TeamsPlannierError(f"Failed to get task details: {e.status_code}")
         except Exception as e:
             logger.error("Error getting complete task details", task_id=task_id, error=str(e))
             raise TeamsPlannierError(f"Error getting complete task details: {str(e)}")
@@ -603,62 +736,37 @@ class SimpleTeamsPlannerClient:
     ) -> Dict[str, Any]:
         """Update an existing Planner task"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            # Get current task to obtain ETag
-            async with httpx.AsyncClient() as client:
-                get_response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if get_response.status_code != 200:
-                    raise TeamsPlannierError(f"Failed to get task: {get_response.status_code}")
-
-                current_task = get_response.json()
-                etag = get_response.headers.get("ETag", "")
-
-                # Build update payload
-                update_data = {}
-                if title is not None:
-                    update_data["title"] = title
-                if bucket_id is not None:
-                    update_data["bucketId"] = bucket_id
-                if progress is not None:
-                    update_data["percentComplete"] = 0 if progress == "notStarted" else 50 if progress == "inProgress" else 100
-                if assignments is not None:
-                    update_data["assignments"] = assignments
-                if due_date is not None:
-                    update_data["dueDateTime"] = due_date.isoformat() + "Z"
-                if start_date is not None:
-                    update_data["startDateTime"] = start_date.isoformat() + "Z"
-                if priority is not None:
-                    update_data["priority"] = priority
-
-                # Update task
-                patch_response = await client.patch(
-                    f"{self.base_url}/planner/tasks/{task_id}",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": "application/json",
-                        "If-Match": etag
-                    },
-                    json=update_data
-                )
-
-                if patch_response.status_code == 200:
-                    logger.info("Task updated successfully", task_id=task_id)
-                    return patch_response.json()
-                else:
-                    error_text = patch_response.text
-                    logger.error("Failed to update task",
-                               task_id=task_id,
-                               status_code=patch_response.status_code,
-                               error=error_text)
-                    raise TeamsPlannierError(f"Failed to update task: {patch_response.status_code} - {error_text}")
-
+            # Build update payload
+            update_data = {}
+            if title is not None:
+                update_data["title"] = title
+            if bucket_id is not None:
+                update_data["bucketId"] = bucket_id
+            if progress is not None:
+                update_data["percentComplete"] = 0 if progress == "notStarted" else 50 if progress == "inProgress" else 100
+            if assignments is not None:
+                update_data["assignments"] = assignments
+            if due_date is not None:
+                update_data["dueDateTime"] = due_date.isoformat() + "Z"
+            if start_date is not None:
+                update_data["startDateTime"] = start_date.isoformat() + "Z"
+            if priority is not None:
+                update_data["priority"] = priority
+
+            # Update task
+            result = await self._conditional_write(
+                user_id, "PATCH", f"/planner/tasks/{task_id}", "task", task_id, update_data
+            )
+
+            logger.info("Task updated successfully", task_id=task_id)
+            return result
+
+        except GraphAPIError as e:
+            logger.error("Failed to update task",
+                       task_id=task_id,
+                       status_code=e.status_code,
+                       error=str(e))
+            raise TeamsPlannierError(f"Failed to update task: {e.status_code} - {str(e)}")
         except Exception as e:
             logger.error("Error updating task", task_id=task_id, error=str(e))
             raise TeamsPlannierError(f"Error updating task: {str(e)}")
@@ -666,42 +774,19 @@ class SimpleTeamsPlannerClient:
     async def delete_planner_task(self, user_id: str, task_id: str) -> bool:
         """Delete a Planner task"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            # Get current task to obtain ETag
-            async with httpx.AsyncClient() as client:
-                get_response = await client.get(
-                    f"{self.base_url}/planner/tasks/{task_id}",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if get_response.status_code != 200:
-                    raise TeamsPlannierError(f"Failed to get task: {get_response.status_code}")
-
-                etag = get_response.headers.get("ETag", "")
-
-                # Delete task
-                delete_response = await client.delete(
-                    f"{self.base_url}/planner/tasks/{task_id}",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "If-Match": etag
-                    }
-                )
-
-                if delete_response.status_code == 204:
-                    logger.info("Task deleted successfully", task_id=task_id)
-                    return True
-                else:
-                    error_text = delete_response.text
-                    logger.error("Failed to delete task",
-                               task_id=task_id,
-                               status_code=delete_response.status_code,
-                               error=error_text)
-                    return False
-
+            # Delete task
+            await self._conditional_write(user_id, "DELETE", f"/planner/tasks/{task_id}", "task", task_id)
+
+            self.etag_cache.invalidate("details", task_id)
+            logger.info("Task deleted successfully", task_id=task_id)
+            return True
+
+        except GraphAPIError as e:
+            logger.error("Failed to delete task",
+                       task_id=task_id,
+                       status_code=e.status_code,
+                       error=str(e))
+            return False
         except Exception as e:
             logger.error("Error deleting task", task_id=task_id, error=str(e))
             raise TeamsPlannierError(f"Error deleting task: {str(e)}")
@@ -715,10 +800,6 @@ class SimpleTeamsPlannerClient:
     ) -> Dict[str, Any]:
         """Create a new bucket (column) in a Planner plan"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
             bucket_data = {
                 "name": name,
                 "planId": plan_id
@@ -727,30 +808,19 @@ class SimpleTeamsPlannerClient:
             if order_hint:
                 bucket_data["orderHint"] = order_hint
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/planner/buckets",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": "application/json"
-                    },
-                    json=bucket_data
-                )
-
-                if response.status_code == 201:
-                    bucket_result = response.json()
-                    logger.info("Bucket created successfully",
-                              bucket_id=bucket_result.get('id'),
-                              name=name,
-                              plan_id=plan_id)
-                    return bucket_result
-                else:
-                    error_text = response.text
-                    logger.error("Failed to create bucket",
-                               status_code=response.status_code,
-                               error=error_text)
-                    raise TeamsPlannierError(f"Failed to create bucket: {response.status_code} - {error_text}")
-
+            bucket_result = await self._request("POST", "/planner/buckets", user_id, data=bucket_data)
+            self.etag_cache.record_resource("bucket", bucket_result)
+            logger.info("Bucket created successfully",
+                      bucket_id=bucket_result.get('id'),
+                      name=name,
+                      plan_id=plan_id)
+            return bucket_result
+
+        except GraphAPIError as e:
+            logger.error("Failed to create bucket",
+                       status_code=e.status_code,
+                       error=str(e))
+            raise TeamsPlannierError(f"Failed to create bucket: {e.status_code} - {str(e)}")
         except Exception as e:
             logger.error("Error creating bucket", error=str(e))
             raise TeamsPlannierError(f"Error creating bucket: {str(e)}")
@@ -758,24 +828,13 @@ class SimpleTeamsPlannerClient:
     async def get_team_channels(self, user_id: str, team_id: str) -> List[Dict[str, Any]]:
         """Get channels for a specific team"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/teams/{team_id}/channels",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code == 200:
-                    channels_data = response.json()
-                    logger.info("Retrieved team channels", team_id=team_id, count=len(channels_data.get('value', [])))
-                    return channels_data.get('value', [])
-                else:
-                    logger.error("Failed to get channels", team_id=team_id, status_code=response.status_code)
-                    raise TeamsPlannierError(f"Failed to get channels: {response.status_code}")
+            channels_data = await self._request("GET", f"/teams/{team_id}/channels", user_id)
+            logger.info("Retrieved team channels", team_id=team_id, count=len(channels_data.get('value', [])))
+            return channels_data.get('value', [])
 
+        except GraphAPIError as e:
+            logger.error("Failed to get channels", team_id=team_id, status_code=e.status_code)
+            raise TeamsPlannierError(f"Failed to get channels: {e.status_code}")
         except Exception as e:
             logger.error("Error getting channels", error=str(e))
             raise TeamsPlannierError(f"Error getting channels: {str(e)}")
@@ -783,24 +842,13 @@ class SimpleTeamsPlannerClient:
     async def get_team_members(self, user_id: str, team_id: str) -> List[Dict[str, Any]]:
         """Get members of a specific team"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/teams/{team_id}/members",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code == 200:
-                    members_data = response.json()
-                    logger.info("Retrieved team members", team_id=team_id, count=len(members_data.get('value', [])))
-                    return members_data.get('value', [])
-                else:
-                    logger.error("Failed to get team members", team_id=team_id, status_code=response.status_code)
-                    raise TeamsPlannierError(f"Failed to get team members: {response.status_code}")
+            members_data = await self._request("GET", f"/teams/{team_id}/members", user_id)
+            logger.info("Retrieved team members", team_id=team_id, count=len(members_data.get('value', [])))
+            return members_data.get('value', [])
 
+        except GraphAPIError as e:
+            logger.error("Failed to get team members", team_id=team_id, status_code=e.status_code)
+            raise TeamsPlannierError(f"Failed to get team members: {e.status_code}")
         except Exception as e:
             logger.error("Error getting team members", error=str(e))
             raise TeamsPlannierError(f"Error getting team members: {str(e)}")
@@ -815,10 +863,6 @@ class SimpleTeamsPlannerClient:
     ) -> Dict[str, Any]:
         """Send a message to a Teams channel"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
             message_data = {
                 "body": {
                     "contentType": content_type,
@@ -826,30 +870,20 @@ class SimpleTeamsPlannerClient:
                 }
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/teams/{team_id}/channels/{channel_id}/messages",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": "application/json"
-                    },
-                    json=message_data
-                )
-
-                if response.status_code == 201:
-                    message_result = response.json()
-                    logger.info("Message sent successfully",
-                              message_id=message_result.get('id'),
-                              team_id=team_id,
-                              channel_id=channel_id)
-                    return message_result
-                else:
-                    error_text = response.text
-                    logger.error("Failed to send message",
-                               status_code=response.status_code,
-                               error=error_text)
-                    raise TeamsPlannierError(f"Failed to send message: {response.status_code} - {error_text}")
-
+            message_result = await self._request(
+                "POST", f"/teams/{team_id}/channels/{channel_id}/messages", user_id, data=message_data
+            )
+            logger.info("Message sent successfully",
+                      message_id=message_result.get('id'),
+                      team_id=team_id,
+                      channel_id=channel_id)
+            return message_result
+
+        except GraphAPIError as e:
+            logger.error("Failed to send message",
+                       status_code=e.status_code,
+                       error=str(e))
+            raise TeamsPlannierError(f"Failed to send message: {e.status_code} - {str(e)}")
         except Exception as e:
             logger.error("Error sending message", error=str(e))
             raise TeamsPlannierError(f"Error sending message: {str(e)}")
@@ -863,10 +897,6 @@ class SimpleTeamsPlannerClient:
     ) -> Dict[str, Any]:
         """Create a new Planner plan for a group/team"""
         try:
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                raise TeamsPlannierError("No valid access token available")
-
             plan_data = {
                 "container": {
                     "containerId": group_id,
@@ -875,30 +905,19 @@ class SimpleTeamsPlannerClient:
                 "title": title
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/planner/plans",
-                    headers={
-                        "Authorization": f"Bearer {access_token}",
-                        "Content-Type": "application/json"
-                    },
-                    json=plan_data
-                )
-
-                if response.status_code == 201:
-                    plan_result = response.json()
-                    logger.info("Plan created successfully",
-                              plan_id=plan_result.get('id'),
-                              title=title,
-                              group_id=group_id)
-                    return plan_result
-                else:
-                    error_text = response.text
-                    logger.error("Failed to create plan",
-                               status_code=response.status_code,
-                               error=error_text)
-                    raise TeamsPlannierError(f"Failed to create plan: {response.status_code} - {error_text}")
-
+            plan_result = await self._request("POST", "/planner/plans", user_id, data=plan_data)
+            self.etag_cache.record_resource("plan", plan_result)
+            logger.info("Plan created successfully",
+                      plan_id=plan_result.get('id'),
+                      title=title,
+                      group_id=group_id)
+            return plan_result
+
+        except GraphAPIError as e:
+            logger.error("Failed to create plan",
+                       status_code=e.status_code,
+                       error=str(e))
+            raise TeamsPlannierError(f"Failed to create plan: {e.status_code} - {str(e)}")
         except Exception as e:
             logger.error("Error creating plan", error=str(e))
             raise TeamsPlannierError(f"Error creating plan: {str(e)}")
@@ -914,39 +933,25 @@ class SimpleTeamsPlannerClient:
 
         try:
             # Test 1: Get user info
-            access_token = await self.auth_service.get_access_token(user_id)
-            if not access_token:
-                results["errors"].append("No valid access token available")
-                return results
-
-            async with httpx.AsyncClient() as client:
-                # Test user info
-                response = await client.get(
-                    f"{self.base_url}/me",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code == 200:
-                    results["user_info"] = response.json()
-                    logger.info("User info retrieved successfully")
-                else:
-                    results["errors"].append(f"Failed to get user info: {response.status_code}")
-
-                # Test teams access
-                response = await client.get(
-                    f"{self.base_url}/me/joinedTeams",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code == 200:
-                    teams_data = response.json()
-                    results["teams"] = teams_data.get('value', [])
-                    results["connectivity_test"] = True
-                    logger.info("Teams connectivity test successful",
-                              teams_count=len(results["teams"]))
-                else:
-                    results["errors"].append(f"Failed to get teams: {response.status_code}")
-
+            try:
+                results["user_info"] = await self._request("GET", "/me", user_id)
+                logger.info("User info retrieved successfully")
+            except GraphAPIError as e:
+                results["errors"].append(f"Failed to get user info: {e.status_code}")
+
+            # Test teams access
+            try:
+                teams_data = await self._request("GET", "/me/joinedTeams", user_id)
+                results["teams"] = teams_data.get('value', [])
+                results["connectivity_test"] = True
+                logger.info("Teams connectivity test successful",
+                          teams_count=len(results["teams"]))
+            except GraphAPIError as e:
+                results["errors"].append(f"Failed to get teams: {e.status_code}")
+
+        except TeamsPlannierError as e:
+            # No usable access token
+            results["errors"].append(str(e))
         except Exception as e:
             error_msg = f"Connectivity test failed: {str(e)}"
             results["errors"].append(error_msg)
@@ -1016,6 +1021,7 @@ async def run_mvp_test():
         print(f"❌ MVP test failed: {str(e)}")
 
     finally:
+        await client.close()
         await cache_service.close()
 
 
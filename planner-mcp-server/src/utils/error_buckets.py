@@ -0,0 +1,159 @@
+"""
+Time-bucketed error counts for windowed error reports
+
+Errors are aggregated into one bucket per minute, counted by category,
+severity and error code. The buckets live in a fixed-size ring that covers
+the report window, so memory does not grow with error volume and a report
+over the last N hours reads at most N * 60 buckets. Codes beyond the per-minute
+limit are counted under OVERFLOW_ERROR_CODE.
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+OVERFLOW_ERROR_CODE = "_other"
+
+
+@dataclass(slots=True)
+class ErrorBucket:
+    """Error counts for one minute"""
+    minute: int = -1  # Minutes since the epoch; -1 while unused
+    total: int = 0
+    by_category: Dict[str, int] = field(default_factory=dict)
+    by_severity: Dict[str, int] = field(default_factory=dict)
+    by_code: Dict[str, int] = field(default_factory=dict)
+
+    def reset(self, minute: int) -> None:
+        """Reuse the bucket for another minute"""
+        self.minute = minute
+        self.total = 0
+        self.by_category.clear()
+        self.by_severity.clear()
+        self.by_code.clear()
+
+
+class ErrorTimeBuckets:
+    """Ring of per-minute error buckets"""
+
+    def __init__(self, window_minutes: int = 1440, max_codes_per_minute: int = 200):
+        self.window_minutes = max(1, window_minutes)
+        self.max_codes_per_minute = max_codes_per_minute
+        self.buckets: List[ErrorBucket] = [ErrorBucket() for _ in range(self.window_minutes)]
+
+        self.stats = {
+            "recorded": 0,
+            "dropped": 0,  # Older than the window
+            "overflowed": 0  # Counted under OVERFLOW_ERROR_CODE
+        }
+
+    def record(self, category: str, severity: str, error_code: str,
+               timestamp: Optional[datetime] = None) -> bool:
+        """
+        Count an error in the bucket of its minute
+
+        Args:
+            category: Error category
+            severity: Error severity
+            error_code: Error code
+            timestamp: When the error occurred (default: now)
+
+        Returns:
+            False if the error is older than the window and was not counted
+        """
+        now_minute = int(time.time() // 60)
+        minute = self._to_minute(timestamp) if timestamp else now_minute
+        # Future timestamps (clock skew) count as now
+        minute = min(minute, now_minute)
+
+        if minute <= now_minute - self.window_minutes:
+            self.stats["dropped"] += 1
+            return False
+
+        bucket = self.buckets[minute % self.window_minutes]
+        if bucket.minute != minute:
+            if bucket.minute > minute:
+                # Slot already holds a newer minute
+                self.stats["dropped"] += 1
+                return False
+            bucket.reset(minute)
+
+        if error_code not in bucket.by_code and len(bucket.by_code) >= self.max_codes_per_minute:
+            error_code = OVERFLOW_ERROR_CODE
+            self.stats["overflowed"] += 1
+
+        bucket.total += 1
+        bucket.by_category[category] = bucket.by_category.get(category, 0) + 1
+        bucket.by_severity[severity] = bucket.by_severity.get(severity, 0) + 1
+        bucket.by_code[error_code] = bucket.by_code.get(error_code, 0) + 1
+        self.stats["recorded"] += 1
+        return True
+
+    def summarize(self, minutes: int) -> Dict[str, Any]:
+        """
+        Aggregate the buckets of the last minutes
+
+        Args:
+            minutes: Length of the window, capped at window_minutes
+
+        Returns:
+            Totals by category, severity and code, and per-minute counts
+        """
+        minutes = max(0, min(minutes, self.window_minutes))
+        now_minute = int(time.time() // 60)
+
+        total = 0
+        by_category: Dict[str, int] = {}
+        by_severity: Dict[str, int] = {}
+        by_code: Dict[str, int] = {}
+        per_minute: List[Dict[str, Any]] = []
+
+        for minute in range(now_minute - minutes + 1, now_minute + 1):
+            bucket = self.buckets[minute % self.window_minutes]
+            if bucket.minute != minute or not bucket.total:
+                continue
+
+            total += bucket.total
+            for counts, merged in ((bucket.by_category, by_category),
+                                   (bucket.by_severity, by_severity),
+                                   (bucket.by_code, by_code)):
+                for key, count in counts.items():
+                    merged[key] = merged.get(key, 0) + count
+            per_minute.append({
+                "minute": datetime.fromtimestamp(minute * 60, timezone.utc).isoformat(),
+                "count": bucket.total
+            })
+
+        return {
+            "minutes": minutes,
+            "total": total,
+            "by_category": by_category,
+            "by_severity": by_severity,
+            "by_code": by_code,
+            "per_minute": per_minute
+        }
+
+    def clear(self) -> None:
+        """Forget all counts"""
+        for bucket in self.buckets:
+            bucket.reset(-1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bucket usage statistics"""
+        now_minute = int(time.time() // 60)
+        return {
+            **self.stats,
+            "window_minutes": self.window_minutes,
+            "active_buckets": sum(
+                1 for bucket in self.buckets
+                if bucket.minute > now_minute - self.window_minutes and bucket.total
+            )
+        }
+
+    @staticmethod
+    def _to_minute(timestamp: datetime) -> int:
+        """Minutes since the epoch; naive timestamps are taken as UTC"""
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return int(timestamp.timestamp() // 60)
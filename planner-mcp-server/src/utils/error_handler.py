@@ -3,20 +3,27 @@ Enhanced error handling and classification for Graph API operations
 Story 2.1 Task 7: Comprehensive Error Classification
 """
 
+import os
 import re
 import uuid
 import asyncio
-from typing import Dict, List, Any, Optional, Callable, Union, Type
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Union, Type, Pattern, Tuple
 from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import structlog
 
 from ..models.graph_models import ErrorContext
+from .shared_circuit_breaker import SharedCircuitBreaker
+from .error_buckets import ErrorTimeBuckets
+from .performance_monitor import get_performance_monitor
 
 
 logger = structlog.get_logger(__name__)
 
+_STATUS_CODE_RE = re.compile(r'\b(4\d{2}|5\d{2})\b')
+
 
 class ErrorCategory(str, Enum):
     """Error categories for classification"""
@@ -67,6 +74,18 @@ class ErrorPattern:
     tags: List[str] = field(default_factory=list)
 
 
+# Returned for errors no pattern matches
+_UNKNOWN_ERROR_PATTERN = ErrorPattern(
+    pattern=".*",
+    category=ErrorCategory.UNKNOWN,
+    severity=ErrorSeverity.MEDIUM,
+    recovery_strategy=RecoveryStrategy.ALERT,
+    description="Unclassified error",
+    retry_count=1,
+    tags=["unknown"]
+)
+
+
 @dataclass
 class ErrorMetrics:
     """Error metrics and statistics"""
@@ -99,12 +118,33 @@ class EnhancedErrorHandler:
     Provides intelligent error classification, recovery strategies, and circuit breaker patterns
     """
 
-    def __init__(self):
+    def __init__(self, performance_monitor: Any = None):
+        self.performance_monitor = performance_monitor
         self.error_patterns = self._initialize_error_patterns()
         self.error_metrics: Dict[str, ErrorMetrics] = {}
+
+        # Per-minute counts for windowed reports
+        self.error_buckets = ErrorTimeBuckets(
+            window_minutes=int(os.getenv("ERROR_METRICS_WINDOW_MINUTES", "1440")),
+            max_codes_per_minute=int(os.getenv("ERROR_METRICS_MAX_CODES_PER_MINUTE", "200"))
+        )
+
         self.circuit_breakers: Dict[str, CircuitBreakerState] = {}
         self.correlation_tracking: Dict[str, List[str]] = {}
 
+        # Compiled form of error_patterns, rebuilt when the list changes
+        self._compiled_patterns: Tuple[ErrorPattern, ...] = ()
+        self._pattern_regexes: List[Pattern] = []
+        # First pattern matched by a status code or Graph error code on its own
+        self._dispatch_table: Dict[str, Optional[int]] = {}
+
+        # Memoized classifications of repeated messages (LRU)
+        self.classification_cache_size = int(os.getenv("ERROR_CLASSIFICATION_CACHE_SIZE", "2048"))
+        self._classification_cache: "OrderedDict[Tuple[Optional[int], Optional[str], str], ErrorPattern]" = OrderedDict()
+
+        # Breaker transitions shared with other replicas, if enabled
+        self.shared_breakers: Optional[SharedCircuitBreaker] = None
+
         logger.info("Enhanced error handler initialized",
                    patterns=len(self.error_patterns))
 
@@ -324,7 +364,7 @@ class EnhancedErrorHandler:
         error_code = self._extract_error_code(error, context)
 
         # Classify using patterns
-        error_pattern = self._match_error_pattern(error_message, status_code)
+        error_pattern = self._match_error_pattern(error_message, status_code, error_code)
 
         # Generate correlation ID
         correlation_id = context.get("correlation_id") or str(uuid.uuid4())
@@ -418,7 +458,7 @@ class EnhancedErrorHandler:
         # Try to parse from message
         if isinstance(error, (str, Exception)):
             message = str(error)
-            status_match = re.search(r'\b(4\d{2}|5\d{2})\b', message)
+            status_match = _STATUS_CODE_RE.search(message)
             if status_match:
                 return int(status_match.group(1))
 
@@ -445,29 +485,88 @@ class EnhancedErrorHandler:
 
         return None
 
-    def _match_error_pattern(self, error_message: str, status_code: Optional[int]) -> ErrorPattern:
-        """Match error against classification patterns"""
+    def _match_error_pattern(self, error_message: str, status_code: Optional[int],
+                             error_code: Optional[str] = None) -> ErrorPattern:
+        """
+        Match error against classification patterns
+
+        The first pattern in error_patterns that matches wins. Patterns are
+        compiled once; status and Graph error codes are looked up in a dispatch
+        table first, so only the patterns ahead of the one the code selects are
+        tried against the message. Results for repeated errors come from an LRU
+        cache.
+
+        Args:
+            error_message: Error message
+            status_code: HTTP status code, if known
+            error_code: Graph error code, if known
+
+        Returns:
+            Matching pattern, or the unknown pattern
+        """
+        if len(self.error_patterns) != len(self._compiled_patterns) or \
+                tuple(self.error_patterns) != self._compiled_patterns:
+            self._compile_error_patterns()
+
+        cache_key = (status_code, error_code, error_message)
+        cached = self._classification_cache.get(cache_key)
+        if cached is not None:
+            self._classification_cache.move_to_end(cache_key)
+            return cached
+
         search_text = error_message.lower()
 
         # Add status code to search text if available
         if status_code:
             search_text = f"{status_code} {search_text}"
 
-        # Try to match patterns
-        for pattern in self.error_patterns:
-            if re.search(pattern.pattern, search_text, re.IGNORECASE):
-                return pattern
-
-        # Default unknown pattern
-        return ErrorPattern(
-            pattern=".*",
-            category=ErrorCategory.UNKNOWN,
-            severity=ErrorSeverity.MEDIUM,
-            recovery_strategy=RecoveryStrategy.ALERT,
-            description="Unclassified error",
-            retry_count=1,
-            tags=["unknown"]
-        )
+        # Fast path: the pattern selected by the codes, unless an earlier one matches the text
+        candidate = None
+        if status_code:
+            index = self._dispatch_index(f"{status_code} ")
+            if index is not None and self._pattern_regexes[index].search(search_text):
+                candidate = index
+        if error_code and error_code != str(status_code):
+            index = self._dispatch_index(error_code)
+            if index is not None and (candidate is None or index < candidate):
+                candidate = index
+
+        index = self._scan_patterns(search_text, len(self._compiled_patterns) if candidate is None else candidate)
+        if index is None:
+            index = candidate
+        pattern = self._compiled_patterns[index] if index is not None else _UNKNOWN_ERROR_PATTERN
+
+        if self.classification_cache_size > 0:
+            self._classification_cache[cache_key] = pattern
+            if len(self._classification_cache) > self.classification_cache_size:
+                self._classification_cache.popitem(last=False)
+
+        return pattern
+
+    def _compile_error_patterns(self) -> None:
+        """Compile error_patterns and reset everything derived from them"""
+        self._compiled_patterns = tuple(self.error_patterns)
+        self._pattern_regexes = [re.compile(p.pattern, re.IGNORECASE) for p in self._compiled_patterns]
+        self._dispatch_table.clear()
+        self._classification_cache.clear()
+
+    def _dispatch_index(self, code: str) -> Optional[int]:
+        """Get the index of the first pattern matching a status or error code"""
+        if code in self._dispatch_table:
+            return self._dispatch_table[code]
+
+        index = self._scan_patterns(code.lower(), len(self._compiled_patterns))
+        if len(self._dispatch_table) >= self.classification_cache_size:
+            self._dispatch_table.clear()
+        self._dispatch_table[code] = index
+        return index
+
+    def _scan_patterns(self, search_text: str, end: int) -> Optional[int]:
+        """Get the index of the first of the first `end` patterns matching the text"""
+        for index, regex in enumerate(self._pattern_regexes[:end]):
+            if regex.search(search_text):
+                return index
+        return None
 
     def _get_suggested_action(self, pattern: ErrorPattern) -> str:
         """Get suggested action based on error pattern"""
@@ -497,6 +596,15 @@ class EnhancedErrorHandler:
         metrics.recent_count += 1
         metrics.last_seen = error_context.timestamp
 
+        category = error_context.additional_details.get("category", ErrorCategory.UNKNOWN)
+        severity = error_context.additional_details.get("severity", ErrorSeverity.MEDIUM)
+        category = getattr(category, "value", category)
+        severity = getattr(severity, "value", severity)
+        self.error_buckets.record(category, severity, error_code, error_context.timestamp)
+
+        if self.performance_monitor:
+            self.performance_monitor.record_classified_error(category, severity)
+
         # Update correlation tracking
         if error_context.correlation_id:
             if error_context.correlation_id not in self.correlation_tracking:
@@ -538,23 +646,33 @@ class EnhancedErrorHandler:
         delay = base_delay * (multiplier ** retry_count) * (1 + jitter)
         return min(delay, max_delay)
 
+    def set_shared_circuit_breaker(self, shared_breakers: Optional[SharedCircuitBreaker]) -> None:
+        """Share circuit breaker transitions with other replicas (None to stop sharing)"""
+        self.shared_breakers = shared_breakers
+
     def _is_circuit_breaker_open(self, operation: str) -> bool:
         """Check if circuit breaker is open for operation"""
-        if operation not in self.circuit_breakers:
-            return False
-
-        breaker = self.circuit_breakers[operation]
+        breaker = self.circuit_breakers.get(operation)
 
-        if breaker.state == "open":
+        if breaker is not None and breaker.state == "open":
             # Check if timeout has passed
             if breaker.next_attempt and datetime.now(timezone.utc) >= breaker.next_attempt:
                 breaker.state = "half_open"
                 breaker.success_count = 0
                 logger.info("Circuit breaker transitioning to half-open", operation=operation)
+                # Other replicas hold off while this one probes
+                lease = datetime.now(timezone.utc) + timedelta(seconds=breaker.timeout)
+                self._share_transition(operation, "half_open", lease)
                 return False
             return True
 
-        return False
+        # Another replica opened the breaker or is probing it
+        return bool(self.shared_breakers and self.shared_breakers.blocking_state(operation))
+
+    def _share_transition(self, operation: str, state: str, next_attempt: Optional[datetime] = None) -> None:
+        """Propagate a breaker transition to other replicas"""
+        if self.shared_breakers:
+            self.shared_breakers.share(operation, state, next_attempt.timestamp() if next_attempt else None)
 
     def record_operation_result(self, operation: str, success: bool, error_context: Optional[ErrorContext] = None) -> None:
         """Record operation result for circuit breaker tracking"""
@@ -577,6 +695,7 @@ class EnhancedErrorHandler:
                 breaker.state = "closed"
                 breaker.failure_count = 0
                 logger.info("Circuit breaker closed", operation=operation)
+                self._share_transition(operation, "closed")
 
         else:
             breaker.failure_count += 1
@@ -585,6 +704,7 @@ class EnhancedErrorHandler:
             if breaker.state in ["closed", "half_open"] and breaker.failure_count >= breaker.threshold:
                 breaker.state = "open"
                 breaker.next_attempt = datetime.now(timezone.utc) + timedelta(seconds=breaker.timeout)
+                self._share_transition(operation, "open", breaker.next_attempt)
                 logger.warning("Circuit breaker opened",
                              operation=operation,
                              failure_count=breaker.failure_count)
@@ -596,18 +716,21 @@ class EnhancedErrorHandler:
         return self.circuit_breakers.copy()
 
     def generate_error_report(self, hours: int = 24) -> Dict[str, Any]:
-        """Generate comprehensive error report"""
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        """
+        Generate comprehensive error report
 
-        # Filter recent errors
-        recent_errors = {
-            code: metrics for code, metrics in self.error_metrics.items()
-            if metrics.last_seen and metrics.last_seen >= cutoff_time
-        }
+        Counts come from the per-minute error buckets, so the report covers at
+        most ERROR_METRICS_WINDOW_MINUTES.
 
-        # Calculate statistics
-        total_errors = sum(metrics.recent_count for metrics in recent_errors.values())
-        top_errors = sorted(recent_errors.items(), key=lambda x: x[1].recent_count, reverse=True)[:10]
+        Args:
+            hours: Length of the report period
+
+        Returns:
+            Error counts, top errors, circuit breakers and correlated errors
+        """
+        window = self.error_buckets.summarize(int(hours * 60))
+
+        top_errors = sorted(window["by_code"].items(), key=lambda x: x[1], reverse=True)[:10]
 
         # Circuit breaker status
         active_breakers = {
@@ -617,16 +740,19 @@ class EnhancedErrorHandler:
 
         return {
             "report_period_hours": hours,
-            "total_errors": total_errors,
-            "unique_error_types": len(recent_errors),
+            "total_errors": window["total"],
+            "unique_error_types": len(window["by_code"]),
             "top_errors": [
                 {
                     "error_code": code,
-                    "count": metrics.recent_count,
-                    "last_seen": metrics.last_seen.isoformat() if metrics.last_seen else None
+                    "count": count,
+                    "last_seen": self._last_seen(code)
                 }
-                for code, metrics in top_errors
+                for code, count in top_errors
             ],
+            "errors_by_category": window["by_category"],
+            "errors_by_severity": window["by_severity"],
+            "errors_per_minute": window["per_minute"],
             "circuit_breaker_status": {
                 op: {
                     "state": breaker.state,
@@ -642,6 +768,11 @@ class EnhancedErrorHandler:
             "generated_at": datetime.now(timezone.utc).isoformat()
         }
 
+    def _last_seen(self, error_code: str) -> Optional[str]:
+        """Get when an error code was last seen, for reports"""
+        metrics = self.error_metrics.get(error_code)
+        return metrics.last_seen.isoformat() if metrics and metrics.last_seen else None
+
 
 # Global error handler instance
 _error_handler: Optional[EnhancedErrorHandler] = None
@@ -651,7 +782,7 @@ def get_error_handler() -> EnhancedErrorHandler:
     """Get or create global error handler instance"""
     global _error_handler
     if _error_handler is None:
-        _error_handler = EnhancedErrorHandler()
+        _error_handler = EnhancedErrorHandler(get_performance_monitor())
     return _error_handler
 
 
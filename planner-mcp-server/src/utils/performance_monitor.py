@@ -3,9 +3,12 @@ Performance monitoring and metrics collection for Graph API operations
 Story 2.1 Task 8: Performance Optimization and Connection Management
 """
 
+import os
 import time
+import random
 import asyncio
 import threading
+from contextvars import ContextVar
 from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -13,6 +16,8 @@ from collections import defaultdict, deque
 from contextlib import asynccontextmanager
 import structlog
 
+from .quantile_sketch import DDSketch, RollingQuantileWindow
+
 # Optional monitoring dependencies
 try:
     from prometheus_client import Counter, Histogram, Gauge, start_http_server
@@ -29,6 +34,9 @@ except ImportError:
 
 logger = structlog.get_logger(__name__)
 
+# Sampling decision of the enclosing tracked operation, if any
+_parent_sampled: ContextVar[Optional[bool]] = ContextVar("performance_parent_sampled", default=None)
+
 
 @dataclass
 class PerformanceMetrics:
@@ -70,11 +78,34 @@ class PerformanceMonitor:
     def __init__(self,
                  enable_prometheus: bool = True,
                  enable_opentelemetry: bool = True,
-                 metrics_retention_minutes: int = 60):
+                 metrics_retention_minutes: int = 60,
+                 sketch_relative_accuracy: float = 0.01,
+                 sketch_slot_seconds: int = 60,
+                 sample_rate: Optional[float] = None):
         self.enable_prometheus = enable_prometheus and PROMETHEUS_AVAILABLE
         self.enable_opentelemetry = enable_opentelemetry and OPENTELEMETRY_AVAILABLE
         self.metrics_retention_minutes = metrics_retention_minutes
 
+        # Head-based sampling: sampled calls get full metrics and a span, the
+        # rest are only counted and timed on a lock-free fast path
+        self.sample_rate = sample_rate if sample_rate is not None else \
+            float(os.getenv("PERFORMANCE_SAMPLE_RATE", "1.0"))
+        self.operation_sample_rates: Dict[str, float] = {}
+        for entry in os.getenv("PERFORMANCE_OPERATION_SAMPLE_RATES", "").split(","):
+            if "=" in entry:
+                operation, rate = entry.split("=", 1)
+                self.operation_sample_rates[operation.strip()] = float(rate)
+        self.disabled_operations = {
+            operation.strip()
+            for operation in os.getenv("PERFORMANCE_DISABLED_OPERATIONS", "").split(",")
+            if operation.strip()
+        }
+        self.flush_interval = float(os.getenv("PERFORMANCE_FLUSH_INTERVAL", "1.0"))
+        self.flush_every = int(os.getenv("PERFORMANCE_FLUSH_EVERY", "256"))
+
+        # Fast-path counts per thread (an event loop's tasks share one), merged on flush
+        self._local = threading.local()
+
         # In-memory metrics storage
         self._metrics_history: deque = deque(maxlen=10000)
         self._operation_stats: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
@@ -84,11 +115,28 @@ class PerformanceMonitor:
             "last_execution": None
         })
 
+        # Rolling latency sketches per operation, and across all operations for health
+        self.sketch_relative_accuracy = sketch_relative_accuracy
+        self.sketch_slot_seconds = sketch_slot_seconds
+        self._latency_windows: Dict[str, RollingQuantileWindow] = {}
+        self._health_window = self._new_latency_window()
+
         # Connection pool tracking
         self._connection_stats = ConnectionPoolStats()
 
+        # $batch packing efficiency
+        self._batch_packing_stats = {
+            "plans": 0,
+            "batches": 0,
+            "operations": 0,
+            "capacity": 0,
+            "last_fill_ratio": 0.0,
+            "last_rounds": 0
+        }
+
         # Thread-safe access
         self._lock = threading.Lock()
+        self._cleanup_task = None
 
         # Initialize Prometheus metrics if available
         if self.enable_prometheus:
@@ -132,15 +180,100 @@ class PerformanceMonitor:
             ['operation']
         )
 
+        self.prometheus_batch_fill_ratio = Histogram(
+            'graph_api_batch_fill_ratio',
+            'Operations per $batch request divided by the per-batch limit',
+            buckets=[0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 1.0]
+        )
+
+        self.prometheus_batch_rounds = Histogram(
+            'graph_api_batch_rounds',
+            'Sequential $batch rounds needed for a packed workload',
+            buckets=[1, 2, 3, 5, 10, 20, 50]
+        )
+
+        self.prometheus_connection_events = Counter(
+            'graph_api_connection_events_total',
+            'HTTP connections opened, reused and closed by the Graph client',
+            ['event']
+        )
+
+        self.prometheus_pool_wait = Histogram(
+            'graph_api_pool_wait_seconds',
+            'Time a request waited for a pooled connection or HTTP/2 stream',
+            ['connection'],
+            buckets=[0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+        )
+
+        self.prometheus_tls_handshake = Histogram(
+            'graph_api_tls_handshake_seconds',
+            'Duration of TLS handshakes for new connections',
+            buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+        )
+
+        self.prometheus_http2_streams = Histogram(
+            'graph_api_http2_streams_per_connection',
+            'Concurrent HTTP/2 streams on a connection when a stream opens',
+            buckets=[1, 2, 4, 8, 16, 32, 64, 100]
+        )
+
+        self.prometheus_priority_queue_depth = Gauge(
+            'graph_api_priority_queue_depth',
+            'Graph requests waiting for a concurrency slot, by priority class',
+            ['priority']
+        )
+
+        self.prometheus_priority_queue_wait = Histogram(
+            'graph_api_priority_queue_wait_seconds',
+            'Time a queued Graph request waited for a concurrency slot',
+            ['priority'],
+            buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+        )
+
+        self.prometheus_classified_errors = Counter(
+            'graph_api_classified_errors_total',
+            'Errors classified by the error handler, by category and severity',
+            ['category', 'severity']
+        )
+
+    def track_operation(self, operation_name: str, metadata: Dict[str, Any] = None):
+        """
+        Context manager to track operation performance
+
+        Yields the PerformanceMetrics of a sampled call, or None for calls that
+        are only counted (not sampled) or not tracked (operation disabled).
+        """
+        return self._track(operation_name, metadata, self.sampling_decision(operation_name))
+
     @asynccontextmanager
-    async def track_operation(self, operation_name: str, metadata: Dict[str, Any] = None):
-        """Context manager to track operation performance"""
+    async def _track(self, operation_name: str, metadata: Optional[Dict[str, Any]], sampled: Optional[bool]):
+        """Track an operation with an already drawn sampling decision"""
+        if not sampled:
+            if sampled is None:
+                yield None
+                return
+
+            token = _parent_sampled.set(False)
+            start = time.perf_counter()
+            error = False
+            try:
+                yield None
+            except Exception:
+                error = True
+                raise
+            finally:
+                _parent_sampled.reset(token)
+                self.record_unsampled(operation_name, time.perf_counter() - start, error,
+                                      (metadata or {}).get("endpoint", "unknown"))
+            return
+
         metadata = metadata or {}
         metrics = PerformanceMetrics(
             operation_name=operation_name,
             start_time=time.time(),
             metadata=metadata
         )
+        token = _parent_sampled.set(True)
 
         # Start OpenTelemetry span if available
         span = None
@@ -166,12 +299,125 @@ class PerformanceMonitor:
             raise
 
         finally:
+            _parent_sampled.reset(token)
+
             # Record metrics
             self._record_metrics(metrics)
 
             if span:
                 span.end()
 
+    def sampling_decision(self, operation_name: str) -> Optional[bool]:
+        """
+        Decide how to track a call of an operation
+
+        Calls inside an unsampled operation are never sampled, so sampled
+        traces are complete from their root.
+
+        Args:
+            operation_name: Operation being called
+
+        Returns:
+            True to sample, False to only count the call, None if the operation is disabled
+        """
+        if operation_name in self.disabled_operations:
+            return None
+        if _parent_sampled.get() is False:
+            return False
+
+        rate = self.operation_sample_rates.get(operation_name, self.sample_rate)
+        if rate >= 1.0:
+            return True
+        return rate > 0.0 and random.random() < rate
+
+    def set_sample_rate(self, rate: float, operation_name: Optional[str] = None) -> None:
+        """
+        Set the sampling rate for all operations or one operation
+
+        Args:
+            rate: Fraction of calls to sample (0.0 to 1.0)
+            operation_name: Operation to configure (default: the global rate)
+        """
+        rate = min(max(rate, 0.0), 1.0)
+        if operation_name is None:
+            self.sample_rate = rate
+        else:
+            self.operation_sample_rates[operation_name] = rate
+
+    def disable_operation(self, operation_name: str) -> None:
+        """Stop tracking an operation entirely"""
+        self.disabled_operations.add(operation_name)
+
+    def enable_operation(self, operation_name: str) -> None:
+        """Resume tracking a disabled operation"""
+        self.disabled_operations.discard(operation_name)
+
+    def record_unsampled(self, operation_name: str, duration: float, error: bool = False,
+                         endpoint: str = "unknown") -> None:
+        """
+        Count a call that was not sampled
+
+        Counts accumulate per thread without locking and are merged into the
+        operation statistics every flush_every calls or flush_interval seconds.
+        """
+        local = self._local
+        pending = getattr(local, "pending", None)
+        if pending is None:
+            pending = local.pending = {}
+            local.pending_calls = 0
+            local.flushed_at = time.perf_counter()
+
+        entry = pending.get((operation_name, endpoint))
+        if entry is None:
+            pending[(operation_name, endpoint)] = [1, int(error), duration]
+        else:
+            entry[0] += 1
+            entry[1] += error
+            entry[2] += duration
+
+        local.pending_calls += 1
+        if local.pending_calls >= self.flush_every or \
+                time.perf_counter() - local.flushed_at >= self.flush_interval:
+            self.flush_unsampled()
+
+    def flush_unsampled(self) -> None:
+        """Merge the calling thread's unsampled counts into the operation statistics and system health"""
+        local = self._local
+        pending = getattr(local, "pending", None)
+        local.flushed_at = time.perf_counter()
+        if not pending:
+            return
+        local.pending = {}
+        local.pending_calls = 0
+
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for (operation_name, _), (count, errors, duration) in pending.items():
+                stats = self._operation_stats[operation_name]
+                stats["count"] += count
+                stats["error_count"] += errors
+                stats["total_duration"] += duration
+                stats["last_execution"] = now
+                # Counted in system health at their mean duration
+                self._health_window.add_many(duration / count, count, errors)
+
+        if not self.enable_prometheus:
+            return
+
+        for (operation_name, endpoint), (count, errors, _) in pending.items():
+            if count > errors:
+                self.prometheus_request_total.labels(
+                    operation=operation_name, status="success", endpoint=endpoint
+                ).inc(count - errors)
+            if errors:
+                self.prometheus_request_total.labels(
+                    operation=operation_name, status="error", endpoint=endpoint
+                ).inc(errors)
+            stats = self._operation_stats[operation_name]
+            self.prometheus_error_rate.labels(operation=operation_name).set(
+                (stats["error_count"] / stats["count"]) * 100
+            )
+
     def _record_metrics(self, metrics: PerformanceMetrics) -> None:
         """Record performance metrics"""
         with self._lock:
@@ -187,6 +433,14 @@ class PerformanceMonitor:
             if metrics.status == "error":
                 stats["error_count"] += 1
 
+            if metrics.duration is not None:
+                window = self._latency_windows.get(metrics.operation_name)
+                if window is None:
+                    window = self._latency_windows[metrics.operation_name] = self._new_latency_window()
+                is_error = metrics.status == "error"
+                window.add(metrics.duration, is_error, metrics.end_time)
+                self._health_window.add(metrics.duration, is_error, metrics.end_time)
+
         # Update Prometheus metrics if available
         if self.enable_prometheus and metrics.duration:
             endpoint = metrics.metadata.get("endpoint", "unknown")
@@ -213,6 +467,7 @@ class PerformanceMonitor:
 
     def get_operation_stats(self, operation_name: str) -> Dict[str, Any]:
         """Get statistics for a specific operation"""
+        self.flush_unsampled()
         with self._lock:
             stats = self._operation_stats[operation_name].copy()
 
@@ -227,6 +482,7 @@ class PerformanceMonitor:
 
     def get_all_operation_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for all operations"""
+        self.flush_unsampled()
         return {
             operation: self.get_operation_stats(operation)
             for operation in self._operation_stats.keys()
@@ -273,6 +529,71 @@ class PerformanceMonitor:
                 self._connection_stats.total_connections
             )
 
+    def record_connection_pool_telemetry(self,
+                                         event: Optional[str] = None,
+                                         count: int = 1,
+                                         pool_wait: Optional[float] = None,
+                                         tls_handshake: Optional[float] = None,
+                                         http2_streams: Optional[int] = None) -> None:
+        """
+        Export measured connection pool telemetry
+
+        Args:
+            event: Connection event ("opened", "reused" or "closed")
+            count: Number of connections the event applies to
+            pool_wait: Seconds the request waited for its connection
+            tls_handshake: Seconds spent in a TLS handshake
+            http2_streams: Open HTTP/2 streams on the connection
+        """
+        with self._lock:
+            if event == "opened":
+                self._connection_stats.connection_creation_count += count
+            elif event == "reused":
+                self._connection_stats.connection_reuse_count += count
+
+        if not self.enable_prometheus:
+            return
+
+        if event:
+            self.prometheus_connection_events.labels(event=event).inc(count)
+        if pool_wait is not None:
+            self.prometheus_pool_wait.labels(
+                connection="reused" if event == "reused" else "new"
+            ).observe(pool_wait)
+        if tls_handshake is not None:
+            self.prometheus_tls_handshake.observe(tls_handshake)
+        if http2_streams is not None:
+            self.prometheus_http2_streams.observe(http2_streams)
+
+    def record_priority_queue(self, priority: str, depth: int, wait: Optional[float] = None) -> None:
+        """
+        Export the state of a Graph request priority queue
+
+        Args:
+            priority: Priority class ("interactive", "bulk" or "maintenance")
+            depth: Requests currently queued in the class
+            wait: Seconds a request just admitted from the queue waited
+        """
+        if not self.enable_prometheus:
+            return
+
+        self.prometheus_priority_queue_depth.labels(priority=priority).set(depth)
+        if wait is not None:
+            self.prometheus_priority_queue_wait.labels(priority=priority).observe(wait)
+
+    def record_classified_error(self, category: str, severity: str) -> None:
+        """
+        Export a classified error
+
+        Args:
+            category: Error category
+            severity: Error severity
+        """
+        if not self.enable_prometheus:
+            return
+
+        self.prometheus_classified_errors.labels(category=category, severity=severity).inc()
+
     def get_connection_stats(self) -> ConnectionPoolStats:
         """Get current connection pool statistics"""
         with self._lock:
@@ -286,36 +607,105 @@ class PerformanceMonitor:
                 connection_errors=self._connection_stats.connection_errors
             )
 
+    def record_batch_packing(self, batch_count: int, operation_count: int, capacity: int, rounds: int) -> None:
+        """Record how well a workload was packed into $batch requests"""
+        fill_ratio = operation_count / capacity if capacity else 0.0
+
+        with self._lock:
+            self._batch_packing_stats["plans"] += 1
+            self._batch_packing_stats["batches"] += batch_count
+            self._batch_packing_stats["operations"] += operation_count
+            self._batch_packing_stats["capacity"] += capacity
+            self._batch_packing_stats["last_fill_ratio"] = fill_ratio
+            self._batch_packing_stats["last_rounds"] = rounds
+
+        if self.enable_prometheus and capacity:
+            self.prometheus_batch_fill_ratio.observe(fill_ratio)
+            self.prometheus_batch_rounds.observe(rounds)
+
+    def get_batch_packing_stats(self) -> Dict[str, Any]:
+        """Get cumulative $batch packing statistics"""
+        with self._lock:
+            stats = self._batch_packing_stats.copy()
+
+        stats["fill_ratio"] = stats["operations"] / stats["capacity"] if stats["capacity"] else 0.0
+        return stats
+
     def calculate_percentiles(self, operation_name: str, percentiles: List[float] = None) -> Dict[str, float]:
-        """Calculate response time percentiles for an operation"""
+        """
+        Estimate response time percentiles for an operation
+
+        Read from the operation's rolling sketch over the retention window; each
+        estimate is within sketch_relative_accuracy of the exact percentile.
+
+        Args:
+            operation_name: Operation to report
+            percentiles: Percentiles to estimate (default 50, 95 and 99)
+
+        Returns:
+            Estimates keyed by "p<percentile>"
+        """
         if percentiles is None:
             percentiles = [50.0, 95.0, 99.0]
 
-        recent_metrics = self.get_recent_metrics(minutes=self.metrics_retention_minutes)
-        operation_durations = [
-            m.duration for m in recent_metrics
-            if m.operation_name == operation_name and m.duration is not None
-        ]
+        with self._lock:
+            window = self._latency_windows.get(operation_name)
+            return {
+                f"p{p}": (window.quantile(p / 100.0) if window else None) or 0.0
+                for p in percentiles
+            }
 
-        if not operation_durations:
-            return {f"p{p}": 0.0 for p in percentiles}
+    def export_latency_sketches(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Export the windowed latency sketch of every operation
 
-        operation_durations.sort()
-        result = {}
+        The result is JSON-serializable, for merging on another replica with
+        calculate_merged_percentiles.
+        """
+        with self._lock:
+            sketches = {
+                operation: window.snapshot()
+                for operation, window in self._latency_windows.items()
+            }
+            return {operation: sketch.to_dict() for operation, sketch in sketches.items() if sketch.count}
+
+    def calculate_merged_percentiles(self,
+                                     operation_name: str,
+                                     exported: List[Dict[str, Dict[str, Any]]],
+                                     percentiles: List[float] = None) -> Dict[str, float]:
+        """
+        Estimate percentiles across replicas
+
+        Args:
+            operation_name: Operation to report
+            exported: export_latency_sketches() results from other replicas
+            percentiles: Percentiles to estimate (default 50, 95 and 99)
+
+        Returns:
+            Estimates over the local and exported windows, keyed by "p<percentile>"
+        """
+        if percentiles is None:
+            percentiles = [50.0, 95.0, 99.0]
+
+        merged = DDSketch(self.sketch_relative_accuracy)
+        with self._lock:
+            window = self._latency_windows.get(operation_name)
+            if window:
+                merged.merge(window.snapshot())
 
-        for p in percentiles:
-            index = int((p / 100.0) * len(operation_durations))
-            if index >= len(operation_durations):
-                index = len(operation_durations) - 1
-            result[f"p{p}"] = operation_durations[index]
+        for sketches in exported:
+            if operation_name in sketches:
+                merged.merge(DDSketch.from_dict(sketches[operation_name]))
 
-        return result
+        return {f"p{p}": merged.quantile(p / 100.0) or 0.0 for p in percentiles}
 
     def get_system_health(self) -> Dict[str, Any]:
         """Get overall system health metrics"""
-        recent_metrics = self.get_recent_metrics(minutes=5)
+        self.flush_unsampled()
+        with self._lock:
+            recent = self._health_window.summary(seconds=300)
 
-        if not recent_metrics:
+        if not recent["count"]:
             return {
                 "status": "unknown",
                 "total_requests": 0,
@@ -323,12 +713,9 @@ class PerformanceMonitor:
                 "average_response_time": 0.0
             }
 
-        total_requests = len(recent_metrics)
-        error_count = sum(1 for m in recent_metrics if m.status == "error")
-        error_rate = (error_count / total_requests) * 100 if total_requests > 0 else 0.0
-
-        valid_durations = [m.duration for m in recent_metrics if m.duration is not None]
-        avg_response_time = sum(valid_durations) / len(valid_durations) if valid_durations else 0.0
+        total_requests = recent["count"]
+        error_rate = (recent["errors"] / total_requests) * 100
+        avg_response_time = recent["mean"]
 
         # Determine health status
         status = "healthy"
@@ -345,8 +732,36 @@ class PerformanceMonitor:
             "connection_stats": self.get_connection_stats().__dict__
         }
 
+    async def start(self) -> None:
+        """Start the periodic cleanup task"""
+        if not self._cleanup_task or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def stop(self) -> None:
+        """Stop the cleanup task and flush the pending unsampled counts"""
+        if self._cleanup_task:
+            self._cleanup_task.cancel()
+            await asyncio.gather(self._cleanup_task, return_exceptions=True)
+            self._cleanup_task = None
+        self.flush_unsampled()
+
+    async def _cleanup_loop(self) -> None:
+        """
+        Background task flushing unsampled counts and trimming the history
+
+        Runs on the event loop thread, so the counts of its tasks reach the
+        statistics every flush_interval even when no further call is tracked.
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.cleanup_old_metrics()
+            except Exception as e:
+                logger.error("Performance metrics cleanup failed", error=str(e))
+
     async def cleanup_old_metrics(self) -> None:
-        """Clean up old metrics to prevent memory growth"""
+        """Flush unsampled counts and clean up old metrics to prevent memory growth"""
+        self.flush_unsampled()
         cutoff_time = time.time() - (self.metrics_retention_minutes * 60)
 
         with self._lock:
@@ -357,6 +772,14 @@ class PerformanceMonitor:
 
         logger.debug("Cleaned up old performance metrics")
 
+    def _new_latency_window(self) -> RollingQuantileWindow:
+        """Create a latency window covering the retention period"""
+        return RollingQuantileWindow(
+            window_seconds=max(self.metrics_retention_minutes, 5) * 60,
+            slot_seconds=self.sketch_slot_seconds,
+            relative_accuracy=self.sketch_relative_accuracy
+        )
+
     def start_prometheus_server(self, port: int = 8000) -> None:
         """Start Prometheus metrics server"""
         if self.enable_prometheus:
@@ -383,16 +806,52 @@ def get_performance_monitor() -> PerformanceMonitor:
 
 def track_operation(operation_name: str, metadata: Dict[str, Any] = None):
     """Decorator to track function performance"""
+    endpoint = (metadata or {}).get("endpoint", "unknown")
+
     def decorator(func: Callable) -> Callable:
         if asyncio.iscoroutinefunction(func):
             async def async_wrapper(*args, **kwargs):
                 monitor = get_performance_monitor()
-                async with monitor.track_operation(operation_name, metadata):
+                sampled = monitor.sampling_decision(operation_name)
+                if sampled:
+                    async with monitor._track(operation_name, metadata, True):
+                        return await func(*args, **kwargs)
+                if sampled is None:
                     return await func(*args, **kwargs)
+
+                # Fast path: time and count only
+                token = _parent_sampled.set(False)
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    monitor.record_unsampled(operation_name, time.perf_counter() - start, True, endpoint)
+                    raise
+                finally:
+                    _parent_sampled.reset(token)
+                monitor.record_unsampled(operation_name, time.perf_counter() - start, False, endpoint)
+                return result
             return async_wrapper
         else:
             def sync_wrapper(*args, **kwargs):
                 monitor = get_performance_monitor()
+                sampled = monitor.sampling_decision(operation_name)
+                if sampled is None:
+                    return func(*args, **kwargs)
+
+                token = _parent_sampled.set(sampled)
+                if not sampled:
+                    start = time.perf_counter()
+                    try:
+                        result = func(*args, **kwargs)
+                    except Exception:
+                        monitor.record_unsampled(operation_name, time.perf_counter() - start, True, endpoint)
+                        raise
+                    finally:
+                        _parent_sampled.reset(token)
+                    monitor.record_unsampled(operation_name, time.perf_counter() - start, False, endpoint)
+                    return result
+
                 # For sync functions, we can't use async context manager
                 metrics = PerformanceMetrics(
                     operation_name=operation_name,
@@ -407,6 +866,7 @@ def track_operation(operation_name: str, metadata: Dict[str, Any] = None):
                     metrics.complete("error", type(e).__name__)
                     raise
                 finally:
+                    _parent_sampled.reset(token)
                     monitor._record_metrics(metrics)
             return sync_wrapper
-    return decorator
\ No newline at end of file
+    return decorator
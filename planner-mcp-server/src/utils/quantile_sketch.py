@@ -0,0 +1,281 @@
+"""
+Streaming quantile sketches for operation latencies
+
+DDSketch maps each value to a logarithmic bin whose width is a fixed fraction
+of the value, so every quantile it returns is within the configured relative
+error of the exact one, whatever the distribution. Bin counts only add up,
+which makes sketches from different time slots or replicas mergeable without
+loss, and lets a rolling window subtract the slot that falls out of it.
+
+RollingQuantileWindow keeps one sketch per time slot in a ring plus their
+running sum, so a percentile query reads only the summed bins (a few hundred
+at most for latencies) instead of sorting raw samples.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Values below this are counted as zero (no logarithmic bin)
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class DDSketch:
+    """Mergeable quantile sketch with relative-error guarantees"""
+
+    __slots__ = ("relative_accuracy", "gamma", "_multiplier", "bins",
+                 "zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self.gamma)
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value to the sketch"""
+        if value < MIN_INDEXABLE_VALUE:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) * self._multiplier)
+            self.bins[key] = self.bins.get(key, 0) + count
+
+        self.count += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add the counts of another sketch with the same accuracy"""
+        self._check_compatible(other)
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def subtract(self, other: "DDSketch") -> None:
+        """
+        Remove the counts of a sketch previously merged into this one
+
+        min and max can't be un-merged; the caller recomputes them.
+        """
+        self._check_compatible(other)
+        for key, count in other.bins.items():
+            remaining = self.bins.get(key, 0) - count
+            if remaining > 0:
+                self.bins[key] = remaining
+            else:
+                self.bins.pop(key, None)
+        self.zero_count = max(0, self.zero_count - other.zero_count)
+        self.count = max(0, self.count - other.count)
+        self.sum = self.sum - other.sum if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None for an empty sketch
+        """
+        if self.count <= 0:
+            return None
+
+        # Same rank as indexing a sorted list at int(q * n)
+        rank = min(int(q * self.count), self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    def clear(self) -> None:
+        """Reset all counts"""
+        self.bins.clear()
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the sketch for merging on another replica"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DDSketch":
+        """Rebuild a sketch serialized with to_dict"""
+        sketch = cls(data["relative_accuracy"])
+        sketch.bins = {int(key): int(count) for key, count in data.get("bins", {}).items()}
+        sketch.zero_count = int(data.get("zero_count", 0))
+        sketch.count = int(data.get("count", 0))
+        sketch.sum = float(data.get("sum", 0.0))
+        if data.get("min") is not None:
+            sketch.min = float(data["min"])
+        if data.get("max") is not None:
+            sketch.max = float(data["max"])
+        return sketch
+
+    def _check_compatible(self, other: "DDSketch") -> None:
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot combine sketches with different relative accuracy")
+
+
+@dataclass(slots=True)
+class WindowSlot:
+    """Sketch and error count for one time slot"""
+    slot: int = -1  # Slot number since the epoch; -1 while unused
+    sketch: DDSketch = field(default_factory=DDSketch)
+    errors: int = 0
+
+
+class RollingQuantileWindow:
+    """Quantile sketch over a rolling time window"""
+
+    def __init__(self, window_seconds: int = 3600, slot_seconds: int = 60,
+                 relative_accuracy: float = 0.01):
+        self.slot_seconds = max(1, slot_seconds)
+        self.slot_count = max(1, math.ceil(window_seconds / self.slot_seconds))
+        self.relative_accuracy = relative_accuracy
+
+        self.slots: List[WindowSlot] = [
+            WindowSlot(sketch=DDSketch(relative_accuracy)) for _ in range(self.slot_count)
+        ]
+        # Sum of the live slots
+        self.total = DDSketch(relative_accuracy)
+        self.errors = 0
+        self._current_slot = -1
+
+    def add(self, value: float, error: bool = False, now: Optional[float] = None) -> None:
+        """Add a value observed at `now`"""
+        slot = self._slot(now)
+        slot.sketch.add(value)
+        self.total.add(value)
+        if error:
+            slot.errors += 1
+            self.errors += 1
+
+    def add_many(self, value: float, count: int, errors: int = 0, now: Optional[float] = None) -> None:
+        """
+        Add `count` observations of `value` at `now`, `errors` of them failed
+
+        Used for pre-aggregated counts: the mean is exact, quantiles see all
+        `count` observations at `value`.
+        """
+        if count <= 0:
+            return
+        slot = self._slot(now)
+        slot.sketch.add(value, count)
+        self.total.add(value, count)
+        slot.errors += errors
+        self.errors += errors
+
+    def quantile(self, q: float, now: Optional[float] = None) -> Optional[float]:
+        """Estimate a quantile over the window"""
+        self._advance(now)
+        return self.total.quantile(q)
+
+    def snapshot(self, now: Optional[float] = None) -> DDSketch:
+        """Get the sketch summing the window (live object; copy to keep it)"""
+        self._advance(now)
+        return self.total
+
+    def summary(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Count, errors and mean over the most recent slots
+
+        Args:
+            seconds: Length of the summary, rounded up to whole slots (default: the window)
+            now: Current time
+
+        Returns:
+            Request count, error count and mean value
+        """
+        current = self._advance(now)
+        if seconds is None:
+            count, errors, total = self.total.count, self.errors, self.total.sum
+        else:
+            slots = min(self.slot_count, max(1, math.ceil(seconds / self.slot_seconds)))
+            count = errors = 0
+            total = 0.0
+            for slot_number in range(current - slots + 1, current + 1):
+                slot = self.slots[slot_number % self.slot_count]
+                if slot.slot == slot_number:
+                    count += slot.sketch.count
+                    errors += slot.errors
+                    total += slot.sketch.sum
+
+        return {
+            "count": count,
+            "errors": errors,
+            "mean": total / count if count else 0.0
+        }
+
+    def _slot(self, now: Optional[float]) -> WindowSlot:
+        """Get the slot of `now`, resetting it if it held an older slot"""
+        slot_number = self._advance(now)
+        slot = self.slots[slot_number % self.slot_count]
+        if slot.slot != slot_number:
+            slot.slot = slot_number
+            slot.sketch.clear()
+            slot.errors = 0
+        return slot
+
+    def _advance(self, now: Optional[float]) -> int:
+        """Move the window to the slot of `now`, dropping slots that left it"""
+        slot_number = int((time.time() if now is None else now) // self.slot_seconds)
+        if slot_number <= self._current_slot:
+            return self._current_slot
+
+        self._current_slot = slot_number
+        expired = False
+        for slot in self.slots:
+            if slot.slot != -1 and slot.slot <= slot_number - self.slot_count:
+                self.total.subtract(slot.sketch)
+                self.errors -= slot.errors
+                slot.slot = -1
+                slot.sketch.clear()
+                slot.errors = 0
+                expired = True
+
+        if expired:
+            # min and max can't be subtracted; recompute from the live slots
+            live = [slot.sketch for slot in self.slots if slot.slot != -1 and slot.sketch.count]
+            self.total.min = min((s.min for s in live), default=math.inf)
+            self.total.max = max((s.max for s in live), default=-math.inf)
+            if not live:
+                self.total.clear()
+                self.errors = 0
+
+        return slot_number
@@ -0,0 +1,225 @@
+"""
+Cluster-shared circuit breaker state
+
+Circuit breakers count failures per process, so without sharing every replica
+has to fail on its own before it stops calling a broken endpoint. With
+SharedCircuitBreaker the open, half-open and closed transitions of one replica
+are written to Redis (with a TTL so a dead replica cannot leave a breaker open)
+and published on a pub/sub channel. Every replica keeps the latest transitions
+in a local dict fed by its subscription, so the hot-path check is a dictionary
+lookup and never waits on Redis.
+
+A replica moving a breaker to half-open publishes a probe lease: the other
+replicas keep treating the breaker as open until the lease ends, so only one
+replica sends test requests to the recovering endpoint.
+"""
+
+import os
+import time
+import uuid
+import socket
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+import structlog
+
+from ..cache import CacheService
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(slots=True)
+class SharedBreakerState:
+    """Last transition of a breaker as published by a replica"""
+    state: str  # open, half_open or closed
+    next_attempt: Optional[float]  # End of the open period or probe lease (epoch seconds)
+    origin: str
+    updated_at: float
+
+
+class SharedCircuitBreaker:
+    """Circuit breaker transitions shared between replicas through Redis"""
+
+    def __init__(
+        self,
+        cache_service: CacheService,
+        scope: str = "graph",
+        instance_id: Optional[str] = None
+    ):
+        self.cache_service = cache_service
+        self.scope = scope
+        self.channel = f"circuit_breakers:{scope}"
+        self.key_prefix = f"circuit_breaker:{scope}:"
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        # Keep shared state a little past its deadline so late readers still see it
+        self.ttl_slack = int(os.getenv("CIRCUIT_BREAKER_SHARED_TTL_SLACK", "30"))
+        self.resubscribe_delay = float(os.getenv("CIRCUIT_BREAKER_SHARED_RESUBSCRIBE_DELAY", "1.0"))
+
+        # Latest transition per breaker key, updated by the subscription
+        self.states: Dict[str, SharedBreakerState] = {}
+
+        self._listener_task = None
+        self._pending_publishes: Set[asyncio.Task] = set()
+
+        self.stats = {
+            "published": 0,
+            "publish_failures": 0,
+            "received": 0,
+            "resubscribes": 0
+        }
+
+    async def start(self) -> None:
+        """Load breakers opened by other replicas and subscribe to transitions"""
+        await self._load_states()
+        if not self._listener_task or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen())
+
+        logger.info("Shared circuit breaker started",
+                   scope=self.scope,
+                   instance_id=self.instance_id,
+                   open_breakers=len(self.states))
+
+    async def stop(self) -> None:
+        """Finish pending publishes and stop listening"""
+        if self._pending_publishes:
+            await asyncio.gather(*self._pending_publishes, return_exceptions=True)
+        if self._listener_task:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+
+    def blocking_state(self, key: str) -> Optional[SharedBreakerState]:
+        """
+        Get a transition from another replica that should block requests now
+
+        Called on the hot path; reads only the local copy of the shared state.
+
+        Args:
+            key: Breaker key
+
+        Returns:
+            The open breaker or active probe lease of another replica, if any
+        """
+        shared = self.states.get(key)
+        if shared is None or not shared.next_attempt:
+            return None
+        if shared.next_attempt <= time.time():
+            # Deadline passed; the local breaker decides from here
+            del self.states[key]
+            return None
+        if shared.origin == self.instance_id:
+            return None
+        return shared
+
+    def share(self, key: str, state: str, next_attempt: Optional[float] = None) -> None:
+        """
+        Record a local transition and publish it without blocking the caller
+
+        Args:
+            key: Breaker key
+            state: New state (open, half_open or closed)
+            next_attempt: End of the open period or probe lease (epoch seconds)
+        """
+        self._apply(key, SharedBreakerState(state, next_attempt, self.instance_id, time.time()))
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (synchronous caller); the transition stays local
+            return
+
+        task = loop.create_task(self.publish(key, state, next_attempt))
+        self._pending_publishes.add(task)
+        task.add_done_callback(self._pending_publishes.discard)
+
+    async def publish(self, key: str, state: str, next_attempt: Optional[float] = None) -> bool:
+        """Write a transition to Redis and announce it to the other replicas"""
+        message = {
+            "key": key,
+            "state": state,
+            "next_attempt": next_attempt,
+            "origin": self.instance_id,
+            "updated_at": time.time()
+        }
+
+        try:
+            if state == "closed" or not next_attempt:
+                await self.cache_service.delete(self.key_prefix + key)
+            else:
+                ttl = max(1, int(next_attempt - time.time()) + self.ttl_slack)
+                await self.cache_service.set(self.key_prefix + key, message, ttl=ttl)
+            await self.cache_service.publish(self.channel, message)
+            self.stats["published"] += 1
+            return True
+
+        except Exception as e:
+            self.stats["publish_failures"] += 1
+            logger.error("Failed to publish circuit breaker transition",
+                        key=key,
+                        state=state,
+                        error=str(e))
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get propagation statistics"""
+        return {
+            **self.stats,
+            "scope": self.scope,
+            "instance_id": self.instance_id,
+            "tracked_breakers": len(self.states),
+            "listening": bool(self._listener_task and not self._listener_task.done())
+        }
+
+    # Private methods
+
+    async def _load_states(self) -> None:
+        """Read breakers currently open in Redis"""
+        try:
+            keys = await self.cache_service.get_keys_pattern(self.key_prefix + "*")
+            if not keys:
+                return
+            for message in (await self.cache_service.get_multiple(keys)).values():
+                self._receive(message)
+        except Exception as e:
+            logger.error("Failed to load shared circuit breakers", scope=self.scope, error=str(e))
+
+    async def _listen(self) -> None:
+        """Apply transitions published by other replicas, resubscribing after errors"""
+        while True:
+            try:
+                async for message in self.cache_service.subscribe(self.channel):
+                    self._receive(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Circuit breaker subscription failed", scope=self.scope, error=str(e))
+
+            # Transitions published meanwhile are missed; reload what is open
+            self.stats["resubscribes"] += 1
+            await asyncio.sleep(self.resubscribe_delay)
+            await self._load_states()
+
+    def _receive(self, message: Any) -> None:
+        """Apply a transition message from Redis"""
+        if not isinstance(message, dict) or "key" not in message:
+            return
+        if message.get("origin") == self.instance_id:
+            return
+
+        self.stats["received"] += 1
+        self._apply(message["key"], SharedBreakerState(
+            state=message.get("state", "closed"),
+            next_attempt=message.get("next_attempt"),
+            origin=message.get("origin", ""),
+            updated_at=message.get("updated_at") or time.time()
+        ))
+
+    def _apply(self, key: str, shared: SharedBreakerState) -> None:
+        """Keep the newest transition per key"""
+        current = self.states.get(key)
+        if current and current.updated_at > shared.updated_at:
+            return
+        if shared.state == "closed":
+            self.states.pop(key, None)
+        else:
+            self.states[key] = shared
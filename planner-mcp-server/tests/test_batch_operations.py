@@ -6,6 +6,7 @@ Story 2.1 Task 1: Tests for batch request building, response parsing, dependenci
 import pytest
 import asyncio
 import json
+import time
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Any
@@ -305,6 +306,133 @@ class TestBatchOperationBuilder:
         assert builder_config["strategy"] == BatchOptimizationStrategy.DEPENDENCY_AWARE
 
 
+
+class TestDependencyAwarePacking:
+    """Packing operations into as few batches and rounds as possible"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.builder = BatchOperationBuilder(BatchRequestConfig(max_operations_per_batch=20))
+
+    @staticmethod
+    def _chain(prefix: str, length: int) -> List[BatchOperation]:
+        operations = []
+        for i in range(length):
+            operations.append(BatchOperation(
+                id=f"{prefix}_{i}",
+                method=RequestMethod.POST,
+                url="/planner/tasks",
+                depends_on=[f"{prefix}_{i - 1}"] if i else None
+            ))
+        return operations
+
+    @staticmethod
+    def _assert_dependencies_respected(plan):
+        position = {}
+        packed = []
+        for round_index, batches in enumerate(plan.rounds):
+            for batch_index, batch in enumerate(batches):
+                for op_index, op in enumerate(batch):
+                    position[op.id] = (round_index, batch_index, op_index)
+                    packed.append(op)
+
+        for op in packed:
+            round_index, batch_index, op_index = position[op.id]
+            for dep_id in op.depends_on or []:
+                dep_round, dep_batch, dep_index = position[dep_id]
+                same_batch = (dep_round, dep_batch) == (round_index, batch_index)
+                assert dep_round < round_index or (same_batch and dep_index < op_index)
+
+    def test_cyclic_dependencies_are_rejected(self):
+        """Operations in a dependsOn cycle are reported instead of silently dropped"""
+        operations = [
+            BatchOperation(id="a", method=RequestMethod.POST, url="/planner/tasks", depends_on=["b"]),
+            BatchOperation(id="b", method=RequestMethod.POST, url="/planner/tasks", depends_on=["a"]),
+            BatchOperation(id="c", method=RequestMethod.POST, url="/planner/tasks"),
+        ]
+
+        with pytest.raises(ValueError, match="Circular dependency detected in batch operations: a, b"):
+            self.builder.pack_operations(operations)
+
+    def test_chains_bin_packed_into_full_batches(self):
+        """Independent chains of mixed sizes fill batches completely"""
+        operations = []
+        for index, length in enumerate([12, 8, 5, 5, 5, 3, 2]):
+            operations.extend(self._chain(f"chain{index}", length))
+
+        plan = self.builder.pack_operations(operations)
+
+        assert len(plan.rounds) == 1
+        assert plan.batch_count == 2
+        assert plan.fill_ratio == 1.0
+        self._assert_dependencies_respected(plan)
+
+    def test_oversized_chain_split_across_rounds(self):
+        """A chain longer than a batch runs over sequential rounds"""
+        plan = self.builder.pack_operations(self._chain("long", 45))
+
+        assert len(plan.rounds) == 3
+        assert [len(batch) for batches in plan.rounds for batch in batches] == [20, 20, 5]
+        self._assert_dependencies_respected(plan)
+
+    def test_wide_fan_out_uses_two_rounds(self):
+        """One parent with 100 children needs two rounds, not six"""
+        operations = [BatchOperation(id="bucket", method=RequestMethod.POST, url="/planner/buckets")]
+        operations.extend(
+            BatchOperation(id=f"task_{i}", method=RequestMethod.POST, url="/planner/tasks", depends_on=["bucket"])
+            for i in range(100)
+        )
+
+        plan = self.builder.pack_operations(operations)
+
+        assert len(plan.rounds) == 2
+        assert plan.batch_count == 6
+        self._assert_dependencies_respected(plan)
+
+    def test_independent_operations_fill_later_rounds(self):
+        """Free operations use leftover space instead of opening batches"""
+        operations = self._chain("long", 25)
+        operations.extend(
+            BatchOperation(id=f"read_{i}", method=RequestMethod.GET, url=f"/me/{i}") for i in range(15)
+        )
+
+        plan = self.builder.pack_operations(operations)
+
+        assert len(plan.rounds) == 2
+        assert plan.batch_count == 2
+        assert plan.fill_ratio == 1.0
+
+    def test_fill_ratio_published(self):
+        """Every packing plan is recorded with the performance monitor"""
+        from src.utils.performance_monitor import get_performance_monitor
+
+        monitor = get_performance_monitor()
+        plans_before = monitor.get_batch_packing_stats()["plans"]
+
+        self.builder.pack_operations(self._chain("short", 5))
+
+        stats = monitor.get_batch_packing_stats()
+        assert stats["plans"] == plans_before + 1
+        assert stats["last_fill_ratio"] == 0.25
+        assert stats["last_rounds"] == 1
+
+    def test_prepared_request_sends_in_batch_depends_on(self):
+        """dependsOn is sent only for dependencies inside the same batch"""
+        operations = self._chain("chain", 3)
+        batch_request = BatchRequest(id="packed", operations=operations[1:], user_id="user123")
+        context = BatchExecutionContext(
+            batch_request=batch_request,
+            config=BatchRequestConfig(),
+            correlation_id="corr123",
+            start_time=datetime.now(timezone.utc),
+            auth_token="test_token"
+        )
+
+        requests = BatchExecutor()._prepare_batch_request(context)["data"]["requests"]
+
+        assert "dependsOn" not in requests[0]
+        assert requests[1]["dependsOn"] == ["chain_1"]
+
 class TestBatchResponseParser:
     """Test batch response parsing functionality"""
 
@@ -733,6 +861,132 @@ class TestBatchExecutor:
         assert request2["body"] == {"title": "Test Plan"}
 
 
+
+class TestOperationLevelRetry:
+    """Retrying individual failed sub-requests of a $batch response"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.config = BatchRequestConfig(max_operation_retries=2, operation_retry_base_delay=0.01)
+        self.executor = BatchExecutor(self.config)
+        self.sent: List[List[str]] = []
+
+    def _fake_graph(self, failures: Dict[str, List[Dict[str, Any]]]):
+        """Answer each sub-request with its next scripted failure, then 200"""
+        async def make_http_request(request_data, context):
+            requests = request_data["data"]["requests"]
+            self.sent.append([request["id"] for request in requests])
+
+            responses = []
+            failed = set()
+            for request in requests:
+                scripted = failures.get(request["id"])
+                if scripted:
+                    response = {"id": request["id"], **scripted.pop(0)}
+                elif any(dep_id in failed for dep_id in request.get("dependsOn", [])):
+                    response = {"id": request["id"], "status": 424, "body": {}}
+                else:
+                    response = {"id": request["id"], "status": 200, "body": {"id": request["id"]}}
+                if response["status"] >= 400:
+                    failed.add(request["id"])
+                responses.append(response)
+            return {"responses": responses}
+
+        return patch.object(self.executor, '_make_http_request', side_effect=make_http_request)
+
+    def _batch(self, *operations: BatchOperation) -> BatchRequest:
+        return BatchRequest(id="retry_batch", operations=list(operations), user_id="test_user")
+
+    @pytest.mark.asyncio
+    async def test_only_throttled_operations_are_resent(self):
+        """Successful operations are never re-executed"""
+        batch_request = self._batch(
+            BatchOperation(id="ok_1", method=RequestMethod.POST, url="/planner/tasks"),
+            BatchOperation(id="throttled", method=RequestMethod.POST, url="/planner/tasks"),
+            BatchOperation(id="ok_2", method=RequestMethod.GET, url="/me")
+        )
+        failures = {"throttled": [{"status": 429, "headers": {"Retry-After": "0.1"}, "body": {}}]}
+
+        with self._fake_graph(failures):
+            start_time = time.monotonic()
+            response = await self.executor.execute_batch(batch_request, auth_token="test_token")
+            duration = time.monotonic() - start_time
+
+        assert self.sent == [["ok_1", "throttled", "ok_2"], ["throttled"]]
+        assert response.success_count == 3
+        assert [r["id"] for r in response.responses] == ["ok_1", "throttled", "ok_2"]
+        assert duration >= 0.1
+        assert batch_request.metadata["operation_retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_individual_retry_after_headers_are_honoured(self):
+        """Operations with different Retry-After values are resent separately"""
+        batch_request = self._batch(
+            BatchOperation(id="short", method=RequestMethod.GET, url="/a"),
+            BatchOperation(id="long", method=RequestMethod.GET, url="/b")
+        )
+        failures = {
+            "short": [{"status": 429, "headers": {"retry-after": "0.02"}, "body": {}}],
+            "long": [{"status": 503, "headers": {"Retry-After": "0.2"}, "body": {}}]
+        }
+
+        with self._fake_graph(failures):
+            response = await self.executor.execute_batch(batch_request, auth_token="test_token")
+
+        assert self.sent == [["short", "long"], ["short"], ["long"]]
+        assert response.error_count == 0
+
+    @pytest.mark.asyncio
+    async def test_posts_with_unknown_outcome_are_not_resent(self):
+        """A 5xx POST may have been applied, so only idempotent methods are retried"""
+        batch_request = self._batch(
+            BatchOperation(id="create", method=RequestMethod.POST, url="/planner/tasks"),
+            BatchOperation(id="update", method=RequestMethod.PATCH, url="/planner/tasks/1"),
+            BatchOperation(id="read", method=RequestMethod.GET, url="/planner/tasks/2")
+        )
+        failures = {
+            "create": [{"status": 502, "body": {}}],
+            "update": [{"status": 500, "body": {}}],
+            "read": [{"status": 504, "body": {}}]
+        }
+
+        with self._fake_graph(failures):
+            response = await self.executor.execute_batch(batch_request, auth_token="test_token")
+
+        assert self.sent == [["create", "update", "read"], ["update", "read"]]
+        assert response.error_count == 1
+        assert batch_request.get_operation("create").status == OperationStatus.ERROR
+
+    @pytest.mark.asyncio
+    async def test_failed_dependents_are_resent_with_their_dependency(self):
+        """424s caused by a throttled dependency are retried in the same batch"""
+        batch_request = self._batch(
+            BatchOperation(id="task", method=RequestMethod.PATCH, url="/planner/tasks/1"),
+            BatchOperation(id="details", method=RequestMethod.PATCH, url="/planner/tasks/1/details",
+                           depends_on=["task"]),
+            BatchOperation(id="other", method=RequestMethod.GET, url="/me")
+        )
+        failures = {"task": [{"status": 429, "headers": {"Retry-After": "0"}, "body": {}}]}
+
+        with self._fake_graph(failures):
+            response = await self.executor.execute_batch(batch_request, auth_token="test_token")
+
+        assert self.sent == [["task", "details", "other"], ["task", "details"]]
+        assert response.success_count == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_stop_after_max_operation_retries(self):
+        """Persistently throttled operations end up as errors"""
+        batch_request = self._batch(BatchOperation(id="hot", method=RequestMethod.GET, url="/me"))
+        failures = {"hot": [{"status": 429, "headers": {"Retry-After": "0"}, "body": {}} for _ in range(5)]}
+
+        with self._fake_graph(failures):
+            response = await self.executor.execute_batch(batch_request, auth_token="test_token")
+
+        assert len(self.sent) == 1 + self.config.max_operation_retries
+        assert response.error_count == 1
+        assert batch_request.get_operation("hot").status == OperationStatus.ERROR
+
 class TestBatchOperationsManager:
     """Test high-level batch operations manager"""
 
@@ -841,6 +1095,193 @@ class TestBatchOperationsManager:
         assert success is False
 
 
+
+class TestPipelinedChunkExecution:
+    """Concurrent, dependency-ordered execution of chunked batches"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.config = BatchRequestConfig(max_operations_per_batch=20, max_concurrent_batches=5)
+        self.manager = BatchOperationsManager(self.config)
+
+    def _track_in_flight(self, delay: float = 0.05, fail_ids: set = None):
+        """Replace batch execution with a timed fake recording concurrency"""
+        state = {"active": 0, "peak": 0, "batches": []}
+        fail_ids = fail_ids or set()
+
+        async def fake_execute(batch_request, auth_token, base_url=None):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["batches"].append([op.id for op in batch_request.operations])
+            await asyncio.sleep(delay)
+            state["active"] -= 1
+
+            # Like Graph, in-batch dependents of a failed request get 424
+            responses = []
+            failed = set()
+            for op in batch_request.operations:
+                status = 201
+                if op.id in fail_ids:
+                    status = 500
+                elif any(dep_id in failed for dep_id in op.depends_on or []):
+                    status = 424
+                if status != 201:
+                    failed.add(op.id)
+                op.status = OperationStatus.ERROR if status != 201 else OperationStatus.SUCCESS
+                responses.append({"id": op.id, "status": status, "body": {}})
+            return BatchResponse(batch_id=batch_request.id, responses=responses)
+
+        self.manager.execute_batch_operations = fake_execute
+        return state
+
+    @pytest.mark.asyncio
+    async def test_transport_sends_batches(self):
+        """A configured transport replaces the placeholder HTTP request"""
+        sent = []
+
+        async def transport(request_data, context):
+            sent.append((context.batch_request.user_id, [request["id"] for request in request_data["data"]["requests"]]))
+            return {"responses": [
+                {"id": request["id"], "status": 201, "body": {"id": f"graph-{request['id']}"}}
+                for request in request_data["data"]["requests"]
+            ]}
+
+        manager = BatchOperationsManager(self.config, transport=transport)
+        operations = [
+            BatchOperation(id=f"op_{i}", method=RequestMethod.POST, url="/planner/tasks", body={"title": str(i)})
+            for i in range(25)
+        ]
+
+        responses = await manager.execute_operations_in_chunks(operations, "user123", "test_token")
+
+        assert sorted(len(ids) for _, ids in sent) == [5, 20]
+        assert all(user_id == "user123" for user_id, _ in sent)
+        assert responses[0].responses[0]["body"]["id"].startswith("graph-op_")
+
+    @pytest.mark.asyncio
+    async def test_keeps_max_concurrent_batches_in_flight(self):
+        """Chunks run concurrently up to max_concurrent_batches"""
+        state = self._track_in_flight()
+        operations = [
+            BatchOperation(id=f"op_{i}", method=RequestMethod.POST, url="/planner/tasks", body={"title": str(i)})
+            for i in range(200)
+        ]
+
+        responses = await self.manager.execute_operations_in_chunks(
+            operations=operations, user_id="user123", auth_token="test_token", tenant_id="tenant-1"
+        )
+
+        assert len(responses) == 10
+        assert state["peak"] == 5
+        # Responses come back in chunk order
+        assert [r.responses[0]["id"] for r in responses] == [f"op_{i * 20}" for i in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_dependency_chains_share_a_batch(self):
+        """Chains that fit in one batch are packed together, dependencies first"""
+        state = self._track_in_flight(delay=0.01)
+        operations = []
+        for i in range(30):
+            operations.append(BatchOperation(id=f"bucket_{i}", method=RequestMethod.POST, url="/planner/buckets"))
+            operations.append(BatchOperation(
+                id=f"task_{i}", method=RequestMethod.POST, url="/planner/tasks", depends_on=[f"bucket_{i}"]
+            ))
+
+        await self.manager.execute_operations_in_chunks(
+            operations=operations, user_id="user123", auth_token="test_token"
+        )
+
+        assert len(state["batches"]) == 3
+        for batch in state["batches"]:
+            assert len(batch) == 20
+            for op_id in batch:
+                if op_id.startswith("task_"):
+                    assert batch.index(op_id.replace("task_", "bucket_")) < batch.index(op_id)
+
+    @pytest.mark.asyncio
+    async def test_dependents_of_failed_operations_are_skipped(self):
+        """A failed dependency in an earlier round short-circuits its dependents"""
+        state = self._track_in_flight(delay=0.01, fail_ids={"bucket_0"})
+        operations = [
+            BatchOperation(id="bucket_0", method=RequestMethod.POST, url="/planner/buckets"),
+            BatchOperation(id="bucket_1", method=RequestMethod.POST, url="/planner/buckets"),
+            BatchOperation(id="task_0", method=RequestMethod.POST, url="/planner/tasks", depends_on=["bucket_0"]),
+            BatchOperation(id="task_1", method=RequestMethod.POST, url="/planner/tasks", depends_on=["bucket_1"]),
+            BatchOperation(id="details_0", method=RequestMethod.PATCH, url="/planner/tasks/x/details",
+                           depends_on=["task_0"])
+        ]
+
+        # With two operations per batch the three-step chain spans two rounds
+        responses = await self.manager.execute_operations_in_chunks(
+            operations=operations, user_id="user123", auth_token="test_token", chunk_size=2
+        )
+
+        statuses = {r["id"]: r["status"] for response in responses for r in response.responses}
+        assert statuses == {"bucket_0": 500, "bucket_1": 201, "task_0": 424, "task_1": 201, "details_0": 424}
+        assert operations[4].status == OperationStatus.SKIPPED
+        assert not any("details_0" in batch for batch in state["batches"])
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_responses_as_they_complete(self):
+        """Streaming does not wait for slower earlier chunks"""
+        async def fake_execute(batch_request, auth_token, base_url=None):
+            # The first chunk is the slowest
+            await asyncio.sleep(0.1 if batch_request.operations[0].id == "op_0" else 0.01)
+            return BatchResponse(batch_id=batch_request.operations[0].id, responses=[])
+
+        self.manager.execute_batch_operations = fake_execute
+        operations = [BatchOperation(id=f"op_{i}", method=RequestMethod.GET, url=f"/me/{i}") for i in range(60)]
+
+        order = []
+        async for response in self.manager.stream_operations_in_chunks(
+            operations=operations, user_id="user123", auth_token="test_token"
+        ):
+            order.append(response.batch_id)
+
+        assert order[-1] == "op_0"
+        assert sorted(order) == ["op_0", "op_20", "op_40"]
+
+    @pytest.mark.asyncio
+    async def test_in_flight_limit_is_shared_per_tenant(self):
+        """Concurrent executions for one tenant share its batch slots"""
+        state = self._track_in_flight()
+
+        def operations(prefix):
+            return [BatchOperation(id=f"{prefix}_{i}", method=RequestMethod.GET, url=f"/me/{i}") for i in range(100)]
+
+        await asyncio.gather(
+            self.manager.execute_operations_in_chunks(operations("a"), "user1", "token", tenant_id="tenant-1"),
+            self.manager.execute_operations_in_chunks(operations("b"), "user2", "token", tenant_id="tenant-1")
+        )
+
+        assert state["peak"] == 5
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_1000_tasks_benchmark(self, monkeypatch):
+        """1,000 task creations through the real executor finish in a few seconds"""
+        from src.graph.rate_limiter import IntelligentRateLimiter
+
+        # Predictive throttling paces a tenant's $batch calls to ~0.5/s by design
+        monkeypatch.setenv("RATE_LIMIT_PREDICTIVE", "false")
+        self.manager.executor.rate_limiter = IntelligentRateLimiter()
+
+        operations = [
+            BatchOperation(id=f"task_{i}", method=RequestMethod.POST, url="/planner/tasks",
+                           body={"planId": "plan-1", "title": f"Task {i}"})
+            for i in range(1000)
+        ]
+
+        start_time = time.time()
+        responses = await self.manager.execute_operations_in_chunks(
+            operations=operations, user_id="user123", auth_token="test_token", tenant_id="bench-tenant"
+        )
+        duration = time.time() - start_time
+
+        assert len(responses) == 50
+        assert sum(r.success_count for r in responses) == 1000
+        # 50 serial round trips of the executor take at least 5 seconds
+        assert duration < 3.0
+
 class TestDependencyHandling:
     """Test dependency handling and conditional execution"""
 
@@ -0,0 +1,216 @@
+"""
+Tests for webhook-driven cache invalidation
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional
+
+import pytest
+
+from src.graph.cache_invalidation import (
+    WebhookCacheInvalidator,
+    CacheRefreshMode,
+    extract_resource_id
+)
+from src.graph_client import graph_cache_key
+from src.models.graph_models import WebhookNotification, WebhookSubscription
+
+
+class InMemoryCache:
+    """Cache double keyed like CacheService without namespaces"""
+
+    def __init__(self, values: Optional[Dict[str, Any]] = None):
+        self.values: Dict[str, Any] = dict(values or {})
+        self.delete_calls: List[List[str]] = []
+
+    async def get(self, key: str, namespace: str = "itp"):
+        return self.values.get(key)
+
+    async def delete_multiple(self, keys: List[str], namespace: str = "itp") -> int:
+        self.delete_calls.append(list(keys))
+        return len([key for key in keys if self.values.pop(key, None) is not None])
+
+
+class RecordingDatabase:
+    """Database double for task and plan rows"""
+
+    def __init__(self):
+        self.tasks: Dict[str, Any] = {}
+        self.plans: Dict[str, Any] = {}
+        self.saved: List[Dict[str, Any]] = []
+
+    async def get_task_by_graph_id(self, graph_id: str):
+        return self.tasks.get(graph_id)
+
+    async def get_plan_by_graph_id(self, graph_id: str):
+        return self.plans.get(graph_id)
+
+    async def delete_task(self, graph_id: str) -> bool:
+        return self.tasks.pop(graph_id, None) is not None
+
+    async def delete_plan(self, graph_id: str) -> bool:
+        return self.plans.pop(graph_id, None) is not None
+
+    async def save_task(self, task_data: Dict[str, Any]):
+        self.saved.append(task_data)
+
+    async def save_plan(self, plan_data: Dict[str, Any]):
+        self.saved.append(plan_data)
+
+
+class SlowGraphClient:
+    """Graph client double counting refetches"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.task_fetches = 0
+
+    async def get_task_details(self, task_id: str, user_id: str):
+        self.task_fetches += 1
+        await asyncio.sleep(self.delay)
+        return {"id": task_id, "planId": "plan-1", "title": "Refetched", "percentComplete": 50}
+
+
+def make_subscription() -> WebhookSubscription:
+    return WebhookSubscription(
+        id="sub-1",
+        resource="/planner/tasks",
+        change_types=["created", "updated", "deleted"],
+        notification_url="https://test.example.com/webhooks/default",
+        tenant_id="tenant-1",
+        user_id="user-1"
+    )
+
+
+def make_notification(resource: str, change_type: str = "updated", resource_data=None) -> WebhookNotification:
+    return WebhookNotification(
+        subscription_id="sub-1",
+        client_state=None,
+        change_type=change_type,
+        resource=resource,
+        resource_data=resource_data,
+        tenant_id="tenant-1"
+    )
+
+
+class TestResourceIdExtraction:
+    """Resolving changed resource IDs"""
+
+    def test_prefers_resource_data_id(self):
+        notification = make_notification("/planner/tasks/other", resource_data={"id": "task-1"})
+        assert extract_resource_id(notification, "tasks") == "task-1"
+
+    def test_falls_back_to_resource_path(self):
+        notification = make_notification("planner/plans/plan-9/details")
+        assert extract_resource_id(notification, "plans") == "plan-9"
+        assert extract_resource_id(make_notification("/planner/tasks"), "tasks") is None
+
+
+class TestWebhookCacheInvalidator:
+    """Targeted invalidation of cached Graph responses"""
+
+    @pytest.mark.asyncio
+    async def test_task_update_invalidates_task_and_plan_list(self):
+        task_key = graph_cache_key("/planner/tasks/task-1")
+        list_key = graph_cache_key("/planner/plans/plan-1/tasks")
+        other_key = graph_cache_key("/planner/plans/plan-2/tasks")
+        cache = InMemoryCache({
+            task_key: {"id": "task-1", "planId": "plan-1"},
+            list_key: {"value": []},
+            other_key: {"value": []}
+        })
+        invalidator = WebhookCacheInvalidator(cache, refresh_mode=CacheRefreshMode.NONE)
+
+        result = await invalidator.handle_task_change(
+            make_notification("/planner/tasks/task-1"), make_subscription()
+        )
+
+        # Plan resolved from the cached task entry; unrelated plans keep their cache
+        assert result["plan_id"] == "plan-1"
+        assert len(cache.delete_calls) == 1
+        assert task_key not in cache.values and list_key not in cache.values
+        assert other_key in cache.values
+
+    @pytest.mark.asyncio
+    async def test_task_delete_removes_local_row(self):
+        database = RecordingDatabase()
+        database.tasks["task-1"] = SimpleNamespace(plan_graph_id="plan-1")
+        cache = InMemoryCache()
+        invalidator = WebhookCacheInvalidator(cache, database=database, refresh_mode=CacheRefreshMode.TARGETED)
+
+        result = await invalidator.handle_task_change(
+            make_notification("/planner/tasks/task-1", change_type="deleted"), make_subscription()
+        )
+
+        assert result["plan_id"] == "plan-1"
+        assert graph_cache_key("/planner/plans/plan-1/tasks") in cache.delete_calls[0]
+        assert "task-1" not in database.tasks
+        assert invalidator.stats["rows_deleted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_targeted_refresh_updates_row_and_coalesces(self):
+        database = RecordingDatabase()
+        graph_client = SlowGraphClient(delay=0.05)
+        invalidator = WebhookCacheInvalidator(
+            InMemoryCache(),
+            database=database,
+            graph_client=graph_client,
+            refresh_mode=CacheRefreshMode.TARGETED
+        )
+        notification = make_notification("/planner/tasks/task-1", resource_data={"id": "task-1", "planId": "plan-1"})
+
+        await asyncio.gather(*(
+            invalidator.handle_task_change(notification, make_subscription()) for _ in range(5)
+        ))
+
+        assert graph_client.task_fetches == 1
+        assert invalidator.stats["refreshes_coalesced"] == 4
+        assert database.saved[0]["graph_id"] == "task-1"
+        assert database.saved[0]["completion_percentage"] == 50
+
+    @pytest.mark.asyncio
+    async def test_delta_refresh_syncs_affected_plan(self):
+        calls = []
+
+        class DeltaManager:
+            async def sync_resource_changes(self, **kwargs):
+                calls.append(kwargs)
+
+        invalidator = WebhookCacheInvalidator(
+            InMemoryCache(),
+            delta_manager=DeltaManager(),
+            refresh_mode=CacheRefreshMode.DELTA
+        )
+        await invalidator.handle_task_change(
+            make_notification("/planner/tasks/task-1", resource_data={"id": "task-1", "planId": "plan-1"}),
+            make_subscription()
+        )
+
+        assert calls == [{
+            "resource_type": "tasks",
+            "user_id": "user-1",
+            "tenant_id": "tenant-1",
+            "resource_id": "plan-1"
+        }]
+
+    @pytest.mark.asyncio
+    async def test_plan_delete_invalidates_plan_children_and_group_list(self):
+        database = RecordingDatabase()
+        database.plans["plan-1"] = SimpleNamespace(group_id="group-1")
+        cache = InMemoryCache()
+        invalidator = WebhookCacheInvalidator(cache, database=database, refresh_mode=CacheRefreshMode.NONE)
+
+        result = await invalidator.handle_plan_change(
+            make_notification("/planner/plans/plan-1", change_type="deleted"), make_subscription()
+        )
+
+        assert result["group_id"] == "group-1"
+        assert set(result["invalidated"]) == {
+            graph_cache_key("/planner/plans/plan-1"),
+            graph_cache_key("/planner/plans/plan-1/details"),
+            graph_cache_key("/planner/plans/plan-1/tasks"),
+            graph_cache_key("/planner/plans/plan-1/buckets"),
+            graph_cache_key("/groups/group-1/planner/plans")
+        }
+        assert "plan-1" not in database.plans
@@ -0,0 +1,205 @@
+"""
+Tests for adaptive concurrency limiting of Graph traffic
+"""
+
+import asyncio
+import pytest
+import httpx
+
+from src.graph.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter, RequestPriority, current_priority, endpoint_tier, graph_priority
+)
+from src.graph.rate_limiter import EndpointTier
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setenv("GRAPH_CONCURRENCY_INITIAL", "4")
+    return AdaptiveConcurrencyLimiter()
+
+
+async def send(limiter, endpoint="/planner/tasks", tenant_id="tenant-1", status_code=200, delay=0.0):
+    async with limiter.acquire(endpoint, tenant_id) as slot:
+        await asyncio.sleep(delay)
+        slot.record(status_code)
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Limit adjustment and admission"""
+
+    def test_endpoint_tiers(self):
+        assert endpoint_tier("/me/joinedTeams") == EndpointTier.HIGH_VOLUME
+        assert endpoint_tier("/users/{id}") == EndpointTier.HIGH_VOLUME
+        assert endpoint_tier("/$batch") == EndpointTier.BATCH
+        assert endpoint_tier("/subscriptions/{id}") == EndpointTier.WEBHOOK
+        assert endpoint_tier("/servicePrincipals") == EndpointTier.LOW_VOLUME
+        assert endpoint_tier("/planner/tasks/{id}") == EndpointTier.MEDIUM_VOLUME
+
+    @pytest.mark.asyncio
+    async def test_limit_grows_while_saturated_and_healthy(self, limiter):
+        for _ in range(5):
+            await asyncio.gather(*(send(limiter, delay=0.001) for _ in range(4)))
+
+        assert limiter.get_limit("/planner/tasks", "tenant-1") > 4
+
+    @pytest.mark.asyncio
+    async def test_throttle_cuts_limit_for_that_tenant_and_tier_only(self, limiter):
+        await send(limiter, status_code=429)
+
+        assert limiter.get_limit("/planner/tasks/{id}", "tenant-1") == 2
+        assert limiter.get_limit("/planner/tasks", "tenant-2") == 4
+        assert limiter.get_limit("/$batch", "tenant-1") == 4
+
+    @pytest.mark.asyncio
+    async def test_timeout_counts_as_throttle(self, limiter):
+        with pytest.raises(httpx.ReadTimeout):
+            async with limiter.acquire("/planner/tasks", "tenant-1"):
+                raise httpx.ReadTimeout("timed out")
+
+        assert limiter.get_limit("/planner/tasks", "tenant-1") == 2
+        assert limiter.get_stats()["tenant-1|medium_volume"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_latency_inflection_shrinks_limit(self, limiter):
+        for _ in range(3):
+            await asyncio.gather(*(send(limiter, delay=0.005) for _ in range(4)))
+        grown = limiter.states[("tenant-1", EndpointTier.MEDIUM_VOLUME)].limit
+
+        for _ in range(3):
+            await asyncio.gather(*(send(limiter, delay=0.1) for _ in range(4)))
+
+        assert limiter.states[("tenant-1", EndpointTier.MEDIUM_VOLUME)].limit < grown
+
+    @pytest.mark.asyncio
+    async def test_requests_over_limit_queue_in_order(self, limiter):
+        in_flight = 0
+        peak = 0
+        finished = []
+
+        async def request(index):
+            nonlocal in_flight, peak
+            async with limiter.acquire("/planner/tasks", "tenant-1") as slot:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                finished.append(index)
+                slot.record(500)
+
+        await asyncio.gather(*(request(i) for i in range(10)))
+
+        assert peak == 4
+        assert finished == list(range(10))
+        assert limiter.get_stats()["tenant-1|medium_volume"]["total_waits"] == 6
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self, limiter):
+        holders = [asyncio.create_task(send(limiter, delay=0.05)) for _ in range(4)]
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(send(limiter))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(*holders)
+
+        stats = limiter.get_stats()["tenant-1|medium_volume"]
+        assert stats["queued"] == 0
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_settles_under_service_throttle(self, limiter):
+        """Against a service throttling above 8 concurrent requests, few requests are rejected"""
+        service_in_flight = 0
+        throttled = 0
+
+        async def request():
+            nonlocal service_in_flight, throttled
+            async with limiter.acquire("/planner/tasks", "tenant-1") as slot:
+                service_in_flight += 1
+                status_code = 429 if service_in_flight > 8 else 200
+                await asyncio.sleep(0.002)
+                service_in_flight -= 1
+                throttled += status_code == 429
+                slot.record(status_code)
+
+        await asyncio.gather(*(request() for _ in range(400)))
+
+        assert throttled < 40
+        assert 2 <= limiter.get_limit("/planner/tasks", "tenant-1") <= 12
+
+
+class TestPriorityDispatch:
+    """Priority classes in the admission queue"""
+
+    async def run_contended(self, limiter, arrivals):
+        """Hold every slot, queue `arrivals` in order, then release; returns dispatch order"""
+        order = []
+        gate = asyncio.Event()
+
+        async def holder():
+            async with limiter.acquire("/planner/tasks", "tenant-1") as slot:
+                await gate.wait()
+                slot.record(500)
+
+        async def request(priority):
+            async with limiter.acquire("/planner/tasks", "tenant-1", priority) as slot:
+                order.append(priority)
+                await asyncio.sleep(0)
+                slot.record(500)
+
+        holders = [asyncio.create_task(holder()) for _ in range(4)]
+        await asyncio.sleep(0)
+        requests = []
+        for priority in arrivals:
+            requests.append(asyncio.create_task(request(priority)))
+            await asyncio.sleep(0)
+
+        gate.set()
+        await asyncio.gather(*holders, *requests)
+        return order
+
+    def test_priority_follows_context(self):
+        assert current_priority() == RequestPriority.INTERACTIVE
+        with graph_priority(RequestPriority.MAINTENANCE):
+            assert current_priority() == RequestPriority.MAINTENANCE
+        assert current_priority() == RequestPriority.INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_interactive_preempts_queued_background_work(self, limiter, monkeypatch):
+        monkeypatch.setitem(limiter.config["min_shares"], RequestPriority.BULK, 0.0)
+        arrivals = [RequestPriority.BULK] * 3 + [RequestPriority.INTERACTIVE] * 2
+
+        order = await self.run_contended(limiter, arrivals)
+
+        assert order[:2] == [RequestPriority.INTERACTIVE] * 2
+
+    @pytest.mark.asyncio
+    async def test_background_classes_keep_minimum_share(self, limiter):
+        arrivals = ([RequestPriority.MAINTENANCE] * 10 + [RequestPriority.BULK] * 20
+                    + [RequestPriority.INTERACTIVE] * 40)
+
+        order = await self.run_contended(limiter, arrivals)
+
+        # While interactive work was queued, background classes got their minimum shares
+        contended = order[:max(i for i, priority in enumerate(order) if priority == RequestPriority.INTERACTIVE) + 1]
+        assert contended.count(RequestPriority.BULK) >= int(0.2 * len(contended))
+        assert contended.count(RequestPriority.MAINTENANCE) >= int(0.1 * len(contended))
+        assert order[:4] == [RequestPriority.INTERACTIVE] * 4
+
+    @pytest.mark.asyncio
+    async def test_reports_depth_and_wait_per_class(self, limiter):
+        holders = [asyncio.create_task(send(limiter, delay=0.02)) for _ in range(4)]
+        await asyncio.sleep(0)
+        with graph_priority(RequestPriority.BULK):
+            queued = asyncio.create_task(send(limiter))
+        await asyncio.sleep(0)
+
+        assert limiter.get_priority_stats()["bulk"]["queued"] == 1
+
+        await asyncio.gather(*holders, queued)
+
+        stats = limiter.get_priority_stats()
+        assert stats["bulk"]["queued"] == 0
+        assert stats["bulk"]["waits"] == 1
+        assert stats["bulk"]["wait_max"] >= 0.01
+        assert stats["interactive"]["admitted"] == 4
+        assert stats["interactive"]["waits"] == 0
@@ -0,0 +1,114 @@
+"""
+Tests for per-minute error buckets
+"""
+
+import sys
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from src.utils.error_buckets import ErrorTimeBuckets, OVERFLOW_ERROR_CODE
+from src.utils.error_handler import EnhancedErrorHandler, ErrorCategory, ErrorSeverity
+
+NOW = 1_699_999_980.0  # Start of a minute
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """Controllable clock for the bucket module"""
+    clock = {"now": NOW}
+    monkeypatch.setattr("src.utils.error_buckets.time.time", lambda: clock["now"])
+    return clock
+
+
+def minutes_ago(minutes: int) -> datetime:
+    return datetime.fromtimestamp(NOW, timezone.utc) - timedelta(minutes=minutes)
+
+
+class TestErrorTimeBuckets:
+    """Ring of per-minute buckets"""
+
+    def test_summarize_window(self, frozen_time):
+        buckets = ErrorTimeBuckets(window_minutes=60)
+        buckets.record("rate_limit", "medium", "TooManyRequests", minutes_ago(0))
+        buckets.record("rate_limit", "medium", "TooManyRequests", minutes_ago(5))
+        buckets.record("not_found", "low", "ItemNotFound", minutes_ago(30))
+
+        summary = buckets.summarize(10)
+        assert summary["total"] == 2
+        assert summary["by_code"] == {"TooManyRequests": 2}
+        assert len(summary["per_minute"]) == 2
+
+        summary = buckets.summarize(60)
+        assert summary["total"] == 3
+        assert summary["by_category"] == {"rate_limit": 2, "not_found": 1}
+        assert summary["by_severity"] == {"medium": 2, "low": 1}
+
+    def test_ring_reuses_expired_buckets(self, frozen_time):
+        buckets = ErrorTimeBuckets(window_minutes=60)
+        buckets.record("timeout", "medium", "Timeout")
+
+        # An hour later the same slot is reused and the old count is gone
+        frozen_time["now"] += 3600
+        buckets.record("timeout", "medium", "Timeout")
+
+        assert buckets.summarize(60)["total"] == 1
+        assert buckets.get_stats()["active_buckets"] == 1
+
+    def test_errors_older_than_window_are_dropped(self, frozen_time):
+        buckets = ErrorTimeBuckets(window_minutes=60)
+
+        assert buckets.record("timeout", "medium", "Timeout", minutes_ago(90)) is False
+        assert buckets.summarize(60)["total"] == 0
+        assert buckets.get_stats()["dropped"] == 1
+
+    def test_codes_per_minute_are_capped(self, frozen_time):
+        buckets = ErrorTimeBuckets(window_minutes=60, max_codes_per_minute=3)
+        for i in range(10):
+            buckets.record("client_error", "low", f"Code{i}")
+
+        by_code = buckets.summarize(1)["by_code"]
+        assert len(by_code) == 4
+        assert by_code[OVERFLOW_ERROR_CODE] == 7
+
+    def test_memory_bounded_by_window(self, frozen_time):
+        buckets = ErrorTimeBuckets(window_minutes=60, max_codes_per_minute=50)
+
+        def bucket_memory():
+            return sum(
+                sys.getsizeof(b.by_category) + sys.getsizeof(b.by_severity) + sys.getsizeof(b.by_code)
+                for b in buckets.buckets
+            )
+
+        # Fill every bucket up to the code limit, then keep going for hours with new codes
+        for second in range(3600):
+            frozen_time["now"] = NOW + second
+            buckets.record("client_error", "low", f"Code{second}")
+        baseline = bucket_memory()
+
+        for second in range(3600, 6 * 3600):
+            frozen_time["now"] = NOW + second
+            buckets.record("client_error", "low", f"Code{second}")
+
+        assert len(buckets.buckets) == 60
+        assert bucket_memory() == baseline
+        assert buckets.summarize(60)["total"] == 3600
+
+
+class TestErrorReportFromBuckets:
+    """generate_error_report built from the buckets"""
+
+    def test_report_breaks_down_by_category_and_severity(self):
+        handler = EnhancedErrorHandler()
+        for message in ["429 Too Many Requests", "429 Too Many Requests", "404 Not Found"]:
+            handler.classify_error(message)
+
+        report = handler.generate_error_report(1)
+
+        assert report["total_errors"] == 3
+        assert report["errors_by_category"] == {
+            ErrorCategory.RATE_LIMIT.value: 2,
+            ErrorCategory.NOT_FOUND.value: 1
+        }
+        assert report["errors_by_severity"][ErrorSeverity.MEDIUM.value] >= 2
+        assert sum(minute["count"] for minute in report["errors_per_minute"]) == 3
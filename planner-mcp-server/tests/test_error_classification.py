@@ -1036,6 +1036,27 @@ class TestErrorPatternCustomization:
         assert result.additional_details["severity"] == ErrorSeverity.CRITICAL
         assert "specific" in result.additional_details["tags"]
 
+    def test_graph_error_code_classifies_generic_message(self, error_handler):
+        """Test that the Graph error code is used when the message is generic"""
+        result = error_handler.classify_error({
+            "error": {"code": "ItemNotFound", "message": "The requested object could not be located"}
+        })
+
+        assert result.error_code == "ItemNotFound"
+        assert result.additional_details["category"] == ErrorCategory.NOT_FOUND
+
+    def test_classification_cache_is_bounded(self, error_handler):
+        """Test that memoized classifications are evicted least recently used first"""
+        error_handler.classification_cache_size = 3
+
+        for message in ["first failure", "second failure", "third failure"]:
+            error_handler.classify_error(message)
+        error_handler.classify_error("first failure")
+        error_handler.classify_error("fourth failure")
+
+        cached_messages = [key[2] for key in error_handler._classification_cache]
+        assert cached_messages == ["third failure", "first failure", "fourth failure"]
+
 
 # Performance and stress tests
 class TestErrorHandlerPerformance:
@@ -1073,6 +1094,52 @@ class TestErrorHandlerPerformance:
         avg_time = duration / len(error_messages)
         assert avg_time < 0.002  # Less than 2ms per classification
 
+    def test_precompiled_classification_benchmark(self, error_handler):
+        """Benchmark precompiled classification against re.search over every pattern"""
+        import ast
+        import time
+
+        # Corpus: every message string in this test module, with and without status codes
+        with open(__file__) as f:
+            messages = [
+                node.value for node in ast.walk(ast.parse(f.read()))
+                if isinstance(node, ast.Constant) and isinstance(node.value, str) and 3 < len(node.value) < 200
+            ]
+        corpus = [(message, status) for status in (None, 404, 429, 500) for message in messages]
+
+        def regex_loop(message, status_code):
+            search_text = message.lower()
+            if status_code:
+                search_text = f"{status_code} {search_text}"
+            for pattern in error_handler.error_patterns:
+                if re.search(pattern.pattern, search_text, re.IGNORECASE):
+                    return pattern.description
+            return "Unclassified error"
+
+        # Same first-match-wins results as the plain loop
+        for message, status_code in corpus:
+            assert error_handler._match_error_pattern(message, status_code).description == \
+                regex_loop(message, status_code)
+
+        rounds = 10
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            for message, status_code in corpus:
+                regex_loop(message, status_code)
+        loop_duration = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            for message, status_code in corpus:
+                error_handler._match_error_pattern(message, status_code)
+        cached_duration = time.perf_counter() - start_time
+
+        print(f"\n{len(corpus) * rounds} classifications: regex loop {loop_duration:.3f}s, "
+              f"precompiled and cached {cached_duration:.3f}s")
+
+        # Repeated messages are served from the LRU cache
+        assert cached_duration < loop_duration / 3
+
     def test_memory_usage_stability(self, error_handler):
         """Test that error handler doesn't leak memory"""
         import gc
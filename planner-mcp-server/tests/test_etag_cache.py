@@ -0,0 +1,85 @@
+"""
+Tests for the Planner ETag cache
+"""
+
+import pytest
+
+from src.graph.etag_cache import PlannerETagCache
+from src.graph.cache_invalidation import WebhookCacheInvalidator, CacheRefreshMode
+from src.models.graph_models import WebhookNotification, WebhookSubscription
+
+
+class EmptyCache:
+    """Cache double with nothing cached"""
+
+    async def get(self, key, namespace="itp"):
+        return None
+
+    async def delete_multiple(self, keys, namespace="itp"):
+        return 0
+
+
+def make_notification(change_type: str, resource_data=None) -> WebhookNotification:
+    return WebhookNotification(
+        subscription_id="sub-1",
+        client_state=None,
+        change_type=change_type,
+        resource="/planner/tasks/task-1",
+        resource_data=resource_data,
+        tenant_id="tenant-1"
+    )
+
+
+class TestPlannerETagCache:
+    """ETag storage and eviction"""
+
+    def test_records_resources_and_evicts_least_recent(self):
+        cache = PlannerETagCache(max_entries=2)
+
+        assert cache.record_resource("task", {"id": "task-1", "@odata.etag": 'W/"1"'})
+        assert not cache.record_resource("task", {"id": "task-2"})
+        cache.set("task", "task-2", 'W/"2"')
+        assert cache.get("task", "task-1") == 'W/"1"'
+
+        cache.set("details", "task-1", 'W/"d1"')
+
+        assert cache.get("task", "task-2") is None
+        assert cache.get("task", "task-1") == 'W/"1"'
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_resource_types_are_separate(self):
+        cache = PlannerETagCache()
+        cache.set("task", "task-1", 'W/"task"')
+        cache.set("details", "task-1", 'W/"details"')
+
+        cache.invalidate("task", "task-1")
+
+        assert cache.get("task", "task-1") is None
+        assert cache.get("details", "task-1") == 'W/"details"'
+
+
+class TestWebhookETagUpdates:
+    """Notifications keep cached ETags current"""
+
+    @pytest.mark.asyncio
+    async def test_notifications_update_and_drop_etags(self):
+        etag_cache = PlannerETagCache()
+        etag_cache.set("details", "task-1", 'W/"d"')
+        invalidator = WebhookCacheInvalidator(
+            EmptyCache(), refresh_mode=CacheRefreshMode.NONE, etag_cache=etag_cache
+        )
+        subscription = WebhookSubscription(
+            id="sub-1",
+            resource="/planner/tasks",
+            change_types=["updated", "deleted"],
+            notification_url="https://test.example.com/webhooks/default"
+        )
+
+        await invalidator.handle_task_change(
+            make_notification("updated", {"id": "task-1", "@odata.etag": 'W/"2"'}), subscription
+        )
+        assert etag_cache.get("task", "task-1") == 'W/"2"'
+
+        await invalidator.handle_task_change(make_notification("deleted"), subscription)
+        assert etag_cache.get("task", "task-1") is None
+        assert etag_cache.get("details", "task-1") is None
@@ -25,12 +25,14 @@ from src.graph.rate_limiter import IntelligentRateLimiter, get_rate_limiter
 class MockAuthService:
     """Mock authentication service for testing"""
 
-    def __init__(self, client_id: str, client_secret: str, tenant_id: str, cache_service):
+    def __init__(self, client_id: str, client_secret: str, tenant_id: str, cache_service, tenant_index=None):
         self.client_id = client_id
         self.client_secret = client_secret
         self.tenant_id = tenant_id
         self.cache_service = cache_service
+        self.tenant_index = tenant_index
         self.tokens = {}
+        self.valid_token_checks = 0
 
     async def get_access_token(self, user_id: str) -> Optional[str]:
         """Mock access token retrieval"""
@@ -46,6 +48,7 @@ class MockAuthService:
 
     async def has_valid_token(self, user_id: str) -> bool:
         """Mock token validation"""
+        self.valid_token_checks += 1
         # Simulate token existence for test users
         return user_id in [user["user_id"] for user in REAL_TEST_USERS.values()]
 
@@ -506,6 +509,24 @@ class TestTenantDiscovery:
         discovered_tenant = await tenant_manager.discover_tenant_from_user(unknown_user)
         assert discovered_tenant is None
 
+    @pytest.mark.asyncio
+    async def test_discovery_reads_token_info_once_and_indexes_it(self, setup_test_environment, tenant_manager):
+        """Test that discovery does not probe every tenant for a valid token"""
+        await tenant_manager.reload_tenant_configurations()
+        user_2_id = REAL_TEST_USERS["user_2"]["user_id"]
+
+        with patch('src.graph.tenant_manager.AuthService', MockAuthService):
+            discovered_tenant = await tenant_manager.discover_tenant_from_user(user_2_id)
+
+            # Token info read through the default tenant, no per-tenant token checks
+            assert discovered_tenant == tenant_manager.default_tenant_id
+            assert len(tenant_manager.auth_services) == 1
+            assert all(service.valid_token_checks == 0 for service in tenant_manager.auth_services.values())
+
+            # Later lookups are served by the index
+            assert await tenant_manager.discover_tenant_from_user(user_2_id) == discovered_tenant
+            assert tenant_manager.user_tenant_index.get_stats()["redis_hits"] == 1
+
     @pytest.mark.asyncio
     async def test_default_tenant_fallback(self, setup_test_environment, tenant_manager):
         """Test default tenant fallback mechanism"""
@@ -717,6 +738,42 @@ class TestTenantConfigurationReloading:
         assert len(tenant_manager.auth_services) == 0
 
 
+class TestAuthServicePool:
+    """Test lazily created, LRU-bounded per-tenant auth services"""
+
+    @pytest.mark.asyncio
+    async def test_auth_services_created_on_first_use(self, setup_test_environment, tenant_manager):
+        """Test that no auth service is created before a tenant is used"""
+        await tenant_manager.reload_tenant_configurations()
+        assert len(tenant_manager.auth_services) == 0
+
+        tenant_2_id = REAL_TEST_TENANTS["tenant_2"]["tenant_id"]
+        with patch('src.graph.tenant_manager.AuthService', MockAuthService):
+            auth_service = await tenant_manager.get_auth_service(tenant_2_id)
+            assert await tenant_manager.get_auth_service(tenant_2_id) is auth_service
+
+        assert list(tenant_manager.auth_services) == [tenant_2_id]
+        assert auth_service.tenant_index is tenant_manager.user_tenant_index
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_auth_service_is_evicted(self, setup_test_environment, tenant_manager):
+        """Test that the pool stays within its size"""
+        await tenant_manager.reload_tenant_configurations()
+        tenant_manager.auth_service_pool_size = 2
+        tenant_ids = [REAL_TEST_TENANTS[key]["tenant_id"] for key in ("tenant_1", "tenant_2", "tenant_3")]
+
+        with patch('src.graph.tenant_manager.AuthService', MockAuthService):
+            await tenant_manager.get_auth_service(tenant_ids[0])
+            await tenant_manager.get_auth_service(tenant_ids[1])
+            await tenant_manager.get_auth_service(tenant_ids[0])  # tenant_2 is now least recently used
+            await tenant_manager.get_auth_service(tenant_ids[2])
+
+        assert list(tenant_manager.auth_services) == [tenant_ids[0], tenant_ids[2]]
+
+        status = await tenant_manager.get_tenant_status()
+        assert status["auth_service_pool"] == {"size": 2, "max_size": 2, "evictions": 1}
+
+
 class TestErrorHandlingAndEdgeCases:
     """Test error handling and edge cases"""
 
@@ -3,32 +3,91 @@ MVP tests for Microsoft Teams and Planner connectivity
 Focus on basic authentication and task creation
 """
 
+import json
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+import httpx
+from unittest.mock import AsyncMock
 from datetime import datetime, timezone
 
 from src.teams_planner_client import SimpleTeamsPlannerClient, TeamsPlannierError
+from src.graph.client import EnhancedGraphClient
+from src.graph.etag_cache import PlannerETagCache
+from src.graph.rate_limiter import IntelligentRateLimiter
 from src.auth import AuthService
 
 
+class FakeGraph:
+    """Answers requests sent through the pooled Graph client with canned responses"""
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+
+    def add(self, method, path, status=200, body=None):
+        """Queue a response; the last one for a route keeps being returned"""
+        self.responses.setdefault((method, path), []).append((status, body))
+
+    def handle(self, request):
+        path = request.url.path[len("/v1.0"):]
+        self.requests.append({
+            "method": request.method,
+            "path": path,
+            "headers": request.headers,
+            "json": json.loads(request.content) if request.content else None
+        })
+
+        queue = self.responses[(request.method, path)]
+        status, body = queue.pop(0) if len(queue) > 1 else queue[0]
+        if body is None:
+            return httpx.Response(status)
+        if isinstance(body, str):
+            return httpx.Response(status, text=body)
+        return httpx.Response(status, json=body)
+
+    def sent(self, method, path):
+        return [request for request in self.requests if request["method"] == method and request["path"] == path]
+
+
+def make_client(auth_service, graph, etag_cache=None):
+    """Client whose pooled Graph transport is answered by the fake"""
+    graph_client = EnhancedGraphClient(auth_service)
+    graph_client._client = httpx.AsyncClient(transport=httpx.MockTransport(graph.handle))
+
+    # Own limiter without predictive pacing, so bursts of fake requests are not delayed
+    graph_client.rate_limiter = IntelligentRateLimiter()
+    graph_client.rate_limiter.config["predictive_enabled"] = False
+    client = SimpleTeamsPlannerClient(
+        auth_service,
+        etag_cache=etag_cache or PlannerETagCache(),
+        graph_client=graph_client
+    )
+    client.batch_manager.executor.rate_limiter = graph_client.rate_limiter
+    return client
+
+
+@pytest.fixture
+def mock_auth_service():
+    """Mock auth service for testing"""
+    auth_service = AsyncMock(spec=AuthService)
+    auth_service.get_access_token.return_value = "mock_access_token_12345"
+    return auth_service
+
+
 class TestMVPTeamsPlanner:
     """Test basic Teams and Planner functionality for MVP"""
 
     @pytest.fixture
-    def mock_auth_service(self):
-        """Mock auth service for testing"""
-        auth_service = AsyncMock(spec=AuthService)
-        auth_service.get_access_token.return_value = "mock_access_token_12345"
-        return auth_service
+    def graph(self):
+        return FakeGraph()
 
     @pytest.fixture
-    def teams_client(self, mock_auth_service):
+    def teams_client(self, mock_auth_service, graph):
         """Teams and Planner client for testing"""
-        return SimpleTeamsPlannerClient(mock_auth_service)
+        return make_client(mock_auth_service, graph)
 
     @pytest.mark.asyncio
-    async def test_get_user_teams_success(self, teams_client, mock_auth_service):
+    async def test_get_user_teams_success(self, teams_client, mock_auth_service, graph):
         """Test successful retrieval of user teams"""
         mock_teams_response = {
             "value": [
@@ -44,31 +103,27 @@ class TestMVPTeamsPlanner:
                 }
             ]
         }
+        graph.add("GET", "/me/joinedTeams", 200, mock_teams_response)
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = mock_teams_response
+        result = await teams_client.get_user_teams("test_user")
 
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
-
-            result = await teams_client.get_user_teams("test_user")
-
-            assert len(result) == 2
-            assert result[0]["id"] == "team-001"
-            assert result[0]["displayName"] == "Test Team 1"
-            mock_auth_service.get_access_token.assert_called_once_with("test_user")
+        assert len(result) == 2
+        assert result[0]["id"] == "team-001"
+        assert result[0]["displayName"] == "Test Team 1"
+        mock_auth_service.get_access_token.assert_called_once_with("test_user")
+        assert graph.requests[0]["headers"]["Authorization"] == "Bearer mock_access_token_12345"
 
     @pytest.mark.asyncio
-    async def test_get_user_teams_no_token(self, teams_client, mock_auth_service):
+    async def test_get_user_teams_no_token(self, teams_client, mock_auth_service, graph):
         """Test teams retrieval with no access token"""
         mock_auth_service.get_access_token.return_value = None
 
         with pytest.raises(TeamsPlannierError, match="No valid access token available"):
             await teams_client.get_user_teams("test_user")
+        assert graph.requests == []
 
     @pytest.mark.asyncio
-    async def test_create_planner_task_success(self, teams_client, mock_auth_service):
+    async def test_create_planner_task_success(self, teams_client, mock_auth_service, graph):
         """Test successful task creation in Planner with description update"""
         mock_task_response = {
             "id": "task-12345",
@@ -80,133 +135,84 @@ class TestMVPTeamsPlanner:
 
         mock_details_response = {
             "id": "task-12345",
-            "description": "This is a test task"
+            "description": "",
+            "@odata.etag": "test-etag"
         }
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client_instance = mock_client.return_value.__aenter__.return_value
+        graph.add("POST", "/planner/tasks", 201, mock_task_response)
+        graph.add("GET", "/planner/tasks/task-12345/details", 200, mock_details_response)
+        graph.add("PATCH", "/planner/tasks/task-12345/details", 204)
 
-            # Mock task creation response
-            mock_post_response = MagicMock()
-            mock_post_response.status_code = 201
-            mock_post_response.json.return_value = mock_task_response
+        result = await teams_client.create_planner_task(
+            "test_user",
+            "plan-001",
+            "Test Task",
+            "This is a test task"
+        )
 
-            # Mock task details get response (for description update)
-            mock_get_response = MagicMock()
-            mock_get_response.status_code = 200
-            mock_get_response.json.return_value = mock_details_response
-            mock_get_response.headers = {"ETag": "test-etag"}
+        assert result["id"] == "task-12345"
+        assert result["title"] == "Test Task"
+        assert result["planId"] == "plan-001"
 
-            # Mock task details patch response
-            mock_patch_response = MagicMock()
-            mock_patch_response.status_code = 200
+        patch_request = graph.sent("PATCH", "/planner/tasks/task-12345/details")[0]
+        assert patch_request["headers"]["If-Match"] == "test-etag"
+        assert patch_request["json"] == {"description": "This is a test task"}
 
-            mock_client_instance.post.return_value = mock_post_response
-            mock_client_instance.get.return_value = mock_get_response
-            mock_client_instance.patch.return_value = mock_patch_response
+    @pytest.mark.asyncio
+    async def test_create_planner_task_failure(self, teams_client, mock_auth_service, graph):
+        """Test task creation failure handling"""
+        graph.add("POST", "/planner/tasks", 403, "Forbidden: Insufficient privileges")
 
-            result = await teams_client.create_planner_task(
+        with pytest.raises(TeamsPlannierError, match="Failed to create task: 403"):
+            await teams_client.create_planner_task(
                 "test_user",
                 "plan-001",
-                "Test Task",
-                "This is a test task"
+                "Test Task"
             )
 
-            assert result["id"] == "task-12345"
-            assert result["title"] == "Test Task"
-            assert result["planId"] == "plan-001"
-            # Enhanced method calls get_access_token twice (task creation + description update)
-            assert mock_auth_service.get_access_token.call_count == 2
-
     @pytest.mark.asyncio
-    async def test_create_planner_task_failure(self, teams_client, mock_auth_service):
-        """Test task creation failure handling"""
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = MagicMock()
-            mock_response.status_code = 403
-            mock_response.text = "Forbidden: Insufficient privileges"
-
-            mock_client.return_value.__aenter__.return_value.post.return_value = mock_response
-
-            with pytest.raises(TeamsPlannierError, match="Failed to create task: 403"):
-                await teams_client.create_planner_task(
-                    "test_user",
-                    "plan-001",
-                    "Test Task"
-                )
-
-    @pytest.mark.asyncio
-    async def test_connectivity_test_success(self, teams_client, mock_auth_service):
+    async def test_connectivity_test_success(self, teams_client, mock_auth_service, graph):
         """Test successful connectivity check"""
-        mock_user_response = {
+        graph.add("GET", "/me", 200, {
             "id": "user-123",
             "displayName": "Test User",
             "mail": "test@example.com"
-        }
-
-        mock_teams_response = {
+        })
+        graph.add("GET", "/me/joinedTeams", 200, {
             "value": [
                 {"id": "team-001", "displayName": "Test Team"}
             ]
-        }
-
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client_instance = mock_client.return_value.__aenter__.return_value
+        })
 
-            # Mock user info response
-            mock_user_resp = MagicMock()
-            mock_user_resp.status_code = 200
-            mock_user_resp.json.return_value = mock_user_response
+        result = await teams_client.test_connectivity("test_user")
 
-            # Mock teams response
-            mock_teams_resp = MagicMock()
-            mock_teams_resp.status_code = 200
-            mock_teams_resp.json.return_value = mock_teams_response
-
-            mock_client_instance.get.side_effect = [mock_user_resp, mock_teams_resp]
-
-            result = await teams_client.test_connectivity("test_user")
-
-            assert result["connectivity_test"] is True
-            assert result["user_info"]["id"] == "user-123"
-            assert len(result["teams"]) == 1
-            assert len(result["errors"]) == 0
+        assert result["connectivity_test"] is True
+        assert result["user_info"]["id"] == "user-123"
+        assert len(result["teams"]) == 1
+        assert len(result["errors"]) == 0
 
     @pytest.mark.asyncio
-    async def test_connectivity_test_partial_failure(self, teams_client, mock_auth_service):
+    async def test_connectivity_test_partial_failure(self, teams_client, mock_auth_service, graph):
         """Test connectivity with partial failures"""
-        mock_user_response = {
+        graph.add("GET", "/me", 200, {
             "id": "user-123",
             "displayName": "Test User",
             "mail": "test@example.com"
-        }
-
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client_instance = mock_client.return_value.__aenter__.return_value
+        })
+        graph.add("GET", "/me/joinedTeams", 403, "Forbidden")
 
-            # Mock successful user info response
-            mock_user_resp = MagicMock()
-            mock_user_resp.status_code = 200
-            mock_user_resp.json.return_value = mock_user_response
+        result = await teams_client.test_connectivity("test_user")
 
-            # Mock failed teams response
-            mock_teams_resp = MagicMock()
-            mock_teams_resp.status_code = 403
-
-            mock_client_instance.get.side_effect = [mock_user_resp, mock_teams_resp]
-
-            result = await teams_client.test_connectivity("test_user")
-
-            assert result["connectivity_test"] is False
-            assert result["user_info"]["id"] == "user-123"
-            assert result["teams"] is None
-            assert len(result["errors"]) == 1
-            assert "Failed to get teams: 403" in result["errors"][0]
+        assert result["connectivity_test"] is False
+        assert result["user_info"]["id"] == "user-123"
+        assert result["teams"] is None
+        assert len(result["errors"]) == 1
+        assert "Failed to get teams: 403" in result["errors"][0]
 
     @pytest.mark.asyncio
-    async def test_get_team_planner_plans_success(self, teams_client, mock_auth_service):
+    async def test_get_team_planner_plans_success(self, teams_client, mock_auth_service, graph):
         """Test successful retrieval of team planner plans"""
-        mock_plans_response = {
+        graph.add("GET", "/groups/team-001/planner/plans", 200, {
             "value": [
                 {
                     "id": "plan-001",
@@ -219,77 +225,260 @@ class TestMVPTeamsPlanner:
                     "owner": "team-001"
                 }
             ]
+        })
+
+        result = await teams_client.get_team_planner_plans("test_user", "team-001")
+
+        assert len(result) == 2
+        assert result[0]["id"] == "plan-001"
+        assert result[0]["title"] == "Sprint Planning"
+        mock_auth_service.get_access_token.assert_called_once_with("test_user")
+
+    @pytest.mark.asyncio
+    async def test_get_team_planner_plans_not_found(self, teams_client, graph):
+        """A team without Planner returns no plans"""
+        graph.add("GET", "/groups/team-404/planner/plans", 404)
+
+        assert await teams_client.get_team_planner_plans("test_user", "team-404") == []
+
+    @pytest.mark.asyncio
+    async def test_requests_share_one_connection_pool(self, teams_client, graph):
+        """Methods reuse the graph client instead of opening their own"""
+        graph.add("GET", "/me/joinedTeams", 200, {"value": []})
+        http_client = teams_client.graph_client._client
+
+        await asyncio.gather(*(teams_client.get_user_teams("test_user") for _ in range(5)))
+
+        assert teams_client.graph_client._client is http_client
+        assert len(graph.requests) == 5
+
+        await teams_client.close()
+        assert teams_client.graph_client._client is None
+
+
+class FakeGraphBatch:
+    """Answers $batch posts like Graph for task creation and details updates
+
+    Task details carry their own ETag: a details PATCH is only accepted with
+    the ETag returned by a GET of those details, never with the task's.
+    """
+
+    def __init__(self, edited_concurrently=(), throttle_once=()):
+        self.edited_concurrently = set(edited_concurrently)
+        self.throttle_once = set(throttle_once)
+        self.batches = []
+
+    def handle(self, request):
+        assert request.url.path.endswith("/$batch")
+        requests = json.loads(request.content)["requests"]
+        assert len(requests) <= 20
+        self.batches.append(requests)
+
+        return httpx.Response(200, json={"responses": [self._answer(sub_request) for sub_request in requests]})
+
+    def requests(self, method):
+        return [request for batch in self.batches for request in batch if request["method"] == method]
+
+    def _answer(self, request):
+        request_id = request["id"]
+        if request_id in self.throttle_once:
+            self.throttle_once.discard(request_id)
+            return {"id": request_id, "status": 429, "headers": {"Retry-After": "0"}}
+
+        if request["method"] == "POST" and request["body"]["title"] == "Invalid":
+            return {"id": request_id, "status": 400, "body": {"error": {"message": "Bad title"}}}
+
+        if request["method"] == "POST":
+            task = {**request["body"], "id": f"task-{request_id}", "@odata.etag": f'W/"task-{request_id}"'}
+            return {"id": request_id, "status": 201, "body": task}
+
+        details_etag = f'W/"details-{request_id}"'
+        if request["method"] == "GET":
+            return {"id": request_id, "status": 200, "body": {"@odata.etag": details_etag}}
+
+        if request_id in self.edited_concurrently or request["headers"]["If-Match"] != details_etag:
+            return {"id": request_id, "status": 412, "body": {"error": {"message": "Precondition failed"}}}
+        return {"id": request_id, "status": 200, "body": {**request["body"], "@odata.etag": f'W/"details-{request_id}-2"'}}
+
+
+class TestBulkTaskCreation:
+    """Bulk task creation through $batch"""
+
+    @pytest.mark.asyncio
+    async def test_template_import_batches_details_with_their_own_etag(self, mock_auth_service):
+        """300 tasks with details take 15 create, 15 details GET and 15 details PATCH batches"""
+        graph = FakeGraphBatch()
+        teams_client = make_client(mock_auth_service, graph)
+        specs = [
+            {"title": f"Task {i}", "description": "From template", "checklist": [{"title": "Step"}]}
+            for i in range(300)
+        ]
+
+        outcomes = await teams_client.create_planner_tasks_bulk("test_user", "plan-001", specs)
+
+        assert len(graph.batches) == 45
+        assert [outcome["status"] for outcome in outcomes] == ["created"] * 300
+        assert outcomes[7]["task"]["id"] == "task-7"
+        assert len(graph.requests("GET")) == 300
+        assert len(graph.requests("PATCH")) == 300
+
+        details_request = next(request for request in graph.requests("PATCH") if request["id"] == "7")
+        assert details_request["headers"]["If-Match"] == 'W/"details-7"'
+        assert details_request["body"]["description"] == "From template"
+        assert len(details_request["body"]["checklist"]) == 1
+        assert teams_client.etag_cache.get("details", "task-7") == 'W/"details-7-2"'
+
+    @pytest.mark.asyncio
+    async def test_tasks_without_details_skip_details_rounds(self, mock_auth_service):
+        """Only tasks with a description or checklist have their details read and written"""
+        graph = FakeGraphBatch()
+        teams_client = make_client(mock_auth_service, graph)
+        specs = [{"title": "Plain"}, {"title": "Described", "description": "Notes"}]
+
+        await teams_client.create_planner_tasks_bulk("test_user", "plan-001", specs)
+
+        assert [len(batch) for batch in graph.batches] == [2, 1, 1]
+        assert [request["url"] for request in graph.requests("GET")] == ["/planner/tasks/task-1/details"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_details_edit_is_reported_as_partial(self, mock_auth_service):
+        """A details PATCH rejected with 412 leaves the task created and reports the failure"""
+        graph = FakeGraphBatch(edited_concurrently={"1"})
+        teams_client = make_client(mock_auth_service, graph)
+        specs = [{"title": f"Task {i}", "description": "Notes"} for i in range(3)]
+
+        outcomes = await teams_client.create_planner_tasks_bulk("test_user", "plan-001", specs)
+
+        assert [outcome["status"] for outcome in outcomes] == ["created", "partial", "created"]
+        assert outcomes[1]["task"]["id"] == "task-1"
+        assert outcomes[1]["error"] == "412: Precondition failed"
+
+    @pytest.mark.asyncio
+    async def test_reports_per_item_outcomes(self, mock_auth_service):
+        """Throttled creates are resent; failures are reported per task"""
+        graph = FakeGraphBatch(throttle_once={"0"})
+        teams_client = make_client(mock_auth_service, graph)
+        specs = [{"title": "Retried"}, {"title": "Plain"}, {"title": "Invalid", "description": "Never applied"}]
+
+        outcomes = await teams_client.create_planner_tasks_bulk("test_user", "plan-001", specs)
+
+        assert [len(batch) for batch in graph.batches] == [3, 1]
+        assert outcomes[0] == {
+            "index": 0,
+            "title": "Retried",
+            "status": "created",
+            "task": outcomes[0]["task"],
+            "error": None
         }
+        assert outcomes[0]["task"]["planId"] == "plan-001"
+        assert outcomes[1]["status"] == "created"
+        assert outcomes[2]["status"] == "failed"
+        assert outcomes[2]["error"] == "400: Bad title"
+
+
+class TestOptimisticWrites:
+    """Writes use cached ETags and only read on 412"""
+
+    @pytest.fixture
+    def etag_cache(self):
+        return PlannerETagCache()
+
+    @pytest.fixture
+    def graph(self):
+        return FakeGraph()
+
+    @pytest.fixture
+    def teams_client(self, mock_auth_service, graph, etag_cache):
+        return make_client(mock_auth_service, graph, etag_cache=etag_cache)
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client_instance = mock_client.return_value.__aenter__.return_value
+    @pytest.mark.asyncio
+    async def test_update_after_read_skips_get(self, teams_client, graph, etag_cache):
+        """A task seen in a listing is updated without reading it again"""
+        graph.add("GET", "/planner/plans/plan-001/tasks", 200, {"value": [{"id": "task-1", "@odata.etag": 'W/"1"'}]})
+        graph.add("PATCH", "/planner/tasks/task-1", 200, {"id": "task-1", "@odata.etag": 'W/"2"'})
 
-            # Mock plans response (direct API call to /groups/{team_id}/planner/plans)
-            mock_plans_resp = MagicMock()
-            mock_plans_resp.status_code = 200
-            mock_plans_resp.json.return_value = mock_plans_response
+        await teams_client.get_plan_tasks("test_user", "plan-001")
+        result = await teams_client.update_planner_task("test_user", "task-1", title="Renamed")
 
-            mock_client_instance.get.return_value = mock_plans_resp
+        assert graph.sent("GET", "/planner/tasks/task-1") == []
+        patch_request = graph.sent("PATCH", "/planner/tasks/task-1")[0]
+        assert patch_request["headers"]["If-Match"] == 'W/"1"'
+        assert patch_request["headers"]["Prefer"] == "return=representation"
+        assert result["@odata.etag"] == 'W/"2"'
+        assert etag_cache.get("task", "task-1") == 'W/"2"'
 
-            result = await teams_client.get_team_planner_plans("test_user", "team-001")
+    @pytest.mark.asyncio
+    async def test_stale_etag_refetches_and_retries(self, teams_client, graph, etag_cache):
+        """A 412 refreshes the ETag and resends the write once"""
+        etag_cache.set("task", "task-1", 'W/"old"')
+        graph.add("DELETE", "/planner/tasks/task-1", 412, "Precondition failed")
+        graph.add("DELETE", "/planner/tasks/task-1", 204)
+        graph.add("GET", "/planner/tasks/task-1", 200, {"id": "task-1", "@odata.etag": 'W/"new"'})
 
-            assert len(result) == 2
-            assert result[0]["id"] == "plan-001"
-            assert result[0]["title"] == "Sprint Planning"
-            mock_auth_service.get_access_token.assert_called_once_with("test_user")
+        assert await teams_client.delete_planner_task("test_user", "task-1") is True
+
+        assert len(graph.sent("GET", "/planner/tasks/task-1")) == 1
+        deletes = graph.sent("DELETE", "/planner/tasks/task-1")
+        assert [request["headers"]["If-Match"] for request in deletes] == ['W/"old"', 'W/"new"']
+        assert etag_cache.get("task", "task-1") is None
+
+    @pytest.mark.asyncio
+    async def test_checklist_writes_reuse_details_etag(self, teams_client, graph, etag_cache):
+        """Consecutive details writes chain ETags from the write responses"""
+        details_path = "/planner/tasks/task-1/details"
+        graph.add("GET", details_path, 200, {"checklist": {}, "@odata.etag": 'W/"d1"'})
+        graph.add("PATCH", details_path, 200, {"@odata.etag": 'W/"d2"', "checklist": {"item-1": {}}})
+        graph.add("PATCH", details_path, 200, {"@odata.etag": 'W/"d3"'})
+
+        assert await teams_client.add_task_checklist("test_user", "task-1", [{"title": "Step"}])
+        assert await teams_client.update_checklist_item("test_user", "task-1", "item-1", True)
+
+        assert len(graph.sent("GET", details_path)) == 1
+        second_patch = graph.sent("PATCH", details_path)[1]
+        assert second_patch["headers"]["If-Match"] == 'W/"d2"'
+        assert second_patch["json"] == {"checklist": {"item-1": {
+            "@odata.type": "microsoft.graph.plannerChecklistItem",
+            "isChecked": True
+        }}}
+        assert etag_cache.get("details", "task-1") == 'W/"d3"'
 
 
 class TestMVPIntegration:
     """Integration tests for MVP functionality"""
 
     @pytest.mark.asyncio
-    async def test_end_to_end_task_creation_workflow(self):
+    async def test_end_to_end_task_creation_workflow(self, mock_auth_service):
         """Test the complete workflow from auth to task creation"""
         # This test would require actual Azure AD credentials in a real scenario
-        # For MVP, we'll test the workflow with mocks
-
-        with patch('src.teams_planner_client.AuthService') as mock_auth_class:
-            mock_auth_service = AsyncMock()
-            mock_auth_service.get_access_token.return_value = "valid_token"
-            mock_auth_class.return_value = mock_auth_service
-
-            client = SimpleTeamsPlannerClient(mock_auth_service)
-
-            # Test the full workflow with mocked responses
-            with patch('httpx.AsyncClient') as mock_http_client:
-                mock_client_instance = mock_http_client.return_value.__aenter__.return_value
-
-                # Mock responses for the workflow
-                user_info_response = MagicMock(status_code=200, json=lambda: {"id": "user-123", "displayName": "Test User"})
-                teams_response = MagicMock(status_code=200, json=lambda: {"value": [{"id": "team-001", "displayName": "Test Team"}]})
-                plans_response = MagicMock(status_code=200, json=lambda: {"value": [{"id": "plan-001", "title": "Test Plan"}]})
-                task_creation_response = MagicMock(status_code=201, json=lambda: {"id": "task-123", "title": "MVP Test Task", "planId": "plan-001"})
-                task_details_response = MagicMock(status_code=200, json=lambda: {"id": "task-123", "description": "End-to-end test task"})
-                task_details_response.headers = {"ETag": "test-etag"}
-                task_patch_response = MagicMock(status_code=200)
-
-                # Set up mock responses for different calls
-                get_responses = [user_info_response, teams_response, plans_response, task_details_response]
-                mock_client_instance.get.side_effect = get_responses
-                mock_client_instance.post.return_value = task_creation_response
-                mock_client_instance.patch.return_value = task_patch_response
-
-                # Execute the workflow
-                connectivity = await client.test_connectivity("test_user")
-                assert connectivity["connectivity_test"] is True
-
-                if connectivity["teams"]:
-                    team_id = connectivity["teams"][0]["id"]
-                    plans = await client.get_team_planner_plans("test_user", team_id)
-                    assert len(plans) == 1
-
-                    if plans:
-                        plan_id = plans[0]["id"]
-                        task = await client.create_planner_task(
-                            "test_user",
-                            plan_id,
-                            "MVP Test Task",
-                            "End-to-end test task"
-                        )
-                        assert task["id"] == "task-123"
-                        assert task["title"] == "MVP Test Task"
\ No newline at end of file
+        # For MVP, we'll test the workflow with a fake Graph transport
+        graph = FakeGraph()
+        graph.add("GET", "/me", 200, {"id": "user-123", "displayName": "Test User"})
+        graph.add("GET", "/me/joinedTeams", 200, {"value": [{"id": "team-001", "displayName": "Test Team"}]})
+        graph.add("GET", "/groups/team-001/planner/plans", 200, {"value": [{"id": "plan-001", "title": "Test Plan"}]})
+        graph.add("POST", "/planner/tasks", 201, {"id": "task-123", "title": "MVP Test Task", "planId": "plan-001"})
+        graph.add("GET", "/planner/tasks/task-123/details", 200, {"id": "task-123", "@odata.etag": "test-etag"})
+        graph.add("PATCH", "/planner/tasks/task-123/details", 204)
+
+        client = make_client(mock_auth_service, graph)
+
+        # Execute the workflow
+        connectivity = await client.test_connectivity("test_user")
+        assert connectivity["connectivity_test"] is True
+
+        if connectivity["teams"]:
+            team_id = connectivity["teams"][0]["id"]
+            plans = await client.get_team_planner_plans("test_user", team_id)
+            assert len(plans) == 1
+
+            if plans:
+                plan_id = plans[0]["id"]
+                task = await client.create_planner_task(
+                    "test_user",
+                    plan_id,
+                    "MVP Test Task",
+                    "End-to-end test task"
+                )
+                assert task["id"] == "task-123"
+                assert task["title"] == "MVP Test Task"
+
+        await client.close()
@@ -18,6 +18,7 @@ from src.nlp.batch_processor import BatchProcessor, BatchJob, BatchOperation
 from src.nlp.disambiguator import NLDisambiguator, AmbiguityContext, ClarificationRequest
 from src.nlp.error_handler import NLErrorHandler, ErrorContext
 from src.services.nlp_service import NLPService
+from src.graph.batch_operations import BatchOperationsManager
 
 
 class TestIntentClassifier:
@@ -388,6 +389,110 @@ class TestBatchProcessor:
         assert progress_updates[-1]["status"] == "completed"
         assert progress_updates[-1]["progress"] == 100
 
+    @pytest.mark.asyncio
+    async def test_batch_job_runs_through_graph_batch(self):
+        """Task operations are sent as $batch sub-requests with per-operation progress"""
+        manager = BatchOperationsManager()
+        sent = []
+
+        async def fake_http_request(request_data, context):
+            sent.append(request_data["data"]["requests"])
+            return {"responses": [
+                {"id": request["id"], "status": 201, "body": {"id": f"graph-{request['id']}"}}
+                for request in request_data["data"]["requests"]
+            ]}
+
+        manager.executor._make_http_request = fake_http_request
+        batch_processor = BatchProcessor(max_batch_size=50, batch_manager=manager)
+        batch_job = await batch_processor.create_batch_job(
+            "test_user", "test_session", "create_multiple_tasks",
+            {"quantity": 25, "task_template": {"title": "Task", "plan_id": "plan-1"}}
+        )
+        executor = AsyncMock()
+
+        progress_updates = [
+            update async for update in batch_processor.execute_batch_job(
+                batch_job.job_id, executor, auth_token="token"
+            )
+        ]
+
+        executor.assert_not_called()
+        assert [len(requests) for requests in sent] == [20, 5]
+        assert sent[0][0]["method"] == "POST"
+        assert sent[0][0]["body"]["planId"] == "plan-1"
+        assert len([update for update in progress_updates if update["status"] == "progress"]) == 25
+        assert progress_updates[-1]["status"] == "completed"
+        assert all(operation.result["id"].startswith("graph-") for operation in batch_job.operations)
+
+    @pytest.mark.asyncio
+    async def test_query_operation_expands_to_conditional_patches(self):
+        """Updating every task in a plan becomes one If-Match PATCH per task"""
+        manager = BatchOperationsManager()
+        sent = []
+
+        async def fake_http_request(request_data, context):
+            sent.extend(request_data["data"]["requests"])
+            return {"responses": [
+                {"id": request["id"], "status": 412 if request["url"].endswith("task-2") else 204}
+                for request in request_data["data"]["requests"]
+            ]}
+
+        async def task_lookup(task_filter):
+            assert task_filter == {"plan_name": "Alpha"}
+            return [{"id": f"task-{i}", "@odata.etag": f"W/\"etag-{i}\""} for i in range(3)]
+
+        manager.executor._make_http_request = fake_http_request
+        manager.config.retry_failed_operations = False
+        batch_processor = BatchProcessor(batch_manager=manager, task_lookup=task_lookup)
+        batch_job = await batch_processor.create_batch_job(
+            "test_user", "test_session", "update_tasks_in_project",
+            {"project_name": "Alpha", "update_data": {"status": "completed"}}
+        )
+
+        progress_updates = [
+            update async for update in batch_processor.execute_batch_job(batch_job.job_id, auth_token="token")
+        ]
+
+        assert batch_job.total_operations == 3
+        assert {request["method"] for request in sent} == {"PATCH"}
+        assert all(request["body"] == {"percentComplete": 100} for request in sent)
+        assert sent[0]["headers"]["If-Match"] == 'W/"etag-0"'
+        assert progress_updates[-1]["status"] == "partial"
+        assert progress_updates[-1]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_sending_batches(self):
+        """Cancelling a job stops before the next $batch request"""
+        manager = BatchOperationsManager()
+        manager.config.max_concurrent_batches = 1
+        sent = []
+
+        async def fake_http_request(request_data, context):
+            sent.append(request_data["data"]["requests"])
+            await asyncio.sleep(0.05)
+            return {"responses": [
+                {"id": request["id"], "status": 201, "body": {}} for request in request_data["data"]["requests"]
+            ]}
+
+        manager.executor._make_http_request = fake_http_request
+        batch_processor = BatchProcessor(batch_manager=manager)
+        batch_job = await batch_processor.create_batch_job(
+            "test_user", "test_session", "create_multiple_tasks",
+            {"quantity": 45, "task_template": {"title": "Task", "plan_id": "plan-1"}}
+        )
+
+        progress_updates = []
+        async for update in batch_processor.execute_batch_job(batch_job.job_id, auth_token="token"):
+            progress_updates.append(update)
+            if update["status"] == "progress" and update["completed"] == 20:
+                assert await batch_processor.cancel_job(batch_job.job_id)
+
+        # The third batch is never sent
+        assert len(sent) < 3
+        assert progress_updates[-1]["status"] == "cancelled"
+        assert batch_job.completed_operations == 20
+        assert {operation.status for operation in batch_job.operations[20:]} == {"cancelled"}
+
 
 class TestDisambiguator:
     """Test disambiguation and clarification logic"""
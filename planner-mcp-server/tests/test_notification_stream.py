@@ -0,0 +1,347 @@
+"""
+Tests for the Redis Streams webhook notification backbone
+
+Unit tests run against an in-memory stream double; the throughput tests use a
+local Redis (TEST_REDIS_URL, default redis://localhost:6379/15) and are skipped
+when it is not reachable.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+
+import pytest
+import pytest_asyncio
+
+from src.cache import CacheService, CacheError
+from src.database import Database
+from src.graph.notification_stream import WebhookNotificationStream, NotificationStreamError
+from src.graph.webhooks import WebhookSubscriptionManager
+from src.models.graph_models import WebhookNotification, WebhookSubscription
+
+
+class InMemoryStreamCache:
+    """Minimal in-memory implementation of the CacheService stream helpers"""
+
+    def __init__(self):
+        self.streams: Dict[str, List[Tuple[str, Any]]] = {}
+        self.groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.values: Dict[str, Any] = {}
+        self._sequence = 0
+        self.fail_writes = False
+
+    async def set(self, key: str, value: Any, ttl: int = None, namespace: str = "itp"):
+        self.values[key] = value
+        return True
+
+    async def delete(self, key: str, namespace: str = "itp"):
+        return self.values.pop(key, None) is not None
+
+    async def get(self, key: str, namespace: str = "itp"):
+        return self.values.get(key)
+
+    async def delete_multiple(self, keys: List[str], namespace: str = "itp"):
+        return len([key for key in keys if self.values.pop(key, None) is not None])
+
+    async def stream_add(self, stream: str, value: Any, maxlen: int = None, namespace: str = "itp"):
+        if self.fail_writes:
+            return None
+        self._sequence += 1
+        entry_id = f"{self._sequence}-0"
+        entries = self.streams.setdefault(stream, [])
+        entries.append((entry_id, value))
+        if maxlen:
+            del entries[:-maxlen]
+        return entry_id
+
+    async def stream_create_group(self, stream: str, group: str, start_id: str = "0", namespace: str = "itp"):
+        self.streams.setdefault(stream, [])
+        self.groups.setdefault((stream, group), {"delivered": set(), "pending": {}})
+        return True
+
+    async def stream_read_group(self, stream, group, consumer, count=100, block_ms=None, namespace="itp"):
+        state = self.groups[(stream, group)]
+        entries = [
+            entry for entry in self.streams.get(stream, [])
+            if entry[0] not in state["delivered"]
+        ][:count]
+        for entry_id, _ in entries:
+            state["delivered"].add(entry_id)
+            state["pending"][entry_id] = (consumer, time.monotonic())
+        if not entries and block_ms:
+            await asyncio.sleep(min(block_ms, 10) / 1000)
+        return entries
+
+    async def stream_ack(self, stream, group, entry_ids, namespace="itp"):
+        pending = self.groups[(stream, group)]["pending"]
+        return len([entry_id for entry_id in entry_ids if pending.pop(entry_id, None)])
+
+    async def stream_autoclaim(self, stream, group, consumer, min_idle_ms, start_id="0-0", count=100, namespace="itp"):
+        pending = self.groups[(stream, group)]["pending"]
+        now = time.monotonic()
+        values = dict(self.streams.get(stream, []))
+        claimed = []
+        for entry_id, (_, delivered_at) in list(pending.items()):
+            if (now - delivered_at) * 1000 >= min_idle_ms and entry_id in values:
+                pending[entry_id] = (consumer, now)
+                claimed.append((entry_id, values[entry_id]))
+        return "0-0", claimed[:count]
+
+    async def stream_stats(self, stream, group, namespace="itp"):
+        return {
+            "length": len(self.streams.get(stream, [])),
+            "pending": len(self.groups[(stream, group)]["pending"]),
+            "consumers": 1
+        }
+
+
+class AcceptingConnection:
+    """asyncpg connection double that accepts all writes"""
+
+    async def copy_records_to_table(self, table_name: str, *, records, columns):
+        return None
+
+    async def executemany(self, query: str, args):
+        return None
+
+
+class AcceptingPool:
+    def acquire(self):
+        class _Acquire:
+            async def __aenter__(self):
+                return AcceptingConnection()
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def make_database() -> Database:
+    """Real Database whose asyncpg pool accepts all writes"""
+    database = Database("postgresql+asyncpg://localhost/test")
+    database._connection_pool = AcceptingPool()
+    return database
+
+
+def make_notification(task_id: str, change_type: str = "updated") -> WebhookNotification:
+    """Build a planner task notification"""
+    return WebhookNotification(
+        subscription_id="sub-1",
+        client_state="task_tracking_v2",
+        change_type=change_type,
+        resource=f"/planner/tasks/{task_id}",
+        resource_data={"id": task_id, "@odata.etag": 'W/"etag-1"'},
+        subscription_expiration_date_time=datetime(2024, 10, 11, 8, 15),
+        tenant_id="tenant-1"
+    )
+
+
+class TestNotificationSerialization:
+    """Round-tripping notifications through stream entries"""
+
+    def test_round_trip(self):
+        notification = make_notification("task-1")
+        data = WebhookNotificationStream.serialize(notification)
+        assert "stream_entry_id" not in data
+
+        # Values are JSON encoded by CacheService with default=str
+        encoded = {key: (str(value) if isinstance(value, datetime) else value) for key, value in data.items()}
+        encoded["received_at"] = notification.received_at.isoformat()
+        encoded["subscription_expiration_date_time"] = notification.subscription_expiration_date_time.isoformat()
+
+        restored = WebhookNotificationStream.deserialize(encoded, "42-0")
+        assert restored.stream_entry_id == "42-0"
+        assert restored.resource == notification.resource
+        assert restored.received_at == notification.received_at
+        assert restored.subscription_expiration_date_time == notification.subscription_expiration_date_time
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_raises(self):
+        cache = InMemoryStreamCache()
+        cache.fail_writes = True
+        stream = WebhookNotificationStream(cache, consumer_name="replica-1")
+
+        with pytest.raises(NotificationStreamError):
+            await stream.publish(make_notification("task-1"))
+
+    @pytest.mark.asyncio
+    async def test_malformed_entries_are_acknowledged(self):
+        cache = InMemoryStreamCache()
+        stream = WebhookNotificationStream(cache, consumer_name="replica-1")
+        await stream.initialize()
+        await cache.stream_add(stream.stream_name, {"unexpected": "payload"})
+
+        assert await stream.read() == []
+        stats = await stream.get_stats()
+        assert stats["pending"] == 0
+
+
+class TestStreamBackedWebhookManager:
+    """Webhook manager ingesting through the notification stream"""
+
+    @pytest_asyncio.fixture
+    async def manager(self, monkeypatch):
+        monkeypatch.setenv("WEBHOOK_STREAM_ENABLED", "true")
+        monkeypatch.setenv("WEBHOOK_STREAM_BLOCK_MS", "10")
+        monkeypatch.setenv("WEBHOOK_STREAM_CLAIM_IDLE_MS", "50")
+        monkeypatch.setenv("WEBHOOK_TENANT_STREAM_MAX_LENGTH", "5")
+        monkeypatch.setenv("WEBHOOK_STREAM_CONSUMER", "replica-1")
+        manager = WebhookSubscriptionManager(make_database(), InMemoryStreamCache())
+        manager.subscriptions["sub-1"] = WebhookSubscription(
+            id="sub-1",
+            resource="/planner/tasks",
+            change_types=["updated"],
+            notification_url="https://test.example.com/webhooks/default",
+            tenant_id="tenant-1"
+        )
+        manager._renewal_monitor = lambda: asyncio.sleep(3600)
+        await manager.initialize()
+        yield manager
+        await manager.shutdown()
+
+    async def _wait_for_acks(self, manager: WebhookSubscriptionManager, expected_length: int) -> Dict[str, Any]:
+        stream = manager.notification_stream
+        delivered = manager.cache_service.groups[(stream.stream_name, stream.group_name)]["delivered"]
+        stats = {}
+        for _ in range(200):
+            stats = await stream.get_stats()
+            if len(delivered) == expected_length and stats["pending"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        return stats
+
+    @pytest.mark.asyncio
+    async def test_notifications_flow_through_stream_and_are_acknowledged(self, manager):
+        for i in range(10):
+            await manager._publish_to_stream(make_notification(f"task-{i}"))
+
+        stats = await self._wait_for_acks(manager, 10)
+        assert stats["pending"] == 0
+
+        # Per-tenant change streams are capped instead of growing forever
+        tenant_stream = manager.cache_service.streams["task_notifications:tenant-1"]
+        assert len(tenant_stream) == 5
+
+    @pytest.mark.asyncio
+    async def test_stale_entries_from_dead_consumer_are_reclaimed(self, manager):
+        cache = manager.cache_service
+        stream = manager.notification_stream
+
+        # Another replica read an entry and died before acknowledging it
+        dead_replica = WebhookNotificationStream(cache, consumer_name="replica-dead")
+        manager._stream_consumer_task.cancel()
+        await dead_replica.publish(make_notification("task-orphan"))
+        assert len(await dead_replica.read()) == 1
+
+        reclaimed = await stream.reclaim_stale(0)
+        await manager._dispatch_stream_notifications(reclaimed)
+
+        stats = await self._wait_for_acks(manager, 1)
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_dropped_rows_release_entries_for_reclaim(self, manager):
+        manager._stream_consumer_task.cancel()
+        await manager._publish_to_stream(make_notification("task-1"))
+        notification = (await manager.notification_stream.read())[0]
+        manager._stream_inflight_ids.add(notification.stream_entry_id)
+
+        # Buffer overflowed during a database outage: the entry stays pending
+        await manager._release_notification(notification)
+
+        assert notification.stream_entry_id not in manager._stream_inflight_ids
+        assert (await manager.notification_stream.get_stats())["pending"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_write_failure_returns_503(self, manager):
+        from fastapi import HTTPException
+
+        manager.cache_service.fail_writes = True
+        with pytest.raises(HTTPException) as exc_info:
+            await manager._publish_to_stream(make_notification("task-1"))
+        assert exc_info.value.status_code == 503
+
+
+@pytest_asyncio.fixture
+async def redis_cache():
+    """CacheService connected to a local Redis, skipped when unavailable"""
+    cache = CacheService(os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15"))
+    try:
+        await cache.initialize()
+    except CacheError:
+        pytest.skip("Local Redis not available")
+    yield cache
+    await cache.close()
+
+
+class TestNotificationStreamThroughput:
+    """Throughput of the stream backbone against a local Redis"""
+
+    @pytest.mark.asyncio
+    async def test_publish_consume_ack_throughput(self, redis_cache):
+        stream = WebhookNotificationStream(
+            redis_cache,
+            stream_name=f"test_stream:{uuid.uuid4()}",
+            consumer_name="replica-1"
+        )
+        await stream.initialize()
+        total = 2000
+
+        try:
+            start_time = time.time()
+            await asyncio.gather(*(
+                stream.publish(make_notification(f"task-{i}")) for i in range(total)
+            ))
+            publish_duration = time.time() - start_time
+
+            consumed = 0
+            start_time = time.time()
+            while consumed < total:
+                notifications = await stream.read(count=500)
+                assert notifications
+                await asyncio.gather(*(stream.acknowledge(n) for n in notifications))
+                consumed += len(notifications)
+            consume_duration = time.time() - start_time
+
+            stats = await stream.get_stats()
+            assert stats["pending"] == 0
+            assert total / publish_duration > 500
+            assert total / consume_duration > 500
+
+        finally:
+            await redis_cache.redis_client.delete(f"itp:{stream.stream_name}")
+
+    @pytest.mark.asyncio
+    async def test_consumer_group_shares_load_and_trims(self, redis_cache):
+        stream_name = f"test_stream:{uuid.uuid4()}"
+        replica_a = WebhookNotificationStream(redis_cache, stream_name, consumer_name="a", max_length=100)
+        replica_b = WebhookNotificationStream(redis_cache, stream_name, consumer_name="b", max_length=100)
+        await replica_a.initialize()
+        await replica_b.initialize()
+
+        try:
+            for i in range(50):
+                await replica_a.publish(make_notification(f"task-{i}"))
+
+            first = await replica_a.read(count=25)
+            second = await replica_b.read(count=25)
+            ids_a = {n.stream_entry_id for n in first}
+            ids_b = {n.stream_entry_id for n in second}
+            assert len(ids_a) == 25 and len(ids_b) == 25
+            assert not ids_a & ids_b
+
+            # Replica b dies; replica a reclaims its pending entries
+            reclaimed = await replica_a.reclaim_stale(0)
+            assert {n.stream_entry_id for n in reclaimed} >= ids_b
+
+            for i in range(1000):
+                await replica_a.publish(make_notification(f"task-extra-{i}"))
+            stats = await replica_a.get_stats()
+            assert stats["length"] < 300
+
+        finally:
+            await redis_cache.redis_client.delete(f"itp:{stream_name}")
@@ -0,0 +1,276 @@
+"""
+Tests for batched webhook notification persistence
+"""
+
+import json
+import time
+import asyncio
+from typing import Dict, List, Any
+
+import pytest
+
+from src.database import Database
+from src.graph.notification_writer import NotificationBatchWriter
+from src.models.graph_models import WebhookNotification, WebhookSubscription
+
+
+class RecordingConnection:
+    """asyncpg connection double recording COPYs and executemany calls"""
+
+    def __init__(self, pool: "RecordingPool"):
+        self.pool = pool
+
+    async def _round_trip(self):
+        if self.pool.latency:
+            await asyncio.sleep(self.pool.latency)
+        if self.pool.fail_next:
+            self.pool.fail_next -= 1
+            raise ConnectionError("connection reset")
+
+    async def copy_records_to_table(self, table_name: str, *, records, columns):
+        await self._round_trip()
+        rows = [dict(zip(columns, record)) for record in records]
+        self.pool.statements.append({"kind": "copy", "table": table_name, "rows": rows})
+
+    async def executemany(self, query: str, args):
+        await self._round_trip()
+        self.pool.statements.append({"kind": "executemany", "query": " ".join(query.split()), "args": list(args)})
+
+
+class RecordingPool:
+    """asyncpg pool double with a simulated round-trip latency"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.statements: List[Dict[str, Any]] = []
+        self.fail_next = 0
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return RecordingConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def make_database(latency: float = 0.0) -> Database:
+    """Real Database whose asyncpg pool is replaced by a recording double"""
+    database = Database("postgresql+asyncpg://localhost/test")
+    database._connection_pool = RecordingPool(latency)
+    return database
+
+
+def copies(database: Database) -> List[Dict[str, Any]]:
+    return [s for s in database._connection_pool.statements
+            if s["kind"] == "copy" and s["table"] == "webhook_notifications"]
+
+
+def updates(database: Database) -> List[Dict[str, Any]]:
+    return [s for s in database._connection_pool.statements
+            if s["kind"] == "executemany" and s["query"].startswith("UPDATE webhook_subscriptions")]
+
+
+def make_subscription(subscription_id: str) -> WebhookSubscription:
+    return WebhookSubscription(
+        id=subscription_id,
+        resource="/planner/tasks",
+        change_types=["created", "updated"],
+        notification_url="https://test.example.com/webhooks/default",
+        tenant_id="tenant-1"
+    )
+
+
+def make_notification(subscription_id: str, index: int) -> WebhookNotification:
+    return WebhookNotification(
+        subscription_id=subscription_id,
+        client_state=None,
+        change_type="updated",
+        resource=f"/planner/tasks/task-{index}",
+        tenant_id="tenant-1",
+        processed=True
+    )
+
+
+class TestNotificationBatchWriter:
+    """Size/time triggered flushing and statement shape"""
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_batch_size_with_single_copy(self):
+        database = make_database()
+        writer = NotificationBatchWriter(database, batch_size=5, flush_interval_ms=60000)
+
+        for i in range(12):
+            await writer.add_notification(make_notification("sub-1", i))
+
+        batches = copies(database)
+        assert [len(batch["rows"]) for batch in batches] == [5, 5]
+        row = batches[0]["rows"][4]
+        assert row["resource"] == "/planner/tasks/task-4"
+        assert row["id"] is not None
+        assert json.loads(row["notification_data"])["subscription_id"] == "sub-1"
+        assert writer.pending_count() == 2
+
+        await writer.flush()
+        assert writer.stats["notifications_written"] == 12
+
+    @pytest.mark.asyncio
+    async def test_flushes_on_interval(self):
+        database = make_database()
+        writer = NotificationBatchWriter(database, batch_size=1000, flush_interval_ms=20)
+        await writer.start()
+        try:
+            await writer.add_notification(make_notification("sub-1", 1))
+            await asyncio.sleep(0.1)
+        finally:
+            await writer.stop()
+
+        assert len(copies(database)) == 1
+        assert writer.pending_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_during_timed_flush_keeps_rows(self):
+        database = make_database(latency=0.1)
+        writer = NotificationBatchWriter(database, batch_size=1000, flush_interval_ms=20)
+        await writer.start()
+        for i in range(3):
+            await writer.add_notification(make_notification("sub-1", i))
+
+        # The timed flush has taken the rows and is waiting on the COPY
+        await asyncio.sleep(0.05)
+        assert writer.pending_count() == 0
+        await writer.stop()
+
+        assert sum(len(batch["rows"]) for batch in copies(database)) == 3
+
+    @pytest.mark.asyncio
+    async def test_subscription_counters_coalesce_to_one_executemany(self):
+        database = make_database()
+        writer = NotificationBatchWriter(database, batch_size=1000, flush_interval_ms=60000)
+        first, second = make_subscription("sub-1"), make_subscription("sub-2")
+
+        for _ in range(7):
+            writer.record_subscription_notification(first)
+        for _ in range(3):
+            writer.record_subscription_notification(second)
+
+        # In-memory stats stay current without touching the database
+        assert first.notification_count == 7
+        assert database._connection_pool.statements == []
+
+        await writer.flush()
+        statements = updates(database)
+        assert len(statements) == 1
+        assert {args[0]: args[1] for args in statements[0]["args"]} == {"sub-1": 7, "sub-2": 3}
+
+    @pytest.mark.asyncio
+    async def test_failed_subscription_update_keeps_increments(self):
+        database = make_database()
+        writer = NotificationBatchWriter(database, batch_size=1000, flush_interval_ms=60000)
+        subscription = make_subscription("sub-1")
+        writer.record_subscription_notification(subscription)
+
+        database._connection_pool.fail_next = 1
+        await writer.flush()
+        writer.record_subscription_notification(subscription)
+        await writer.flush()
+
+        assert [args[1] for args in updates(database)[0]["args"]] == [2]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_requeues_and_defers_callbacks(self):
+        database = make_database()
+        database._connection_pool.fail_next = 1
+        writer = NotificationBatchWriter(database, batch_size=1000, flush_interval_ms=60000)
+        persisted = []
+
+        async def on_persisted(notification):
+            persisted.append(notification.resource)
+
+        await writer.add_notification(make_notification("sub-1", 1), on_persisted=on_persisted)
+        await writer.flush()
+        assert persisted == []
+        assert writer.pending_count() == 1
+
+        await writer.flush()
+        assert persisted == ["/planner/tasks/task-1"]
+        assert writer.stats["failed_flushes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_requeued_rows_are_written_in_batch_size_chunks(self):
+        database = make_database()
+        writer = NotificationBatchWriter(database, batch_size=10, flush_interval_ms=60000)
+
+        # Outage: every size-triggered flush fails and requeues its rows
+        database._connection_pool.fail_next = 1000
+        for i in range(45):
+            await writer.add_notification(make_notification("sub-1", i))
+        assert writer.pending_count() == 45
+
+        database._connection_pool.fail_next = 0
+        await writer.flush()
+
+        assert [len(batch["rows"]) for batch in copies(database)] == [10, 10, 10, 10, 5]
+        resources = [row["resource"] for batch in copies(database) for row in batch["rows"]]
+        assert resources == [f"/planner/tasks/task-{i}" for i in range(45)]
+        assert writer.pending_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_max_pending_bounds_buffer(self):
+        database = make_database()
+        database._connection_pool.fail_next = 1
+        writer = NotificationBatchWriter(database, batch_size=1000, flush_interval_ms=60000, max_pending=3)
+        dropped = []
+
+        async def on_dropped(notification):
+            dropped.append(notification.resource)
+
+        for i in range(5):
+            await writer.add_notification(make_notification("sub-1", i), on_dropped=on_dropped)
+        await writer.flush()
+
+        assert writer.pending_count() == 3
+        assert writer.stats["dropped_notifications"] == 2
+        assert dropped == ["/planner/tasks/task-0", "/planner/tasks/task-1"]
+
+
+class TestNotificationReplayBenchmark:
+    """Replay of 1k notifications/sec against a database with 2ms round trips"""
+
+    @pytest.mark.asyncio
+    async def test_replay_1k_notifications_per_second(self):
+        database = make_database(latency=0.002)
+        writer = NotificationBatchWriter(database, batch_size=100, flush_interval_ms=100)
+        subscriptions = [make_subscription(f"sub-{i}") for i in range(5)]
+        total = 1000
+
+        await writer.start()
+        start_time = time.time()
+        try:
+            # Emit in 10ms ticks of 10 notifications to pace the replay at 1k/s
+            for tick in range(total // 10):
+                for offset in range(10):
+                    index = tick * 10 + offset
+                    subscription = subscriptions[index % len(subscriptions)]
+                    writer.record_subscription_notification(subscription)
+                    await writer.add_notification(make_notification(subscription.id, index))
+                await asyncio.sleep(0.01)
+        finally:
+            await writer.stop()
+        duration = time.time() - start_time
+
+        # One COPY per 100 rows and one executemany of the counters per flush
+        batches = copies(database)
+        assert sum(len(batch["rows"]) for batch in batches) == total
+        assert len(batches) <= total // 100 + 2
+        assert len(updates(database)) <= len(batches) + 1
+
+        # Unbatched this would need 2,000 round trips (4s of latency alone)
+        assert len(database._connection_pool.statements) < 100
+        assert duration < 3.0
+        assert sum(s.notification_count for s in subscriptions) == total
+        assert sum(args[1] for s in updates(database) for args in s["args"]) == total
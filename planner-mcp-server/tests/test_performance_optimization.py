@@ -373,5 +373,177 @@ class TestPerformanceBenchmarks:
         assert len(stats) == 10  # 10 different operation names
 
 
+class TestOperationSampling:
+    """Head-based sampling and the unsampled fast path"""
+
+    @pytest.fixture
+    def monitor(self, monkeypatch):
+        """Monitor used by the track_operation decorator"""
+        monitor = PerformanceMonitor(enable_prometheus=False, enable_opentelemetry=False)
+        monkeypatch.setattr("src.utils.performance_monitor._performance_monitor", monitor)
+        return monitor
+
+    @pytest.mark.asyncio
+    async def test_unsampled_calls_are_still_counted(self, monitor):
+        monitor.set_sample_rate(0.0)
+
+        @track_operation("unsampled_operation")
+        async def operation(fail=False):
+            if fail:
+                raise ValueError("failed")
+            return "ok"
+
+        for _ in range(10):
+            assert await operation() == "ok"
+        with pytest.raises(ValueError):
+            await operation(fail=True)
+
+        stats = monitor.get_operation_stats("unsampled_operation")
+        assert stats["count"] == 11
+        assert stats["error_count"] == 1
+        # Nothing went through the full path
+        assert len(monitor._metrics_history) == 0
+
+    @pytest.mark.asyncio
+    async def test_nested_calls_follow_unsampled_parent(self, monitor):
+        monitor.set_sample_rate(0.0, "graph_api_request")
+
+        @track_operation("permission_validation")
+        async def validate():
+            return True
+
+        @track_operation("graph_api_request")
+        async def request():
+            return await validate()
+
+        await request()
+
+        assert monitor.get_operation_stats("permission_validation")["count"] == 1
+        assert len(monitor._metrics_history) == 0
+
+        async with monitor.track_operation("graph_api_request") as metrics:
+            assert metrics is None
+            await validate()
+        assert len(monitor._metrics_history) == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_operation_is_not_tracked(self, monitor):
+        monitor.disable_operation("noisy_operation")
+
+        @track_operation("noisy_operation")
+        async def operation():
+            return "ok"
+
+        await operation()
+        assert monitor.get_operation_stats("noisy_operation")["count"] == 0
+
+        monitor.enable_operation("noisy_operation")
+        await operation()
+        assert monitor.get_operation_stats("noisy_operation")["count"] == 1
+
+    def test_sampled_fraction(self, monitor):
+        monitor.set_sample_rate(0.1)
+
+        @track_operation("sync_operation")
+        def operation():
+            return 1
+
+        for _ in range(5000):
+            operation()
+
+        assert monitor.get_operation_stats("sync_operation")["count"] == 5000
+        assert 300 < len(monitor._metrics_history) < 700
+
+    @pytest.mark.asyncio
+    async def test_async_sampled_fraction(self, monitor):
+        """Sampling is drawn once per call, so a 10% rate samples ~10%, not ~1%"""
+        monitor.set_sample_rate(0.1)
+
+        @track_operation("async_operation")
+        async def operation():
+            return 1
+
+        for _ in range(5000):
+            await operation()
+        assert monitor.get_operation_stats("async_operation")["count"] == 5000
+        assert 300 < len(monitor._metrics_history) < 700
+
+        monitor._metrics_history.clear()
+        for _ in range(5000):
+            async with monitor.track_operation("context_operation"):
+                pass
+        assert monitor.get_operation_stats("context_operation")["count"] == 5000
+        assert 300 < len(monitor._metrics_history) < 700
+
+    @pytest.mark.asyncio
+    async def test_unsampled_calls_count_in_system_health(self, monitor):
+        monitor.set_sample_rate(0.0)
+
+        @track_operation("unsampled_operation")
+        async def operation(fail=False):
+            if fail:
+                raise ValueError("failed")
+            return "ok"
+
+        for _ in range(9):
+            await operation()
+        with pytest.raises(ValueError):
+            await operation(fail=True)
+
+        health = monitor.get_system_health()
+        assert health["total_requests"] == 10
+        assert health["error_rate"] == pytest.approx(10.0)
+
+    @pytest.mark.asyncio
+    async def test_cleanup_loop_flushes_pending_counts(self, monitor):
+        monitor.set_sample_rate(0.0)
+        monitor.flush_interval = 0.05
+        monitor.flush_every = 1000
+
+        @track_operation("unsampled_operation")
+        async def operation():
+            return "ok"
+
+        await operation()
+        await operation()
+        assert monitor._operation_stats["unsampled_operation"]["count"] == 0
+
+        await monitor.start()
+        try:
+            await asyncio.sleep(0.2)
+            assert monitor._operation_stats["unsampled_operation"]["count"] == 2
+        finally:
+            await monitor.stop()
+
+    def test_tracking_overhead_benchmark(self, monitor):
+        """Cost per tracked call at 0%, 1% and 100% sampling"""
+        calls = 20000
+
+        async def bare():
+            return None
+
+        tracked = track_operation("overhead_operation")(bare)
+
+        async def run(func):
+            start = time.perf_counter()
+            for _ in range(calls):
+                await func()
+            return time.perf_counter() - start
+
+        baseline = asyncio.run(run(bare))
+        overhead = {}
+        for rate in (0.0, 0.01, 1.0):
+            monitor.set_sample_rate(rate)
+            overhead[rate] = (asyncio.run(run(tracked)) - baseline) / calls * 1e6
+
+        print("\nTracking overhead per call: " + ", ".join(
+            f"{rate:.0%} sampled {cost:.2f}us" for rate, cost in overhead.items()
+        ))
+
+        assert overhead[0.0] < overhead[1.0] / 2
+        assert overhead[0.01] < overhead[1.0] / 2
+        assert monitor.get_operation_stats("overhead_operation")["count"] == calls * 3
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
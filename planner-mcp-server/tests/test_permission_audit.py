@@ -0,0 +1,338 @@
+"""
+Tests for the batched permission audit sink
+
+The sink is tested against a recording double of the asyncpg pool; one test
+runs against a local Postgres (TEST_DATABASE_URL, default
+postgresql://localhost/planner_test) and is skipped when it is not reachable.
+"""
+
+import os
+import time
+import asyncio
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Set
+
+import asyncpg
+import pytest
+import pytest_asyncio
+
+from src.graph.permission_audit import PermissionAuditSink, AUDIT_COLUMNS
+from src.graph.permissions import GraphPermissionValidator, PermissionAuditEntry
+
+
+class RecordingConnection:
+    """asyncpg connection double recording statements and copied rows"""
+
+    def __init__(self, pool: "RecordingPool"):
+        self.pool = pool
+
+    async def execute(self, query: str, *args):
+        self.pool.statements.append(" ".join(query.split()))
+
+    async def fetch(self, query: str, *args):
+        self.pool.statements.append(" ".join(query.split()))
+        return self.pool.rows
+
+    async def copy_records_to_table(self, table: str, records: List[tuple], columns: List[str]):
+        if self.pool.latency:
+            await asyncio.sleep(self.pool.latency)
+        if self.pool.fail_next:
+            self.pool.fail_next -= 1
+            raise ConnectionError("connection reset")
+        if any(record[0] in self.pool.reject for record in records):
+            raise asyncpg.DataError("invalid input syntax")
+        self.pool.copies.append({"table": table, "records": list(records), "columns": columns})
+
+
+class RecordingPool:
+    """asyncpg pool double"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self.copies: List[Dict[str, Any]] = []
+        self.rows: List[Dict[str, Any]] = []
+        self.fail_next = 0
+        self.latency = 0.0
+        self.reject: Set[str] = set()
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return RecordingConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+    def partitions_created(self) -> List[str]:
+        return [s for s in self.statements if "PARTITION OF" in s]
+
+
+class RecordingDatabase:
+    def __init__(self):
+        self._connection_pool = RecordingPool()
+
+
+def make_entry(index: int, user_id: str = "user1@acme.com", timestamp: datetime = None) -> PermissionAuditEntry:
+    return PermissionAuditEntry(
+        audit_id=f"audit-{index}",
+        user_id=user_id,
+        tenant_id="tenant_123",
+        operation="read_tasks",
+        resource_type="planner",
+        resource_id=None,
+        requested_scopes=["Tasks.Read"],
+        granted_scopes=["Tasks.Read"],
+        denied_scopes=[],
+        result="granted",
+        timestamp=timestamp or datetime.now(timezone.utc),
+        additional_context={"correlation_id": f"corr-{index}"}
+    )
+
+
+class TestPermissionAuditSink:
+    """Queueing, batching and the partitioned table"""
+
+    @pytest.mark.asyncio
+    async def test_flush_copies_in_batches(self):
+        database = RecordingDatabase()
+        sink = PermissionAuditSink(database, queue_size=100, batch_size=4, flush_interval_ms=1000)
+
+        for index in range(10):
+            assert sink.enqueue(make_entry(index))
+        assert await sink.flush() == 10
+
+        copies = database._connection_pool.copies
+        assert [len(copy["records"]) for copy in copies] == [4, 4, 2]
+        assert copies[0]["table"] == "permission_audit"
+        assert copies[0]["columns"] == AUDIT_COLUMNS
+        assert copies[0]["records"][0][0] == "audit-0"
+        assert sink.pending_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_table_is_partitioned_by_day_with_indexes(self):
+        database = RecordingDatabase()
+        sink = PermissionAuditSink(database, batch_size=10, retention_days=0)
+        today = datetime.now(timezone.utc)
+
+        sink.enqueue(make_entry(1, timestamp=today))
+        sink.enqueue(make_entry(2, timestamp=today - timedelta(days=1)))
+        await sink.flush()
+        sink.enqueue(make_entry(3, timestamp=today))
+        await sink.flush()
+
+        statements = database._connection_pool.statements
+        assert any("PARTITION BY RANGE (timestamp)" in s for s in statements)
+        assert any("(user_id, timestamp DESC)" in s for s in statements)
+        assert any("(tenant_id, timestamp DESC)" in s for s in statements)
+
+        # One partition per day, created once
+        partitions = database._connection_pool.partitions_created()
+        assert len(partitions) == 2
+        assert f"permission_audit_{today:%Y%m%d}" in partitions[1]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_instead_of_blocking(self):
+        sink = PermissionAuditSink(RecordingDatabase(), queue_size=3, batch_size=10)
+
+        results = [sink.enqueue(make_entry(index)) for index in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert sink.get_stats()["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_requeued(self):
+        database = RecordingDatabase()
+        database._connection_pool.fail_next = 1
+        sink = PermissionAuditSink(database, batch_size=10, retention_days=0)
+
+        for index in range(3):
+            sink.enqueue(make_entry(index))
+        assert await sink.flush() == 0
+        assert sink.pending_count() == 3
+        assert sink.get_stats()["failed_flushes"] == 1
+
+        assert await sink.flush() == 3
+        assert [record[0] for record in database._connection_pool.copies[0]["records"]] == \
+            ["audit-0", "audit-1", "audit-2"]
+
+    @pytest.mark.asyncio
+    async def test_rejected_entry_is_dropped_without_blocking_the_rest(self):
+        database = RecordingDatabase()
+        database._connection_pool.reject = {"audit-5"}
+        sink = PermissionAuditSink(database, batch_size=8, retention_days=0)
+
+        for index in range(12):
+            sink.enqueue(make_entry(index))
+        assert await sink.flush() == 11
+
+        written = [record[0] for copy in database._connection_pool.copies for record in copy["records"]]
+        assert written == [f"audit-{index}" for index in range(12) if index != 5]
+        assert sink.pending_count() == 0
+        assert sink.get_stats()["rejected"] == 1
+        assert sink.get_stats()["failed_flushes"] == 0
+
+        sink.enqueue(make_entry(12))
+        assert await sink.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_background_task_flushes_full_batches_and_on_stop(self):
+        database = RecordingDatabase()
+        sink = PermissionAuditSink(database, batch_size=5, flush_interval_ms=60000, retention_days=0)
+        await sink.start()
+
+        for index in range(5):
+            sink.enqueue(make_entry(index))
+        await asyncio.sleep(0.05)
+        assert sink.get_stats()["written"] == 5
+
+        sink.enqueue(make_entry(5))
+        await sink.stop()
+        assert sink.get_stats()["written"] == 6
+
+    @pytest.mark.asyncio
+    async def test_stop_during_timed_flush_keeps_batch(self):
+        database = RecordingDatabase()
+        database._connection_pool.latency = 0.1
+        sink = PermissionAuditSink(database, batch_size=100, flush_interval_ms=20, retention_days=0)
+        await sink.start()
+        for index in range(3):
+            sink.enqueue(make_entry(index))
+
+        # The timed flush has taken the batch and is waiting on the COPY
+        await asyncio.sleep(0.05)
+        assert sink.pending_count() == 0
+        await sink.stop()
+
+        assert sink.get_stats()["written"] == 3
+
+    @pytest.mark.asyncio
+    async def test_query_builds_filters(self):
+        database = RecordingDatabase()
+        sink = PermissionAuditSink(database)
+
+        await sink.query(user_id="user1@acme.com", tenant_id="tenant_123",
+                         since=datetime.now(timezone.utc) - timedelta(hours=1), limit=50)
+
+        query = database._connection_pool.statements[-1]
+        assert "WHERE user_id = $1 AND tenant_id = $2 AND timestamp >= $3" in query
+        assert "ORDER BY timestamp DESC LIMIT $4" in query
+
+
+class TestValidatorAuditTrail:
+    """Ring buffer of recent entries and hand-off to the sink"""
+
+    @pytest.mark.asyncio
+    async def test_recent_trail_is_bounded(self):
+        validator = GraphPermissionValidator()
+        validator._audit_trail = type(validator._audit_trail)(maxlen=100)
+
+        for index in range(250):
+            await validator._log_audit_entry(
+                user_id=f"user{index}@acme.com", operation="read", resource_type="planner",
+                requested_scopes=["Tasks.Read"], granted_scopes=["Tasks.Read"], denied_scopes=[],
+                result="granted"
+            )
+
+        assert len(validator._audit_trail) == 100
+        assert validator._audit_trail[0].user_id == "user150@acme.com"
+
+    @pytest.mark.asyncio
+    async def test_entries_are_handed_to_the_sink(self):
+        database = RecordingDatabase()
+        sink = PermissionAuditSink(database, batch_size=100, retention_days=0)
+        validator = GraphPermissionValidator()
+        validator.set_audit_sink(sink)
+
+        await validator._log_audit_entry(
+            user_id="user1@acme.com", operation="read", resource_type="planner",
+            requested_scopes=["Tasks.Read"], granted_scopes=[], denied_scopes=["Tasks.Read"],
+            result="denied", tenant_id="tenant_123"
+        )
+
+        assert sink.pending_count() == 1
+        await sink.flush()
+        record = database._connection_pool.copies[0]["records"][0]
+        assert record[1] == "user1@acme.com"
+        assert record[9] == "denied"
+
+    @pytest.mark.asyncio
+    async def test_query_audit_trail_without_sink_uses_recent_entries(self):
+        validator = GraphPermissionValidator()
+        for tenant_id in ("tenant_a", "tenant_b", "tenant_a"):
+            await validator._log_audit_entry(
+                user_id="user1@acme.com", operation="read", resource_type="planner",
+                requested_scopes=[], granted_scopes=[], denied_scopes=[],
+                result="granted", tenant_id=tenant_id
+            )
+
+        entries = await validator.query_audit_trail(tenant_id="tenant_a")
+
+        assert len(entries) == 2
+        assert entries[0].timestamp >= entries[1].timestamp
+
+    @pytest.mark.asyncio
+    async def test_logging_cost_stays_flat(self):
+        """Ring buffer append plus enqueue instead of list slicing"""
+        validator = GraphPermissionValidator()
+        validator.set_audit_sink(PermissionAuditSink(RecordingDatabase(), queue_size=200000))
+
+        async def log(count: int) -> float:
+            start = time.perf_counter()
+            for index in range(count):
+                await validator._log_audit_entry(
+                    user_id="user1@acme.com", operation="read", resource_type="planner",
+                    requested_scopes=["Tasks.Read"], granted_scopes=["Tasks.Read"], denied_scopes=[],
+                    result="granted"
+                )
+            return (time.perf_counter() - start) / count
+
+        first = await log(5000)
+        later = await log(60000)
+        print(f"\nPer entry: first 5k {first * 1e6:.2f}us, next 60k {later * 1e6:.2f}us")
+
+        assert len(validator._audit_trail) == validator._audit_trail.maxlen
+        assert later < first * 3
+
+
+@pytest_asyncio.fixture
+async def postgres_database():
+    """Database backed by a local Postgres, skipped when unavailable"""
+    url = os.getenv("TEST_DATABASE_URL", "postgresql://localhost/planner_test")
+    try:
+        pool = await asyncio.wait_for(asyncpg.create_pool(url, min_size=1, max_size=2), 2)
+    except Exception:
+        pytest.skip("Postgres not available")
+
+    database = RecordingDatabase()
+    database._connection_pool = pool
+    async with pool.acquire() as conn:
+        await conn.execute("DROP TABLE IF EXISTS permission_audit CASCADE")
+    yield database
+    async with pool.acquire() as conn:
+        await conn.execute("DROP TABLE IF EXISTS permission_audit CASCADE")
+    await pool.close()
+
+
+class TestPermissionAuditSinkPostgres:
+    """Round trip through a real partitioned table"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, postgres_database):
+        sink = PermissionAuditSink(postgres_database, batch_size=50, retention_days=0)
+        now = datetime.now(timezone.utc)
+
+        for index in range(120):
+            sink.enqueue(make_entry(index, user_id=f"user{index % 3}@acme.com",
+                                    timestamp=now - timedelta(hours=index)))
+        assert await sink.flush() == 120
+
+        rows = await sink.query(user_id="user0@acme.com", since=now - timedelta(hours=30))
+        assert len(rows) == 10
+        assert rows[0]["audit_id"] == "audit-0"
+        assert rows[0]["additional_context"] == {"correlation_id": "corr-0"}
+        entry = PermissionAuditEntry(**rows[0])
+        assert entry.requested_scopes == ["Tasks.Read"]
@@ -0,0 +1,185 @@
+"""
+Tests for the sharded permission cache and its Redis tier
+
+The Redis tier is tested with an in-memory double of the CacheService
+key/value helpers; one test runs against a local Redis (TEST_REDIS_URL,
+default redis://localhost:6379/15) and is skipped when it is not reachable.
+"""
+
+import os
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict
+from unittest.mock import patch, AsyncMock
+
+import pytest
+import pytest_asyncio
+
+from src.cache import CacheService, CacheError
+from src.graph.permission_cache import PermissionCache, PermissionCacheEntry
+from src.graph.permissions import GraphPermissionValidator, ResourceType
+from src.models.graph_models import UserPermissions
+
+
+class InMemoryCache:
+    """Minimal in-memory implementation of the CacheService key/value helpers"""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+
+    async def set(self, key: str, value: Any, ttl: int = None, namespace: str = "itp"):
+        self.values[f"{namespace}:{key}"] = value
+        return True
+
+    async def get(self, key: str, namespace: str = "itp", default: Any = None):
+        return self.values.get(f"{namespace}:{key}", default)
+
+    async def delete(self, key: str, namespace: str = "itp"):
+        return self.values.pop(f"{namespace}:{key}", None) is not None
+
+
+def make_entry(user_id: str, tenant_id: str = "tenant", ttl_minutes: float = 15, scopes=None):
+    return PermissionCacheEntry(
+        user_id=user_id,
+        tenant_id=tenant_id,
+        permissions=UserPermissions(
+            user_id=user_id,
+            tenant_id=tenant_id,
+            granted_scopes=scopes or ["User.Read", "Planner.Read"],
+            last_validated=datetime.now(timezone.utc)
+        ),
+        cache_key=(tenant_id, user_id),
+        expires_at=datetime.now(timezone.utc) + timedelta(minutes=ttl_minutes)
+    )
+
+
+class TestPermissionCache:
+    """In-process LRU shards"""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PermissionCache(max_entries=2, shards=1)
+        cache.put(make_entry("a"))
+        cache.put(make_entry("b"))
+        assert cache.get(("tenant", "a")) is not None  # a is now the most recent
+
+        cache.put(make_entry("c"))
+
+        assert ("tenant", "a") in cache
+        assert ("tenant", "b") not in cache
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_cache_smaller_than_shard_count_evicts_globally(self):
+        cache = PermissionCache(max_entries=3, shards=16)
+        for i in range(5):
+            cache.put(make_entry(f"user_{i}"))
+
+        assert len(cache) == 3
+        assert ("tenant", "user_0") not in cache
+        assert ("tenant", "user_1") not in cache
+        assert cache.get_stats()["shards"] == 1
+
+        cache.resize(10000)
+        assert cache.get_stats()["shards"] == 16
+        assert ("tenant", "user_4") in cache
+
+    def test_expired_entries_are_misses(self):
+        cache = PermissionCache()
+        cache.put(make_entry("a", ttl_minutes=-1))
+
+        assert cache.get(("tenant", "a")) is None
+        assert len(cache) == 0
+        assert cache.get_stats()["expired"] == 1
+
+    def test_bounded_in_bytes(self):
+        cache = PermissionCache(max_entries=10000, max_bytes=100_000, shards=4)
+        for i in range(1000):
+            cache.put(make_entry(f"user_{i}", scopes=[f"Scope.{n}" for n in range(20)]))
+
+        stats = cache.get_stats()
+        assert stats["bytes"] <= 100_000
+        assert 0 < stats["entries"] < 1000
+
+    def test_lookups_stay_constant_time_for_many_users(self):
+        """Benchmark hits and inserts at 1k and 50k cached users"""
+        def run(users: int) -> float:
+            cache = PermissionCache(max_entries=users // 2)
+            entries = [make_entry(f"user_{i}") for i in range(users)]
+            start = time.perf_counter()
+            for entry in entries:
+                cache.put(entry)
+            for entry in entries:
+                cache.get(entry.cache_key)
+            return (time.perf_counter() - start) / (2 * users)
+
+        small, large = run(1000), run(50000)
+        print(f"\nPer operation: 1k users {small * 1e6:.2f}us, 50k users {large * 1e6:.2f}us")
+
+        # A list-based access order would be ~50x slower per operation at 50k
+        assert large < small * 5
+
+
+class TestPermissionCacheRedisTier:
+    """Second tier shared by replicas"""
+
+    @pytest.mark.asyncio
+    async def test_other_replica_reads_through_redis(self):
+        shared = InMemoryCache()
+        replica_a = GraphPermissionValidator(cache_service=shared)
+        replica_b = GraphPermissionValidator(cache_service=shared)
+        permissions = make_entry("john@acme.com", "tenant_1").permissions
+
+        with patch.object(replica_a, "_fetch_user_permissions", AsyncMock(return_value=permissions)):
+            await replica_a.validate_permissions("john@acme.com", ["User.Read"], "read_user",
+                                                 ResourceType.USER, tenant_id="tenant_1")
+
+        with patch.object(replica_b, "_fetch_user_permissions", AsyncMock()) as fetch:
+            result = await replica_b.validate_permissions("john@acme.com", ["User.Read"], "read_user",
+                                                          ResourceType.USER, tenant_id="tenant_1")
+
+        fetch.assert_not_called()
+        assert result.is_valid
+        assert replica_b._permission_cache.get_stats()["redis_hits"] == 1
+        assert ("tenant_1", "john@acme.com") in replica_b._permission_cache
+
+    @pytest.mark.asyncio
+    async def test_invalidation_removes_both_tiers(self):
+        shared = InMemoryCache()
+        cache = PermissionCache(cache_service=shared)
+        entry = make_entry("john@acme.com")
+        cache.put(entry)
+        await cache.store(entry)
+
+        assert await cache.invalidate(entry.cache_key) is True
+        assert entry.cache_key not in cache
+        assert await cache.load(entry.cache_key) is None
+
+
+@pytest_asyncio.fixture
+async def redis_cache():
+    """CacheService connected to a local Redis, skipped when unavailable"""
+    cache = CacheService(os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15"))
+    try:
+        await cache.initialize()
+    except CacheError:
+        pytest.skip("Local Redis not available")
+    yield cache
+    await cache.close()
+
+
+class TestPermissionCacheWithRedis:
+    """Round trip through a local Redis"""
+
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, redis_cache):
+        user_id = f"user-{uuid.uuid4()}"
+        entry = make_entry(user_id)
+        assert await PermissionCache(cache_service=redis_cache).store(entry)
+
+        restarted = PermissionCache(cache_service=redis_cache)
+        try:
+            loaded = await restarted.load(entry.cache_key)
+            assert loaded.permissions.granted_scopes == entry.permissions.granted_scopes
+            assert loaded.expires_at == entry.expires_at
+        finally:
+            await restarted.invalidate(entry.cache_key)
@@ -0,0 +1,225 @@
+"""
+Tests for the compiled permission model
+
+The compiled masks are checked against a reference implementation of the
+dictionary walk the validator used before (scope table lookup plus access
+level hierarchy), for every pair of known scopes on every resource type.
+"""
+
+import re
+import time
+from itertools import combinations
+from typing import List, Tuple
+from unittest.mock import patch
+
+import pytest
+
+from src.graph.permission_model import CompiledPermissionModel, ESCALATION_SCOPE_PATTERNS
+from src.graph.permissions import GraphPermissionValidator, ResourceType
+from src.models.graph_models import UserPermissions
+
+GRAPH_SCOPES = GraphPermissionValidator.GRAPH_SCOPES
+PERMISSION_HIERARCHY = GraphPermissionValidator.PERMISSION_HIERARCHY
+ALL_SCOPES = sorted({scope for scopes in GRAPH_SCOPES.values() for scope in scopes})
+
+
+def reference_validate_scope(granted_scopes: List[str], scope: str, resource_type: ResourceType) -> bool:
+    """Scope check as done by walking GRAPH_SCOPES and PERMISSION_HIERARCHY"""
+    if scope in granted_scopes:
+        return True
+
+    resource_scopes = GRAPH_SCOPES.get(resource_type, {})
+    scope_info = resource_scopes.get(scope)
+    if not scope_info:
+        return False
+
+    for user_scope in granted_scopes:
+        user_scope_info = resource_scopes.get(user_scope)
+        if user_scope_info and scope_info["level"] in PERMISSION_HIERARCHY.get(user_scope_info["level"], []):
+            return True
+    return False
+
+
+def reference_check(granted_scopes: List[str], required_scopes: List[str],
+                    resource_type: ResourceType) -> Tuple[List[str], List[str]]:
+    granted, missing = [], []
+    for scope in required_scopes:
+        (granted if reference_validate_scope(granted_scopes, scope, resource_type) else missing).append(scope)
+    return granted, missing
+
+
+class ReferenceModel:
+    """Stand-in for CompiledPermissionModel doing the dictionary walk on every check"""
+
+    def __init__(self):
+        self.compiled = CompiledPermissionModel(GRAPH_SCOPES, PERMISSION_HIERARCHY)
+
+    def compile(self, resource_type, scopes):
+        return resource_type, list(scopes)
+
+    def mask(self, scopes):
+        return list(scopes)
+
+    def check(self, requirement, granted_scopes):
+        resource_type, scopes = requirement
+        return reference_check(granted_scopes, scopes, resource_type)
+
+    def admin_mask(self, scopes):
+        return [scope for scope in scopes
+                if any(re.match(pattern, scope, re.IGNORECASE) for pattern in ESCALATION_SCOPE_PATTERNS)]
+
+
+class TestCompiledPermissionModel:
+    """Masks match the dictionary walk"""
+
+    @pytest.fixture
+    def model(self):
+        return CompiledPermissionModel(GRAPH_SCOPES, PERMISSION_HIERARCHY)
+
+    def test_matches_reference_for_all_scope_pairs(self, model):
+        grants = [[]] + [[scope] for scope in ALL_SCOPES] + [list(pair) for pair in combinations(ALL_SCOPES, 2)]
+
+        for resource_type in ResourceType:
+            for granted_scopes in grants:
+                user_mask = model.mask(granted_scopes)
+                for required in ([scope] for scope in ALL_SCOPES + ["Calendars.Read"]):
+                    requirement = model.compile(resource_type, required)
+                    assert model.check(requirement, user_mask) == \
+                        reference_check(granted_scopes, required, resource_type), \
+                        (resource_type, granted_scopes, required)
+
+    def test_higher_level_scope_grants_lower_one(self, model):
+        requirement = model.compile(ResourceType.PLANNER, ["Planner.Read", "Planner.ReadWrite"])
+
+        assert model.check(requirement, model.mask(["Planner.ReadWrite"])) == \
+            (["Planner.Read", "Planner.ReadWrite"], [])
+        assert model.check(requirement, model.mask(["Planner.Read"])) == \
+            (["Planner.Read"], ["Planner.ReadWrite"])
+
+    def test_unknown_scopes_only_satisfy_themselves(self, model):
+        requirement = model.compile(ResourceType.CALENDAR, ["Calendars.ReadWrite"])
+
+        assert model.check(requirement, model.mask(["Calendars.ReadWrite"])) == (["Calendars.ReadWrite"], [])
+        assert model.check(requirement, model.mask(["Directory.ReadWrite.All"])) == ([], ["Calendars.ReadWrite"])
+
+    def test_admin_mask_follows_escalation_patterns(self, model):
+        assert model.admin_mask(model.mask(["Group.Read.All", "Sites.Admin", "Reports.Application"])) == \
+            model.mask(["Group.Read.All", "Sites.Admin", "Reports.Application"])
+        assert model.admin_mask(model.mask(["User.Read", "Planner.ReadWrite"])) == 0
+
+    def test_requirements_are_memoized_and_bounded(self):
+        model = CompiledPermissionModel(GRAPH_SCOPES, PERMISSION_HIERARCHY, max_requirements=10)
+
+        first = model.compile(ResourceType.TASKS, ["Tasks.Read"])
+        assert model.compile(ResourceType.TASKS, ["Tasks.Read"]) is first
+
+        for index in range(25):
+            model.compile(ResourceType.TASKS, [f"Custom.Scope{index}"])
+        assert model.get_stats()["compiled_requirements"] <= 10
+
+
+class TestValidatorScopeMasks:
+    """Validator integration"""
+
+    @pytest.mark.asyncio
+    async def test_mask_follows_added_scopes(self):
+        validator = GraphPermissionValidator(enable_audit_logging=False)
+        permissions = UserPermissions(user_id="user@acme.com", granted_scopes=["Tasks.Read"])
+
+        with patch.object(validator, "_fetch_user_permissions", return_value=permissions):
+            result = await validator.validate_permissions(
+                "user@acme.com", ["Tasks.ReadWrite"], "update_task", ResourceType.TASKS
+            )
+            assert not result.is_valid
+
+            permissions.add_permission("Tasks.ReadWrite")
+            result = await validator.validate_permissions(
+                "user@acme.com", ["Tasks.Read", "Tasks.ReadWrite"], "update_task", ResourceType.TASKS
+            )
+            assert result.is_valid
+            assert result.granted_scopes == ["Tasks.Read", "Tasks.ReadWrite"]
+
+    @pytest.mark.asyncio
+    async def test_mask_follows_scope_swap_of_same_length(self):
+        validator = GraphPermissionValidator(enable_audit_logging=False)
+        permissions = UserPermissions(user_id="user@acme.com", granted_scopes=["User.Read", "Tasks.ReadWrite"])
+
+        with patch.object(validator, "_fetch_user_permissions", return_value=permissions):
+            result = await validator.validate_permissions(
+                "user@acme.com", ["Tasks.ReadWrite"], "update_task", ResourceType.TASKS
+            )
+            assert result.is_valid
+
+            # Revoked and replaced by another scope: same count, different set
+            permissions.granted_scopes = ["User.Read", "Tasks.Read"]
+            result = await validator.validate_permissions(
+                "user@acme.com", ["Tasks.ReadWrite"], "update_task", ResourceType.TASKS
+            )
+            assert not result.is_valid
+            assert result.missing_scopes == ["Tasks.ReadWrite"]
+
+    @pytest.mark.asyncio
+    async def test_escalation_check_uses_compiled_admin_mask(self):
+        validator = GraphPermissionValidator(enable_audit_logging=False)
+        permissions = UserPermissions(user_id="user@acme.com", granted_scopes=["User.Read"])
+
+        with patch.object(validator, "_fetch_user_permissions", return_value=permissions):
+            await validator.validate_permissions("user@acme.com", ["Group.Read.All"], "read_group", ResourceType.GROUP)
+
+            with patch.object(validator.permission_model, "mask", wraps=validator.permission_model.mask) as mask:
+                result = await validator.validate_permissions(
+                    "user@acme.com", ["Group.Read.All"], "read_group", ResourceType.GROUP
+                )
+
+        assert result.escalation_detected
+        mask.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_validate_permissions_throughput(self):
+        """Benchmark validate_permissions with the dictionary walk and with compiled masks"""
+        granted_scopes = ["User.Read", "Planner.Read", "Group.Read.All", "Tasks.ReadWrite",
+                          "Tasks.ReadWrite.Shared", "Group.ReadWrite.All"]
+        requests = [
+            (["Planner.Read", "Group.Read.All"], ResourceType.PLANNER),
+            (["Tasks.Read", "Tasks.Read.Shared"], ResourceType.TASKS),
+            (["GroupMember.Read.All"], ResourceType.GROUP),
+            (["User.Read"], ResourceType.USER),
+        ]
+
+        async def run(validator: GraphPermissionValidator, iterations: int) -> float:
+            permissions = UserPermissions(user_id="user@acme.com", granted_scopes=list(granted_scopes))
+            with patch.object(validator, "_fetch_user_permissions", return_value=permissions):
+                await validator.validate_permissions("user@acme.com", ["User.Read"], "warmup", ResourceType.USER)
+                start = time.perf_counter()
+                for index in range(iterations):
+                    scopes, resource_type = requests[index % len(requests)]
+                    await validator.validate_permissions("user@acme.com", scopes, "read", resource_type)
+                return iterations / (time.perf_counter() - start)
+
+        legacy = GraphPermissionValidator(enable_audit_logging=False)
+        legacy.permission_model = ReferenceModel()
+        legacy._get_scope_mask = lambda entry: entry.permissions.granted_scopes
+        compiled = GraphPermissionValidator(enable_audit_logging=False)
+
+        before = await run(legacy, 5000)
+        after = await run(compiled, 5000)
+        print(f"\nvalidate_permissions: dictionary walk {before:,.0f}/s, compiled masks {after:,.0f}/s")
+
+        # Scope resolution alone, without the cache lookup and logging around it
+        model = compiled.permission_model
+        user_mask = model.mask(granted_scopes)
+        iterations = 50000
+        start = time.perf_counter()
+        for index in range(iterations):
+            scopes, resource_type = requests[index % len(requests)]
+            reference_check(granted_scopes, scopes, resource_type)
+        walk = (time.perf_counter() - start) / iterations
+        start = time.perf_counter()
+        for index in range(iterations):
+            scopes, resource_type = requests[index % len(requests)]
+            model.check(model.compile(resource_type, scopes), user_mask)
+        masks = (time.perf_counter() - start) / iterations
+        print(f"Scope resolution: dictionary walk {walk * 1e6:.2f}us, compiled masks {masks * 1e6:.2f}us")
+
+        assert masks < walk
+        assert after > before
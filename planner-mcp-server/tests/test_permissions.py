@@ -15,10 +15,12 @@ from src.graph.permissions import (
     AccessLevel,
     ResourceType,
     PermissionAuditEntry,
+    PermissionCacheEntry,
     get_permission_validator,
     require_permissions
 )
 from src.models.graph_models import UserPermissions, TenantContext
+from src.utils.performance_monitor import get_performance_monitor
 
 
 class TestGraphPermissionValidator:
@@ -498,36 +500,38 @@ class TestGraphPermissionValidator:
         assert "User.ReadBasic.All" in user_scopes
         assert user_scopes["User.Read"]["type"] == PermissionType.DELEGATED
 
+    @pytest.mark.asyncio
+    async def test_validation_is_tracked(self, validator, mock_user_permissions):
+        """validate_permissions reports the permission_validation operation"""
+        monitor = get_performance_monitor()
+        before = monitor.get_operation_stats("permission_validation")["count"]
+
+        with patch.object(validator, '_fetch_user_permissions', return_value=mock_user_permissions):
+            await validator.validate_permissions(
+                "john.smith@acme.com", ["User.Read"], "read_user", ResourceType.USER
+            )
+
+        assert monitor.get_operation_stats("permission_validation")["count"] == before + 1
+
     def test_cache_size_management(self, validator):
         """Test cache size management and LRU eviction"""
         # Set small cache size for testing
         validator.max_cache_size = 3
 
-        # Mock user permissions
-        mock_permissions = UserPermissions(
-            user_id="test_user",
-            granted_scopes=["User.Read"],
-            last_validated=datetime.now(timezone.utc)
-        )
-
         # Add entries beyond cache size
         for i in range(5):
-            cache_key = f"user_{i}"
-            validator._permission_cache[cache_key] = type('CacheEntry', (), {
-                'user_id': f'user_{i}',
-                'permissions': mock_permissions,
-                'cache_key': cache_key,
-                'is_expired': lambda: False,
-                'update_access': lambda: None
-            })()
-            validator._cache_access_order.append(cache_key)
-
-        # Trigger cache management
-        validator._manage_cache_size()
-
-        # Should only have max_cache_size entries
+            cache_key = validator._generate_cache_key(f"user_{i}")
+            validator._permission_cache.put(PermissionCacheEntry(
+                user_id=f"user_{i}",
+                tenant_id=None,
+                permissions=UserPermissions(user_id=f"user_{i}", granted_scopes=["User.Read"]),
+                cache_key=cache_key
+            ))
+
+        # Should only have max_cache_size entries, the most recent ones
         assert len(validator._permission_cache) <= validator.max_cache_size
-        assert len(validator._cache_access_order) <= validator.max_cache_size
+        assert validator._generate_cache_key("user_4") in validator._permission_cache
+        assert validator._generate_cache_key("user_0") not in validator._permission_cache
 
 
 class TestPermissionIntegration:
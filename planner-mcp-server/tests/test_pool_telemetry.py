@@ -0,0 +1,123 @@
+"""
+Tests for Graph client connection pool telemetry
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+import httpx
+from unittest.mock import AsyncMock, Mock
+
+from src.graph.client import EnhancedGraphClient
+from src.graph.pool_telemetry import ConnectionPoolTelemetry, InstrumentedTransport, _RequestTrace
+
+
+@pytest_asyncio.fixture
+async def local_server():
+    """Plain HTTP/1.1 server on localhost answering every request with {}"""
+    async def handle(reader, writer):
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                if not request:
+                    break
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: 2\r\n\r\n{}"
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    server.close()
+    await server.wait_closed()
+
+
+class TestInstrumentedTransport:
+    """Telemetry measured from a real connection pool"""
+
+    @pytest.mark.asyncio
+    async def test_counts_opened_reused_and_closed_connections(self, local_server):
+        monitor = Mock()
+        telemetry = ConnectionPoolTelemetry(monitor)
+        client = httpx.AsyncClient(transport=InstrumentedTransport(telemetry))
+
+        for _ in range(3):
+            response = await client.get(f"{local_server}/me")
+            assert response.json() == {}
+
+        stats = telemetry.get_stats()
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 2
+        assert stats["pool_wait_count"] == 3
+        assert stats["total"] == 1
+        assert stats["idle"] == 1
+
+        await client.aclose()
+
+        assert telemetry.get_stats()["connections_closed"] == 1
+        events = [call.kwargs.get("event") for call in monitor.record_connection_pool_telemetry.call_args_list]
+        assert events == ["opened", "reused", "reused", "closed"]
+
+    @pytest.mark.asyncio
+    async def test_graph_client_reports_measured_pool(self, local_server, monkeypatch):
+        monkeypatch.setenv("GRAPH_BASE_URL", local_server)
+        monkeypatch.setenv("HTTP2_ENABLED", "false")
+        auth_service = Mock()
+        auth_service.get_access_token = AsyncMock(return_value="mock_token")
+        graph_client = EnhancedGraphClient(auth_service)
+
+        await asyncio.gather(*(graph_client.make_request("GET", "/me", "test_user") for _ in range(4)))
+        await graph_client.make_request("GET", "/me", "test_user")
+
+        stats = await graph_client.get_connection_stats()
+        assert stats["created"] == stats["total"] == 4
+        assert stats["reused"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["pool"]["pool_wait_avg"] >= 0.0
+
+        await graph_client.close()
+
+
+class TestRequestTrace:
+    """Trace events mapped to telemetry"""
+
+    @pytest.mark.asyncio
+    async def test_tls_handshake_and_http2_streams(self):
+        telemetry = ConnectionPoolTelemetry()
+        first = _RequestTrace(telemetry)
+        second = _RequestTrace(telemetry)
+
+        await first("connection.connect_tcp.started", {})
+        await first("connection.start_tls.started", {})
+        await first("connection.start_tls.complete", {})
+        await second("http2.send_request_headers.started", {"stream_id": 3})
+
+        first.http2_connection = second.http2_connection = 1
+        telemetry.open_http2_stream(1)
+        telemetry.open_http2_stream(1)
+        await first("http2.response_closed.complete", {})
+
+        stats = telemetry.get_stats()
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 1
+        assert stats["tls_handshakes"] == 1
+        assert stats["http2_streams_max"] == 2
+        assert stats["http2_open_streams"] == 1
+
+    @pytest.mark.asyncio
+    async def test_chains_existing_trace_callback(self):
+        seen = []
+
+        async def callback(event_name, info):
+            seen.append(event_name)
+
+        trace = _RequestTrace(ConnectionPoolTelemetry(), chained=callback)
+        await trace("http11.send_request_headers.started", {})
+
+        assert seen == ["http11.send_request_headers.started"]
@@ -0,0 +1,163 @@
+"""
+Tests for streaming latency sketches
+"""
+
+import random
+import time
+
+import pytest
+
+from src.utils.performance_monitor import PerformanceMonitor, PerformanceMetrics
+from src.utils.quantile_sketch import DDSketch, RollingQuantileWindow
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def record(monitor, operation, duration, status="success", end_time=None):
+    end_time = end_time or time.time()
+    monitor._record_metrics(PerformanceMetrics(
+        operation_name=operation,
+        start_time=end_time - duration,
+        end_time=end_time,
+        duration=duration,
+        status=status
+    ))
+
+
+class TestDDSketch:
+    """Relative-error quantile sketch"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-3, 1.2) for _ in range(20000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.95, 0.99, 0.999):
+            exact = exact_quantile(values, q)
+            assert abs(sketch.quantile(q) - exact) <= 0.01 * exact * 1.001
+
+        # Bins stay few even for 20k samples spread over orders of magnitude
+        assert len(sketch.bins) < 1000
+
+    def test_merge_matches_single_sketch(self):
+        rng = random.Random(11)
+        values = [rng.expovariate(5) for _ in range(5000)]
+        whole, left, right = DDSketch(), DDSketch(), DDSketch()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (left if i % 2 else right).add(value)
+
+        merged = DDSketch.from_dict(left.to_dict())
+        merged.merge(DDSketch.from_dict(right.to_dict()))
+
+        assert merged.count == whole.count
+        assert merged.bins == whole.bins
+        assert merged.quantile(0.99) == whole.quantile(0.99)
+
+    def test_rejects_different_accuracy(self):
+        with pytest.raises(ValueError):
+            DDSketch(0.01).merge(DDSketch(0.02))
+
+
+class TestRollingQuantileWindow:
+    """Sketch over a sliding time window"""
+
+    def test_old_slots_leave_the_window(self):
+        window = RollingQuantileWindow(window_seconds=300, slot_seconds=60)
+        start = 1_000_020.0  # Start of a slot
+
+        for i in range(100):
+            window.add(10.0, now=start + i * 0.1)
+        for i in range(100):
+            window.add(0.1, error=True, now=start + 240 + i * 0.1)
+
+        assert window.quantile(0.99, now=start + 250) == pytest.approx(10.0, rel=0.01)
+
+        # The first slot has expired five minutes later
+        assert window.quantile(0.99, now=start + 300) == pytest.approx(0.1, rel=0.01)
+        assert window.snapshot(now=start + 300).max == 0.1
+        assert window.summary(now=start + 300) == {"count": 100, "errors": 100, "mean": pytest.approx(0.1)}
+
+    def test_summary_of_recent_slots(self):
+        window = RollingQuantileWindow(window_seconds=3600, slot_seconds=60)
+        start = 1_000_020.0
+        window.add(1.0, now=start)
+        window.add(3.0, error=True, now=start + 600)
+
+        recent = window.summary(seconds=300, now=start + 600)
+        assert recent == {"count": 1, "errors": 1, "mean": 3.0}
+        assert window.summary(now=start + 600)["count"] == 2
+
+    def test_add_many_counts_aggregates(self):
+        window = RollingQuantileWindow(window_seconds=300, slot_seconds=60)
+        start = 1_000_020.0
+        window.add(1.0, now=start)
+        window.add_many(0.5, 4, errors=2, now=start + 1)
+        window.add_many(0.5, 0, now=start + 1)
+
+        assert window.summary(now=start + 1) == {"count": 5, "errors": 2, "mean": pytest.approx(0.6)}
+        assert window.summary(now=start + 300) == {"count": 0, "errors": 0, "mean": 0.0}
+
+
+class TestPerformanceMonitorSketches:
+    """Percentiles and health read from the sketches"""
+
+    @pytest.fixture
+    def monitor(self):
+        return PerformanceMonitor(enable_prometheus=False, enable_opentelemetry=False)
+
+    def test_system_health_from_recent_window(self, monitor):
+        for i in range(90):
+            record(monitor, "get_tasks", 0.2)
+        for i in range(10):
+            record(monitor, "get_tasks", 0.2, status="error")
+
+        health = monitor.get_system_health()
+        assert health["total_requests"] == 100
+        assert health["error_rate"] == pytest.approx(10.0)
+        assert health["average_response_time"] == pytest.approx(0.2)
+        assert health["status"] == "degraded"
+
+    def test_percentiles_merged_across_replicas(self, monitor):
+        other = PerformanceMonitor(enable_prometheus=False, enable_opentelemetry=False)
+        for i in range(100):
+            record(monitor, "get_plans", 0.1)
+            record(other, "get_plans", 1.0)
+
+        local = monitor.calculate_percentiles("get_plans")
+        merged = monitor.calculate_merged_percentiles("get_plans", [other.export_latency_sketches()])
+
+        assert local["p95.0"] == pytest.approx(0.1, rel=0.01)
+        assert merged["p50.0"] == pytest.approx(1.0, rel=0.01)
+        assert merged["p95.0"] == pytest.approx(1.0, rel=0.01)
+
+    def test_percentile_query_cost_independent_of_samples(self, monitor):
+        """Benchmark percentile queries against a sort of the raw history"""
+        rng = random.Random(3)
+        durations = [rng.lognormvariate(-2, 0.8) for _ in range(10000)]
+        for duration in durations:
+            record(monitor, "list_tasks", duration)
+
+        rounds = 200
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            monitor.calculate_percentiles("list_tasks")
+        sketch_duration = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            exact = sorted(durations)
+            [exact[min(int(p / 100 * len(exact)), len(exact) - 1)] for p in (50.0, 95.0, 99.0)]
+        sort_duration = time.perf_counter() - start_time
+
+        print(f"\n{rounds} percentile queries over {len(durations)} samples: "
+              f"sketch {sketch_duration:.4f}s, sort {sort_duration:.4f}s")
+
+        assert sketch_duration < sort_duration
+        assert monitor.calculate_percentiles("list_tasks")["p99.0"] == \
+            pytest.approx(exact_quantile(durations, 0.99), rel=0.011)
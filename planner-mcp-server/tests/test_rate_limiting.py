@@ -14,7 +14,7 @@ from typing import Dict, Any, List
 from src.graph.rate_limiter import (
     IntelligentRateLimiter, RateLimitStrategy, EndpointTier,
     RateLimitWindow, RetryConfig, RateLimitState,
-    get_rate_limiter
+    EndpointCircuitBreaker, UsagePattern, get_rate_limiter
 )
 from src.utils.performance_monitor import get_performance_monitor
 
@@ -603,13 +603,13 @@ class TestCircuitBreaker:
             rate_limiter._update_circuit_breaker(key, False, True)
 
         breaker = rate_limiter.circuit_breakers[key]
-        assert breaker["state"] == "closed"
-        assert breaker["failure_count"] == 2
+        assert breaker.state == "closed"
+        assert breaker.failure_count == 2
 
         # One more failure should open the circuit
         rate_limiter._update_circuit_breaker(key, False, True)
-        assert breaker["state"] == "open"
-        assert breaker["failure_count"] == 3
+        assert breaker.state == "open"
+        assert breaker.failure_count == 3
         assert rate_limiter._is_circuit_breaker_open(key)
 
     def test_circuit_breaker_timeout_transition(self, rate_limiter):
@@ -621,56 +621,42 @@ class TestCircuitBreaker:
             rate_limiter._update_circuit_breaker(key, False, True)
 
         breaker = rate_limiter.circuit_breakers[key]
-        assert breaker["state"] == "open"
+        assert breaker.state == "open"
 
         # Simulate timeout passage by setting next_attempt to past
-        breaker["next_attempt"] = time.time() - 1
+        breaker.next_attempt = time.time() - 1
 
         # Should transition to half-open
         assert not rate_limiter._is_circuit_breaker_open(key)
-        assert breaker["state"] == "half_open"
+        assert breaker.state == "half_open"
 
     def test_circuit_breaker_half_open_recovery(self, rate_limiter):
         """Test circuit breaker recovery from half-open to closed"""
         key = "test_endpoint"
 
         # Set up half-open state
-        rate_limiter.circuit_breakers[key] = {
-            "state": "half_open",
-            "failure_count": 3,
-            "success_count": 0,
-            "last_failure": None,
-            "next_attempt": None,
-            "test_requests": 0
-        }
+        rate_limiter.circuit_breakers[key] = EndpointCircuitBreaker(state="half_open", failure_count=3)
 
         # Record successful test requests
         for _ in range(3):
             rate_limiter._update_circuit_breaker(key, True, False)
 
         breaker = rate_limiter.circuit_breakers[key]
-        assert breaker["state"] == "closed"
-        assert breaker["failure_count"] == 0
+        assert breaker.state == "closed"
+        assert breaker.failure_count == 0
 
     def test_circuit_breaker_half_open_failure(self, rate_limiter):
         """Test circuit breaker failure in half-open state"""
         key = "test_endpoint"
 
         # Set up half-open state
-        rate_limiter.circuit_breakers[key] = {
-            "state": "half_open",
-            "failure_count": 2,  # Just below threshold
-            "success_count": 0,
-            "last_failure": None,
-            "next_attempt": None,
-            "test_requests": 0
-        }
+        rate_limiter.circuit_breakers[key] = EndpointCircuitBreaker(state="half_open", failure_count=2)  # Just below threshold
 
         # Failure in half-open should immediately re-open
         rate_limiter._update_circuit_breaker(key, False, True)
 
         breaker = rate_limiter.circuit_breakers[key]
-        assert breaker["state"] == "open"
+        assert breaker.state == "open"
 
     def test_circuit_breaker_delay_calculation(self, rate_limiter):
         """Test circuit breaker delay calculation"""
@@ -682,14 +668,7 @@ class TestCircuitBreaker:
 
         # Open breaker with future next_attempt
         future_time = time.time() + 60
-        rate_limiter.circuit_breakers[key] = {
-            "state": "open",
-            "next_attempt": future_time,
-            "failure_count": 3,
-            "success_count": 0,
-            "last_failure": None,
-            "test_requests": 0
-        }
+        rate_limiter.circuit_breakers[key] = EndpointCircuitBreaker(state="open", next_attempt=future_time, failure_count=3)
 
         delay = rate_limiter._get_circuit_breaker_delay(key)
         assert 55 <= delay <= 60  # Should be close to 60 seconds
@@ -719,12 +698,12 @@ class TestCircuitBreaker:
             rate_limiter._update_circuit_breaker(key, False, True)
 
         breaker = rate_limiter.circuit_breakers[key]
-        assert breaker["failure_count"] == 2
+        assert breaker.failure_count == 2
 
         # Success should reset failures
         rate_limiter._update_circuit_breaker(key, True, False)
-        assert breaker["failure_count"] == 0
-        assert breaker["success_count"] == 1
+        assert breaker.failure_count == 0
+        assert breaker.success_count == 1
 
 
 class TestPredictiveThrottling:
@@ -756,11 +735,9 @@ class TestPredictiveThrottling:
 
         # Simulate low frequency requests
         current_time = time.time()
-        rate_limiter.usage_patterns[key] = [
-            current_time - 30,  # 30 seconds ago
-            current_time - 20,  # 20 seconds ago
-            current_time - 10   # 10 seconds ago
-        ]
+        pattern = rate_limiter.usage_patterns[key] = UsagePattern()
+        for seconds_ago in (30, 20, 10):
+            pattern.record(current_time - seconds_ago)
 
         delay = rate_limiter._predict_rate_limit_delay(endpoint, tenant_id)
         assert delay == 0.0  # Should not throttle low frequency
@@ -776,9 +753,9 @@ class TestPredictiveThrottling:
         # Pre-populate with requests to create high frequency
         # Need more than 30 requests in last 60 seconds to exceed 0.5 req/s
         # Pre-populate with 31 requests, method will add 1 more = 32 total
-        rate_limiter.usage_patterns[key] = [
-            current_time - (i * 1.5) for i in range(31)  # 31 requests over ~46 seconds
-        ]
+        pattern = rate_limiter.usage_patterns[key] = UsagePattern()
+        for i in range(30, -1, -1):  # 31 requests over ~46 seconds
+            pattern.record(current_time - (i * 1.5))
 
         delay = rate_limiter._predict_rate_limit_delay(endpoint, tenant_id)
         assert delay > 0  # Should apply throttling
@@ -792,9 +769,9 @@ class TestPredictiveThrottling:
 
         # Set up high frequency pattern
         current_time = time.time()
-        rate_limiter.usage_patterns[key] = [
-            current_time - i for i in range(9, 0, -1)  # 9 requests recently
-        ]
+        pattern = rate_limiter.usage_patterns[key] = UsagePattern()
+        for i in range(9, 0, -1):  # 9 requests recently
+            pattern.record(current_time - i)
 
         # This request should trigger predictive throttling
         result = await rate_limiter.check_rate_limit(endpoint, tenant_id)
@@ -814,7 +791,9 @@ class TestPredictiveThrottling:
             rate_limiter._predict_rate_limit_delay(endpoint, tenant_id)
 
         key = f"{endpoint}:{tenant_id}"
-        assert len(rate_limiter.usage_patterns[key]) <= 100
+        pattern = rate_limiter.usage_patterns[key]
+        assert pattern.requests_in_window(time.time()) == 150
+        assert len(pattern.counts) == 60  # One slot per second, however many requests
 
 
 class TestRateLimitMetrics:
@@ -877,23 +856,13 @@ class TestRateLimitMetrics:
         key1 = "endpoint1"
         key2 = "endpoint2"
 
-        rate_limiter.circuit_breakers[key1] = {
-            "state": "closed",
-            "failure_count": 1,
-            "success_count": 5,
-            "last_failure": time.time(),
-            "next_attempt": None,
-            "test_requests": 0
-        }
+        rate_limiter.circuit_breakers[key1] = EndpointCircuitBreaker(
+            state="closed", failure_count=1, success_count=5, last_failure=time.time()
+        )
 
-        rate_limiter.circuit_breakers[key2] = {
-            "state": "open",
-            "failure_count": 5,
-            "success_count": 0,
-            "last_failure": time.time(),
-            "next_attempt": time.time() + 60,
-            "test_requests": 0
-        }
+        rate_limiter.circuit_breakers[key2] = EndpointCircuitBreaker(
+            state="open", failure_count=5, last_failure=time.time(), next_attempt=time.time() + 60
+        )
 
         status = rate_limiter.get_circuit_breaker_status()
         assert len(status) == 2
@@ -934,6 +903,88 @@ class TestRateLimitMetrics:
         # This is tested indirectly through the update_connection_stats call
 
 
+class TestBoundedState:
+    """Test idle eviction, capacity limits and memory accounting of limiter state"""
+
+    @pytest.fixture
+    def rate_limiter(self):
+        """Create rate limiter with small state tables"""
+        with patch.dict('os.environ', {
+            'RATE_LIMIT_STATE_IDLE_TTL': '900',
+            'RATE_LIMIT_STATE_MAX_ENTRIES': '1000',
+            'RATE_LIMIT_PREDICTIVE': 'false'
+        }):
+            return IntelligentRateLimiter()
+
+    @pytest.mark.asyncio
+    async def test_compaction_drops_idle_state_but_keeps_pinned(self, rate_limiter):
+        """Test that idle entries are dropped unless rate limited or tripped"""
+        await rate_limiter.record_request_result("/me", True, status_code=200, user_id="idle")
+        await rate_limiter.record_request_result("/me", False, status_code=429, user_id="throttled")
+        for _ in range(5):
+            rate_limiter._update_circuit_breaker("tripped", False, False)
+        rate_limiter._update_circuit_breaker("healthy", True, False)
+
+        # Age every entry past the TTL
+        for table in (rate_limiter.rate_limit_states, rate_limiter.circuit_breakers):
+            for record in table.values():
+                record.last_seen -= 1000
+
+        dropped = rate_limiter.compact()
+
+        assert dropped["rate_limit_states"] == 1
+        assert rate_limiter._get_rate_limit_key("/me", user_id="throttled") in rate_limiter.rate_limit_states
+        assert set(rate_limiter.circuit_breakers) == {"tripped"}
+
+    @pytest.mark.asyncio
+    async def test_hard_cap_evicts_least_recently_used(self, rate_limiter):
+        """Test that the table never exceeds its cap"""
+        for i in range(1500):
+            await rate_limiter.record_request_result("/me", True, status_code=200, user_id=f"user{i}")
+            if i % 100 == 0:
+                # Keep the first user active
+                await rate_limiter.check_rate_limit("/me", user_id="user0")
+
+        states = rate_limiter.rate_limit_states
+        assert len(states) == 1000
+        assert rate_limiter._get_rate_limit_key("/me", user_id="user0") in states
+        assert rate_limiter._get_rate_limit_key("/me", user_id="user1") not in states
+        assert states.evicted_capacity == 500
+
+    @pytest.mark.asyncio
+    async def test_memory_stays_flat_with_many_users(self, rate_limiter):
+        """Test that 50k distinct users do not grow limiter memory past the cap"""
+        async def serve(users):
+            for i in users:
+                await rate_limiter.check_rate_limit("/planner/tasks", user_id=f"user{i}")
+                await rate_limiter.record_request_result("/planner/tasks", True, status_code=200, user_id=f"user{i}")
+            return (await rate_limiter.get_rate_limit_status())["memory"]
+
+        warmed_up = await serve(range(5000))
+        after_50k = await serve(range(5000, 50000))
+
+        assert after_50k["total_entries"] == warmed_up["total_entries"] == 2000
+        assert after_50k["total_bytes"] <= warmed_up["total_bytes"] * 1.05
+        assert after_50k["tables"]["rate_limit_states"]["evicted_capacity"] == 49000
+
+    @pytest.mark.asyncio
+    async def test_compaction_task_lifecycle(self):
+        """Test that the periodic compaction task compacts and stops cleanly"""
+        with patch.dict('os.environ', {
+            'RATE_LIMIT_STATE_IDLE_TTL': '0',
+            'RATE_LIMIT_COMPACTION_INTERVAL': '0.01'
+        }):
+            limiter = IntelligentRateLimiter()
+
+        await limiter.record_request_result("/me", True, status_code=200)
+        await limiter.start()
+        await asyncio.sleep(0.05)
+        await limiter.stop()
+
+        assert len(limiter.rate_limit_states) == 0
+        assert limiter._compaction_task is None
+
+
 class TestEndpointTierConfigurations:
     """Test different endpoint tier configurations"""
 
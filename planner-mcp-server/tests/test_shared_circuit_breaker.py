@@ -0,0 +1,231 @@
+"""
+Tests for circuit breaker transitions shared between replicas
+
+Replicas share an in-memory double of the CacheService key/value and pub/sub
+helpers; one test runs against a local Redis (TEST_REDIS_URL, default
+redis://localhost:6379/15) and is skipped when it is not reachable.
+"""
+
+import os
+import time
+import uuid
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from src.cache import CacheService, CacheError
+from src.graph.rate_limiter import IntelligentRateLimiter
+from src.utils.error_handler import EnhancedErrorHandler
+from src.utils.shared_circuit_breaker import SharedCircuitBreaker
+
+
+class InMemoryPubSubCache:
+    """Minimal in-memory implementation of the CacheService key/value and pub/sub helpers"""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def set(self, key: str, value: Any, ttl: int = None, namespace: str = "itp"):
+        self.values[key] = value
+        return True
+
+    async def delete(self, key: str, namespace: str = "itp"):
+        return self.values.pop(key, None) is not None
+
+    async def get_keys_pattern(self, pattern: str, namespace: str = "itp"):
+        prefix = pattern.rstrip("*")
+        return [key for key in self.values if key.startswith(prefix)]
+
+    async def get_multiple(self, keys: List[str], namespace: str = "itp"):
+        return {key: self.values[key] for key in keys if key in self.values}
+
+    async def publish(self, channel: str, value: Any, namespace: str = "itp"):
+        queues = self.subscribers.get(channel, [])
+        for queue in queues:
+            queue.put_nowait(value)
+        return len(queues)
+
+    async def subscribe(self, channel: str, namespace: str = "itp"):
+        queue = asyncio.Queue()
+        self.subscribers.setdefault(channel, []).append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.subscribers[channel].remove(queue)
+
+
+async def settle():
+    """Let pending publishes reach the other replicas"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest_asyncio.fixture
+async def replicas():
+    """Two rate limiters sharing breaker transitions through one cache"""
+    cache = InMemoryPubSubCache()
+    with patch.dict('os.environ', {
+        'CIRCUIT_BREAKER_THRESHOLD': '3',
+        'CIRCUIT_BREAKER_TIMEOUT': '30',
+        'RATE_LIMIT_PREDICTIVE': 'false'
+    }):
+        limiters = [IntelligentRateLimiter(), IntelligentRateLimiter()]
+
+    shared = [SharedCircuitBreaker(cache, instance_id=f"replica-{i}") for i in range(2)]
+    for limiter, breakers in zip(limiters, shared):
+        await breakers.start()
+        limiter.set_shared_circuit_breaker(breakers)
+    await settle()
+
+    yield limiters, shared, cache
+
+    for breakers in shared:
+        await breakers.stop()
+
+
+class TestSharedRateLimiterBreakers:
+    """Open, half-open and closed transitions across rate limiter replicas"""
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_blocks_other_replica(self, replicas):
+        (replica_a, replica_b), _, cache = replicas
+        key = replica_a._get_rate_limit_key("/planner/tasks")
+
+        for _ in range(3):
+            replica_a._update_circuit_breaker(key, False, False)
+        await settle()
+
+        result = await replica_b.check_rate_limit("/planner/tasks")
+        assert result["allowed"] is False
+        assert result["reason"] == "circuit_breaker_open"
+        assert 25 < result["delay"] <= 30
+        # Replica B never saw a failure itself
+        assert key not in replica_b.circuit_breakers
+        assert f"circuit_breaker:graph:{key}" in cache.values
+
+    @pytest.mark.asyncio
+    async def test_only_one_replica_probes_half_open_breaker(self, replicas):
+        (replica_a, replica_b), _, _ = replicas
+        key = "/planner/tasks"
+
+        for _ in range(3):
+            replica_a._update_circuit_breaker(key, False, False)
+        replica_a.circuit_breakers[key].next_attempt = time.time() - 1
+
+        # Replica A moves to half-open and takes the probe lease
+        assert not replica_a._is_circuit_breaker_open(key)
+        await settle()
+        assert replica_b._is_circuit_breaker_open(key)
+
+        # Successful probes close the breaker everywhere
+        for _ in range(3):
+            replica_a._update_circuit_breaker(key, True, False)
+        await settle()
+        assert replica_a.circuit_breakers[key].state == "closed"
+        assert not replica_b._is_circuit_breaker_open(key)
+
+    @pytest.mark.asyncio
+    async def test_late_replica_loads_open_breakers(self, replicas):
+        (replica_a, _), _, cache = replicas
+        for _ in range(3):
+            replica_a._update_circuit_breaker("/groups", False, False)
+        await settle()
+
+        late = SharedCircuitBreaker(cache, instance_id="replica-late")
+        await late.start()
+        try:
+            assert late.blocking_state("/groups").state == "open"
+        finally:
+            await late.stop()
+
+    @pytest.mark.asyncio
+    async def test_expired_shared_state_stops_blocking(self, replicas):
+        _, (shared_a, shared_b), _ = replicas
+        shared_a.share("/me", "open", time.time() + 0.05)
+        await settle()
+        assert shared_b.blocking_state("/me") is not None
+
+        await asyncio.sleep(0.06)
+        assert shared_b.blocking_state("/me") is None
+        assert "/me" not in shared_b.states
+
+    @pytest.mark.asyncio
+    async def test_hot_path_check_is_local(self, replicas):
+        (replica_a, replica_b), (_, shared_b), cache = replicas
+        for _ in range(3):
+            replica_a._update_circuit_breaker("/me", False, False)
+        await settle()
+
+        # Redis going away does not slow down or change the check
+        cache.values.clear()
+        start = time.perf_counter()
+        for _ in range(10000):
+            assert replica_b._is_circuit_breaker_open("/me")
+        assert time.perf_counter() - start < 0.5
+        assert shared_b.get_stats()["received"] == 1
+
+
+class TestSharedErrorHandlerBreakers:
+    """Error handler breakers shared across replicas"""
+
+    @pytest.mark.asyncio
+    async def test_operation_breaker_opens_on_other_replica(self):
+        cache = InMemoryPubSubCache()
+        handlers = [EnhancedErrorHandler(), EnhancedErrorHandler()]
+        shared = [SharedCircuitBreaker(cache, scope="operations", instance_id=f"replica-{i}") for i in range(2)]
+        for handler, breakers in zip(handlers, shared):
+            await breakers.start()
+            handler.set_shared_circuit_breaker(breakers)
+        await settle()
+
+        try:
+            for _ in range(5):
+                handlers[0].record_operation_result("create_task", False)
+            await settle()
+
+            assert handlers[1]._is_circuit_breaker_open("create_task")
+            assert not handlers[1]._is_circuit_breaker_open("list_tasks")
+        finally:
+            for breakers in shared:
+                await breakers.stop()
+
+
+@pytest_asyncio.fixture
+async def redis_cache():
+    """CacheService connected to a local Redis, skipped when unavailable"""
+    cache = CacheService(os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15"))
+    try:
+        await cache.initialize()
+    except CacheError:
+        pytest.skip("Local Redis not available")
+    yield cache
+    await cache.close()
+
+
+class TestSharedBreakerPropagation:
+    """Propagation latency through a local Redis"""
+
+    @pytest.mark.asyncio
+    async def test_transition_reaches_other_replica(self, redis_cache):
+        scope = f"test:{uuid.uuid4()}"
+        replica_a = SharedCircuitBreaker(redis_cache, scope=scope, instance_id="a")
+        replica_b = SharedCircuitBreaker(redis_cache, scope=scope, instance_id="b")
+        await replica_a.start()
+        await replica_b.start()
+        await asyncio.sleep(0.05)
+
+        try:
+            start = time.perf_counter()
+            replica_a.share("/planner/tasks", "open", time.time() + 30)
+            while replica_b.blocking_state("/planner/tasks") is None:
+                assert time.perf_counter() - start < 1.0
+                await asyncio.sleep(0.001)
+        finally:
+            replica_a.share("/planner/tasks", "closed")
+            await replica_a.stop()
+            await replica_b.stop()
@@ -0,0 +1,194 @@
+"""
+Tests for the persistent user to tenant index
+
+Postgres is replaced by a double of the asyncpg pool keeping rows in a dict,
+Redis by an in-memory double of the CacheService key/value helpers.
+"""
+
+import os
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.auth import AuthService
+from src.graph.tenant_index import UserTenantIndex
+
+ENCRYPTION_KEY = "0123456789abcdef0123456789abcdef"
+
+
+class InMemoryCache:
+    """Minimal in-memory implementation of the CacheService key/value helpers"""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.ttls: Dict[str, int] = {}
+
+    async def set(self, key: str, value: Any, ttl: int = None, namespace: str = "itp"):
+        self.values[f"{namespace}:{key}"] = value
+        self.ttls[f"{namespace}:{key}"] = ttl
+        return True
+
+    async def get(self, key: str, namespace: str = "itp", default: Any = None):
+        return self.values.get(f"{namespace}:{key}", default)
+
+    async def delete(self, key: str, namespace: str = "itp"):
+        return self.values.pop(f"{namespace}:{key}", None) is not None
+
+
+class IndexConnection:
+    """asyncpg connection double for the user_tenant_index table"""
+
+    def __init__(self, pool: "IndexPool"):
+        self.pool = pool
+
+    async def execute(self, query: str, *args):
+        if self.pool.fail:
+            raise ConnectionError("connection refused")
+        query = " ".join(query.split())
+        self.pool.statements.append(query)
+        if query.startswith("INSERT INTO user_tenant_index"):
+            user_id, tenant_id, source = args
+            self.pool.rows[user_id] = {"tenant_id": tenant_id, "source": source}
+
+    async def fetchval(self, query: str, *args):
+        if self.pool.fail:
+            raise ConnectionError("connection refused")
+        self.pool.lookups += 1
+        row = self.pool.rows.get(args[0])
+        return row["tenant_id"] if row else None
+
+
+class IndexPool:
+    def __init__(self):
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.statements: List[str] = []
+        self.lookups = 0
+        self.fail = False
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return IndexConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+class IndexDatabase:
+    def __init__(self):
+        self._connection_pool = IndexPool()
+
+
+class TestUserTenantIndex:
+    """Writes to both stores, reads from Redis first"""
+
+    @pytest.mark.asyncio
+    async def test_record_writes_postgres_and_redis(self):
+        cache, database = InMemoryCache(), IndexDatabase()
+        index = UserTenantIndex(cache, database, ttl=600)
+
+        assert await index.record("user@acme.com", "tenant-a", source="login")
+
+        assert database._connection_pool.rows["user@acme.com"] == {"tenant_id": "tenant-a", "source": "login"}
+        assert cache.values["itp:user_tenant:user@acme.com"] == "tenant-a"
+        assert cache.ttls["itp:user_tenant:user@acme.com"] == 600
+        assert any("CREATE TABLE IF NOT EXISTS user_tenant_index" in s
+                   for s in database._connection_pool.statements)
+
+    @pytest.mark.asyncio
+    async def test_lookup_prefers_redis(self):
+        cache, database = InMemoryCache(), IndexDatabase()
+        index = UserTenantIndex(cache, database)
+        await index.record("user@acme.com", "tenant-a")
+
+        assert await index.lookup("user@acme.com") == "tenant-a"
+        assert database._connection_pool.lookups == 0
+        assert index.get_stats()["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_miss_falls_back_to_postgres_and_refills(self):
+        cache, database = InMemoryCache(), IndexDatabase()
+        index = UserTenantIndex(cache, database)
+        await index.record("user@acme.com", "tenant-a")
+        cache.values.clear()  # Redis flushed or key expired
+
+        assert await index.lookup("user@acme.com") == "tenant-a"
+        assert cache.values["itp:user_tenant:user@acme.com"] == "tenant-a"
+        assert await index.lookup("unknown@acme.com") is None
+
+        stats = index.get_stats()
+        assert stats["database_hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_database_failures_do_not_raise(self):
+        cache, database = InMemoryCache(), IndexDatabase()
+        database._connection_pool.fail = True
+        index = UserTenantIndex(cache, database)
+
+        assert not await index.record("user@acme.com", "tenant-a")
+        # Redis still written and read
+        assert await index.lookup("user@acme.com") == "tenant-a"
+        assert index.get_stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_only_without_database(self):
+        index = UserTenantIndex(InMemoryCache())
+
+        assert await index.record("user@acme.com", "tenant-a")
+        assert await index.lookup("user@acme.com") == "tenant-a"
+        assert not index.get_stats()["persistent"]
+
+
+class TestAuthServiceIndexing:
+    """Login and token refresh write the index"""
+
+    @pytest.fixture
+    def auth_service(self):
+        cache = InMemoryCache()
+        index = UserTenantIndex(cache, IndexDatabase())
+        with patch.dict(os.environ, {"ENCRYPTION_KEY": ENCRYPTION_KEY}), \
+                patch("src.auth.msal.ConfidentialClientApplication") as app_class:
+            service = AuthService("client", "secret", "home-tenant", cache, tenant_index=index)
+        service.app = app_class.return_value
+        return service
+
+    @pytest.mark.asyncio
+    async def test_login_records_tenant_from_token_claims(self, auth_service):
+        await auth_service.cache_service.set("oauth_state:state-1", {"user_id": "user@acme.com"})
+        auth_service.app.acquire_token_by_authorization_code.return_value = {
+            "access_token": "access",
+            "refresh_token": "refresh",
+            "expires_in": 3600,
+            "id_token_claims": {"tid": "guest-tenant"}
+        }
+
+        assert await auth_service.handle_callback("code", "state-1")
+        assert await auth_service.tenant_index.lookup("user@acme.com") == "guest-tenant"
+
+    @pytest.mark.asyncio
+    async def test_refresh_records_tenant(self, auth_service):
+        auth_service.app.acquire_token_by_refresh_token.return_value = {
+            "access_token": "new-access",
+            "expires_in": 3600
+        }
+
+        token = await auth_service._refresh_access_token(
+            "user@acme.com", {"refresh_token": "refresh", "tenant_id": "tenant-b"}
+        )
+
+        assert token == "new-access"
+        rows = auth_service.tenant_index.database._connection_pool.rows
+        assert rows["user@acme.com"] == {"tenant_id": "tenant-b", "source": "refresh"}
+
+    def test_cipher_derived_once_per_key(self, auth_service):
+        with patch.dict(os.environ, {"ENCRYPTION_KEY": ENCRYPTION_KEY}), \
+                patch("src.auth.msal.ConfidentialClientApplication", MagicMock()):
+            other = AuthService("client", "secret", "other-tenant", auth_service.cache_service)
+
+        assert other.cipher is auth_service.cipher
@@ -3,12 +3,14 @@ Comprehensive tests for webhook subscription system
 Story 2.1 Task 3: Tests with real data, no mocking, comprehensive coverage
 """
 
+import time
 import asyncio
 import json
 import hmac
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+from dataclasses import asdict
 from unittest.mock import AsyncMock
 import pytest
 from fastapi import FastAPI
@@ -491,8 +493,12 @@ class TestWebhookSubscriptionManager:
 
         webhook_manager._handle_notification = mock_handle_notification
 
-        # Process notification with retry
-        await webhook_manager._handle_notification_with_retry(notification)
+        # Process notification through the worker pool (retries are delayed, not inline)
+        await webhook_manager.enqueue_notification(notification)
+        for _ in range(50):
+            if notification.processed:
+                break
+            await asyncio.sleep(0.1)
 
         # Verify it succeeded after retries
         assert call_count == 3
@@ -715,18 +721,420 @@ class TestWebhookSubscriptionManager:
         notification_data = real_webhook_notification_plan["value"][0]
         notification = webhook_manager._create_webhook_notification(notification_data)
 
-        # Add to queue
-        await webhook_manager.notification_queue.put(notification)
+        # Add to the shard owning this resource and wait for its worker
+        shard = webhook_manager.notification_shards[webhook_manager._get_shard_index(notification)]
+        await webhook_manager.enqueue_notification(notification)
+        await asyncio.wait_for(shard.join(), timeout=5)
 
-        # Verify queue has the notification
-        assert webhook_manager.notification_queue.qsize() == 1
+        # Verify notification was processed
+        assert notification.processed is True
 
-        # Process notification from queue (simulate background processing)
-        queued_notification = await webhook_manager.notification_queue.get()
-        await webhook_manager._handle_notification_with_retry(queued_notification)
 
-        # Verify notification was processed
-        assert queued_notification.processed is True
+class SubscriptionTableConnection:
+    """asyncpg connection double keeping webhook_subscriptions rows in memory"""
+
+    def __init__(self, pool: "SubscriptionTablePool"):
+        self.pool = pool
+
+    async def fetch(self, query: str, *args):
+        self.pool.queries.append(" ".join(query.split()))
+        now = datetime.utcnow()
+        return [row for row in self.pool.rows.values() if row["expiration_date_time"] > now]
+
+    async def fetchrow(self, query: str, *args):
+        self.pool.queries.append(" ".join(query.split()))
+        return self.pool.rows.get(args[0])
+
+    async def execute(self, query: str, *args):
+        query = " ".join(query.split())
+        self.pool.queries.append(query)
+        if query.startswith("INSERT INTO webhook_subscriptions"):
+            self.pool.rows[args[1]] = {"subscription_data": args[12], "expiration_date_time": args[8]}
+        elif query.startswith("DELETE FROM webhook_subscriptions"):
+            self.pool.rows.pop(args[0], None)
+
+    async def copy_records_to_table(self, table_name: str, *, records, columns):
+        self.pool.queries.append(f"COPY {table_name}")
+
+    async def executemany(self, query: str, args):
+        self.pool.queries.append(" ".join(query.split()))
+
+
+class SubscriptionTablePool:
+    def __init__(self):
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.queries: List[str] = []
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return SubscriptionTableConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+
+def make_database() -> Database:
+    """Real Database whose asyncpg pool is an in-memory webhook_subscriptions table"""
+    database = Database("postgresql+asyncpg://localhost/test")
+    database._connection_pool = SubscriptionTablePool()
+    return database
+
+
+class RecordingCache:
+    """In-memory cache double for webhook tests"""
+
+    def __init__(self):
+        self.values: Dict[str, Any] = {}
+        self.lists: Dict[str, List[Any]] = {}
+
+    async def set(self, key: str, value: Any, ttl: int = None, namespace: str = "itp"):
+        self.values[key] = value
+        return True
+
+    async def delete(self, key: str, namespace: str = "itp"):
+        return self.values.pop(key, None) is not None
+
+    async def get(self, key: str, namespace: str = "itp"):
+        return self.values.get(key)
+
+    async def delete_multiple(self, keys: List[str], namespace: str = "itp"):
+        return len([key for key in keys if self.values.pop(key, None) is not None])
+
+    async def stream_add(self, stream: str, value: Any, maxlen: int = None, namespace: str = "itp"):
+        entries = self.lists.setdefault(stream, [])
+        entries.append(value)
+        if maxlen:
+            del entries[:-maxlen]
+        return f"{len(entries)}-0"
+
+
+class TestShardedNotificationProcessing:
+    """Worker pool, per-resource ordering, delayed retries and backpressure"""
+
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        monkeypatch.setenv("WEBHOOK_NOTIFICATION_PROCESSOR_WORKERS", "4")
+        monkeypatch.setenv("WEBHOOK_NOTIFICATION_QUEUE_SIZE", "8")
+        monkeypatch.setenv("WEBHOOK_ENQUEUE_TIMEOUT", "0.05")
+        monkeypatch.setenv("WEBHOOK_RETRY_ATTEMPTS", "3")
+        monkeypatch.setenv("WEBHOOK_RETRY_DELAY", "0")
+        monkeypatch.setenv("WEBHOOK_STREAM_ENABLED", "false")
+        manager = WebhookSubscriptionManager(make_database(), RecordingCache())
+        manager.subscriptions["sub-1"] = WebhookSubscription(
+            id="sub-1",
+            resource="/planner/tasks",
+            change_types=["updated"],
+            notification_url="https://test.example.com/webhooks/default",
+            tenant_id="tenant-1"
+        )
+        return manager
+
+    @staticmethod
+    def _notification(task_id: str, change_type: str = "updated") -> WebhookNotification:
+        return WebhookNotification(
+            subscription_id="sub-1",
+            client_state=None,
+            change_type=change_type,
+            resource=f"/planner/tasks/{task_id}",
+            resource_data={"id": task_id},
+            tenant_id="tenant-1"
+        )
+
+    async def _drain(self, manager: WebhookSubscriptionManager) -> None:
+        for _ in range(100):
+            await asyncio.gather(*(shard.join() for shard in manager.notification_shards))
+            if not manager.retry_queue and not manager._deferred_notifications:
+                return
+            await asyncio.sleep(0.01)
+
+    def test_same_resource_maps_to_same_shard(self, manager):
+        first = self._notification("task-a")
+        second = self._notification("task-a", "deleted")
+        assert manager._get_shard_index(first) == manager._get_shard_index(second)
+
+        shards = {manager._get_shard_index(self._notification(f"task-{i}")) for i in range(64)}
+        assert len(shards) == manager.worker_count
+
+    @pytest.mark.asyncio
+    async def test_resources_processed_in_parallel(self, manager):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_handle(notification):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+
+        manager._handle_notification = slow_handle
+        manager._start_notification_workers()
+        try:
+            for i in range(16):
+                await manager.enqueue_notification(self._notification(f"task-{i}"))
+            await self._drain(manager)
+        finally:
+            await manager.shutdown()
+
+        assert max_in_flight > 1
+
+    @pytest.mark.asyncio
+    async def test_retry_does_not_block_other_resources_and_keeps_order(self, manager):
+        handled: List[Tuple[str, str]] = []
+        failures = {"task-a": 2}
+
+        async def flaky_handle(notification):
+            task_id = notification.resource_data["id"]
+            if failures.get(task_id, 0) > 0 and notification.change_type == "updated":
+                failures[task_id] -= 1
+                raise RuntimeError("transient")
+            handled.append((task_id, notification.change_type))
+
+        manager._handle_notification = flaky_handle
+        manager.retry_delay = 0.05
+        manager._start_notification_workers()
+        try:
+            await manager.enqueue_notification(self._notification("task-a", "updated"))
+            await manager.enqueue_notification(self._notification("task-a", "deleted"))
+            await manager.enqueue_notification(self._notification("task-b", "updated"))
+            await self._drain(manager)
+        finally:
+            await manager.shutdown()
+
+        task_a = [change for task_id, change in handled if task_id == "task-a"]
+        assert task_a == ["updated", "deleted"]
+        assert ("task-b", "updated") in handled
+        assert handled.index(("task-b", "updated")) < handled.index(("task-a", "updated"))
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_with_503(self, manager):
+        from fastapi import HTTPException
+
+        # Workers are not started, so the shard fills up
+        shard_index = manager._get_shard_index(self._notification("task-a"))
+        for _ in range(manager.notification_shards[shard_index].maxsize):
+            await manager.enqueue_notification(self._notification("task-a"))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await manager.enqueue_notification(self._notification("task-a"))
+
+        assert exc_info.value.status_code == 503
+        assert "Retry-After" in exc_info.value.headers
+
+    @pytest.mark.asyncio
+    async def test_deferred_notifications_count_against_the_shard(self, manager):
+        from fastapi import HTTPException
+
+        handled: List[str] = []
+        failures = {"first": 1}
+
+        async def flaky_handle(notification):
+            if failures.get(notification.change_type, 0) > 0:
+                failures[notification.change_type] -= 1
+                raise RuntimeError("transient")
+            handled.append(notification.change_type)
+
+        manager._handle_notification = flaky_handle
+        manager.retry_delay = 0.3
+        shard_index = manager._get_shard_index(self._notification("task-a"))
+        capacity = manager.notification_shards[shard_index].maxsize
+        manager._start_notification_workers()
+        try:
+            # The first change waits for its retry; later ones are parked behind it
+            await manager.enqueue_notification(self._notification("task-a", "first"))
+            for index in range(capacity):
+                await manager.enqueue_notification(self._notification("task-a", f"parked-{index}"))
+            for _ in range(50):
+                if manager._deferred_counts[shard_index] == capacity:
+                    break
+                await asyncio.sleep(0.005)
+            assert manager._deferred_counts[shard_index] == capacity
+
+            with pytest.raises(HTTPException) as exc_info:
+                await manager.enqueue_notification(self._notification("task-a", "rejected"))
+            assert exc_info.value.status_code == 503
+
+            await self._drain(manager)
+        finally:
+            await manager.shutdown()
+
+        assert handled == ["first"] + [f"parked-{index}" for index in range(capacity)]
+        assert manager._deferred_counts[shard_index] == 0
+
+
+
+class FakeRateLimiter:
+    """Rate limiter double that throttles the first check per tenant"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.checks: List[str] = []
+        self.results: List[bool] = []
+
+    async def check_rate_limit(self, endpoint: str, tenant_id: str = None, user_id: str = None):
+        self.checks.append(tenant_id)
+        if self.delay and self.checks.count(tenant_id) == 1:
+            return {"allowed": False, "delay": self.delay, "reason": "rate_limited"}
+        return {"allowed": True, "delay": 0, "reason": "within_limits"}
+
+    async def record_request_result(self, endpoint: str, success: bool, tenant_id: str = None, **kwargs):
+        self.results.append(success)
+
+
+class TestSubscriptionRenewalScheduler:
+    """Deadline-ordered renewals, batching, retries and startup rebuild"""
+
+    @staticmethod
+    def _subscription(subscription_id: str, expires_in: float, tenant_id: str = "tenant-1") -> WebhookSubscription:
+        return WebhookSubscription(
+            id=subscription_id,
+            resource="/planner/tasks",
+            change_types=["updated"],
+            notification_url="https://test.example.com/webhooks/default",
+            expiration_date_time=datetime.utcnow() + timedelta(seconds=expires_in),
+            tenant_id=tenant_id
+        )
+
+    def test_deadlines_pop_in_order_and_reschedule_drops_stale_entries(self):
+        from src.graph.renewal_scheduler import SubscriptionRenewalScheduler
+
+        async def renew(subscription_id):
+            return None
+
+        scheduler = SubscriptionRenewalScheduler(renew, renewal_buffer=60, jitter_seconds=0)
+        scheduler.schedule(self._subscription("late", 3600))
+        scheduler.schedule(self._subscription("soon", 90))
+        scheduler.schedule(self._subscription("overdue", 10))
+
+        assert scheduler.next_due_in() == 0
+        assert [sid for sid, _ in scheduler.pop_due()] == ["overdue"]
+
+        # Renewed elsewhere: the old heap entry must not fire
+        scheduler.schedule(self._subscription("soon", 7200))
+        scheduler.unschedule("late")
+        assert scheduler.pop_due(now=time.monotonic() + 3600) == []
+        assert [sid for sid, _ in scheduler.pop_due(now=time.monotonic() + 7200)] == ["soon"]
+
+    def test_jitter_only_moves_renewals_earlier(self):
+        from src.graph.renewal_scheduler import SubscriptionRenewalScheduler
+
+        scheduler = SubscriptionRenewalScheduler(None, renewal_buffer=0, jitter_seconds=30)
+        now = time.monotonic()
+        due_times = [scheduler.schedule(self._subscription(f"sub-{i}", 100)) for i in range(50)]
+
+        assert all(now + 69 <= due <= now + 101 for due in due_times)
+        assert len({round(due, 3) for due in due_times}) > 1
+
+    @pytest.mark.asyncio
+    async def test_due_renewals_run_in_parallel_batches_under_rate_limiter(self):
+        from src.graph.renewal_scheduler import SubscriptionRenewalScheduler
+
+        active = 0
+        peak = 0
+        renewed = []
+
+        async def renew(subscription_id):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            renewed.append(subscription_id)
+
+        rate_limiter = FakeRateLimiter(delay=0.01)
+        scheduler = SubscriptionRenewalScheduler(
+            renew, rate_limiter=rate_limiter, renewal_buffer=3600, jitter_seconds=0, batch_size=4
+        )
+        for i in range(10):
+            scheduler.schedule(self._subscription(f"sub-{i}", 60, tenant_id=f"tenant-{i % 2}"))
+
+        start_time = time.time()
+        assert await scheduler.renew_due() == 10
+        duration = time.time() - start_time
+
+        assert sorted(renewed) == sorted(f"sub-{i}" for i in range(10))
+        assert peak == 4
+        assert scheduler.stats["batches"] == 3
+        assert scheduler.stats["rate_limit_waits"] == 2
+        assert rate_limiter.results == [True] * 10
+        # Serial renewals would take at least 0.2s
+        assert duration < 0.15
+
+    @pytest.mark.asyncio
+    async def test_failed_renewal_is_retried(self):
+        from src.graph.renewal_scheduler import SubscriptionRenewalScheduler
+
+        attempts = []
+
+        async def renew(subscription_id):
+            attempts.append(subscription_id)
+            if len(attempts) == 1:
+                raise RuntimeError("graph unavailable")
+
+        scheduler = SubscriptionRenewalScheduler(renew, renewal_buffer=3600, jitter_seconds=0, retry_delay=0.05)
+        scheduler.schedule(self._subscription("sub-1", 60))
+
+        task = asyncio.create_task(scheduler.run())
+        try:
+            for _ in range(100):
+                if len(attempts) == 2:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        assert attempts == ["sub-1", "sub-1"]
+        assert scheduler.stats["failed_renewals"] == 1
+        assert scheduler.stats["renewals"] == 1
+
+    @pytest.mark.asyncio
+    async def test_manager_rebuilds_schedule_from_one_query_and_renews_on_deadline(self, monkeypatch):
+        monkeypatch.setenv("WEBHOOK_STREAM_ENABLED", "false")
+        monkeypatch.setenv("WEBHOOK_RENEWAL_JITTER_SECONDS", "0")
+        monkeypatch.setenv("WEBHOOK_SUBSCRIPTION_RENEWAL_BUFFER", "3600")
+
+        soon = self._subscription("sub-soon", 3600.1)
+        later = self._subscription("sub-later", 86400)
+        expired = self._subscription("sub-expired", -60)
+
+        # Rows as asyncpg returns them: json columns as text, naive timestamps
+        database = make_database()
+        pool = database._connection_pool
+        for subscription in (later, soon, expired):
+            pool.rows[subscription.id] = {
+                "subscription_data": json.dumps(
+                    {**asdict(subscription), "expiration_date_time": None}, default=str
+                ),
+                "expiration_date_time": subscription.expiration_date_time
+            }
+
+        manager = WebhookSubscriptionManager(database, RecordingCache())
+        await manager.initialize()
+        try:
+            assert sum(query.startswith("SELECT") for query in pool.queries) == 1
+            assert manager.renewal_scheduler.get_stats()["scheduled"] == 2
+            assert isinstance(manager.subscriptions["sub-later"].created_at, datetime)
+
+            for _ in range(100):
+                if manager.renewal_scheduler.stats["renewals"]:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await manager.shutdown()
+
+        assert manager.renewal_scheduler.stats["renewals"] == 1
+        assert manager.subscriptions["sub-soon"].expiration_date_time > later.expiration_date_time
+        assert manager.renewal_scheduler.get_stats()["scheduled"] == 2
+
+        # The renewal was written back and reads back with its new expiration
+        stored = await manager._load_subscription_from_database("sub-soon")
+        assert stored.expiration_date_time == manager.subscriptions["sub-soon"].expiration_date_time
 
 
 @pytest.fixture